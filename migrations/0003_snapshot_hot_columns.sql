@@ -0,0 +1,28 @@
+-- Migration 0003: promote the snapshot cache-hit fields out of ``payload``
+-- The incremental snapshot cache only needs the newest checksum, generation
+-- time and row count for a ticker.  Reading them from dedicated columns
+-- avoids fetching and decoding the whole JSON payload on every ingest.
+
+ALTER TABLE snapshots ADD COLUMN generated_at TEXT;
+
+-- backfill rows written before the columns were maintained on insert;
+-- snapshot ingests store the digest as ``sha256`` and the row count as
+-- ``rows_count`` in the payload
+UPDATE snapshots
+SET checksum = COALESCE(checksum, json_extract(payload, '$.checksum'),
+                        json_extract(payload, '$.sha256')),
+    rows = COALESCE(rows, json_extract(payload, '$.rows'),
+                    json_extract(payload, '$.rows_count')),
+    generated_at = json_extract(payload, '$.generated_at')
+WHERE json_valid(payload);
+
+-- covering index for the last-snapshot lookup: the newest row of a ticker
+-- and its hot fields are answered from the index alone
+DROP INDEX IF EXISTS snapshots_ticker_created_at_idx;
+
+CREATE INDEX IF NOT EXISTS snapshots_ticker_created_at_idx
+    ON snapshots(ticker, created_at, checksum, generated_at, rows);
+
+-- index to accelerate lookups by content digest
+CREATE INDEX IF NOT EXISTS snapshots_checksum_idx
+    ON snapshots(checksum);
@@ -0,0 +1,12 @@
+-- Migration 0004: locate snapshots archived into bundles
+-- `snapshots purge --archive-dir --bundle` packs archived snapshots per
+-- ticker and month into a zip bundle.  These columns record the bundle file,
+-- the member name inside it and the byte offset of the member's local
+-- header, so a single snapshot can be restored without unpacking the bundle.
+-- Rows archived as individual files keep them NULL.
+
+ALTER TABLE snapshots ADD COLUMN archive_bundle TEXT;
+
+ALTER TABLE snapshots ADD COLUMN archive_member TEXT;
+
+ALTER TABLE snapshots ADD COLUMN archive_offset INTEGER;
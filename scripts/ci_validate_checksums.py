@@ -4,7 +4,10 @@
 Validates snapshot checksums against stored metadata in DB.
 
 Usage:
-    python scripts/ci_validate_checksums.py
+    python scripts/ci_validate_checksums.py [--no-cache]
+
+Checksums come from the shared persistent cache when the file is unchanged
+since it was last hashed; ``--no-cache`` re-reads every snapshot.
 
 Exit codes:
     0: All checksums valid
@@ -13,10 +16,12 @@ Exit codes:
 
 from __future__ import annotations
 
+import argparse
 import logging
 import os
 import sys
 from pathlib import Path
+from typing import Optional, Sequence
 
 # Ensure repo root is on sys.path for imports
 _REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -24,19 +29,35 @@ if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
 from src import db  # noqa: E402
-from src.utils.checksums import sha256_file  # noqa: E402
+from src.etl.snapshot import snapshot_file_checksum  # noqa: E402
+from src.utils.checksums import set_checksum_cache_enabled  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
 
-def main() -> int:  # noqa: C901 - complexity acceptable in simple script
+def main(argv: Optional[Sequence[str]] = None) -> int:  # noqa: C901
     """Run checksum validation against all non-archived snapshots.
 
+    Parameters
+    ----------
+    argv : Sequence[str], optional
+        Command-line arguments (default: none, i.e. use the checksum cache).
+
     Returns
     -------
     int
         Exit code: 0 if all pass, 1 if any fail.
     """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read every snapshot instead of using the checksum cache",
+    )
+    args = parser.parse_args(list(argv or []))
+    if args.no_cache:
+        set_checksum_cache_enabled(False)
+
     print("Validating snapshot checksums...")
     print()
 
@@ -92,7 +113,7 @@ def main() -> int:  # noqa: C901 - complexity acceptable in simple script
             failed += 1
             continue
 
-        computed = sha256_file(path_obj)
+        computed = snapshot_file_checksum(path_obj)
         if computed == stored_checksum:
             print(f"PASS: {ticker} (id={snap_id}) - checksum: {computed[:12]}...")
             passed += 1
@@ -119,4 +140,4 @@ def main() -> int:  # noqa: C901 - complexity acceptable in simple script
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(main(sys.argv[1:]))
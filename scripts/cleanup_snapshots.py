@@ -13,7 +13,6 @@ arquivo existir e o checksum bater; caso contrário marca como archived).
 from __future__ import annotations
 
 import argparse
-import hashlib
 import json
 import logging
 import os
@@ -25,6 +24,7 @@ from typing import Any
 
 from src.logging_config import configure_logging
 from src.time_utils import now_utc_iso
+from src.utils.checksums import checksum_cached, set_checksum_cache_enabled
 
 # configure a basic structured logger for the script
 configure_logging()
@@ -34,6 +34,10 @@ logger = logging.getLogger(__name__)
 def sha256_file(path: Path) -> str:
     """Compute SHA-256 checksum of a file.
 
+    Uses the shared persistent checksum cache
+    (:func:`src.utils.checksums.checksum_cached`), so unchanged files are
+    not re-read across runs.
+
     Parameters:
         path (Path): Path to the file to hash.
 
@@ -43,11 +47,7 @@ def sha256_file(path: Path) -> str:
     Raises:
         OSError: Propagated if the file cannot be opened or read.
     """
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    return checksum_cached(path, "file")
 
 
 def backup_db(db_path: Path) -> Path:
@@ -205,8 +205,15 @@ def main() -> None:
         action="store_true",
         help="Do not backup DB before applying (not recommended)",
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read every candidate instead of using the checksum cache",
+    )
 
     args = p.parse_args()
+    if args.no_cache:
+        set_checksum_cache_enabled(False)
     if args.apply and args.dry_run:
         p.error("Cannot specify both --apply and --dry-run")
     apply_changes = args.apply and not args.dry_run
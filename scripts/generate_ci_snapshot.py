@@ -275,13 +275,13 @@ def _compute_and_persist_metadata(out_path: Path, df: pd.DataFrame) -> str:
     """
     try:
         from src import db
-        from src.utils.checksums import sha256_file  # local import
+        from src.utils.checksums import checksum_cached  # local import
     except ImportError as exc:  # pragma: no cover - defensive
         print(f"Falha ao importar helpers de checksum/DB: {exc}", file=sys.stderr)
         return ""
 
     try:
-        checksum = sha256_file(out_path)
+        checksum = checksum_cached(out_path, "file")
         size = out_path.stat().st_size
         rows = len(df)
         metadata = {
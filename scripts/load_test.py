@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Teste de carga do fluxo `main run` contra o servidor local de market data.
+
+Sobe :class:`src.loadtest.MarketDataServer` numa porta aleatória e dispara
+``--workers`` processos ``main run --provider http`` em paralelo, cada um com
+uma fatia dos tickers sintéticos (via ``DEFAULT_TICKERS``). Cada processo
+grava suas métricas num sink JSONL (``METRICS_SINK_FILE``); ao final os
+registros são agregados em um relatório com vazão, retries e latência de
+cauda (p50/p95/p99) por ticker e por tentativa de fetch.
+
+Todos os artefatos (banco, raw/, metadata/, locks) ficam num diretório de
+trabalho temporário, então o script não toca nos dados do projeto.
+
+Usage:
+    python scripts/load_test.py --tickers 40 --workers 4 \
+        --latency-ms 50 --jitter-ms 100 --error-rate 0.05 --rate-limit-rate 0.05
+    python scripts/load_test.py --tickers 8 --workers 2 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from src.loadtest import MarketDataServer, MarketServerConfig  # noqa: E402
+
+_RETRY_COUNTERS = {
+    "attempts": "adapter_fetch_attempts_total",
+    "retries": "adapter_fetch_retries_total",
+    "permanent_failures": "adapter_fetch_permanent_failures_total",
+}
+
+
+def synthetic_tickers(count: int) -> List[str]:
+    """Gera ``count`` tickers válidos no padrão B3 (``LTAA3``, ``LTAB3``...)."""
+    letters = string.ascii_uppercase
+    pairs = ("".join(p) for p in itertools.product(letters, repeat=2))
+    return [f"LT{pair}3" for pair in itertools.islice(pairs, count)]
+
+
+def _chunks(items: List[str], n: int) -> List[List[str]]:
+    n = max(1, min(n, len(items)))
+    return [items[i::n] for i in range(n)]
+
+
+def _run_worker(
+    tickers: List[str], workdir: Path, env: Dict[str, str], index: int
+) -> Dict[str, Any]:
+    sink = workdir / f"metrics-{index}.jsonl"
+    worker_env = {
+        **env,
+        "DEFAULT_TICKERS": ",".join(tickers),
+        "METRICS_SINK_FILE": str(sink),
+    }
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.main", "run", "--provider", "http"],
+        cwd=workdir,
+        env=worker_env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return {
+        "worker": index,
+        "tickers": len(tickers),
+        "returncode": proc.returncode,
+        "seconds": time.perf_counter() - t0,
+        "records": [
+            json.loads(line)
+            for line in (sink.read_text().splitlines() if sink.exists() else [])
+            if line.strip()
+        ],
+        "stderr_tail": proc.stderr[-2000:] if proc.returncode else "",
+    }
+
+
+def _merge_histograms(records: Iterable[Dict[str, Any]], name: str, **labels):
+    buckets: Optional[List[float]] = None
+    counts: List[float] = []
+    total = 0
+    for record in records:
+        for series in record.get("histograms", {}).get(name, []):
+            if any(series["labels"].get(k) != v for k, v in labels.items()):
+                continue
+            if buckets is None:
+                buckets = list(series["buckets"])
+                counts = [0] * len(buckets)
+            counts = [
+                a + b for a, b in zip(counts, series["bucket_counts"], strict=True)
+            ]
+            total += series["count"]
+    return buckets or [], counts, total
+
+
+def histogram_quantile(buckets, cumulative, total, q: float) -> Optional[float]:
+    """Limite superior do bucket que contém o quantil ``q`` (``inf`` se acima)."""
+    if not total:
+        return None
+    target = q * total
+    for bound, seen in zip(buckets, cumulative, strict=True):
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def _latency_summary(records, name: str, **labels) -> Dict[str, Any]:
+    buckets, counts, total = _merge_histograms(records, name, **labels)
+    return {
+        "count": total,
+        **{
+            f"p{int(q * 100)}": histogram_quantile(buckets, counts, total, q)
+            for q in (0.5, 0.95, 0.99)
+        },
+    }
+
+
+def _counter_total(records, name: str) -> float:
+    return sum(
+        series["value"]
+        for record in records
+        for series in record.get("counters", {}).get(name, [])
+    )
+
+
+def run_load_test(
+    tickers: List[str],
+    workers: int,
+    config: MarketServerConfig,
+    workdir: Optional[Path] = None,
+    extra_env: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Executa o teste de carga e retorna o relatório agregado."""
+    with tempfile.TemporaryDirectory(prefix="b3-loadtest-") as tmp:
+        base = Path(workdir or tmp)
+        base.mkdir(parents=True, exist_ok=True)
+        with MarketDataServer(config) as server:
+            env = {
+                **os.environ,
+                "PYTHONPATH": os.pathsep.join(
+                    filter(None, [str(_REPO_ROOT), os.environ.get("PYTHONPATH")])
+                ),
+                "MARKET_DATA_URL": server.url,
+                "DATA_DIR": str(base / "dados"),
+                "LOCK_DIR": str(base / "locks"),
+                "SNAPSHOT_DIR": str(base / "snapshots"),
+                # backoff curto: o objetivo é medir o caminho, não esperar
+                "ADAPTER_RETRY_INITIAL_DELAY_MS": "50",
+                "ADAPTER_RETRY_MAX_DELAY_MS": "500",
+                **(extra_env or {}),
+            }
+            env.pop("PROMETHEUS_TEXTFILE", None)
+            t0 = time.perf_counter()
+            groups = _chunks(tickers, workers)
+            with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+                results = list(
+                    pool.map(
+                        lambda ig: _run_worker(ig[1], base, env, ig[0]),
+                        enumerate(groups),
+                    )
+                )
+            elapsed = time.perf_counter() - t0
+            server_stats = server.stats()
+
+    records = [r for res in results for r in res["records"]]
+    ingested = {
+        status: sum(
+            1
+            for record in records
+            for series in record.get("counters", {}).get("ingest_rows_total", [])
+            if series["labels"].get("status") == status
+        )
+        for status in ("success", "error")
+    }
+    return {
+        "tickers": len(tickers),
+        "workers": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_tickers_per_second": round(len(tickers) / elapsed, 3)
+        if elapsed
+        else None,
+        "failed_workers": [r["worker"] for r in results if r["returncode"] != 0],
+        "ingested": ingested,
+        "retry": {
+            key: _counter_total(records, name) for key, name in _RETRY_COUNTERS.items()
+        },
+        "ticker_fetch_latency_seconds": _latency_summary(
+            records, "pipeline_stage_duration_seconds", stage="fetch"
+        ),
+        "attempt_latency_seconds": _latency_summary(
+            records, "adapter_fetch_latency_seconds", provider="http"
+        ),
+        "server": {k: v for k, v in server_stats.items() if k != "config"},
+        "stderr": {r["worker"]: r["stderr_tail"] for r in results if r["stderr_tail"]},
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"tickers={report['tickers']} workers={report['workers']} "
+        f"elapsed={report['elapsed_seconds']}s "
+        f"throughput={report['throughput_tickers_per_second']} tickers/s"
+    )
+    retry = report["retry"]
+    print(
+        f"attempts={retry['attempts']:.0f} retries={retry['retries']:.0f} "
+        f"permanent_failures={retry['permanent_failures']:.0f} "
+        f"server_status={report['server']['by_status']}"
+    )
+    for key in ("ticker_fetch_latency_seconds", "attempt_latency_seconds"):
+        s = report[key]
+        print(f"{key}: n={s['count']} p50<={s['p50']} p95<={s['p95']} p99<={s['p99']}")
+    for worker, tail in report["stderr"].items():
+        print(f"--- worker {worker} stderr ---\n{tail}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--padding-bytes", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="imprime JSON")
+    args = parser.parse_args(argv)
+
+    config = MarketServerConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        padding_bytes=args.padding_bytes,
+        seed=args.seed,
+    )
+    report = run_load_test(synthetic_tickers(args.tickers), args.workers, config)
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        _print_report(report)
+    return 1 if report["failed_workers"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
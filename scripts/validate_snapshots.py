@@ -6,6 +6,12 @@ Usage:
         --manifest snapshots/checksums.json
     python scripts/validate_snapshots.py --dir snapshots \
         --manifest snapshots/checksums.json --update
+
+Os checksums são calculados por um pool de processos (``--workers``) e
+guardados num cache incremental ao lado do manifesto
+(``.checksums.json.cache``), indexado por caminho, tamanho, mtime_ns e
+inode: arquivos inalterados não são relidos.  ``--no-cache`` força o
+recálculo completo.
 """
 
 from __future__ import annotations
@@ -17,6 +23,7 @@ import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, NoReturn, Tuple
@@ -36,28 +43,136 @@ if str(_REPO_ROOT) not in sys.path:
 # is on `sys.path`.
 
 
+# snapshots CSV, comprimidos ou não
+SNAPSHOT_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.zst")
+
+_HASH_CACHE_VERSION = 1
+# arquivos modificados há menos que isso não entram no cache (ver
+# generate_manifest)
+_RACY_WINDOW_NS = 2_000_000_000
+
+
 def sha256_of_file(path: Path) -> str:
-    h = hashlib.sha256()
+    """SHA256 do conteúdo; ``.gz``/``.zst`` são descomprimidos em fluxo."""
+    if path.suffix in (".gz", ".zst"):
+        from src.utils.checksums import sha256_content
+
+        return sha256_content(path)
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        # file_digest lê com buffers grandes (readinto), sem cópias por bloco
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _hash_files(paths: List[Path], workers: int) -> List[str]:
+    """Calcula o SHA256 de ``paths``, em paralelo com ``workers`` processos.
+
+    Processos (e não threads) para que a descompressão e o hashing de
+    muitos arquivos usem vários núcleos; com ``workers <= 1`` ou um único
+    arquivo o cálculo é sequencial no próprio processo.
+    """
+    if workers <= 1 or len(paths) < 2:
+        return [sha256_of_file(p) for p in paths]
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # fork em processo com threads pode travar; forkserver evita isso sem o
+    # custo de reimportar tudo a cada worker como no spawn
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+    workers = min(workers, len(paths))
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(sha256_of_file, paths, chunksize=chunksize))
+
+
+def _file_key(path: Path) -> List[int]:
+    """Identidade de um arquivo para o cache: (tamanho, mtime_ns, inode)."""
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def load_hash_cache(path: Path) -> Dict[str, Dict[str, object]]:
+    """Carrega o cache incremental de checksums (vazio se ausente/inválido).
+
+    O cache mapeia o caminho de cada arquivo para a sua identidade
+    (:func:`_file_key`) e o SHA256 calculado; um cache corrompido é
+    descartado, pois no pior caso os arquivos são apenas recalculados.
+    """
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _HASH_CACHE_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
 
 
-def generate_manifest(directory: Path, pattern: str = "*") -> Dict[str, Dict[str, str]]:
+def save_hash_cache(path: Path, cache: Dict[str, Dict[str, object]]) -> None:
+    """Grava o cache incremental de forma atômica ao lado do manifesto."""
+    payload = {"version": _HASH_CACHE_VERSION, "entries": cache}
+    _atomic_write_json(_prepare_manifest_target(path, allow_external=True), payload)
+
+
+def generate_manifest(
+    directory: Path,
+    pattern: str | Tuple[str, ...] = "*",
+    *,
+    workers: int = 1,
+    cache: Dict[str, Dict[str, object]] | None = None,
+) -> Dict[str, Dict[str, str]]:
     """Generate a manifest of files under `directory` matching `pattern`.
 
     Default behavior (pattern="*") preserves legacy behavior used by tests
-    (includes all files). When validating snapshots we pass `pattern="*.csv"`
-    to include only CSV snapshot files and ignore auxiliary files like
-    `.checksum` and the manifest itself.
+    (includes all files). When validating snapshots we pass
+    `SNAPSHOT_PATTERNS` to include only (compressed) CSV snapshot files and
+    ignore auxiliary files like `.checksum` and the manifest itself.
+
+    Files are hashed by `workers` processes. When a `cache` mapping (see
+    `load_hash_cache`) is given, files whose (size, mtime_ns, inode) match
+    the cached entry are not read again, and the mapping is updated in place
+    to describe exactly the files seen in this run.
     """
-    out: Dict[str, Dict[str, str]] = {}
-    for p in sorted(directory.rglob(pattern)):
-        if p.is_file():
-            rel = str(p.as_posix())
-            out[rel] = {"sha256": sha256_of_file(p)}
-    return out
+    patterns = (pattern,) if isinstance(pattern, str) else pattern
+    # blobs of the deduplicating store (``objects/``) are reached through
+    # the snapshot names linked to them; listing them would duplicate entries
+    paths = {
+        p
+        for pat in patterns
+        for p in directory.rglob(pat)
+        if "objects" not in p.relative_to(directory).parts[:-1]
+    }
+    files = [p for p in sorted(paths) if p.is_file()]
+
+    digests: Dict[Path, str] = {}
+    fresh: Dict[str, Dict[str, object]] = {}
+    pending: List[Tuple[Path, List[int]]] = []
+    for p in files:
+        key = _file_key(p)
+        entry = (cache or {}).get(str(p))
+        if entry is not None and entry.get("key") == key:
+            digests[p] = str(entry["sha256"])
+            fresh[str(p)] = entry
+        else:
+            pending.append((p, key))
+
+    hashed = _hash_files([p for p, _ in pending], workers)
+    # a file modified within the timestamp granularity of its cache entry
+    # could change again without changing (size, mtime_ns): only files older
+    # than the window are cached ("racy" entries are re-hashed next run)
+    racy_after = time.time_ns() - _RACY_WINDOW_NS
+    for (p, key), digest in zip(pending, hashed, strict=True):
+        digests[p] = digest
+        if key[1] < racy_after:
+            fresh[str(p)] = {"key": key, "sha256": digest}
+
+    if cache is not None:
+        cache.clear()
+        cache.update(fresh)
+    return {str(p.as_posix()): {"sha256": digests[p]} for p in files}
 
 
 def load_manifest(path: Path) -> Dict[str, Dict[str, str]]:
@@ -300,6 +415,26 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         help="Permite usar caminhos fora de snapshots/ (use com cuidado)",
     )
     p.add_argument("--update", action="store_true", help="Regenerate manifest")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processos usados para calcular checksums (padrão: nº de CPUs)",
+    )
+    p.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        help=(
+            "Cache incremental de checksums (padrão: .<manifesto>.cache ao "
+            "lado do manifesto)"
+        ),
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recalcula todos os checksums sem ler nem gravar o cache",
+    )
     return p
 
 
@@ -360,6 +495,15 @@ def _report_basename_collisions(collisions: Dict[str, List[str]]) -> NoReturn:
     raise SystemExit(3)
 
 
+def _cache_path(args: argparse.Namespace) -> Path | None:
+    """Caminho do cache incremental, ou ``None`` com ``--no-cache``."""
+    if args.no_cache:
+        return None
+    if args.cache:
+        return Path(args.cache)
+    return args.manifest.with_name(f".{args.manifest.name}.cache")
+
+
 def main():
     args = _build_arg_parser().parse_args()
 
@@ -372,6 +516,8 @@ def main():
         manifest_str = validate_and_resolve(
             args.manifest or str(_SNAP / "checksums.json"), _SNAP, allow_external
         )
+        if args.cache:
+            args.cache = validate_and_resolve(args.cache, _SNAP, allow_external)
     except (ValueError, OSError) as e:
         print(e)
         raise SystemExit(2) from e
@@ -384,7 +530,16 @@ def main():
     args.manifest = Path(manifest_str)
 
     # Generate current manifest (CSV files only) and apply remapping logic
-    current = generate_manifest(args.dir, pattern="*.csv")
+    cache_path = _cache_path(args)
+    cache = None if cache_path is None else load_hash_cache(cache_path)
+    current = generate_manifest(
+        args.dir, pattern=SNAPSHOT_PATTERNS, workers=args.workers, cache=cache
+    )
+    if cache_path is not None and cache is not None:
+        try:
+            save_hash_cache(cache_path, cache)
+        except OSError as e:
+            logger.warning("não foi possível gravar o cache %s: %s", cache_path, e)
     current = _remap_external_current(current, allow_external)
 
     if args.update:
@@ -4,22 +4,51 @@ Interface base para adaptadores de provedores de dados financeiros.
 Define o contrato público que todos os adaptadores devem implementar.
 """
 
+import asyncio
 import contextlib
+import functools
 import logging
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
-from src.adapters.errors import FetchError, NetworkError, ValidationError
+from src.adapters.chunked import ChunkConfig, ChunkedFetch, Window
+from src.adapters.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from src.adapters.errors import (
+    CircuitOpenError,
+    FetchError,
+    NetworkError,
+    ValidationError,
+)
+from src.adapters.rate_limiter import RateLimiter, acquire_async, get_rate_limiter
 from src.adapters.retry_config import RetryConfig
-from src.adapters.retry_metrics import get_global_metrics
+from src.adapters.retry_metrics import UNKNOWN_PROVIDER, get_global_metrics
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _RetryState:
+    """Estado de uma chamada a `_fetch_with_retries` (sync ou async)."""
+
+    ticker: str
+    log_context: dict
+    metrics: Any
+    provider: str
+    max_attempts: int
+    backoff_factor: float
+    required_columns: Optional[List[str]]
+    rate_limiter: RateLimiter
+    breaker: CircuitBreaker
+    allow_empty: bool = False
+    last_exception: Optional[BaseException] = field(default=None)
+
+
 class Adapter(ABC):
     """
     Interface abstrata para adaptadores de provedores de dados financeiros.
@@ -31,14 +60,21 @@ class Adapter(ABC):
     sem realizar persistência ou transformações complexas.
     """
 
-    def __init__(self, retry_config: Optional[RetryConfig] = None):
+    def __init__(
+        self,
+        retry_config: Optional[RetryConfig] = None,
+        chunk_config: Optional[ChunkConfig] = None,
+    ):
         """
         Inicializa adaptador com configuração de retry.
 
         Args:
             retry_config: Configuração de retry. Se None, carrega do ambiente.
+            chunk_config: Configuração da busca em blocos. Se None, carrega do
+                ambiente.
         """
         self.retry_config = retry_config or RetryConfig.from_env()
+        self.chunk_config = chunk_config or ChunkConfig.from_env()
         self._metrics = get_global_metrics()
 
     @abstractmethod
@@ -265,26 +301,22 @@ class Adapter(ABC):
                 "Adapter validation logging helper not available", exc_info=True
             )
 
-    def _handle_retryable_exception(
+    def _retryable_wait(
         self,
         e: Exception,
         attempt: int,
-        effective_max_retries: int,
-        backoff_factor: float,
-        log_context: dict,
-        metrics,
+        state: "_RetryState",
         status_code,
-        ticker: str,
-    ) -> bool:
-        """Lida com exceções retryable: registra o erro, aguarda segundo
-        backoff e retorna True para indicar retry.
-
-        Atualiza `log_context` com informações da falha, registra métricas e,
-        quando o número de tentativas excede `effective_max_retries`, registra
-        falha permanente e lança `NetworkError`. Caso contrário, calcula o
-        tempo de backoff, aguarda e retorna True para indicar que o chamador
-        deve tentar novamente.
+    ) -> float:
+        """Lida com exceções retryable: registra o erro e retorna o backoff.
+
+        Atualiza o ``log_context`` com informações da falha e registra
+        métricas. Quando o número de tentativas atinge o máximo, registra
+        falha permanente e lança `NetworkError`; caso contrário retorna o tempo
+        de espera antes da próxima tentativa (quem chama decide como dormir:
+        ``time.sleep`` no caminho síncrono, ``asyncio.sleep`` no assíncrono).
         """
+        log_context = state.log_context
         log_context["status"] = "retryable_error"
         log_context["error_message"] = str(e)
         if status_code is not None:
@@ -292,63 +324,184 @@ class Adapter(ABC):
         msg = f"Erro retryable na tentativa {attempt}"
         logger.warning(msg, extra=log_context)
 
-        if attempt >= effective_max_retries:
-            metrics.record_permanent_failure()
+        if attempt >= state.max_attempts:
+            state.metrics.record_permanent_failure(state.provider, state.ticker)
             msg = (
-                f"Falha de rede ao buscar {ticker} "
-                f"após {effective_max_retries} tentativas"
+                f"Falha de rede ao buscar {state.ticker} "
+                f"após {state.max_attempts} tentativas"
             )
             raise NetworkError(msg, original_exception=e) from e
 
         wait_time = self._compute_and_record_backoff(
-            attempt, backoff_factor, metrics, log_context
+            attempt, state.backoff_factor, state.metrics, log_context
         )
         msg = f"Aguardando {wait_time}s antes de retry"
         logger.debug(msg, extra=log_context)
-        time.sleep(wait_time)
-        return True
+        return wait_time
 
-    def _handle_non_retryable_fetch_error(
-        self,
-        e: Exception,
-        attempt: int,
-        effective_max_retries: int,
-        backoff_factor: float,
-        log_context: dict,
-        metrics,
-        ticker: str,
-    ) -> None:
+    def _non_retryable_wait(
+        self, e: Exception, attempt: int, state: "_RetryState"
+    ) -> float:
         """Trata erros de fetch não retryable: registra e levanta exceção ou
-        aguarda para nova tentativa."""
+        retorna o tempo de espera para nova tentativa."""
+        log_context = state.log_context
         log_context["status"] = "fetch_error"
         log_context["error_message"] = str(e)
         log_context["error_type"] = type(e).__name__
         msg = f"Erro ao buscar dados na tentativa {attempt}"
         logger.error(msg, extra=log_context)
 
-        if attempt >= effective_max_retries:
-            metrics.record_permanent_failure()
+        if attempt >= state.max_attempts:
+            state.metrics.record_permanent_failure(state.provider, state.ticker)
             raise FetchError(
-                f"Erro ao buscar dados de {ticker}: {str(e)}",
+                f"Erro ao buscar dados de {state.ticker}: {str(e)}",
                 original_exception=e,
             ) from e
 
-        wait_time = self._compute_and_record_backoff(
-            attempt, backoff_factor, metrics, log_context
+        return self._compute_and_record_backoff(
+            attempt, state.backoff_factor, state.metrics, log_context
         )
-        time.sleep(wait_time)
 
     # TODO: Rename this helper and update references in
-    # `_handle_retryable_exception` and `_handle_non_retryable_fetch_error`.
+    # `_retryable_wait` and `_non_retryable_wait`.
     def _compute_and_record_backoff(
         self, attempt, backoff_factor, metrics, log_context
     ):
         result, delay_ms = self._compute_wait(attempt, backoff_factor)
-        metrics.record_retry()
+        provider = self._metrics_provider(log_context)
+        ticker = log_context.get("ticker")
+        metrics.record_retry(provider, ticker)
+        metrics.observe_backoff_sleep(result, provider, ticker)
         log_context["next_delay_ms"] = delay_ms
         return result
 
-    def _fetch_with_retries(  # noqa: C901
+    def _metrics_provider(self, log_context: Optional[dict] = None) -> str:
+        """Nome do provedor usado como chave nas métricas de retry."""
+        if log_context and log_context.get("provider"):
+            return str(log_context["provider"])
+        try:
+            return self.get_metadata().get("provider") or UNKNOWN_PROVIDER
+        except Exception:
+            return UNKNOWN_PROVIDER
+
+    def _retry_state(
+        self,
+        ticker: str,
+        log_context: Optional[dict],
+        max_retries: int,
+        backoff_factor: float,
+        idempotent: bool,
+        required_columns: Optional[List[str]],
+        allow_empty: bool = False,
+    ) -> "_RetryState":
+        """Monta o estado compartilhado pelos loops de retry sync e async."""
+        # Allow zero to be specified by configuration (interpreted as
+        # "no additional retries"). Only negative values are invalid.
+        if max_retries < 0:
+            raise ValueError(f"max_retries deve ser >= 0, recebido: {max_retries}")
+
+        if log_context is None:
+            log_context = {}
+
+        # Ensure we have at least one attempt by default. A configured
+        # `max_retries=0` is treated as "no extra retries" which means a
+        # single attempt (behavior preserved for backwards compatibility).
+        effective_max_retries = max(1, max_retries)
+        if not idempotent and effective_max_retries > 1:
+            logger.warning(
+                "Operação não-idempotente; desabilitando retries",
+                extra={**log_context, "idempotent": False},
+            )
+            effective_max_retries = 1
+
+        provider = self._metrics_provider(log_context)
+        return _RetryState(
+            ticker=ticker,
+            log_context=log_context,
+            metrics=getattr(self, "_metrics", get_global_metrics()),
+            provider=provider,
+            max_attempts=effective_max_retries,
+            backoff_factor=backoff_factor,
+            required_columns=required_columns,
+            rate_limiter=get_rate_limiter(provider),
+            breaker=get_circuit_breaker(provider),
+            allow_empty=allow_empty,
+        )
+
+    def _start_attempt(self, state: "_RetryState", attempt: int, waited: float):
+        """Registra o início de uma tentativa (após breaker e rate limiter)."""
+        if waited:
+            state.log_context["rate_limit_wait_ms"] = int(waited * 1000)
+        state.metrics.record_attempt(state.provider, state.ticker)
+        state.log_context["attempt"] = attempt
+        msg = f"Tentativa {attempt} de {state.max_attempts}"
+        logger.debug(msg, extra=state.log_context)
+
+    def _finish_attempt(
+        self, state: "_RetryState", attempt: int, df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Valida o resultado de uma tentativa bem-sucedida e registra métricas."""
+        # blocos de uma busca em chunks podem ser vazios (ex.: antes do IPO);
+        # a validação completa é feita sobre o resultado da junção
+        if not (state.allow_empty and df.empty):
+            self._validate_dataframe(
+                df, state.ticker, required_columns=state.required_columns
+            )
+
+        state.log_context["status"] = "success"
+        state.log_context["rows_fetched"] = len(df)
+        msg = f"Dados obtidos com sucesso: {len(df)} linhas"
+        logger.info(msg, extra=state.log_context)
+
+        state.breaker.record_success()
+        if attempt == 1:
+            state.metrics.record_first_attempt_success(state.provider, state.ticker)
+        else:
+            state.metrics.record_success_after_retry(state.provider, state.ticker)
+        return df
+
+    def _failed_attempt(
+        self, state: "_RetryState", attempt: int, e: Exception
+    ) -> float:
+        """Classifica a falha de uma tentativa e retorna o backoff a aguardar.
+
+        Levanta a exceção final (`ValidationError`, `NetworkError`,
+        `FetchError` ou `CircuitOpenError`) quando não haverá nova tentativa.
+        """
+        if isinstance(e, ValidationError):
+            # o provedor respondeu: para o breaker isso não é indisponibilidade
+            state.breaker.record_success()
+            # Log adapter-level validation failures for auditability
+            self._log_adapter_validation(e, state.ticker, state.log_context)
+            raise e
+
+        state.last_exception = e
+        status_code = self._extract_status_code(e)
+        # Retryable errors: network/timeouts or configured status codes
+        if self._is_retryable_exception(e, status_code):
+            state.breaker.record_failure()
+            if state.breaker.is_open():
+                state.metrics.record_permanent_failure(state.provider, state.ticker)
+                raise CircuitOpenError(
+                    f"circuito aberto para {state.provider} após falha em "
+                    f"{state.ticker}",
+                    original_exception=e,
+                ) from e
+            return self._retryable_wait(e, attempt, state, status_code)
+
+        # Non-retryable fetch errors: o provedor respondeu, então não
+        # contam como indisponibilidade para o breaker
+        state.breaker.record_success()
+        return self._non_retryable_wait(e, attempt, state)
+
+    def _exhausted(self, state: "_RetryState") -> FetchError:
+        msg = (
+            f"Falha ao buscar dados de {state.ticker} "
+            f"após {state.max_attempts} tentativas"
+        )
+        return FetchError(msg, original_exception=state.last_exception)
+
+    def _fetch_with_retries(
         self,
         ticker: str,
         start: str,
@@ -359,6 +512,7 @@ class Adapter(ABC):
         timeout: Optional[float] = None,
         required_columns: Optional[List[str]] = None,
         idempotent: bool = True,
+        allow_empty: bool = False,
         **kwargs,
     ) -> pd.DataFrame:
         """
@@ -366,95 +520,272 @@ class Adapter(ABC):
         Mapeia exceções para `NetworkError` / `FetchError`.
 
         Novidades:
-        - Registra métricas por tentativa (RetryMetrics)
+        - Registra métricas por tentativa e latência por provedor (RetryMetrics)
         - Registra logs estruturados com `attempt`, `next_delay_ms` e `error_message`
         - Respeita idempotência: se idempotent=False, retries são desabilitados
         - Usa `RetryConfig` se disponível para calcular delays
+        - Adquire token do rate limiter do provedor antes de cada tentativa
+        - Circuit breaker por provedor: falha rápida com CircuitOpenError
+        - ``allow_empty=True`` aceita DataFrame vazio (blocos de `_fetch_chunked`)
         """
-        # Allow zero to be specified by configuration (interpreted as
-        # "no additional retries"). Only negative values are invalid.
-        if max_retries < 0:
-            raise ValueError(f"max_retries deve ser >= 0, recebido: {max_retries}")
+        state = self._retry_state(
+            ticker,
+            log_context,
+            max_retries,
+            backoff_factor,
+            idempotent,
+            required_columns,
+            allow_empty,
+        )
+        for attempt in range(1, state.max_attempts + 1):
+            # circuito aberto: falha imediatamente sem gastar tentativas/backoff
+            state.breaker.before_call()
+            # token bucket proativo: aguarda a vaga antes de chamar o provedor
+            # (RateLimitError aqui significa espera acima do máximo configurado)
+            try:
+                waited = state.rate_limiter.acquire()
+            except Exception:
+                state.breaker.cancel_call()
+                raise
+            self._start_attempt(state, attempt, waited)
+            try:
+                fetch_started = time.perf_counter()
+                try:
+                    df = self._fetch_once(ticker, start, end, timeout=timeout, **kwargs)
+                finally:
+                    state.metrics.observe_fetch_latency(
+                        time.perf_counter() - fetch_started, state.provider, ticker
+                    )
+                return self._finish_attempt(state, attempt, df)
+            except Exception as e:
+                wait_time = self._failed_attempt(state, attempt, e)
+            time.sleep(wait_time)
 
-        last_exception = None
-        if log_context is None:
-            log_context = {}
+        raise self._exhausted(state)
 
-        metrics = getattr(self, "_metrics", get_global_metrics())
+    async def _fetch_once_async(
+        self, ticker: str, start: str, end: str, **kwargs
+    ) -> pd.DataFrame:
+        """
+        Versão assíncrona de `_fetch_once`.
 
-        # Ensure we have at least one attempt by default. A configured
-        # `max_retries=0` is treated as "no extra retries" which means a
-        # single attempt (behavior preserved for backwards compatibility).
-        effective_max_retries = max(1, max_retries)
-        if not idempotent and effective_max_retries > 1:
-            logger.warning(
-                "Operação não-idempotente; desabilitando retries",
-                extra={**log_context, "idempotent": False},
-            )
-            effective_max_retries = 1
+        O padrão executa `_fetch_once` (síncrono) no executor padrão do loop;
+        adaptadores com cliente HTTP assíncrono podem sobrescrever.
+        """
+        return await asyncio.to_thread(
+            functools.partial(self._fetch_once, ticker, start, end, **kwargs)
+        )
 
-        for attempt in range(1, effective_max_retries + 1):
-            metrics.record_attempt()
+    async def _fetch_with_retries_async(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        log_context: Optional[dict] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 2.0,
+        timeout: Optional[float] = None,
+        required_columns: Optional[List[str]] = None,
+        idempotent: bool = True,
+        allow_empty: bool = False,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Equivalente assíncrono de `_fetch_with_retries`.
+
+        Mesma classificação de erros, métricas, rate limiter e circuit
+        breaker, mas o backoff (e a espera por token) usa `asyncio.sleep`, de
+        modo que uma tentativa aguardando retry não ocupa nenhuma thread.
+        """
+        state = self._retry_state(
+            ticker,
+            log_context,
+            max_retries,
+            backoff_factor,
+            idempotent,
+            required_columns,
+            allow_empty,
+        )
+        for attempt in range(1, state.max_attempts + 1):
+            state.breaker.before_call()
+            try:
+                waited = await acquire_async(state.rate_limiter)
+            except BaseException:
+                state.breaker.cancel_call()
+                raise
+            self._start_attempt(state, attempt, waited)
             try:
-                log_context["attempt"] = attempt
-                msg = f"Tentativa {attempt} de {effective_max_retries}"
-                logger.debug(msg, extra=log_context)
+                fetch_started = time.perf_counter()
+                try:
+                    df = await self._fetch_once_async(
+                        ticker, start, end, timeout=timeout, **kwargs
+                    )
+                finally:
+                    state.metrics.observe_fetch_latency(
+                        time.perf_counter() - fetch_started, state.provider, ticker
+                    )
+                return self._finish_attempt(state, attempt, df)
+            except Exception as e:
+                wait_time = self._failed_attempt(state, attempt, e)
+            await asyncio.sleep(wait_time)
+
+        raise self._exhausted(state)
+
+    def _plan_chunks(
+        self, ticker: str, start: str, end: str, log_context: Optional[dict]
+    ) -> Optional[ChunkedFetch]:
+        """Plano da busca em blocos; ``None`` se a janela cabe em um bloco."""
+        config = getattr(self, "chunk_config", None) or ChunkConfig.from_env()
+        return ChunkedFetch.plan(
+            ticker, self._metrics_provider(log_context), start, end, config
+        )
 
-                df = self._fetch_once(ticker, start, end, timeout=timeout, **kwargs)
+    def _chunk_context(self, log_context: Optional[dict], window: Window) -> dict:
+        return {
+            **(log_context or {}),
+            "start_date": window[0],
+            "end_date": window[1],
+            "chunk": f"{window[0]}..{window[1]}",
+        }
 
-                self._validate_dataframe(df, ticker, required_columns=required_columns)
+    def _merge_chunks(
+        self,
+        chunked: ChunkedFetch,
+        log_context: Optional[dict],
+        required_columns: Optional[List[str]],
+    ) -> pd.DataFrame:
+        """Junta os blocos ou levanta a falha do primeiro bloco que falhou.
 
-                log_context["status"] = "success"
-                log_context["rows_fetched"] = len(df)
-                msg = f"Dados obtidos com sucesso: {len(df)} linhas"
-                logger.info(msg, extra=log_context)
+        Com falhas, os blocos concluídos ficam no checkpoint e uma nova
+        chamada busca apenas os restantes.
+        """
+        if chunked.errors:
+            failed = [w for w in chunked.windows if w in chunked.errors]
+            logger.error(
+                "Busca em blocos incompleta: %d de %d blocos falharam",
+                len(failed),
+                len(chunked.windows),
+                extra={
+                    **(log_context or {}),
+                    "failed_chunks": [f"{s}..{e}" for s, e in failed],
+                },
+            )
+            raise chunked.errors[failed[0]]
+        df = chunked.merge()
+        self._validate_dataframe(df, chunked.ticker, required_columns=required_columns)
+        chunked.finish()
+        return df
 
-                if attempt == 1:
-                    metrics.record_first_attempt_success()
-                else:
-                    metrics.record_success_after_retry()
+    def _fetch_chunked(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        log_context: Optional[dict] = None,
+        required_columns: Optional[List[str]] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Busca ``[start, end]`` em blocos concorrentes quando a janela excede
+        ``chunk_config.chunk_days``; caso contrário equivale a
+        `_fetch_with_retries`.
+
+        Cada bloco passa pelo loop de retry completo (rate limiter, circuit
+        breaker, métricas) de forma independente e é gravado no checkpoint ao
+        concluir. Os blocos são unidos em ordem e deduplicados por data.
+        Demais argumentos são repassados a `_fetch_with_retries`.
+        """
+        chunked = self._plan_chunks(ticker, start, end, log_context)
+        if chunked is None:
+            return self._fetch_with_retries(
+                ticker,
+                start,
+                end,
+                log_context=log_context,
+                required_columns=required_columns,
+                **kwargs,
+            )
 
-                return df
+        def fetch_chunk(window: Window) -> pd.DataFrame:
+            return self._fetch_with_retries(
+                ticker,
+                window[0],
+                window[1],
+                log_context=self._chunk_context(log_context, window),
+                required_columns=required_columns,
+                allow_empty=True,
+                **kwargs,
+            )
 
-            except ValidationError as e:
-                # Log adapter-level validation failures for auditability
-                self._log_adapter_validation(e, ticker, log_context)
-                raise
+        pending = chunked.pending()
+        if pending:
+            workers = min(chunked.concurrency, len(pending))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="fetch-chunk"
+            ) as pool:
+                futures = {pool.submit(fetch_chunk, w): w for w in pending}
+                for future in as_completed(futures):
+                    window = futures[future]
+                    try:
+                        chunked.complete(window, future.result())
+                    except Exception as e:
+                        chunked.fail(window, e)
+        return self._merge_chunks(chunked, log_context, required_columns)
+
+    async def _fetch_chunked_async(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        log_context: Optional[dict] = None,
+        required_columns: Optional[List[str]] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Equivalente assíncrono de `_fetch_chunked` (blocos via `asyncio`)."""
+        chunked = self._plan_chunks(ticker, start, end, log_context)
+        if chunked is None:
+            return await self._fetch_with_retries_async(
+                ticker,
+                start,
+                end,
+                log_context=log_context,
+                required_columns=required_columns,
+                **kwargs,
+            )
 
-            except Exception as e:
-                last_exception = e
-
-                status_code = self._extract_status_code(e)
-                # Retryable errors: network/timeouts or configured status codes
-                if self._is_retryable_exception(e, status_code):
-                    self._handle_retryable_exception(
-                        e=e,
-                        attempt=attempt,
-                        effective_max_retries=effective_max_retries,
-                        backoff_factor=backoff_factor,
-                        log_context=log_context,
-                        metrics=metrics,
-                        status_code=status_code,
-                        ticker=ticker,
+        semaphore = asyncio.Semaphore(chunked.concurrency)
+
+        async def fetch_chunk(window: Window) -> None:
+            async with semaphore:
+                try:
+                    df = await self._fetch_with_retries_async(
+                        ticker,
+                        window[0],
+                        window[1],
+                        log_context=self._chunk_context(log_context, window),
+                        required_columns=required_columns,
+                        allow_empty=True,
+                        **kwargs,
                     )
-                    continue
-
-                # Non-retryable fetch errors
-                self._handle_non_retryable_fetch_error(
-                    e=e,
-                    attempt=attempt,
-                    effective_max_retries=effective_max_retries,
-                    backoff_factor=backoff_factor,
-                    log_context=log_context,
-                    metrics=metrics,
-                    ticker=ticker,
-                )
-                continue
+                except Exception as e:
+                    chunked.fail(window, e)
+                else:
+                    chunked.complete(window, df)
 
-        msg = (
-            f"Falha ao buscar dados de {ticker} após {effective_max_retries} tentativas"
-        )
-        raise FetchError(msg, original_exception=last_exception)
+        await asyncio.gather(*(fetch_chunk(w) for w in chunked.pending()))
+        return self._merge_chunks(chunked, log_context, required_columns)
+
+    async def fetch_async(self, ticker: str, **kwargs) -> pd.DataFrame:
+        """
+        Versão assíncrona de `fetch`.
+
+        Adaptadores apenas síncronos herdam esta implementação, que executa
+        `fetch` em uma thread do executor padrão do loop (incluindo seus
+        retries bloqueantes). Adaptadores que delegam para
+        `_fetch_with_retries_async` devem sobrescrevê-la para obter backoff
+        não bloqueante.
+        """
+        return await asyncio.to_thread(functools.partial(self.fetch, ticker, **kwargs))
 
     def get_metadata(self) -> Dict[str, str]:
         """
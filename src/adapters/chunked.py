@@ -0,0 +1,277 @@
+"""
+Busca de histórico em blocos (chunks) com checkpoint para backfills longos.
+
+Uma janela ``[start, end]`` maior que ``chunk_days`` é dividida em blocos
+contíguos (o fim de um bloco é o início do seguinte, de modo que provedores
+com fim exclusivo, como o Yahoo, não percam dias; a sobreposição é removida
+na junção por data). Cada bloco passa pelo loop de retry do
+:class:`~src.adapters.base.Adapter` de forma independente — uma falha só
+repete o próprio bloco — e, quando concluído, é gravado em
+``<checkpoint_dir>/<provider>/<ticker>/<inicio>_<fim>.csv``. Um backfill
+reiniciado reaproveita os blocos já gravados e busca apenas os que faltam;
+o checkpoint do ticker é removido quando a janela inteira é concluída.
+
+Configuração via ambiente:
+
+    - ADAPTER_CHUNK_DAYS: tamanho do bloco em dias (padrão 365; ``0``
+      desativa a divisão)
+    - ADAPTER_CHUNK_CONCURRENCY: blocos buscados simultaneamente (padrão 4)
+    - ADAPTER_CHUNK_CHECKPOINT_DIR: diretório dos checkpoints (padrão
+      ``metadata/fetch_checkpoints``; vazio desativa o checkpoint)
+"""
+
+import logging
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+Window = Tuple[str, str]
+
+DEFAULT_CHECKPOINT_DIR = "metadata/fetch_checkpoints"
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]")
+
+
+@dataclass
+class ChunkConfig:
+    """
+    Configuração da busca em blocos.
+
+    Attributes:
+        chunk_days: Tamanho máximo de cada bloco em dias; ``0`` desativa
+        concurrency: Quantidade de blocos buscados ao mesmo tempo
+        checkpoint_dir: Diretório dos checkpoints; ``None`` desativa
+    """
+
+    chunk_days: int = 365
+    concurrency: int = 4
+    checkpoint_dir: Optional[str] = DEFAULT_CHECKPOINT_DIR
+
+    def __post_init__(self) -> None:
+        if self.chunk_days < 0:
+            raise ValueError(f"chunk_days deve ser >= 0, recebido: {self.chunk_days}")
+        if self.concurrency < 1:
+            raise ValueError(f"concurrency deve ser >= 1, recebido: {self.concurrency}")
+
+    @classmethod
+    def from_env(cls, prefix: str = "ADAPTER_CHUNK") -> "ChunkConfig":
+        """
+        Carrega configuração de variáveis de ambiente.
+
+        Args:
+            prefix: Prefixo das variáveis (padrão: ADAPTER_CHUNK)
+
+        Variáveis de ambiente suportadas:
+            - {prefix}_DAYS: tamanho do bloco em dias
+            - {prefix}_CONCURRENCY: blocos simultâneos
+            - {prefix}_CHECKPOINT_DIR: diretório dos checkpoints (vazio
+              desativa)
+        """
+        checkpoint_dir = os.getenv(
+            f"{prefix}_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR
+        ).strip()
+        return cls(
+            chunk_days=int(os.getenv(f"{prefix}_DAYS", "365")),
+            concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", "4")),
+            checkpoint_dir=checkpoint_dir or None,
+        )
+
+
+def split_window(start: str, end: str, chunk_days: int) -> List[Window]:
+    """
+    Divide ``[start, end]`` em blocos de até ``chunk_days`` dias.
+
+    Blocos consecutivos compartilham a data de fronteira (``fim == início``
+    do seguinte); a duplicata é removida em :meth:`ChunkedFetch.merge`.
+
+    Args:
+        start: Data inicial ``YYYY-MM-DD``
+        end: Data final ``YYYY-MM-DD``
+        chunk_days: Tamanho máximo do bloco; ``0`` devolve a janela inteira
+
+    Returns:
+        Lista de pares ``(inicio, fim)`` em ordem cronológica
+    """
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    if chunk_days <= 0 or (last - first).days <= chunk_days:
+        return [(start, end)]
+    windows: List[Window] = []
+    cursor = first
+    while cursor < last:
+        stop = min(cursor + timedelta(days=chunk_days), last)
+        windows.append((cursor.isoformat(), stop.isoformat()))
+        cursor = stop
+    return windows
+
+
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # mesmo achatamento de YFinanceAdapter._finalize: checkpoints em CSV não
+    # preservam colunas MultiIndex, então todos os blocos usam o 1º nível
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = [str(c[0]) if isinstance(c, tuple) else str(c) for c in df.columns]
+    return df
+
+
+class ChunkCheckpoint:
+    """
+    Blocos concluídos de um ticker, persistidos como CSV.
+
+    Args:
+        root: Diretório raiz dos checkpoints
+        provider: Nome do provedor (subdiretório)
+        ticker: Ticker normalizado do provedor
+    """
+
+    def __init__(self, root: str | Path, provider: str, ticker: str):
+        self.path = (
+            Path(root) / _UNSAFE_NAME.sub("_", provider) / _UNSAFE_NAME.sub("_", ticker)
+        )
+
+    def _file(self, window: Window) -> Path:
+        return self.path / f"{window[0]}_{window[1]}.csv"
+
+    def load(self, windows: List[Window]) -> Dict[Window, pd.DataFrame]:
+        """Lê os blocos de ``windows`` já gravados; arquivos ilegíveis são ignorados."""
+        done: Dict[Window, pd.DataFrame] = {}
+        for window in windows:
+            path = self._file(window)
+            if not path.exists():
+                continue
+            try:
+                df = pd.read_csv(path, index_col=0)
+                df.index = pd.to_datetime(df.index)
+            except (OSError, ValueError, pd.errors.EmptyDataError):
+                logger.warning("checkpoint ilegível ignorado: %s", path, exc_info=True)
+                continue
+            done[window] = df
+        return done
+
+    def save(self, window: Window, df: pd.DataFrame) -> None:
+        """Grava o bloco de forma atômica (arquivo temporário + ``os.replace``)."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self._file(window)
+        tmp = target.with_suffix(".csv.tmp")
+        df.to_csv(tmp)
+        os.replace(tmp, target)
+
+    def clear(self) -> None:
+        """Remove o checkpoint do ticker (janela concluída)."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+@dataclass
+class ChunkedFetch:
+    """
+    Estado de uma busca em blocos: janelas, blocos concluídos e falhas.
+
+    Attributes:
+        ticker: Ticker normalizado do provedor
+        provider: Nome do provedor (rótulo das métricas)
+        windows: Blocos da janela, em ordem cronológica
+        concurrency: Blocos buscados ao mesmo tempo
+        checkpoint: Checkpoint em disco (``None`` quando desativado)
+        frames: Blocos concluídos (buscados ou retomados do checkpoint)
+        errors: Exceção final de cada bloco que falhou
+    """
+
+    ticker: str
+    provider: str
+    windows: List[Window]
+    concurrency: int
+    checkpoint: Optional[ChunkCheckpoint] = None
+    frames: Dict[Window, pd.DataFrame] = field(default_factory=dict)
+    errors: Dict[Window, BaseException] = field(default_factory=dict)
+
+    @classmethod
+    def plan(
+        cls, ticker: str, provider: str, start: str, end: str, config: ChunkConfig
+    ) -> Optional["ChunkedFetch"]:
+        """
+        Monta o plano da janela; ``None`` quando ela cabe em um único bloco.
+
+        Blocos presentes no checkpoint entram já concluídos.
+        """
+        windows = split_window(start, end, config.chunk_days)
+        if len(windows) <= 1:
+            return None
+        checkpoint = (
+            ChunkCheckpoint(config.checkpoint_dir, provider, ticker)
+            if config.checkpoint_dir
+            else None
+        )
+        chunked = cls(ticker, provider, windows, config.concurrency, checkpoint)
+        if checkpoint is not None:
+            chunked.frames = checkpoint.load(windows)
+            if chunked.frames:
+                metrics.increment_counter(
+                    "adapter_fetch_chunks_total",
+                    len(chunked.frames),
+                    labels={"provider": provider, "status": "resumed"},
+                    documentation="History chunks by outcome (fetched/resumed/failed)",
+                )
+                logger.info(
+                    "retomando %s: %d de %d blocos no checkpoint",
+                    ticker,
+                    len(chunked.frames),
+                    len(windows),
+                    extra={"ticker": ticker, "checkpoint": str(checkpoint.path)},
+                )
+        return chunked
+
+    def pending(self) -> List[Window]:
+        """Blocos ainda não concluídos."""
+        return [w for w in self.windows if w not in self.frames]
+
+    def _count(self, status: str) -> None:
+        metrics.increment_counter(
+            "adapter_fetch_chunks_total",
+            labels={"provider": self.provider, "status": status},
+            documentation="History chunks by outcome (fetched/resumed/failed)",
+        )
+
+    def complete(self, window: Window, df: pd.DataFrame) -> None:
+        """Registra um bloco concluído e o grava no checkpoint."""
+        df = _flatten_columns(df)
+        self.frames[window] = df
+        self._count("fetched")
+        if self.checkpoint is not None:
+            try:
+                self.checkpoint.save(window, df)
+            except OSError:
+                # checkpoint é auxiliar: a busca segue sem ele
+                logger.warning(
+                    "falha ao gravar checkpoint de %s %s",
+                    self.ticker,
+                    window,
+                    exc_info=True,
+                )
+
+    def fail(self, window: Window, exc: BaseException) -> None:
+        """Registra a falha definitiva (após retries) de um bloco."""
+        self.errors[window] = exc
+        self._count("failed")
+
+    def merge(self) -> pd.DataFrame:
+        """Concatena os blocos em ordem, removendo datas repetidas nas fronteiras."""
+        frames = [self.frames[w] for w in self.windows if w in self.frames]
+        non_empty = [df for df in frames if not df.empty]
+        if not non_empty:
+            return frames[0].iloc[0:0] if frames else pd.DataFrame()
+        df = pd.concat(non_empty) if len(non_empty) > 1 else non_empty[0]
+        df = df[~df.index.duplicated(keep="last")]
+        return df.sort_index()
+
+    def finish(self) -> None:
+        """Remove o checkpoint após a janela inteira ser concluída."""
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
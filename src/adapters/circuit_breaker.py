@@ -0,0 +1,246 @@
+"""
+Circuit breaker por provedor para o loop de retry dos adaptadores.
+
+Quando um provedor está fora do ar, cada ticker de uma execução passaria
+pelo ciclo completo de ``max_retries`` × backoff antes de falhar. O breaker
+conta falhas *retryable* consecutivas por provedor e, ao atingir o limite,
+abre o circuito: novas chamadas falham imediatamente com
+:class:`~src.adapters.errors.CircuitOpenError`. Após ``reset_timeout`` o
+circuito passa a *half-open* e libera uma única chamada de sondagem; sucesso
+fecha o circuito, falha o reabre.
+
+Configuração via ambiente (override por provedor com
+``{prefix}_{PROVIDER}_*``):
+
+    - {prefix}_FAILURE_THRESHOLD: falhas consecutivas para abrir (``0``
+      desabilita; padrão 5)
+    - {prefix}_RESET_TIMEOUT_SECONDS: tempo aberto antes da sondagem
+      (padrão 30)
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src import metrics as _metrics
+from src.adapters.errors import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# valor numérico exportado no gauge ``adapter_circuit_state``
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """
+    Configuração do circuit breaker de um provedor.
+
+    Attributes:
+        failure_threshold: Falhas retryable consecutivas que abrem o circuito
+            (``0`` desabilita o breaker)
+        reset_timeout_seconds: Tempo em aberto antes de liberar a sondagem
+    """
+
+    failure_threshold: int = 5
+    reset_timeout_seconds: float = 30.0
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold < 0:
+            raise ValueError(
+                f"failure_threshold deve ser >= 0, recebido: {self.failure_threshold}"
+            )
+        if self.reset_timeout_seconds < 0:
+            raise ValueError(
+                "reset_timeout_seconds deve ser >= 0, recebido: "
+                f"{self.reset_timeout_seconds}"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    @classmethod
+    def from_env(
+        cls, provider: Optional[str] = None, prefix: str = "ADAPTER_CIRCUIT"
+    ) -> "CircuitBreakerConfig":
+        """
+        Carrega configuração de variáveis de ambiente.
+
+        Args:
+            provider: Nome do provedor; variáveis ``{prefix}_{PROVIDER}_*``
+                têm precedência sobre as globais ``{prefix}_*``
+            prefix: Prefixo das variáveis (padrão: ADAPTER_CIRCUIT)
+
+        Returns:
+            CircuitBreakerConfig com valores do ambiente ou padrões
+        """
+
+        def _get(name: str, default: str) -> str:
+            if provider:
+                scoped = os.getenv(f"{prefix}_{provider.upper()}_{name}")
+                if scoped is not None and scoped.strip():
+                    return scoped
+            return os.getenv(f"{prefix}_{name}", default)
+
+        return cls(
+            failure_threshold=int(_get("FAILURE_THRESHOLD", "5")),
+            reset_timeout_seconds=float(_get("RESET_TIMEOUT_SECONDS", "30")),
+        )
+
+
+class CircuitBreaker:
+    """
+    Máquina de estados closed/open/half-open, segura para uso concorrente.
+
+    Args:
+        provider: Nome do provedor (usado em erros e métricas)
+        config: Limites do breaker
+    """
+
+    def __init__(self, provider: str, config: CircuitBreakerConfig):
+        self.provider = provider
+        self.config = config
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Estado atual (``closed``, ``open`` ou ``half_open``)."""
+        with self._lock:
+            return self._state
+
+    def _transition(self, new_state: str) -> None:
+        # chamado com self._lock adquirido
+        if new_state == self._state:
+            return
+        logger.warning(
+            "circuit breaker %s: %s -> %s",
+            self.provider,
+            self._state,
+            new_state,
+            extra={"provider": self.provider, "circuit_state": new_state},
+        )
+        self._state = new_state
+        _metrics.increment_counter(
+            "adapter_circuit_transitions_total",
+            labels={"provider": self.provider, "to": new_state},
+            documentation="Circuit breaker state transitions per provider",
+        )
+        _metrics.set_gauge(
+            "adapter_circuit_state",
+            _STATE_VALUES[new_state],
+            labels={"provider": self.provider},
+            documentation="Circuit breaker state (0=closed, 1=half_open, 2=open)",
+        )
+
+    def before_call(self) -> None:
+        """
+        Autoriza uma chamada ao provedor.
+
+        Raises:
+            CircuitOpenError: Se o circuito está aberto (ou em half-open com
+                a sondagem já em andamento).
+        """
+        if not self.config.enabled:
+            return
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if self._state == OPEN:
+                elapsed = time.monotonic() - self._opened_at
+                if elapsed < self.config.reset_timeout_seconds:
+                    remaining = self.config.reset_timeout_seconds - elapsed
+                    raise CircuitOpenError(
+                        f"circuito aberto para {self.provider}; "
+                        f"nova sondagem em {remaining:.1f}s"
+                    )
+                self._transition(HALF_OPEN)
+            if self._probe_in_flight:
+                raise CircuitOpenError(
+                    f"circuito half-open para {self.provider}; sondagem em andamento"
+                )
+            self._probe_in_flight = True
+
+    def cancel_call(self) -> None:
+        """Libera a sondagem autorizada quando a chamada não chegou a ocorrer."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Registra resposta do provedor: zera falhas e fecha o circuito."""
+        if not self.config.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        """Registra falha retryable; abre o circuito ao atingir o limite."""
+        if not self.config.enabled:
+            return
+        with self._lock:
+            self._consecutive_failures += 1
+            reopen = self._state == HALF_OPEN
+            self._probe_in_flight = False
+            if reopen or self._consecutive_failures >= self.config.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def is_open(self) -> bool:
+        """``True`` quando novas chamadas seriam rejeitadas agora."""
+        with self._lock:
+            return (
+                self._state == OPEN
+                and time.monotonic() - self._opened_at
+                < self.config.reset_timeout_seconds
+            )
+
+    def to_dict(self) -> Dict[str, object]:
+        """Snapshot do estado para logs e resultados de ingest."""
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """
+    Retorna o breaker compartilhado do provedor (criado na primeira chamada).
+
+    Args:
+        provider: Nome do provedor (ex: ``"yfinance"``)
+
+    Returns:
+        CircuitBreaker único por provedor dentro do processo
+    """
+    key = provider.lower()
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, CircuitBreakerConfig.from_env(key))
+            _breakers[key] = breaker
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Descarta todos os breakers (útil para testes ou após mudar o env)."""
+    with _breakers_lock:
+        _breakers.clear()
@@ -96,3 +96,16 @@ class RateLimitError(AdapterError):
         super().__init__(
             message, code="RATE_LIMIT_ERROR", original_exception=original_exception
         )
+
+
+class CircuitOpenError(AdapterError):
+    """Erro quando o circuit breaker do provedor está aberto (falha rápida)."""
+
+    def __init__(
+        self,
+        message: str,
+        original_exception: Optional[BaseException] = None,
+    ):
+        super().__init__(
+            message, code="CIRCUIT_OPEN", original_exception=original_exception
+        )
@@ -87,3 +87,16 @@ def register_adapter(name: str, adapter_cls: Type[Adapter]) -> None:
             _ADAPTER_REGISTRY[key],
         )
     _ADAPTER_REGISTRY[key] = adapter_cls
+
+
+# record/replay sobre o arquivo ``raw/``; registrados pela API pública para
+# seguir o mesmo caminho de adaptadores externos
+from src.adapters.replay import RecordingAdapter, ReplayAdapter  # noqa: E402
+
+register_adapter("replay", ReplayAdapter)
+register_adapter("record", RecordingAdapter)
+
+# cliente do servidor HTTP local de testes de carga (src.loadtest)
+from src.adapters.http_market_adapter import HTTPMarketDataAdapter  # noqa: E402
+
+register_adapter("http", HTTPMarketDataAdapter)
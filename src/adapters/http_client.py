@@ -3,11 +3,36 @@
 Este módulo fornece um protocolo simples e um adaptador baseado em
 `requests` quando disponível. Importações pesadas são feitas sob demanda
 para não causar falhas em ambientes de teste sem dependências.
+
+O :class:`RequestsHTTPClient` mantém um pool de conexões keep-alive
+(``HTTPAdapter`` com ``pool_connections``/``pool_maxsize`` configuráveis)
+compartilhado entre threads, de modo que fetches concorrentes reutilizam
+conexões TCP/TLS em vez de abrir uma nova por requisição. Configuração via
+ambiente:
+
+    - HTTP_POOL_CONNECTIONS: número de hosts com pool mantido (padrão 10)
+    - HTTP_POOL_MAXSIZE: conexões mantidas por host (padrão 10)
+    - HTTP_POOL_BLOCK: ``true`` para aguardar conexão livre em vez de abrir
+      conexões extras descartáveis quando o pool está cheio
 """
 
 from __future__ import annotations
 
+import os
+import threading
+import time
+from dataclasses import dataclass
 from typing import Any, Dict, Optional, Protocol
+from urllib.parse import urlsplit
+
+from src import metrics as _metrics
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
 
 
 class HTTPClientProtocol(Protocol):
@@ -20,16 +45,84 @@ class HTTPClientProtocol(Protocol):
         ...
 
 
+@dataclass
+class HTTPPoolConfig:
+    """
+    Dimensionamento do pool de conexões do :class:`RequestsHTTPClient`.
+
+    Attributes:
+        pool_connections: Quantidade de hosts distintos com pool em cache
+        pool_maxsize: Conexões keep-alive mantidas por host; deve acompanhar
+            a concorrência de ingest (``INGEST_CONCURRENCY``)
+        pool_block: Aguarda conexão livre quando o pool está esgotado
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+
+    def __post_init__(self) -> None:
+        if self.pool_connections < 1:
+            raise ValueError(
+                f"pool_connections deve ser >= 1, recebido: {self.pool_connections}"
+            )
+        if self.pool_maxsize < 1:
+            raise ValueError(
+                f"pool_maxsize deve ser >= 1, recebido: {self.pool_maxsize}"
+            )
+
+    @classmethod
+    def from_env(cls, prefix: str = "HTTP_POOL") -> "HTTPPoolConfig":
+        """
+        Carrega configuração de variáveis de ambiente.
+
+        Args:
+            prefix: Prefixo das variáveis (padrão: HTTP_POOL)
+
+        Returns:
+            HTTPPoolConfig com valores do ambiente ou padrões
+        """
+        return cls(
+            pool_connections=int(os.getenv(f"{prefix}_CONNECTIONS", "10")),
+            pool_maxsize=int(os.getenv(f"{prefix}_MAXSIZE", "10")),
+            pool_block=os.getenv(f"{prefix}_BLOCK", "false").strip().lower()
+            in _TRUE_VALUES,
+        )
+
+
 class RequestsHTTPClient:
-    """Implementação baseada em `requests` (lazy import).
+    """Implementação baseada em `requests` (lazy import) com pool keep-alive.
 
     Usa importação local para evitar falha de import se `requests` não
     estiver instalado em ambientes de teste isolados.
+
+    ``requests.Session`` não é garantidamente thread-safe, então cada thread
+    recebe a sua própria sessão; todas montam o **mesmo** ``HTTPAdapter``,
+    cujo pool (urllib3) é thread-safe. Assim as conexões keep-alive são
+    compartilhadas pelo processo inteiro.
+
+    Cada requisição registra em :mod:`src.metrics`, rotulado por ``host``:
+
+        - ``http_request_duration_seconds``: tempo total (até o corpo lido)
+        - ``http_request_ttfb_seconds``: até os cabeçalhos da resposta
+          (``Response.elapsed``); inclui DNS/connect quando a conexão é nova
+        - ``http_connections_opened_total``: conexões novas abertas pelo pool
+          (contagem estável em uso concorrente; sem incremento = reuso)
+        - ``http_requests_total{status}``
+
+    Args:
+        config: Dimensionamento do pool (padrão: :meth:`HTTPPoolConfig.from_env`)
+        headers: Cabeçalhos extras aplicados a todas as requisições
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        config: Optional[HTTPPoolConfig] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ):
         try:
             import requests  # type: ignore
+            from requests.adapters import HTTPAdapter  # type: ignore
 
             self._requests = requests
         except Exception as exc:  # pragma: no cover - environment dependent
@@ -37,21 +130,148 @@ class RequestsHTTPClient:
                 "requests library is required for RequestsHTTPClient"
             ) from exc
 
+        self.config = config or HTTPPoolConfig.from_env()
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self._adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
+        self._local = threading.local()
+        self._sessions: list = []
+        self._connections_seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Sessão da thread atual (criada sob demanda sobre o pool comum)."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._requests.Session()
+            session.headers.update(self.headers)
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _opened_connections(self, url: str) -> Optional[int]:
+        """Conexões já abertas pelos pools urllib3 do host de ``url``."""
+        parts = urlsplit(url)
+        try:
+            pools = self._adapter.poolmanager.pools
+            total = 0
+            for key in pools.keys():
+                if key.key_host == parts.hostname and (
+                    parts.port is None or key.key_port == parts.port
+                ):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        total += int(pool.num_connections)
+            return total
+        except Exception:  # pragma: no cover - depende da versão do urllib3
+            return None
+
     def get(
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
         timeout: Optional[float] = None,
     ) -> Any:
-        resp = self._requests.get(url, params=params, timeout=timeout)
+        host = urlsplit(url).netloc or "unknown"
+        labels = {"host": host}
+        t0 = time.perf_counter()
+        try:
+            resp = self.session.get(url, params=params, timeout=timeout)
+            # força a leitura (e descompressão gzip) do corpo dentro da medição
+            _ = resp.content
+        except Exception:
+            _record_request(labels, "error", time.perf_counter() - t0)
+            raise
+        _record_request(
+            labels,
+            str(resp.status_code),
+            time.perf_counter() - t0,
+            ttfb=resp.elapsed.total_seconds(),
+        )
+        opened = self._opened_connections(url)
+        if opened is not None:
+            # ``num_connections`` é monotônico: o delta desde a última leitura
+            # conta cada conexão nova uma única vez, mesmo com threads
+            with self._lock:
+                delta = max(0, opened - self._connections_seen.get(host, 0))
+                self._connections_seen[host] = max(
+                    opened, self._connections_seen.get(host, 0)
+                )
+            _metrics.increment_counter(
+                "http_connections_opened_total",
+                delta,
+                labels=labels,
+                documentation="New TCP/TLS connections opened by the HTTP pool",
+            )
         resp.raise_for_status()
         return resp
 
+    def close(self) -> None:
+        """Fecha as sessões de todas as threads e o pool de conexões."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            self._connections_seen.clear()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+        self._local = threading.local()
+
+
+def _record_request(
+    labels: Dict[str, str],
+    status: str,
+    duration: float,
+    ttfb: Optional[float] = None,
+) -> None:
+    _metrics.increment_counter(
+        "http_requests_total",
+        labels={**labels, "status": status},
+        documentation="HTTP requests issued by adapters per host and status",
+    )
+    _metrics.observe_histogram(
+        "http_request_duration_seconds",
+        duration,
+        labels=labels,
+        documentation="Total HTTP request duration including body download",
+    )
+    if ttfb is not None:
+        _metrics.observe_histogram(
+            "http_request_ttfb_seconds",
+            ttfb,
+            labels=labels,
+            documentation="Time until HTTP response headers were received",
+        )
+
+
+_default_client: Optional[RequestsHTTPClient] = None
+_default_client_lock = threading.Lock()
+
 
 def get_default_client() -> HTTPClientProtocol:
-    """Retorna uma implementação padrão do cliente HTTP.
+    """Retorna a implementação padrão do cliente HTTP.
 
-    Atualmente mapeia para `RequestsHTTPClient`. Chamadas a essa função
-    apenas resolvem a implementação em tempo de execução.
+    A instância de `RequestsHTTPClient` é criada na primeira chamada e
+    compartilhada pelo processo, para que todos os adaptadores reutilizem o
+    mesmo pool de conexões keep-alive.
     """
-    return RequestsHTTPClient()
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = RequestsHTTPClient()
+        return _default_client
+
+
+def reset_default_client() -> None:
+    """Fecha e descarta o cliente compartilhado (útil para testes)."""
+    global _default_client
+    with _default_client_lock:
+        client, _default_client = _default_client, None
+    if client is not None:
+        client.close()
@@ -0,0 +1,171 @@
+"""
+Adaptador para servidores HTTP de market data no formato JSON ``split``.
+
+Fala com qualquer endpoint ``GET {base_url}/prices/<ticker>?start=&end=``
+que devolva ``{"columns": [...], "index": [...], "data": [[...], ...]}`` —
+em particular o servidor local de :mod:`src.loadtest.market_server`, usado
+para testes de carga sem acesso à rede. A requisição passa pelo
+:class:`~src.adapters.http_client.HTTPClientProtocol` (pool keep-alive
+compartilhado por padrão) e pelo loop de retry, rate limiter e circuit
+breaker do :class:`~src.adapters.base.Adapter`.
+
+Configuração via ambiente:
+
+    - MARKET_DATA_URL: URL base do servidor (padrão ``http://127.0.0.1:8765``)
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+from src.adapters.base import Adapter
+from src.adapters.errors import ValidationError
+from src.adapters.http_client import HTTPClientProtocol, get_default_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARKET_DATA_URL = "http://127.0.0.1:8765"
+
+
+class HTTPMarketDataAdapter(Adapter):
+    """
+    Adaptador HTTP genérico (provider ``http``).
+
+    Args:
+        base_url: URL base do servidor (padrão: ``MARKET_DATA_URL``)
+        client: Cliente HTTP; padrão :func:`get_default_client`
+        retry_config: Configuração de retry (padrão: ``RetryConfig.from_env``)
+        chunk_config: Busca em blocos (padrão: ``ChunkConfig.from_env``)
+    """
+
+    provider_name = "http"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        client: Optional[HTTPClientProtocol] = None,
+        retry_config=None,
+        chunk_config=None,
+    ):
+        super().__init__(retry_config=retry_config, chunk_config=chunk_config)
+        self.base_url = (
+            base_url or os.getenv("MARKET_DATA_URL", DEFAULT_MARKET_DATA_URL)
+        ).rstrip("/")
+        self._client = client
+
+    @property
+    def client(self) -> HTTPClientProtocol:
+        if self._client is None:
+            self._client = get_default_client()
+        return self._client
+
+    def _window(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> tuple[str, str]:
+        now = datetime.now(timezone.utc)
+        end = self._normalize_date(end_date or now.strftime("%Y-%m-%d"))
+        start = self._normalize_date(
+            start_date or (now - timedelta(days=365)).strftime("%Y-%m-%d")
+        )
+        return start, end
+
+    def fetch(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Busca OHLCV de ``ticker`` no servidor configurado.
+
+        Args:
+            ticker: Código do ativo (enviado como está na URL)
+            start_date: Data inicial (padrão: um ano atrás)
+            end_date: Data final (padrão: hoje)
+
+        Returns:
+            DataFrame com colunas do provedor e índice ``DatetimeIndex``
+        """
+        start, end = self._window(start_date, end_date)
+        df = self._fetch_chunked(
+            ticker,
+            start,
+            end,
+            log_context=self._log_context(ticker, start, end),
+            max_retries=self.retry_config.max_attempts,
+            backoff_factor=self.retry_config.backoff_factor,
+            timeout=self.retry_config.timeout_seconds,
+            **kwargs,
+        )
+        return self._finalize(df, ticker)
+
+    async def fetch_async(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Versão assíncrona de :meth:`fetch` (retry com ``asyncio.sleep``)."""
+        start, end = self._window(start_date, end_date)
+        df = await self._fetch_chunked_async(
+            ticker,
+            start,
+            end,
+            log_context=self._log_context(ticker, start, end),
+            max_retries=self.retry_config.max_attempts,
+            backoff_factor=self.retry_config.backoff_factor,
+            timeout=self.retry_config.timeout_seconds,
+            **kwargs,
+        )
+        return self._finalize(df, ticker)
+
+    def _log_context(self, ticker: str, start: str, end: str) -> dict:
+        return {
+            "ticker": ticker,
+            "provider": self.provider_name,
+            "start_date": start,
+            "end_date": end,
+            "base_url": self.base_url,
+        }
+
+    def _fetch_once(self, ticker: str, start: str, end: str, **kwargs) -> pd.DataFrame:
+        """Uma requisição HTTP; erros 429/5xx sobem com ``response.status_code``."""
+        url = f"{self.base_url}/prices/{quote(ticker, safe='')}"
+        resp = self.client.get(
+            url,
+            params={"start": start, "end": end},
+            timeout=kwargs.get("timeout") or self.retry_config.timeout_seconds,
+        )
+        try:
+            payload = resp.json()
+            df = pd.DataFrame(
+                payload["data"],
+                columns=payload["columns"],
+                index=pd.to_datetime(payload["index"]),
+            )
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ValidationError(
+                f"resposta inválida de {url}", original_exception=exc
+            ) from exc
+        df.index.name = "Date"
+        return df.drop(columns=["Padding"], errors="ignore")
+
+    def _finalize(self, df: pd.DataFrame, ticker: str) -> pd.DataFrame:
+        df.attrs["source"] = self.provider_name
+        df.attrs["ticker"] = ticker
+        df.attrs["fetched_at"] = (
+            datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        )
+        df.attrs["adapter"] = "HTTPMarketDataAdapter"
+        return df
+
+    def get_metadata(self) -> Dict[str, str]:
+        meta = super().get_metadata()
+        meta.update({"provider": self.provider_name, "base_url": self.base_url})
+        return meta
@@ -0,0 +1,320 @@
+"""
+Rate limiter proativo (token bucket) por provedor.
+
+Em vez de apenas reagir a ``429``/``RateLimitError`` com backoff, cada
+adaptador adquire um token antes de chamar o provedor. O bucket é
+compartilhado por todas as threads do processo (um por provedor) e, se
+configurado, também entre processos através de um pequeno arquivo de estado
+em ``LOCK_DIR`` protegido por lock de arquivo.
+
+Configuração via ambiente (mesmo padrão de :meth:`RetryConfig.from_env`),
+com override opcional por provedor (``{prefix}_{PROVIDER}_RPS`` etc.):
+
+    - {prefix}_RPS: tokens por segundo (``0`` desabilita o limiter)
+    - {prefix}_BURST: capacidade máxima do bucket
+    - {prefix}_MAX_WAIT_SECONDS: espera máxima antes de levantar RateLimitError
+    - {prefix}_SHARED: ``true`` para compartilhar o bucket entre processos
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Protocol
+
+from src import metrics as _metrics
+from src.adapters.errors import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+try:
+    import portalocker
+except ImportError:  # pragma: no cover - portalocker é dependência direta
+    portalocker = None
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+@dataclass
+class RateLimitConfig:
+    """
+    Configuração do token bucket de um provedor.
+
+    Attributes:
+        rate_per_second: Tokens repostos por segundo; ``0`` desabilita
+        burst: Capacidade máxima do bucket (requisições em rajada)
+        max_wait_seconds: Espera máxima por um token antes de falhar
+        shared: Compartilha o estado entre processos via arquivo em LOCK_DIR
+    """
+
+    rate_per_second: float = 0.0
+    burst: int = 1
+    max_wait_seconds: float = 60.0
+    shared: bool = False
+
+    def __post_init__(self) -> None:
+        self._validate()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_second > 0
+
+    @classmethod
+    def from_env(
+        cls, provider: Optional[str] = None, prefix: str = "ADAPTER_RATE_LIMIT"
+    ) -> "RateLimitConfig":
+        """
+        Carrega configuração de variáveis de ambiente.
+
+        Args:
+            provider: Nome do provedor; variáveis ``{prefix}_{PROVIDER}_*``
+                têm precedência sobre as globais ``{prefix}_*``
+            prefix: Prefixo das variáveis (padrão: ADAPTER_RATE_LIMIT)
+
+        Returns:
+            RateLimitConfig com valores do ambiente ou padrões
+        """
+
+        def _get(name: str, default: str) -> str:
+            if provider:
+                scoped = os.getenv(f"{prefix}_{provider.upper()}_{name}")
+                if scoped is not None and scoped.strip():
+                    return scoped
+            return os.getenv(f"{prefix}_{name}", default)
+
+        return cls(
+            rate_per_second=float(_get("RPS", "0")),
+            burst=int(_get("BURST", "1")),
+            max_wait_seconds=float(_get("MAX_WAIT_SECONDS", "60")),
+            shared=_get("SHARED", "false").strip().lower() in _TRUE_VALUES,
+        )
+
+    def _validate(self) -> None:
+        """Valida que os parâmetros estão em faixas aceitáveis.
+
+        Raises:
+            ValueError: Se algum parâmetro estiver fora da faixa válida.
+        """
+        if self.rate_per_second < 0:
+            raise ValueError(
+                f"rate_per_second deve ser >= 0, recebido: {self.rate_per_second}"
+            )
+        if self.burst < 1:
+            raise ValueError(f"burst deve ser >= 1, recebido: {self.burst}")
+        if self.max_wait_seconds < 0:
+            raise ValueError(
+                f"max_wait_seconds deve ser >= 0, recebido: {self.max_wait_seconds}"
+            )
+
+
+class RateLimiter(Protocol):
+    """Contrato mínimo usado pelo :class:`~src.adapters.base.Adapter`."""
+
+    def acquire(self) -> float:
+        """Bloqueia até obter um token e retorna o tempo aguardado (s)."""
+        ...
+
+
+class NoopRateLimiter:
+    """Limiter desabilitado: nunca espera."""
+
+    def acquire(self) -> float:
+        return 0.0
+
+    async def acquire_async(self) -> float:
+        return 0.0
+
+
+async def acquire_async(limiter: RateLimiter) -> float:
+    """Adquire um token sem bloquear o event loop.
+
+    Usa ``limiter.acquire_async`` quando disponível; limiters apenas
+    síncronos são executados em uma thread do executor padrão.
+    """
+    native = getattr(limiter, "acquire_async", None)
+    if native is not None:
+        return await native()
+    return await asyncio.to_thread(limiter.acquire)
+
+
+def _reserve(
+    tokens: float, updated_at: float, now: float, config: RateLimitConfig
+) -> tuple[float, float]:
+    """Repõe o bucket até ``now`` e reserva um token.
+
+    Retorna ``(tokens_restantes, espera_em_segundos)``. O saldo pode ficar
+    negativo: cada chamador reserva sua vaga na fila e dorme fora do lock,
+    o que mantém a ordem de chegada sem segurar o lock durante a espera.
+    """
+    elapsed = max(0.0, now - updated_at)
+    tokens = min(float(config.burst), tokens + elapsed * config.rate_per_second)
+    tokens -= 1.0
+    wait = 0.0 if tokens >= 0 else -tokens / config.rate_per_second
+    return tokens, wait
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe (escopo do processo).
+
+    Args:
+        provider: Nome do provedor (usado em logs/métricas)
+        config: Parâmetros do bucket
+    """
+
+    def __init__(self, provider: str, config: RateLimitConfig):
+        self.provider = provider
+        self.config = config
+        self._lock = threading.Lock()
+        self._tokens = float(config.burst)
+        self._updated_at = time.monotonic()
+
+    def _reserve_token(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, wait = _reserve(self._tokens, self._updated_at, now, self.config)
+            if wait > self.config.max_wait_seconds:
+                # não consome o token: a requisição não será feita
+                raise RateLimitError(
+                    f"rate limit local de {self.provider} exigiria "
+                    f"{wait:.2f}s de espera (máximo {self.config.max_wait_seconds}s)"
+                )
+            self._tokens, self._updated_at = tokens, now
+            return wait
+
+    def acquire(self) -> float:
+        wait = self._reserve_token()
+        if wait > 0:
+            time.sleep(wait)
+        _observe_wait(self.provider, wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Como :meth:`acquire`, mas aguarda com ``asyncio.sleep``."""
+        wait = self._reserve_token()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        _observe_wait(self.provider, wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket compartilhado entre processos.
+
+    O estado (saldo e instante da última reposição, em tempo de parede) fica
+    em ``{LOCK_DIR}/ratelimit-{provider}.json``; cada reserva abre o arquivo
+    com lock exclusivo, atualiza e libera. O lock de thread da classe base
+    evita contenção desnecessária no arquivo dentro do mesmo processo.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        config: RateLimitConfig,
+        state_dir: Optional[Path] = None,
+    ):
+        super().__init__(provider, config)
+        if state_dir is None:
+            from src.locks import _resolve_lock_dir
+
+            state_dir = _resolve_lock_dir(os.environ.get("LOCK_DIR"))
+        safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in provider)
+        self.state_path = Path(state_dir) / f"ratelimit-{safe}.json"
+
+    def _reserve_token(self) -> float:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.state_path, "a+", encoding="utf-8") as fh:
+            _lock_file(fh)
+            try:
+                fh.seek(0)
+                raw = fh.read()
+                now = time.time()
+                try:
+                    state = json.loads(raw) if raw.strip() else {}
+                    tokens = float(state["tokens"])
+                    updated_at = float(state["updated_at"])
+                except (ValueError, KeyError, TypeError):
+                    tokens, updated_at = float(self.config.burst), now
+                tokens, wait = _reserve(tokens, updated_at, now, self.config)
+                if wait > self.config.max_wait_seconds:
+                    raise RateLimitError(
+                        f"rate limit compartilhado de {self.provider} exigiria "
+                        f"{wait:.2f}s de espera "
+                        f"(máximo {self.config.max_wait_seconds}s)"
+                    )
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps({"tokens": tokens, "updated_at": now}))
+                fh.flush()
+                return wait
+            finally:
+                _unlock_file(fh)
+
+
+def _lock_file(fh) -> None:
+    if portalocker is not None:
+        portalocker.lock(fh, portalocker.LockFlags.EXCLUSIVE)
+        return
+    import fcntl  # pragma: no cover - fallback POSIX
+
+    fcntl.flock(fh.fileno(), fcntl.LOCK_EX)  # pragma: no cover
+
+
+def _unlock_file(fh) -> None:
+    if portalocker is not None:
+        portalocker.unlock(fh)
+        return
+    import fcntl  # pragma: no cover - fallback POSIX
+
+    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)  # pragma: no cover
+
+
+def _observe_wait(provider: str, wait: float) -> None:
+    _metrics.observe_histogram(
+        "adapter_rate_limit_wait_seconds",
+        wait,
+        labels={"provider": provider},
+        documentation="Time spent waiting for a rate-limiter token",
+    )
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Retorna o limiter compartilhado do provedor (criado na primeira chamada).
+
+    Args:
+        provider: Nome do provedor (ex: ``"yfinance"``)
+
+    Returns:
+        ``NoopRateLimiter`` quando o limite não está configurado; caso
+        contrário um :class:`TokenBucket` (ou :class:`SharedTokenBucket`)
+        único por provedor dentro do processo.
+    """
+    key = provider.lower()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            config = RateLimitConfig.from_env(key)
+            if not config.enabled:
+                limiter = NoopRateLimiter()
+            elif config.shared:
+                limiter = SharedTokenBucket(key, config)
+            else:
+                limiter = TokenBucket(key, config)
+            _limiters[key] = limiter
+        return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Descarta os limiters em cache (útil para testes ou após mudar o env)."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,285 @@
+"""
+Adaptadores de gravação/reprodução sobre o arquivo ``raw/``.
+
+:func:`src.ingest.raw_storage.save_raw_csv` guarda cada resposta de provedor
+em ``raw/<provider>/<ticker>-<ts>.csv`` (``.csv.gz``/``.csv.zst`` com
+``RAW_COMPRESSION``) com um ``.checksum`` ao lado. Este módulo reaproveita
+esse arquivo:
+
+    - :class:`ReplayAdapter` (provider ``replay``) atende ``fetch`` a partir
+      do arquivo raw mais recente do ticker, recortado para a janela pedida,
+      sem rede. Permite reconstruir o banco, rodar benchmarks e reproduzir
+      execuções de produção offline.
+    - :class:`RecordingAdapter` (provider ``record``) envolve qualquer
+      adaptador e grava cada resposta em ``raw/<provider>/`` (a "fita" lida
+      depois pelo replay), também fora do pipeline de ingestão. No pipeline
+      a gravação é reaproveitada: uma única escrita por fetch.
+
+Configuração via ambiente:
+
+    - RAW_ROOT: raiz do arquivo raw (padrão ``raw``)
+    - REPLAY_PROVIDER: subdiretório lido pelo replay (padrão ``yfinance``)
+    - RECORD_PROVIDER: adaptador envolvido pelo modo record (padrão
+      ``yfinance``); as respostas são gravadas sob esse nome de provedor
+    - REPLAY_VERIFY_CHECKSUM: ``false`` desativa a conferência do checksum
+"""
+
+import logging
+import os
+import re
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from src.adapters.base import Adapter
+from src.adapters.errors import FetchError, ValidationError
+from src.ingest.config import get_raw_root
+from src.ingest.raw_storage import save_raw_csv
+from src.utils.checksums import checksum_cached
+
+logger = logging.getLogger(__name__)
+
+_RAW_NAME = re.compile(r"^(?P<ticker>.+)-(?P<ts>\d{8}T\d{6}Z)\.csv(?:\.gz|\.zst)?$")
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _ticker_variants(ticker: str) -> List[str]:
+    """Nomes sob os quais o ticker pode ter sido gravado (entrada, B3, Yahoo)."""
+    raw = ticker.strip()
+    upper = raw.upper()
+    base = upper[:-3] if upper.endswith(".SA") else upper
+    variants = [raw, upper, base, f"{base}.SA"]
+    return list(dict.fromkeys(v for v in variants if v))
+
+
+def find_raw_files(
+    provider: str, ticker: str, raw_root: Union[str, Path, None] = None
+) -> List[Path]:
+    """
+    Lista os arquivos raw de ``ticker`` gravados por ``provider``.
+
+    Args:
+        provider: Subdiretório de ``raw_root`` (nome do provedor)
+        ticker: Ticker em qualquer grafia aceita (``PETR4``, ``PETR4.SA``)
+        raw_root: Raiz do arquivo raw (padrão: ``RAW_ROOT`` ou ``raw``)
+
+    Returns:
+        Caminhos ordenados do mais antigo para o mais recente (pelo
+        timestamp do nome do arquivo)
+    """
+    provider_dir = Path(raw_root or get_raw_root()) / provider
+    if not provider_dir.is_dir():
+        return []
+    wanted = set(_ticker_variants(ticker))
+    found = []
+    for path in provider_dir.glob("*.csv*"):
+        match = _RAW_NAME.match(path.name)
+        if match and match.group("ticker") in wanted:
+            found.append((match.group("ts"), path))
+    return [path for _, path in sorted(found)]
+
+
+def load_raw_csv(path: Union[str, Path], verify_checksum: bool = True) -> pd.DataFrame:
+    """
+    Lê um arquivo raw de volta no formato devolvido pelos adaptadores.
+
+    Args:
+        path: Arquivo ``<ticker>-<ts>.csv[.gz|.zst]`` gravado por
+            ``save_raw_csv`` (descomprimido em fluxo)
+        verify_checksum: Confere o SHA256 do conteúdo descomprimido com o
+            ``.checksum`` irmão, quando existir
+
+    Returns:
+        DataFrame com ``DatetimeIndex`` e as colunas originais do provedor
+
+    Raises:
+        ValidationError: Se o checksum não confere
+    """
+    path = Path(path)
+    checksum_path = Path(f"{path}.checksum")
+    if verify_checksum and checksum_path.exists():
+        expected = checksum_path.read_text(encoding="utf-8").strip()
+        actual = checksum_cached(path)
+        if actual != expected:
+            raise ValidationError(
+                f"checksum divergente para {path}: esperado {expected}, obtido {actual}"
+            )
+    df = pd.read_csv(path, index_col=0)
+    df.index = pd.to_datetime(df.index)
+    if df.index.name is None or str(df.index.name).startswith("Unnamed"):
+        df.index.name = "Date"
+    return df
+
+
+def _slice_window(
+    df: pd.DataFrame, start_date: Optional[str], end_date: Optional[str]
+) -> pd.DataFrame:
+    index = df.index
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    keep = index == index  # all True (NaT excluído)
+    if start_date is not None:
+        keep &= index >= pd.Timestamp(start_date)
+    if end_date is not None:
+        # fim inclusivo: qualquer horário do último dia pedido
+        keep &= index < pd.Timestamp(end_date) + timedelta(days=1)
+    return df.loc[keep]
+
+
+class ReplayAdapter(Adapter):
+    """
+    Serve dados do arquivo ``raw/`` em vez de chamar o provedor.
+
+    Args:
+        provider: Subdiretório de ``raw_root`` a ser lido (padrão:
+            ``REPLAY_PROVIDER`` ou ``yfinance``)
+        raw_root: Raiz do arquivo raw (padrão: ``RAW_ROOT`` ou ``raw``)
+        verify_checksum: Confere o ``.checksum`` de cada arquivo lido
+        retry_config: Configuração de retry (padrão: ``RetryConfig.from_env``)
+        chunk_config: Busca em blocos (padrão: ``ChunkConfig.from_env``)
+    """
+
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        raw_root: Union[str, Path, None] = None,
+        verify_checksum: Optional[bool] = None,
+        retry_config=None,
+        chunk_config=None,
+    ):
+        super().__init__(retry_config=retry_config, chunk_config=chunk_config)
+        self.provider = provider or os.getenv("REPLAY_PROVIDER", "yfinance")
+        self.raw_root = Path(raw_root) if raw_root else get_raw_root()
+        if verify_checksum is None:
+            env = os.getenv("REPLAY_VERIFY_CHECKSUM", "true").strip().lower()
+            verify_checksum = env not in _FALSE_VALUES
+        self.verify_checksum = verify_checksum
+
+    def fetch(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Retorna o arquivo raw mais recente de ``ticker`` recortado à janela.
+
+        Args:
+            ticker: Código do ativo (``PETR4`` ou ``PETR4.SA``)
+            start_date: Data inicial inclusiva (``YYYY-MM-DD``); ``None`` = sem
+                limite
+            end_date: Data final inclusiva (``YYYY-MM-DD``); ``None`` = sem
+                limite
+            **kwargs: Ignorados (compatibilidade com outros adaptadores)
+
+        Raises:
+            FetchError: Se não há arquivo raw para o ticker
+            ValidationError: Se o checksum do arquivo não confere
+        """
+        files = find_raw_files(self.provider, ticker, self.raw_root)
+        if not files:
+            raise FetchError(
+                f"nenhum arquivo raw de {ticker} em "
+                f"{self.raw_root / self.provider} para replay"
+            )
+        path = files[-1]
+        df = _slice_window(
+            load_raw_csv(path, verify_checksum=self.verify_checksum),
+            start_date,
+            end_date,
+        )
+        logger.info(
+            "replay de %s a partir de %s (%d linhas)",
+            ticker,
+            path,
+            len(df),
+            extra={"ticker": ticker, "provider": "replay", "raw_file": str(path)},
+        )
+        df.attrs["source"] = self.provider
+        df.attrs["ticker"] = ticker
+        df.attrs["adapter"] = "ReplayAdapter"
+        df.attrs["replayed_from"] = str(path)
+        return df
+
+    def _fetch_once(self, ticker: str, start: str, end: str, **kwargs) -> pd.DataFrame:
+        return self.fetch(ticker, start_date=start, end_date=end, **kwargs)
+
+    def get_metadata(self) -> Dict[str, str]:
+        meta = super().get_metadata()
+        meta.update(
+            {
+                "provider": "replay",
+                "replays": self.provider,
+                "raw_root": str(self.raw_root),
+            }
+        )
+        return meta
+
+
+class RecordingAdapter(Adapter):
+    """
+    Envolve outro adaptador e grava suas respostas para o replay.
+
+    Cada resposta é gravada com ``save_raw_csv`` em
+    ``<raw_root>/<provider>/...``, onde o :class:`ReplayAdapter` a encontra.
+    A resposta sai com ``attrs["raw_provider"]`` e com os metadados da
+    gravação em ``attrs["recorded_raw"]``; o pipeline de ingestão os
+    reaproveita em vez de gravar uma segunda cópia.
+
+    Args:
+        inner: Adaptador real; padrão: ``get_adapter(RECORD_PROVIDER)``
+        provider: Nome usado no diretório raw (padrão: ``RECORD_PROVIDER`` ou
+            ``yfinance``)
+        raw_root: Raiz do arquivo raw (padrão: ``RAW_ROOT`` ou ``raw``)
+        retry_config: Configuração de retry (padrão: ``RetryConfig.from_env``)
+        chunk_config: Busca em blocos (padrão: ``ChunkConfig.from_env``)
+    """
+
+    def __init__(
+        self,
+        inner: Optional[Adapter] = None,
+        provider: Optional[str] = None,
+        raw_root: Union[str, Path, None] = None,
+        retry_config=None,
+        chunk_config=None,
+    ):
+        super().__init__(retry_config=retry_config, chunk_config=chunk_config)
+        self.provider = provider or os.getenv("RECORD_PROVIDER", "yfinance")
+        self.raw_root = Path(raw_root) if raw_root else get_raw_root()
+        if inner is None:
+            from src.adapters.factory import get_adapter
+
+            inner = get_adapter(self.provider)
+        self.inner = inner
+
+    def fetch(self, ticker: str, **kwargs) -> pd.DataFrame:
+        """Delegado ao adaptador envolvido; a resposta é gravada para replay."""
+        df = self.inner.fetch(ticker, **kwargs)
+        meta = save_raw_csv(df, self.provider, ticker, raw_root=self.raw_root)
+        if meta.get("status") != "success":
+            logger.warning(
+                "falha ao gravar %s para replay: %s",
+                ticker,
+                meta.get("error_message"),
+                extra={"ticker": ticker, "provider": "record"},
+            )
+        df.attrs["raw_provider"] = self.provider
+        df.attrs["recorded_raw"] = meta
+        return df
+
+    def _fetch_once(self, ticker: str, start: str, end: str, **kwargs) -> pd.DataFrame:
+        return self.fetch(ticker, start_date=start, end_date=end, **kwargs)
+
+    def get_metadata(self) -> Dict[str, str]:
+        meta = super().get_metadata()
+        meta.update(
+            {
+                "provider": "record",
+                "records": self.provider,
+                "raw_root": str(self.raw_root),
+            }
+        )
+        return meta
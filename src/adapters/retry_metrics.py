@@ -1,21 +1,130 @@
 """
 Métricas e observabilidade para operações de retry.
 
-Coleta e expõe métricas sobre tentativas, sucessos e falhas de retry
-para monitoramento e debugging de adaptadores.
+Coleta e expõe métricas sobre tentativas, sucessos, falhas, latência de
+fetch e tempo gasto em backoff, separadas por provedor (e opcionalmente por
+ticker), para monitoramento e debugging de adaptadores.
+
+Cada atualização também é espelhada em :mod:`src.metrics` (séries
+``adapter_fetch_*`` rotuladas por ``provider``), de modo que os exportadores
+Prometheus/textfile enxerguem os mesmos números de :meth:`RetryMetrics.to_dict`.
 """
 
+import os
 import threading
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Any, Dict, Optional, Tuple
+
+from src import metrics as _metrics
+
+UNKNOWN_PROVIDER = "unknown"
+
+# limites (segundos) dos histogramas de latência/backoff; cobrem desde
+# respostas locais (ms) até backoffs longos de rate limit
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_COUNTER_FIELDS = (
+    "retry_count",
+    "success_after_retry",
+    "permanent_failures",
+    "first_attempt_success",
+    "total_attempts",
+)
+
+# nome da série exportada em src.metrics para cada contador
+_EXPORTED_COUNTERS = {
+    "retry_count": "adapter_fetch_retries_total",
+    "success_after_retry": "adapter_fetch_success_after_retry_total",
+    "permanent_failures": "adapter_fetch_permanent_failures_total",
+    "first_attempt_success": "adapter_fetch_first_attempt_success_total",
+    "total_attempts": "adapter_fetch_attempts_total",
+}
+
+
+def _per_ticker_from_env() -> bool:
+    raw = os.getenv("RETRY_METRICS_PER_TICKER", "")
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
 @dataclass
-class RetryMetrics:
+class LatencyHistogram:
+    """
+    Histograma de durações (segundos) com buckets fixos.
+
+    Não é thread-safe por si só; :class:`RetryMetrics` o protege com o
+    próprio lock.
     """
-    Métricas agregadas de operações de retry.
 
-    Thread-safe para uso concorrente em múltiplos adaptadores.
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    counts: list = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * len(self.buckets)
+
+    def observe(self, seconds: float) -> None:
+        """Registra uma duração."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima o quantil ``q`` pelo limite superior do bucket correspondente.
+
+        Returns:
+            Limite do bucket (ou o máximo observado, acima do último bucket);
+            ``None`` quando não há observações.
+        """
+        if self.count == 0:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts, strict=True):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo do histograma (contagem, soma, média, p50/p95/p99, máximo)."""
+        mean = self.total / self.count if self.count else None
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "mean": None if mean is None else round(mean, 6),
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+@dataclass
+class ProviderRetryStats:
+    """
+    Contadores e histogramas de uma chave (provedor ou provedor+ticker).
 
     Attributes:
         retry_count: Número total de retries executados (tentativas > 1)
@@ -23,6 +132,8 @@ class RetryMetrics:
         permanent_failures: Falhas permanentes após esgotar max_attempts
         first_attempt_success: Operações bem-sucedidas na primeira tentativa
         total_attempts: Número total de tentativas (incluindo primeiras)
+        fetch_latency: Duração de cada chamada ao provedor (``_fetch_once``)
+        backoff_sleep: Tempo aguardado entre tentativas
     """
 
     retry_count: int = 0
@@ -30,57 +141,217 @@ class RetryMetrics:
     permanent_failures: int = 0
     first_attempt_success: int = 0
     total_attempts: int = 0
-    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    fetch_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    backoff_sleep: LatencyHistogram = field(default_factory=LatencyHistogram)
 
-    def record_attempt(self) -> None:
-        """Registra uma tentativa individual."""
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot dos contadores e resumos dos histogramas."""
+        out: Dict[str, Any] = {name: getattr(self, name) for name in _COUNTER_FIELDS}
+        out["fetch_latency"] = self.fetch_latency.to_dict()
+        out["backoff_sleep"] = self.backoff_sleep.to_dict()
+        return out
+
+
+class RetryMetrics:
+    """
+    Métricas de retry/latência por provedor, seguras para uso concorrente.
+
+    Todos os métodos ``record_*``/``observe_*`` aceitam ``provider`` e
+    ``ticker`` opcionais. Os contadores são sempre agregados por provedor;
+    a quebra por ticker só é mantida quando ``per_ticker=True`` (ou
+    ``RETRY_METRICS_PER_TICKER=1``), para limitar a cardinalidade.
+
+    Os atributos legados (``retry_count``, ``total_attempts``...) continuam
+    disponíveis e retornam o total somado entre provedores.
+    """
+
+    def __init__(self, per_ticker: Optional[bool] = None):
+        self.per_ticker = _per_ticker_from_env() if per_ticker is None else per_ticker
+        self._lock = threading.Lock()
+        self._providers: Dict[str, ProviderRetryStats] = {}
+        self._tickers: Dict[Tuple[str, str], ProviderRetryStats] = {}
+
+    # -- helpers ---------------------------------------------------------
+
+    def _targets(
+        self, provider: Optional[str], ticker: Optional[str]
+    ) -> Tuple[str, list]:
+        """Retorna o nome do provedor e as estatísticas a atualizar.
+
+        Deve ser chamado com ``self._lock`` adquirido.
+        """
+        name = provider or UNKNOWN_PROVIDER
+        targets = [self._providers.setdefault(name, ProviderRetryStats())]
+        if self.per_ticker and ticker:
+            targets.append(
+                self._tickers.setdefault((name, ticker), ProviderRetryStats())
+            )
+        return name, targets
+
+    def _labels(self, provider: str, ticker: Optional[str]) -> Dict[str, str]:
+        labels = {"provider": provider}
+        if self.per_ticker and ticker:
+            labels["ticker"] = ticker
+        return labels
+
+    def _increment(
+        self, counter: str, provider: Optional[str], ticker: Optional[str]
+    ) -> None:
         with self._lock:
-            self.total_attempts += 1
+            name, targets = self._targets(provider, ticker)
+            for stats in targets:
+                setattr(stats, counter, getattr(stats, counter) + 1)
+        _metrics.increment_counter(
+            _EXPORTED_COUNTERS[counter],
+            labels=self._labels(name, ticker),
+            documentation=f"Adapter retry metric '{counter}' per provider",
+        )
 
-    def record_retry(self) -> None:
-        """Registra que um retry foi necessário (tentativa > 1)."""
+    def _observe(
+        self,
+        histogram: str,
+        seconds: float,
+        provider: Optional[str],
+        ticker: Optional[str],
+        exported: str,
+        documentation: str,
+    ) -> None:
         with self._lock:
-            self.retry_count += 1
+            name, targets = self._targets(provider, ticker)
+            for stats in targets:
+                getattr(stats, histogram).observe(seconds)
+        _metrics.observe_histogram(
+            exported,
+            seconds,
+            labels=self._labels(name, ticker),
+            documentation=documentation,
+        )
+
+    # -- API pública -----------------------------------------------------
+
+    def record_attempt(
+        self, provider: Optional[str] = None, ticker: Optional[str] = None
+    ) -> None:
+        """Registra uma tentativa individual."""
+        self._increment("total_attempts", provider, ticker)
+
+    def record_retry(
+        self, provider: Optional[str] = None, ticker: Optional[str] = None
+    ) -> None:
+        """Registra que um retry foi necessário (tentativa > 1)."""
+        self._increment("retry_count", provider, ticker)
 
-    def record_success_after_retry(self) -> None:
+    def record_success_after_retry(
+        self, provider: Optional[str] = None, ticker: Optional[str] = None
+    ) -> None:
         """Registra sucesso após pelo menos um retry."""
-        with self._lock:
-            self.success_after_retry += 1
+        self._increment("success_after_retry", provider, ticker)
 
-    def record_first_attempt_success(self) -> None:
+    def record_first_attempt_success(
+        self, provider: Optional[str] = None, ticker: Optional[str] = None
+    ) -> None:
         """Registra sucesso na primeira tentativa (sem retry)."""
-        with self._lock:
-            self.first_attempt_success += 1
+        self._increment("first_attempt_success", provider, ticker)
 
-    def record_permanent_failure(self) -> None:
+    def record_permanent_failure(
+        self, provider: Optional[str] = None, ticker: Optional[str] = None
+    ) -> None:
         """Registra falha permanente após esgotar tentativas."""
+        self._increment("permanent_failures", provider, ticker)
+
+    def observe_fetch_latency(
+        self,
+        seconds: float,
+        provider: Optional[str] = None,
+        ticker: Optional[str] = None,
+    ) -> None:
+        """Registra a duração de uma chamada ao provedor (sucesso ou falha)."""
+        self._observe(
+            "fetch_latency",
+            seconds,
+            provider,
+            ticker,
+            "adapter_fetch_latency_seconds",
+            "Duration of a single provider fetch attempt",
+        )
+
+    def observe_backoff_sleep(
+        self,
+        seconds: float,
+        provider: Optional[str] = None,
+        ticker: Optional[str] = None,
+    ) -> None:
+        """Registra o tempo de espera (backoff) antes de um novo retry."""
+        self._observe(
+            "backoff_sleep",
+            seconds,
+            provider,
+            ticker,
+            "adapter_backoff_sleep_seconds",
+            "Backoff sleep between provider fetch attempts",
+        )
+
+    def _total(self, counter: str) -> int:
+        with self._lock:
+            return sum(getattr(s, counter) for s in self._providers.values())
+
+    @property
+    def retry_count(self) -> int:
+        return self._total("retry_count")
+
+    @property
+    def success_after_retry(self) -> int:
+        return self._total("success_after_retry")
+
+    @property
+    def permanent_failures(self) -> int:
+        return self._total("permanent_failures")
+
+    @property
+    def first_attempt_success(self) -> int:
+        return self._total("first_attempt_success")
+
+    @property
+    def total_attempts(self) -> int:
+        return self._total("total_attempts")
+
+    def provider_stats(self, provider: str) -> Dict[str, Any]:
+        """Snapshot das métricas de um provedor (vazio se nunca registrado)."""
         with self._lock:
-            self.permanent_failures += 1
+            stats = self._providers.get(provider)
+            return stats.to_dict() if stats is not None else {}
 
-    def to_dict(self) -> Dict[str, int]:
+    def to_dict(self) -> Dict[str, Any]:
         """
         Retorna snapshot das métricas como dicionário.
 
         Returns:
-            Dict com todas as métricas atuais
+            Dict com os totais agregados (mesmas chaves de antes:
+            ``retry_count``, ``total_attempts``...), ``providers`` com o
+            detalhamento por provedor (contadores + resumos de
+            ``fetch_latency``/``backoff_sleep``) e, quando habilitado,
+            ``tickers`` indexado por ``"<provider>:<ticker>"``.
         """
         with self._lock:
-            return {
-                "retry_count": self.retry_count,
-                "success_after_retry": self.success_after_retry,
-                "permanent_failures": self.permanent_failures,
-                "first_attempt_success": self.first_attempt_success,
-                "total_attempts": self.total_attempts,
+            out: Dict[str, Any] = {
+                name: sum(getattr(s, name) for s in self._providers.values())
+                for name in _COUNTER_FIELDS
+            }
+            out["providers"] = {
+                name: stats.to_dict() for name, stats in sorted(self._providers.items())
             }
+            if self.per_ticker:
+                out["tickers"] = {
+                    f"{p}:{t}": stats.to_dict()
+                    for (p, t), stats in sorted(self._tickers.items())
+                }
+            return out
 
     def reset(self) -> None:
         """Reseta todas as métricas para zero (útil para testes)."""
         with self._lock:
-            self.retry_count = 0
-            self.success_after_retry = 0
-            self.permanent_failures = 0
-            self.first_attempt_success = 0
-            self.total_attempts = 0
+            self._providers.clear()
+            self._tickers.clear()
 
 
 # Instância global de métricas (singleton thread-safe)
@@ -9,7 +9,7 @@ import logging
 import re
 import types
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
 
@@ -67,6 +67,7 @@ class YFinanceAdapter(Adapter):
         backoff_factor: float | None = None,
         timeout: int | None = None,
         retry_config=None,
+        chunk_config=None,
     ):
         """
         Inicializa adaptador Yahoo Finance.
@@ -76,9 +77,10 @@ class YFinanceAdapter(Adapter):
             backoff_factor: Fator de backoff (usa RetryConfig por padrão)
             timeout: Timeout em segundos (usa RetryConfig por padrão)
             retry_config: Optional RetryConfig para configurar políticas
+            chunk_config: Optional ChunkConfig para backfills em blocos
         """
         # Inicializa Adapter base para carregar RetryConfig e métricas
-        super().__init__(retry_config=retry_config)
+        super().__init__(retry_config=retry_config, chunk_config=chunk_config)
 
         # Priorizar parâmetros explícitos ou herdar da retry_config
         self.max_retries = 3 if max_retries is None else max_retries
@@ -126,6 +128,69 @@ class YFinanceAdapter(Adapter):
             ... )
             >>> print(df.head())
         """
+        normalized_ticker, start_date, end_date, log_context = self._prepare_request(
+            ticker, start_date, end_date
+        )
+
+        # Delegar obtenção com retry para helper implementado no Adapter base;
+        # janelas longas são divididas em blocos (ver src.adapters.chunked)
+        df = self._fetch_chunked(
+            normalized_ticker,
+            start_date,
+            end_date,
+            log_context=log_context,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            timeout=self.timeout,
+            **kwargs,
+        )
+        return self._finalize(df, normalized_ticker)
+
+    async def fetch_async(
+        self,
+        ticker: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        Versão assíncrona de :meth:`fetch`.
+
+        O loop de retry roda no event loop (esperas com ``asyncio.sleep``);
+        apenas a chamada bloqueante ao ``pandas_datareader`` é executada em
+        thread do executor padrão.
+
+        Args:
+            ticker: Código do ativo (ex: 'PETR4.SA' ou 'AAPL')
+            start_date: Data de início no formato 'YYYY-MM-DD' ou 'MM-DD-YYYY'
+            end_date: Data de fim no formato 'YYYY-MM-DD' ou 'MM-DD-YYYY'
+            **kwargs: Argumentos adicionais ignorados (compatibilidade futura)
+
+        Returns:
+            pd.DataFrame no mesmo formato de :meth:`fetch`
+        """
+        normalized_ticker, start_date, end_date, log_context = self._prepare_request(
+            ticker, start_date, end_date
+        )
+        df = await self._fetch_chunked_async(
+            normalized_ticker,
+            start_date,
+            end_date,
+            log_context=log_context,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            timeout=self.timeout,
+            **kwargs,
+        )
+        return self._finalize(df, normalized_ticker)
+
+    def _prepare_request(
+        self,
+        ticker: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> Tuple[str, str, str, dict]:
+        """Normaliza ticker/datas e monta o contexto de log da requisição."""
         # Normalizar ticker para formato Yahoo (adicionar .SA se necessário para B3)
         normalized_ticker = self._normalize_ticker(ticker)
 
@@ -153,19 +218,10 @@ class YFinanceAdapter(Adapter):
         }
 
         logger.info("Iniciando fetch de dados", extra=log_context)
+        return normalized_ticker, start_date, end_date, log_context
 
-        # Delegar obtenção com retry para helper implementado no Adapter base
-        df = super()._fetch_with_retries(
-            normalized_ticker,
-            start_date,
-            end_date,
-            log_context=log_context,
-            max_retries=self.max_retries,
-            backoff_factor=self.backoff_factor,
-            timeout=self.timeout,
-            **kwargs,
-        )
-
+    def _finalize(self, df: pd.DataFrame, normalized_ticker: str) -> pd.DataFrame:
+        """Achata colunas MultiIndex e anexa metadados de proveniência."""
         # Some providers (notably yfinance) return MultiIndex columns when
         # a ticker argument is provided; e.g. ``('Close','PETR4.SA')``.  We
         # prefer a flat, predictable column set for downstream consumers, so
@@ -0,0 +1,200 @@
+"""Calendário de pregões da B3.
+
+Tabela pré-computada de feriados da bolsa para 1990–2100 — fixos e móveis
+(Carnaval, Sexta-feira Santa e Corpus Christi, derivados da Páscoa) —,
+montada uma única vez em um :class:`numpy.busdaycalendar`. As consultas usam as
+funções vetorizadas ``numpy.is_busday``/``busday_offset``/``busday_count``
+e aceitam tanto um valor escalar (``date``, ``datetime``, ``Timestamp`` ou
+``"YYYY-MM-DD"``) quanto sequências/``DatetimeIndex``:
+
+    - :func:`is_trading_day`: há pregão na data?
+    - :func:`next_session` / :func:`previous_session`: pregão estritamente
+      posterior/anterior
+    - :func:`sessions` / :func:`count_sessions`: pregões de um intervalo
+      (fechado) — base para a contagem esperada de linhas em checagens de
+      qualidade
+    - :func:`last_closed_session`: último pregão encerrado em um instante
+
+Regras da B3 consideradas: além dos feriados nacionais, não há pregão em
+24/12 e 31/12; 25/01 e 09/07 (feriados paulistas) foram dias sem pregão até
+2021; 20/11 não teve pregão de 2004 (quando virou feriado municipal) a 2021 e
+voltou a não ter a partir de 2024 (feriado nacional). Fechamentos excepcionais podem ser
+informados em ``B3_EXTRA_HOLIDAYS`` (datas ``YYYY-MM-DD`` separadas por
+vírgula).
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+FIRST_YEAR = 1990
+LAST_YEAR = 2100
+
+# Brasil sem horário de verão desde 2019: o pregão segue UTC-3
+B3_TZ = timezone(timedelta(hours=-3), "America/Sao_Paulo")
+# horário a partir do qual os dados do dia são considerados fechados
+SESSION_CLOSE = time(18, 30)
+
+_FIXED_HOLIDAYS = {
+    (1, 1): "Confraternização Universal",
+    (4, 21): "Tiradentes",
+    (5, 1): "Dia do Trabalho",
+    (9, 7): "Independência do Brasil",
+    (10, 12): "Nossa Senhora Aparecida",
+    (11, 2): "Finados",
+    (11, 15): "Proclamação da República",
+    (12, 24): "Véspera de Natal",
+    (12, 25): "Natal",
+    (12, 31): "Último dia do ano",
+}
+# feriados locais de São Paulo em que a B3 fechava até 2021
+_SP_HOLIDAYS_UNTIL_2021 = {
+    (1, 25): "Aniversário de São Paulo",
+    (7, 9): "Revolução Constitucionalista",
+}
+# offsets em dias a partir do domingo de Páscoa
+_EASTER_HOLIDAYS = {
+    -48: "Carnaval (segunda-feira)",
+    -47: "Carnaval (terça-feira)",
+    -2: "Sexta-feira Santa",
+    60: "Corpus Christi",
+}
+
+
+def easter_sunday(year: int) -> date:
+    """Domingo de Páscoa (calendário gregoriano, algoritmo de Meeus/Jones/Butcher)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    m = (32 + 2 * e + 2 * i - h - k) % 7
+    n = (a + 11 * h + 22 * m) // 451
+    month, day = divmod(h + m - 7 * n + 114, 31)
+    return date(year, month, day + 1)
+
+
+def holidays(year: int) -> Dict[date, str]:
+    """Feriados da B3 em ``year`` (incluindo os que caem em fim de semana),
+    mapeados ao nome do feriado."""
+    out = {date(year, m, d): name for (m, d), name in _FIXED_HOLIDAYS.items()}
+    if year <= 2021:
+        out.update(
+            {date(year, m, d): name for (m, d), name in _SP_HOLIDAYS_UNTIL_2021.items()}
+        )
+    if 2004 <= year <= 2021 or year >= 2024:
+        out[date(year, 11, 20)] = "Dia da Consciência Negra"
+    easter = easter_sunday(year)
+    for offset, name in _EASTER_HOLIDAYS.items():
+        out[easter + timedelta(days=offset)] = name
+    return dict(sorted(out.items()))
+
+
+def _extra_holidays() -> List[date]:
+    raw = os.getenv("B3_EXTRA_HOLIDAYS", "")
+    return [date.fromisoformat(v.strip()) for v in raw.split(",") if v.strip()]
+
+
+@functools.lru_cache(maxsize=None)
+def _busdaycalendar(extra: tuple = ()) -> np.busdaycalendar:
+    days = [d for year in range(FIRST_YEAR, LAST_YEAR + 1) for d in holidays(year)]
+    days.extend(extra)
+    return np.busdaycalendar(
+        weekmask="1111100", holidays=np.array(days, dtype="datetime64[D]")
+    )
+
+
+def busdaycalendar() -> np.busdaycalendar:
+    """Calendário NumPy da B3 (cacheado), para uso direto em ``numpy.busday_*``."""
+    return _busdaycalendar(tuple(_extra_holidays()))
+
+
+def _as_days(value: Any) -> tuple[np.ndarray, bool]:
+    """Converte escalar ou sequência de datas para ``datetime64[D]``."""
+    # caminho rápido para os escalares mais comuns (sem passar pelo pandas)
+    if isinstance(value, date) and not isinstance(value, pd.Timestamp):
+        if not isinstance(value, datetime) or value.tzinfo is None:
+            return np.array([value], dtype="datetime64[D]"), True
+    elif isinstance(value, str) and len(value) == 10:
+        return np.array([value], dtype="datetime64[D]"), True
+    scalar = np.ndim(value) == 0 and not isinstance(value, pd.Index)
+    index = pd.DatetimeIndex(pd.to_datetime([value] if scalar else value))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]"), scalar
+
+
+def _to_date(day: np.datetime64) -> date:
+    return day.astype("datetime64[D]").astype(date)
+
+
+def _to_index(days: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(days.astype("datetime64[ns]"))
+
+
+def is_trading_day(value: Any) -> Any:
+    """Indica se há pregão em ``value`` (``bool`` ou array de ``bool``)."""
+    days, scalar = _as_days(value)
+    result = np.is_busday(days, busdaycal=busdaycalendar())
+    return bool(result[0]) if scalar else result
+
+
+def next_session(value: Any) -> Any:
+    """Primeiro pregão estritamente posterior a ``value``."""
+    days, scalar = _as_days(value)
+    result = np.busday_offset(days, 1, roll="backward", busdaycal=busdaycalendar())
+    return _to_date(result[0]) if scalar else _to_index(result)
+
+
+def previous_session(value: Any) -> Any:
+    """Último pregão estritamente anterior a ``value``."""
+    days, scalar = _as_days(value)
+    result = np.busday_offset(days, -1, roll="forward", busdaycal=busdaycalendar())
+    return _to_date(result[0]) if scalar else _to_index(result)
+
+
+def sessions(start: Any, end: Any) -> pd.DatetimeIndex:
+    """Pregões no intervalo fechado ``[start, end]``."""
+    (first,), _ = _as_days(start)
+    (last,), _ = _as_days(end)
+    if last < first:
+        return _to_index(np.array([], dtype="datetime64[D]"))
+    days = np.arange(first, last + np.timedelta64(1, "D"), dtype="datetime64[D]")
+    return _to_index(days[np.is_busday(days, busdaycal=busdaycalendar())])
+
+
+def count_sessions(start: Any, end: Any) -> int:
+    """Quantidade de pregões em ``[start, end]`` — linhas esperadas no período."""
+    (first,), _ = _as_days(start)
+    (last,), _ = _as_days(end)
+    if last < first:
+        return 0
+    return int(
+        np.busday_count(
+            first, last + np.timedelta64(1, "D"), busdaycal=busdaycalendar()
+        )
+    )
+
+
+def last_closed_session(now: datetime | None = None) -> date:
+    """Último pregão já encerrado no instante ``now`` (padrão: agora).
+
+    O pregão do próprio dia só conta após :data:`SESSION_CLOSE` no horário de
+    Brasília; ``now`` sem fuso é interpretado como UTC.
+    """
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    local = now.astimezone(B3_TZ)
+    today = local.date()
+    if local.time() >= SESSION_CLOSE and is_trading_day(today):
+        return today
+    return previous_session(today)
@@ -21,10 +21,15 @@ from src.db.connection import (  # noqa: F401
     init_db,
 )
 
+# -- coverage -----------------------------------------------------------
+from src.db.coverage import get_price_coverage, list_price_coverage
+
 # -- prices -------------------------------------------------------------
 from src.db.prices import (
+    last_price_date,
     list_price_tickers,
     read_prices,
+    read_prices_many,
     resolve_existing_ticker,
     write_prices,
 )
@@ -34,13 +39,16 @@ from src.db.returns import write_returns
 
 # -- snapshots ----------------------------------------------------------
 from src.db.snapshots import (
+    clear_last_snapshot_cache,
     delete_snapshots,
+    get_last_snapshot_meta,
     get_last_snapshot_payload,
     get_snapshot_by_path,
     get_snapshot_metadata,
     list_snapshots,
     mark_snapshots_archived,
     record_snapshot_metadata,
+    rename_snapshot_paths,
 )
 
 __all__ = [
@@ -48,19 +56,27 @@ __all__ = [
     "DEFAULT_DB_PATH",
     "connect",
     "init_db",
+    # coverage
+    "get_price_coverage",
+    "list_price_coverage",
     # prices
+    "last_price_date",
     "list_price_tickers",
     "read_prices",
+    "read_prices_many",
     "resolve_existing_ticker",
     "write_prices",
     # returns
     "write_returns",
     # snapshots
+    "clear_last_snapshot_cache",
     "delete_snapshots",
+    "get_last_snapshot_meta",
     "get_last_snapshot_payload",
     "get_snapshot_by_path",
     "get_snapshot_metadata",
     "list_snapshots",
     "mark_snapshots_archived",
     "record_snapshot_metadata",
+    "rename_snapshot_paths",
 ]
@@ -0,0 +1,214 @@
+"""Per-ticker coverage index over the ``prices`` table.
+
+``price_coverage`` keeps one row per stored ticker with its first/last date,
+row count, the ``fetched_at`` of the latest write and the ``raw_checksum`` of
+its newest row.  It is refreshed by :func:`src.db.prices.write_prices` inside
+the same transaction as the price upsert, so lookups such as "which tickers
+exist", "which variant is stored" or "up to which date" are single-row
+primary-key reads instead of scans of ``prices``.
+
+The table is created (and backfilled from ``prices``) by
+:func:`src.db.schema._ensure_schema`.  Readers fall back to querying
+``prices`` directly when it does not exist yet, e.g. on a database that has
+never been written to since the upgrade, and per-ticker lookups also fall
+back when the ticker has no coverage row (rows inserted with plain SQL).
+"""
+
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.db.connection import connect
+from src.tickers import ticker_variants
+
+COVERAGE_COLUMNS = (
+    "ticker",
+    "min_date",
+    "max_date",
+    "row_count",
+    "last_fetched_at",
+    "last_checksum",
+)
+
+# newest row's checksum; ``(ticker, date)`` is the primary key, so this and
+# the MIN/MAX/COUNT below only walk the ticker's own index range
+_LAST_CHECKSUM_SQL = (
+    "(SELECT raw_checksum FROM prices WHERE ticker = p.ticker "
+    "ORDER BY date DESC LIMIT 1)"
+)
+
+
+def _summary_select(conn: sqlite3.Connection, fetched_at_sql: str) -> str:
+    """``SELECT`` producing coverage rows from ``prices`` grouped by ticker.
+
+    Databases created outside :func:`_ensure_schema` may lack the
+    ``raw_checksum``/``fetched_at`` columns; those summaries store ``NULL``.
+    """
+    cols = {row[1] for row in conn.execute("PRAGMA table_info('prices')")}
+    checksum = _LAST_CHECKSUM_SQL if "raw_checksum" in cols else "NULL"
+    if fetched_at_sql != "?" and "fetched_at" not in cols:
+        fetched_at_sql = "NULL"
+    return (
+        f"SELECT p.ticker, MIN(p.date), MAX(p.date), COUNT(*), {fetched_at_sql}, "
+        f"{checksum} FROM prices AS p"
+    )
+
+
+def _ensure_coverage_table(conn: sqlite3.Connection) -> None:
+    """Create ``price_coverage`` and backfill it from ``prices`` if new.
+
+    Does not commit; :func:`src.db.schema._ensure_schema` commits once at
+    the end.
+    """
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'price_coverage'"
+    )
+    if cur.fetchone():
+        return
+    cur.execute(
+        """
+        CREATE TABLE price_coverage (
+            ticker TEXT PRIMARY KEY,
+            min_date TEXT NOT NULL,
+            max_date TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            last_fetched_at TEXT,
+            last_checksum TEXT
+        )
+        """
+    )
+    cur.execute(
+        f"INSERT INTO price_coverage ({', '.join(COVERAGE_COLUMNS)}) "
+        f"{_summary_select(conn, 'MAX(p.fetched_at)')} "
+        "WHERE p.ticker IS NOT NULL GROUP BY p.ticker"
+    )
+
+
+def _refresh_coverage(
+    conn: sqlite3.Connection, ticker: str, fetched_at: Optional[str]
+) -> None:
+    """Recompute the coverage row of ``ticker`` (caller owns the transaction)."""
+    updates = ", ".join(f"{c} = excluded.{c}" for c in COVERAGE_COLUMNS[1:])
+    conn.execute(
+        f"INSERT INTO price_coverage ({', '.join(COVERAGE_COLUMNS)}) "
+        f"{_summary_select(conn, '?')} WHERE p.ticker = ? GROUP BY p.ticker "
+        f"ON CONFLICT(ticker) DO UPDATE SET {updates}",
+        (fetched_at, ticker),
+    )
+
+
+def _candidates(ticker: str) -> tuple[str, ...]:
+    try:
+        return ticker_variants(ticker)
+    except ValueError:
+        return (ticker,)
+
+
+def _row_to_dict(row: Sequence[Any]) -> Dict[str, Any]:
+    out = dict(zip(COVERAGE_COLUMNS, row, strict=True))
+    # ``prices.date`` may carry a time component in legacy databases
+    out["min_date"] = str(out["min_date"])[:10]
+    out["max_date"] = str(out["max_date"])[:10]
+    return out
+
+
+def _query_coverage(
+    conn: sqlite3.Connection, candidates: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """Coverage rows for ``candidates``, in candidate order.
+
+    Tickers missing from ``price_coverage`` (or the whole table missing) are
+    summarised straight from ``prices`` -- still a primary-key range read --
+    so rows inserted without :func:`write_prices` are found too.
+    ``sqlite3.OperationalError`` propagates when ``prices`` is missing.
+    """
+    placeholders = ", ".join("?" for _ in candidates)
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(COVERAGE_COLUMNS)} FROM price_coverage "
+            f"WHERE ticker IN ({placeholders})",
+            tuple(candidates),
+        ).fetchall()
+    except sqlite3.OperationalError as exc:
+        if "price_coverage" not in str(exc):
+            raise
+        rows = []
+    if not rows:
+        rows = conn.execute(
+            "SELECT ticker, MIN(date), MAX(date), COUNT(*), NULL, NULL "
+            f"FROM prices WHERE ticker IN ({placeholders}) GROUP BY ticker",
+            tuple(candidates),
+        ).fetchall()
+    found = {row[0]: _row_to_dict(row) for row in rows}
+    return [found[c] for c in candidates if c in found]
+
+
+def get_price_coverage(
+    ticker: str,
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return the coverage summary of ``ticker`` or ``None`` if not stored.
+
+    Parameters
+    ----------
+    ticker :
+        Ticker in any accepted spelling (``"PETR4"`` or ``"PETR4.SA"``); the
+        base form is preferred when both variants are stored.
+    conn :
+        Optional ``sqlite3.Connection`` instance to use.
+    db_path :
+        Optional path or URI to an SQLite database file.
+
+    Returns
+    -------
+    dict or None
+        Keys ``ticker`` (as stored), ``min_date``, ``max_date``
+        (``YYYY-MM-DD``), ``row_count``, ``last_fetched_at`` and
+        ``last_checksum``.
+
+    Raises
+    ------
+    sqlite3.OperationalError
+        If neither ``price_coverage`` nor ``prices`` exist.
+    """
+    close_conn = False
+    if conn is None:
+        conn = connect(db_path)
+        close_conn = True
+
+    try:
+        rows = _query_coverage(conn, _candidates(ticker))
+        return rows[0] if rows else None
+    finally:
+        if close_conn:
+            conn.close()
+
+
+def list_price_coverage(
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Return the coverage summary of every stored ticker, ordered by ticker."""
+    close_conn = False
+    if conn is None:
+        conn = connect(db_path)
+        close_conn = True
+
+    try:
+        try:
+            rows = conn.execute(
+                f"SELECT {', '.join(COVERAGE_COLUMNS)} FROM price_coverage "
+                "ORDER BY ticker"
+            ).fetchall()
+        except sqlite3.OperationalError as exc:
+            if "price_coverage" not in str(exc):
+                raise
+            rows = conn.execute(
+                "SELECT ticker, MIN(date), MAX(date), COUNT(*), NULL, NULL "
+                "FROM prices GROUP BY ticker ORDER BY ticker"
+            ).fetchall()
+        return [_row_to_dict(row) for row in rows if row and row[0]]
+    finally:
+        if close_conn:
+            conn.close()
@@ -2,8 +2,9 @@
 
 import logging
 import sqlite3
-from typing import Optional, Sequence
+from typing import Any, Iterable, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from src.db._helpers import (
@@ -11,8 +12,10 @@ from src.db._helpers import (
     _row_tuple_from_series,
 )
 from src.db.connection import connect
+from src.db.coverage import _query_coverage, _refresh_coverage, list_price_coverage
 from src.db.schema import _ensure_schema, _get_upsert_sql, _load_canonical_schema
 from src.tickers import normalize_b3_ticker, ticker_variants
+from src.time_utils import now_utc_iso
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +33,8 @@ def write_prices(  # noqa: C901
     The supplied ``df`` must contain a ``DatetimeIndex`` (or a ``date``
     column which will be converted) and any subset of columns defined by
     the canonical schema.  Rows for the given ``ticker`` are upserted using
-    SQLite's ``INSERT ... ON CONFLICT`` logic.
+    SQLite's ``INSERT ... ON CONFLICT`` logic and the ticker's
+    ``price_coverage`` row is refreshed in the same transaction.
 
     Parameters
     ----------
@@ -122,6 +126,8 @@ def write_prices(  # noqa: C901
             if "fetched_at" not in schema_cols:
                 schema_cols.append("fetched_at")
 
+        # one timestamp for the whole batch so it matches the coverage row
+        fetched_at = fetched_at or now_utc_iso()
         rows = []
         rows.extend(
             _row_tuple_from_series(
@@ -133,6 +139,7 @@ def write_prices(  # noqa: C901
 
         cur = conn.cursor()
         cur.executemany(sql, rows)
+        _refresh_coverage(conn, ticker, fetched_at)
         conn.commit()
     except Exception:  # rollback on failure to avoid partial commits
         try:
@@ -152,6 +159,7 @@ def read_prices(
     end: Optional[str] = None,
     conn: Optional[sqlite3.Connection] = None,
     db_path: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
     """Read price rows for ``ticker`` and return a DataFrame indexed by date.
 
@@ -165,12 +173,22 @@ def read_prices(
         Optional ``sqlite3.Connection`` instance to use.
     db_path :
         Optional path or URI to an SQLite database file.
+    columns :
+        Optional subset of schema columns to read (``date`` is always
+        read and becomes the index).  ``None`` reads every canonical
+        column; e.g. ``["close"]`` skips the TEXT metadata columns.
 
     Returns
     -------
     pandas.DataFrame
-        DataFrame indexed by date with columns from the canonical schema.
-        If no rows are found an empty DataFrame is returned.
+        DataFrame indexed by date with columns from the canonical schema
+        (or ``columns``).  If no rows are found an empty DataFrame is
+        returned.
+
+    Raises
+    ------
+    ValueError
+        If ``columns`` names a column outside the canonical schema.
     """
     close_conn = False
     if conn is None:
@@ -178,7 +196,7 @@ def read_prices(
         close_conn = True
 
     try:
-        return _read_prices_core(conn, ticker, start, end)
+        return _read_prices_core(conn, ticker, start, end, columns)
     finally:
         if close_conn:
             conn.close()
@@ -189,6 +207,7 @@ def _read_prices_core(
     ticker: str,
     start: Optional[str],
     end: Optional[str],
+    columns: Optional[Sequence[str]] = None,
 ) -> pd.DataFrame:
     """Retrieve price rows from the database for a ticker and date range.
 
@@ -205,12 +224,15 @@ def _read_prices_core(
     end : Optional[str]
         Upper date bound in ``YYYY-MM-DD`` format; if ``None`` no upper bound
         is applied.
+    columns : Optional[Sequence[str]]
+        Schema columns to select besides ``date``; ``None`` selects all.
 
     Returns
     -------
     pandas.DataFrame
-        DataFrame indexed by ``date`` containing all columns from the
-        canonical prices schema.  If the query returns no rows an empty
+        DataFrame indexed by ``date`` containing the selected columns, built
+        column by column with the dtypes of the canonical schema (see
+        :func:`_typed_frame`).  If the query returns no rows an empty
         DataFrame is returned.  Caller is responsible for any further
         filtering or type conversions.
 
@@ -227,11 +249,13 @@ def _read_prices_core(
         candidates = (ticker,)
 
     params: list[str] = list(candidates)
-    schema = _load_canonical_schema()
-    schema_cols = [c["name"] for c in schema.get("columns", [])]
+    types = _schema_types()
     # ensure date is selected first
-    select_cols = [c for c in schema_cols if c != "date"]
-    select_cols = ["date"] + select_cols
+    select_cols = ["date"] + [
+        c
+        for c in (types if columns is None else _checked_columns(columns, types))
+        if c != "date"
+    ]
     # Validate and quote column identifiers for the SELECT clause to avoid
     # SQL injection or malformed queries when schema contains unexpected
     # names. Column names used as DataFrame columns remain unquoted.
@@ -253,34 +277,255 @@ def _read_prices_core(
     sql += " ORDER BY date"
     cur.execute(sql, params)
     rows = cur.fetchall()
-    cols = select_cols
-    df = pd.DataFrame(rows, columns=cols)
-    if df.empty:
+    if not rows:
+        return pd.DataFrame(rows, columns=select_cols)
+    return _typed_frame(rows, select_cols, types).set_index("date")
+
+
+_NUMPY_DTYPES = {"float": np.float64, "int": np.int64}
+
+
+def _schema_types() -> dict[str, str]:
+    return {
+        c["name"]: c.get("type", "string")
+        for c in _load_canonical_schema().get("columns", [])
+    }
+
+
+def _checked_columns(columns: Sequence[str], known: dict[str, str]) -> list[str]:
+    """Deduplicate ``columns`` and reject names outside the canonical schema."""
+    unknown = [c for c in columns if c not in known]
+    if unknown:
+        raise ValueError(f"unknown price columns: {unknown}")
+    return list(dict.fromkeys(columns))
+
+
+def _decode_dates(values: Sequence[Any]) -> np.ndarray:
+    """Parse stored ``YYYY-MM-DD`` values into ``datetime64[ns]``.
+
+    NumPy parses the fixed ISO layout in C with no per-value format
+    inference; legacy values with a time component keep only their date.
+    """
+    try:
+        days = np.array(values, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        # unexpected layout (e.g. non-ISO text): let pandas sort it out
+        return pd.to_datetime(pd.Index(values), format="mixed").values
+    return days.astype("datetime64[ns]")
+
+
+def _typed_frame(
+    rows: Sequence[tuple], select_cols: Sequence[str], types: dict[str, str]
+) -> pd.DataFrame:
+    """Build a DataFrame column by column with the canonical schema dtypes.
+
+    ``REAL`` columns become ``float64`` (``NULL`` -> ``NaN``), ``INTEGER``
+    columns ``int64`` (``float64`` when they hold ``NULL`` or a ``REAL``
+    value, so nothing is truncated), the ``date`` column ``datetime64[ns]``
+    and everything else ``object``.  Avoids the row-wise dtype inference of
+    ``pd.DataFrame(list_of_tuples)``.
+    """
+    data: dict[str, Any] = {}
+    for name, values in zip(select_cols, zip(*rows, strict=True), strict=True):
+        kind = types.get(name, "string")
+        if kind == "date":
+            data[name] = _decode_dates(values)
+            continue
+        dtype = _NUMPY_DTYPES.get(kind, object)
+        if dtype is np.int64 and not all(type(v) is int for v in values):
+            # a REAL stored in an INTEGER column would be truncated by int64
+            dtype = np.float64
+        try:
+            data[name] = np.array(values, dtype=dtype)
+        except (TypeError, ValueError, OverflowError):
+            # NULL in an INTEGER column, or SQLite's dynamic typing let a
+            # value of another type in: fall back to float, then object
+            try:
+                data[name] = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                data[name] = np.array(values, dtype=object)
+    return pd.DataFrame(data, columns=list(select_cols), copy=False)
+
+
+# SQLite builds before 3.32 cap bind variables at 999 per statement; stay
+# below it so a long ticker list is split into several IN (...) queries
+_MAX_BIND_VARIABLES = 900
+
+
+def _price_projection(
+    columns: Optional[Sequence[str]], field: Optional[str], types: dict[str, str]
+) -> list[str]:
+    """Validated value columns to select for :func:`read_prices_many`."""
+    if field is not None:
+        if field in ("date", "ticker"):
+            raise ValueError(f"field must be a value column, got {field!r}")
+        columns = [field]
+    if columns is None:
+        columns = list(types)
+    return [c for c in _checked_columns(columns, types) if c not in ("date", "ticker")]
+
+
+def _ticker_labels(tickers: Iterable[str]) -> dict[str, str]:
+    """Map every stored spelling (base and ``.SA``) to the base label."""
+    labels: dict[str, str] = {}
+    for ticker in tickers:
+        try:
+            base, provider = ticker_variants(ticker)
+        except ValueError:
+            labels.setdefault(ticker, ticker)
+            continue
+        labels.setdefault(base, base)
+        labels.setdefault(provider, base)
+    return labels
+
+
+def read_prices_many(
+    tickers: Iterable[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    *,
+    field: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """Read price rows for several tickers with a single parameterized query.
+
+    Parameters
+    ----------
+    tickers :
+        Ticker identifiers; base and ``.SA`` variants are both matched, like
+        :func:`read_prices`.  Lists longer than the SQLite bind-variable
+        limit are split into several ``IN (...)`` queries.
+    start, end :
+        Optional date bounds (``YYYY-MM-DD``), inclusive.
+    columns :
+        Schema columns to read besides ``date`` and ``ticker``; ``None``
+        reads every column of the canonical schema.  Only the requested
+        columns are selected from SQLite.
+    field :
+        When given, return a wide ``date x ticker`` panel of this single
+        column instead of the long frame (implies ``columns=[field]``).
+    conn :
+        Optional ``sqlite3.Connection`` instance to use.
+    db_path :
+        Optional path or URI to an SQLite database file.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long frame with columns ``date``, ``ticker`` and ``columns``, sorted
+        by ticker and date, or -- with ``field`` -- a frame indexed by
+        ``date`` with one column per ticker (dates missing for a ticker are
+        ``NaN``).  Tickers are labelled with their base B3 form; when both
+        variants are stored for a date the base row wins.
+
+    Raises
+    ------
+    ValueError
+        If ``columns`` or ``field`` name a column outside the canonical
+        schema.
+    """
+    types = _schema_types()
+    selected = _price_projection(columns, field, types)
+    labels = _ticker_labels(tickers)
+
+    select_cols = ["date", "ticker", *selected]
+    quoted = ", ".join(_quote_identifier(c) for c in select_cols)
+    bounds_sql = ""
+    bounds: list[str] = []
+    if start:
+        bounds_sql += " AND date >= ?"
+        bounds.append(start)
+    if end:
+        bounds_sql += " AND date <= ?"
+        bounds.append(end)
+
+    close_conn = False
+    if conn is None:
+        conn = connect(db_path)
+        close_conn = True
+
+    try:
+        candidates = list(labels)
+        step = _MAX_BIND_VARIABLES - len(bounds)
+        rows: list = []
+        for i in range(0, len(candidates), step):
+            chunk = candidates[i : i + step]
+            sql = (
+                f"SELECT {quoted} FROM prices "
+                f"WHERE ticker IN ({', '.join('?' for _ in chunk)}){bounds_sql}"
+            )
+            rows.extend(conn.execute(sql, [*chunk, *bounds]).fetchall())
+    finally:
+        if close_conn:
+            conn.close()
+
+    if rows:
+        df = _typed_frame(rows, select_cols, types)
+    else:
+        df = pd.DataFrame(columns=select_cols).astype({"date": "datetime64[ns]"})
+    stored = df["ticker"]
+    df["ticker"] = stored.map(labels)
+    # base spelling first so it wins over a stored ``.SA`` duplicate
+    df = df.assign(_variant=stored != df["ticker"])
+    df = df.sort_values(["ticker", "date", "_variant"], kind="stable")
+    df = df.drop_duplicates(["ticker", "date"]).drop(columns="_variant")
+    df = df.reset_index(drop=True)
+    if field is None:
         return df
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.set_index("date")
-    return df
+    panel = df.pivot(index="date", columns="ticker", values=field)
+    panel.columns.name = None
+    return panel
 
 
-def list_price_tickers(
+def last_price_date(
+    ticker: str,
     conn: Optional[sqlite3.Connection] = None,
     db_path: Optional[str] = None,
-) -> list[str]:
-    """Lista tickers existentes na tabela ``prices`` em ordem alfabética."""
+) -> Optional[str]:
+    """Return the most recent stored ``date`` (``YYYY-MM-DD``) for ``ticker``.
+
+    Accepts the base and ``.SA`` variants like :func:`read_prices`.  Returns
+    ``None`` when the ticker has no rows or the ``prices`` table does not
+    exist yet.  Served by the ``price_coverage`` row of the ticker, so no
+    price rows are touched.
+    """
+    try:
+        base, provider = ticker_variants(ticker)
+        candidates: tuple[str, ...] = (base, provider)
+    except ValueError:
+        candidates = (ticker,)
+
     close_conn = False
     if conn is None:
         conn = connect(db_path)
         close_conn = True
 
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT DISTINCT ticker FROM prices ORDER BY ticker")
-        return [row[0] for row in cur.fetchall() if row and row[0]]
+        try:
+            coverage = _query_coverage(conn, candidates)
+        except sqlite3.OperationalError:
+            # fresh database: nothing stored yet
+            return None
+        return max((c["max_date"] for c in coverage), default=None)
     finally:
         if close_conn:
             conn.close()
 
 
+def list_price_tickers(
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> list[str]:
+    """Lista tickers existentes na tabela ``prices`` em ordem alfabética.
+
+    Lê a tabela ``price_coverage`` (uma linha por ticker); bancos sem ela
+    caem no ``SELECT DISTINCT`` em ``prices``.
+    """
+    return [c["ticker"] for c in list_price_coverage(conn=conn, db_path=db_path)]
+
+
 def resolve_existing_ticker(
     ticker: str,
     conn: Optional[sqlite3.Connection] = None,
@@ -312,26 +557,10 @@ def resolve_existing_ticker(
 def _query_existing_tickers(
     conn: sqlite3.Connection, candidates: Sequence[str]
 ) -> Optional[str]:
-    """Consulta quais tickers dos candidatos já existem na tabela prices."""
-    cur = conn.cursor()
-    if len(candidates) == 2:
-        cur.execute(
-            "SELECT DISTINCT ticker FROM prices WHERE ticker IN (?, ?)",
-            candidates,
-        )
-    else:
-        cur.execute(
-            "SELECT DISTINCT ticker FROM prices WHERE ticker = ?",
-            candidates,
-        )
-    existing = [row[0] for row in cur.fetchall() if row and row[0]]
-    if not existing:
-        return None
-    if len(candidates) == 2:
-        # use candidates tuple rather than bare variables to avoid
-        # "possibly unbound" warnings when ticker_variants raised
-        if candidates[0] in existing:
-            return candidates[0]
-        if candidates[1] in existing:
-            return candidates[1]
-    return existing[0]
+    """Consulta quais tickers dos candidatos já existem na tabela prices.
+
+    A consulta vai ao ``price_coverage`` e devolve o primeiro candidato
+    presente (a forma base tem prioridade sobre a variante ``.SA``).
+    """
+    coverage = _query_coverage(conn, candidates)
+    return coverage[0]["ticker"] if coverage else None
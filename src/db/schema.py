@@ -10,6 +10,7 @@ from src.db._helpers import (
     _quote_identifier,
     _sqlite_version_tuple,
 )
+from src.db.coverage import _ensure_coverage_table
 from src.paths import project_root
 
 DEFAULT_SCHEMA_PATH = str(project_root() / "docs" / "schema.json")
@@ -59,8 +60,8 @@ def _ensure_schema(
     """
     Ensure the database schema exists and is up to date.
 
-    Creates the prices and metadata tables if they don't exist, runs
-    necessary migrations, and persists the schema version.
+    Creates the prices, price_coverage and metadata tables if they don't
+    exist, runs necessary migrations, and persists the schema version.
 
     Args:
         conn: SQLite database connection.
@@ -104,6 +105,8 @@ def _ensure_schema(
         from src.db.migrations import _migrate_prices_date_column
 
         _migrate_prices_date_column(conn)
+    # per-ticker summary maintained by write_prices; backfilled on creation
+    _ensure_coverage_table(conn)
     cur.execute(
         """
         CREATE TABLE IF NOT EXISTS metadata (
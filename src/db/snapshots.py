@@ -6,12 +6,28 @@ import os
 import re
 import sqlite3
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence
 
 from src import db
 from src.time_utils import now_utc_iso
 
+# In-process LRU of the newest snapshot's hot fields per ``(db_path, ticker)``.
+# Entries are dropped by the writers in this module; changes made by other
+# processes or with plain SQL are not observed until the entry is evicted or
+# :func:`clear_last_snapshot_cache` is called.
+_LAST_SNAPSHOT_CACHE_SIZE = 256
+_LAST_SNAPSHOT_CACHE: "OrderedDict[tuple[str, str], dict[str, Any]]" = OrderedDict()
+_LAST_SNAPSHOT_LOCK = threading.Lock()
+
+_LAST_SNAPSHOT_SQL = (
+    "SELECT checksum, generated_at, rows, created_at, "
+    "CASE WHEN checksum IS NULL THEN payload END "
+    "FROM snapshots WHERE ticker = ? ORDER BY created_at DESC LIMIT 1"
+)
+
 
 def _extract_date_range_from_payload(  # noqa: C901 - multiple fallback strategies
     metadata: dict[str, Any],
@@ -182,6 +198,107 @@ def get_last_snapshot_payload(
             conn.close()
 
 
+def get_last_snapshot_meta(
+    ticker: str,
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """Return the hot fields of the newest snapshot of *ticker*.
+
+    Only the indexed ``checksum``, ``generated_at``, ``rows`` and
+    ``created_at`` columns are read, so the usual lookup is answered by the
+    ``snapshots_ticker_created_at_idx`` index without touching the JSON
+    payload.  The payload is returned only for rows whose ``checksum``
+    column was never filled (rows inserted by hand or tables predating
+    migration ``0003``) so callers can fall back to decoding it.
+
+    When no ``conn`` is given the result is memoised in an in-process LRU
+    keyed by ``(db_path, ticker)``; :func:`record_snapshot_metadata` and the
+    delete helpers invalidate it, so a repeated cache-hit check costs no
+    query at all.
+
+    Parameters
+    ----------
+    ticker : str
+        Ticker code as stored in ``snapshots``.
+    conn : Optional[sqlite3.Connection]
+        Optional SQLite connection (bypasses the in-process cache).
+    db_path : Optional[str]
+        Database path (used if conn not provided).
+
+    Returns
+    -------
+    Optional[dict]
+        ``{"checksum", "generated_at", "rows", "created_at", "payload"}`` or
+        ``None`` when the ticker has no snapshot.
+    """
+    if conn is not None:
+        return _query_last_snapshot_meta(conn, ticker)
+
+    key = (str(db_path or ""), ticker)
+    with _LAST_SNAPSHOT_LOCK:
+        cached = _LAST_SNAPSHOT_CACHE.get(key)
+        if cached is not None:
+            _LAST_SNAPSHOT_CACHE.move_to_end(key)
+            return dict(cached)
+
+    _conn = db.connect(db_path=db_path)
+    try:
+        meta = _query_last_snapshot_meta(_conn, ticker)
+    finally:
+        _conn.close()
+
+    if meta is not None:
+        with _LAST_SNAPSHOT_LOCK:
+            _LAST_SNAPSHOT_CACHE[key] = dict(meta)
+            _LAST_SNAPSHOT_CACHE.move_to_end(key)
+            while len(_LAST_SNAPSHOT_CACHE) > _LAST_SNAPSHOT_CACHE_SIZE:
+                _LAST_SNAPSHOT_CACHE.popitem(last=False)
+    return meta
+
+
+def _query_last_snapshot_meta(
+    conn: sqlite3.Connection, ticker: str
+) -> Optional[dict[str, Any]]:
+    try:
+        row = conn.execute(_LAST_SNAPSHOT_SQL, (ticker,)).fetchone()
+    except sqlite3.OperationalError as exc:
+        if "no such column" not in str(exc):
+            raise
+        # table created before the hot columns existed: payload only
+        payload = get_last_snapshot_payload(ticker, conn=conn)
+        if payload is None:
+            return None
+        row = (None, None, None, None, payload)
+    if row is None:
+        return None
+    checksum, generated_at, rows, created_at, payload = row
+    return {
+        "checksum": checksum,
+        "generated_at": generated_at,
+        "rows": rows,
+        "created_at": created_at,
+        "payload": payload,
+    }
+
+
+def clear_last_snapshot_cache(ticker: Optional[str] = None) -> None:
+    """Drop memoised :func:`get_last_snapshot_meta` results.
+
+    Parameters
+    ----------
+    ticker : Optional[str]
+        Only drop the entries of this ticker (for every database path);
+        ``None`` empties the whole cache.
+    """
+    with _LAST_SNAPSHOT_LOCK:
+        if ticker is None:
+            _LAST_SNAPSHOT_CACHE.clear()
+            return
+        for key in [k for k in _LAST_SNAPSHOT_CACHE if k[1] == ticker]:
+            del _LAST_SNAPSHOT_CACHE[key]
+
+
 def _normalize_snapshot_path(path: Optional[str]) -> Optional[str]:
     """Return a sanitized path suitable for storing in snapshot metadata.
 
@@ -246,7 +363,10 @@ def record_snapshot_metadata(
     """Registra um resumo de snapshot/ingest na tabela ``snapshots``.
 
     Armazena o JSON serializado no campo ``payload`` junto com ``ticker``
-    e ``created_at`` para consultas rápidas.
+    e ``created_at`` para consultas rápidas.  Os campos consultados a cada
+    ingestão (``checksum``/``sha256``, ``generated_at`` e ``rows``/
+    ``rows_count``) também são gravados em colunas indexadas, e a entrada do
+    ticker no cache de :func:`get_last_snapshot_meta` é invalidada.
     """
     # sanitize path early so that helpers downstream don't have to repeat
     # the logic.  callers may pass either an absolute path or a basename.
@@ -280,6 +400,7 @@ def record_snapshot_metadata(
     try:
         _upsert_snapshot_metadata(conn, metadata)
     finally:
+        clear_last_snapshot_cache(metadata.get("ticker") or metadata.get("symbol"))
         if close_conn:
             conn.close()
 
@@ -295,11 +416,14 @@ def _upsert_snapshot_metadata(
     )
     created_at = metadata.get("created_at") or now_utc_iso()
     ticker = metadata.get("ticker") or metadata.get("symbol") or None
+    rows = metadata.get("rows")
+    if rows is None:
+        rows = metadata.get("rows_count")
     sql = (
         "INSERT OR REPLACE INTO snapshots("
         "id, ticker, created_at, payload, snapshot_path, "
-        "rows, checksum, job_id, size_bytes"
-        ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        "rows, checksum, job_id, size_bytes, generated_at"
+        ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
     )
     cur.execute(
         sql,
@@ -309,10 +433,11 @@ def _upsert_snapshot_metadata(
             created_at,
             json.dumps(metadata, ensure_ascii=False),
             metadata.get("snapshot_path"),
-            metadata.get("rows"),
-            metadata.get("checksum"),
+            rows,
+            metadata.get("checksum") or metadata.get("sha256"),
             job_id,
             metadata.get("size_bytes"),
+            metadata.get("generated_at"),
         ),
     )
     conn.commit()
@@ -360,6 +485,7 @@ def list_snapshots(
     ticker: Optional[str] = None,
     *,
     archived: bool = False,
+    include_payload: bool = False,
     conn: Optional[sqlite3.Connection] = None,
     db_path: Optional[str] = None,
 ) -> list[dict[str, Any]]:
@@ -371,6 +497,9 @@ def list_snapshots(
         Ticker to filter (if None, returns all tickers).
     archived : bool
         Filter by archived status (default False).
+    include_payload : bool
+        Also return the serialized JSON ``payload`` column (default False;
+        every other column is returned).
     conn : Optional[sqlite3.Connection]
         Optional SQLite connection.
     db_path : Optional[str]
@@ -386,7 +515,7 @@ def list_snapshots(
         conn = db.connect(db_path=db_path)
         close_conn = True
     try:
-        return _query_snapshots(conn, archived, ticker)
+        return _query_snapshots(conn, archived, ticker, include_payload)
     finally:
         if close_conn:
             conn.close()
@@ -396,6 +525,7 @@ def _query_snapshots(
     _conn: sqlite3.Connection,
     archived: bool,
     ticker: Optional[str],
+    include_payload: bool = False,
 ) -> List[Dict[str, Any]]:
     """Perform the SQL query for :func:`list_snapshots`.
 
@@ -409,6 +539,8 @@ def _query_snapshots(
     ticker : Optional[str]
         If provided, restricts results to that ticker; ``None`` returns
         all tickers.
+    include_payload : bool
+        Whether to select the JSON ``payload`` column as well.
 
     Returns
     -------
@@ -417,15 +549,22 @@ def _query_snapshots(
         ordered by ``created_at`` descending.
     """
     cur = _conn.cursor()
+    columns = [
+        row[1]
+        for row in cur.execute("PRAGMA table_info(snapshots)").fetchall()
+        if include_payload or row[1] != "payload"
+    ]
+    projection = ", ".join(f'"{col}"' for col in columns) or "*"
     archived_int = 1 if archived else 0
     if ticker is None:
         cur.execute(
-            "SELECT * FROM snapshots WHERE archived = ? ORDER BY created_at DESC",
+            f"SELECT {projection} FROM snapshots WHERE archived = ? "
+            "ORDER BY created_at DESC",
             (archived_int,),
         )
     else:
         cur.execute(
-            "SELECT * FROM snapshots WHERE archived = ? AND ticker = ? "
+            f"SELECT {projection} FROM snapshots WHERE archived = ? AND ticker = ? "
             "ORDER BY created_at DESC",
             (archived_int, ticker),
         )
@@ -538,6 +677,54 @@ def delete_snapshots(
         cur.execute(f"DELETE FROM snapshots WHERE id IN ({placeholders})", snapshot_ids)
         conn.commit()
         return cur.rowcount
+    finally:
+        # the newest snapshot of any ticker may be gone
+        clear_last_snapshot_cache()
+        if close_conn:
+            conn.close()
+
+
+def rename_snapshot_paths(
+    renames: Sequence[tuple[str, str]],
+    *,
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> int:
+    """Point ``snapshot_path`` of moved snapshot files at their new location.
+
+    Parameters
+    ----------
+    renames : Sequence[tuple[str, str]]
+        ``(old_path, new_path)`` pairs.  Rows are matched on the raw and the
+        normalized (see :func:`normalize_snapshot_path`) form of
+        ``old_path``; the normalized ``new_path`` is stored.
+    conn : Optional[sqlite3.Connection]
+        Optional SQLite connection.
+    db_path : Optional[str]
+        Database path (used if conn not provided).
+
+    Returns
+    -------
+    int
+        Number of rows updated.
+    """
+    if not renames:
+        return 0
+    close_conn = False
+    if conn is None:
+        conn = db.connect(db_path=db_path)
+        close_conn = True
+    try:
+        updated = 0
+        for old, new in renames:
+            cur = conn.execute(
+                "UPDATE snapshots SET snapshot_path = ? "
+                "WHERE snapshot_path IN (?, ?)",
+                (_normalize_snapshot_path(new), old, _normalize_snapshot_path(old)),
+            )
+            updated += cur.rowcount
+        conn.commit()
+        return updated
     finally:
         if close_conn:
             conn.close()
@@ -10,11 +10,19 @@ from __future__ import annotations
 
 import abc
 import sqlite3
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional, Sequence
 
 import pandas as pd
 
 import src.db as _db
+from src.tickers import normalize_b3_ticker
+
+
+def _base_ticker(ticker: str) -> str:
+    try:
+        return normalize_b3_ticker(ticker)
+    except ValueError:
+        return ticker
 
 
 class DatabaseClient(abc.ABC):
@@ -28,6 +36,7 @@ class DatabaseClient(abc.ABC):
         end: Optional[str] = None,
         conn: Optional[sqlite3.Connection] = None,
         db_path: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read price rows for a ticker from the persistence layer.
 
@@ -47,6 +56,10 @@ class DatabaseClient(abc.ABC):
             connection to this path. If the adapter manages connections
             centrally, this parameter can be ignored — document such
             behavior in the concrete implementation.
+        columns:
+            Optional subset of schema columns to read; ``None`` reads all.
+            Implementations may return extra columns, so callers should
+            still select what they need.
 
         Returns
         -------
@@ -55,6 +68,45 @@ class DatabaseClient(abc.ABC):
             canonical schema. When no rows match, return an empty DataFrame.
         """
 
+    def read_prices_many(
+        self,
+        tickers: Iterable[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        *,
+        field: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None,
+        db_path: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Read price rows for several tickers as a long frame or wide panel.
+
+        Same contract as :func:`src.db.read_prices_many`.  This fallback
+        calls :meth:`read_prices` once per ticker so custom clients keep
+        working; :class:`DefaultDatabaseClient` overrides it with a single
+        query.
+        """
+        if field is not None:
+            columns = [field]
+        frames = []
+        for ticker in tickers:
+            df = self.read_prices(
+                ticker, start=start, end=end, conn=conn, db_path=db_path
+            )
+            if df.empty:
+                continue
+            df = df.reset_index().drop_duplicates("date")
+            df["ticker"] = _base_ticker(ticker)
+            frames.append(df if columns is None else df[["date", "ticker", *columns]])
+        if not frames:
+            return pd.DataFrame(columns=["date", "ticker", *(columns or [])])
+        long = pd.concat(frames, ignore_index=True)
+        if field is None:
+            return long
+        panel = long.pivot(index="date", columns="ticker", values=field)
+        panel.columns.name = None
+        return panel
+
     @abc.abstractmethod
     def write_returns(
         self,
@@ -127,6 +179,7 @@ class DefaultDatabaseClient(DatabaseClient):
         end: Optional[str] = None,
         conn: Optional[sqlite3.Connection] = None,
         db_path: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Adapter wrapper around `src.db.read_prices`.
 
@@ -141,6 +194,29 @@ class DefaultDatabaseClient(DatabaseClient):
             end=end,
             conn=conn,
             db_path=db_path,
+            columns=columns,
+        )
+
+    def read_prices_many(
+        self,
+        tickers: Iterable[str],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        *,
+        field: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None,
+        db_path: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Adapter wrapper around `src.db.read_prices_many` (one query)."""
+        return _db.read_prices_many(
+            tickers,
+            start=start,
+            end=end,
+            columns=columns,
+            field=field,
+            conn=conn,
+            db_path=db_path,
         )
 
     def write_returns(
@@ -2,20 +2,46 @@
 
 Provides deterministic write for snapshot DataFrames using existing
 serialization utilities so generated snapshots are stable across runs.
+
+Versioned snapshots are sharded per ticker as
+``<snapshot_dir>/<TICKER>/<timestamp>.csv``.  Each ticker directory holds a
+small ``index.json`` listing its retained snapshots newest first, so pruning
+and "latest snapshot" lookups read one manifest instead of scanning the
+directory; the cost of a write does not grow with the number of tickers.
+The historical flat layout (``<snapshot_dir>/<TICKER>-<timestamp>.csv``) is
+still pruned for compatibility -- a sharded write also prunes the ticker's
+flat files -- and can be converted with :func:`migrate_flat_snapshots`.
 """
 
 from __future__ import annotations
 
 import contextlib
+import glob
+import importlib.util
+import json
 import logging
 import os
 import re
+import shutil
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
 
-from src.utils.checksums import serialize_df_bytes, sha256_bytes
+from src.utils.blobstore import link_existing, store_file
+from src.utils.checksums import (
+    checksum_cached,
+    copy_sha256_content,
+    serialize_df_bytes,
+    sha256_bytes,
+    write_df_csv,
+)
+from src.utils.compression import (
+    COMPRESSION_SUFFIXES,
+    compression_for_path,
+    strip_compression_suffix,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -61,12 +87,226 @@ _SNAPSHOT_FILENAME_RE = re.compile(
     (?P<ticker>[A-Z0-9]+(?:\.[A-Z0-9]+)?)   # ticker maiúsculo com opcional ".SA"
     -(?P<timestamp>\d{8}T\d{6}Z?)          # timestamp yyyyMMddTHHMMSS, Z suffix allowed
     (?:-(?P<suffix>[^.]+))?                  # sufixo opcional antes da extensão
-    \.csv$                                   # extensão .csv
+    \.(?P<ext>csv|parquet|arrow)             # extensão do formato
+    (?P<compression>\.gz|\.zst)?$            # compressão opcional (CSV)
     """,
     re.VERBOSE,
 )
 
 
+# nome dos snapshots no layout por ticker: ``<TICKER>/<timestamp>.csv``
+_SHARDED_FILENAME_RE = re.compile(
+    r"^(?P<timestamp>\d{8}T\d{6}Z?)(?:-(?P<suffix>[^.]+))?"
+    r"\.(?P<ext>csv|parquet|arrow)(?P<compression>\.gz|\.zst)?$"
+)
+
+SNAPSHOT_INDEX_NAME = "index.json"
+
+# formato -> extensão; o formato de um snapshot é deduzido da extensão
+SNAPSHOT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def safe_ticker_dirname(ticker: str) -> str:
+    """Nome de diretório seguro para o shard de ``ticker``.
+
+    Apenas alfanuméricos, hífen e underscore são mantidos; todo o resto
+    (inclusive o ponto de ``.SA``) vira underscore, de modo que o nome não
+    consegue escapar do diretório de snapshots.
+    """
+    return re.sub(r"[^A-Za-z0-9_-]", "_", ticker) or "ticker"
+
+
+def sharded_snapshot_path(
+    snapshot_dir: Path,
+    ticker: str,
+    when: datetime,
+    suffix: str = "",
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+) -> Path:
+    """Caminho ``<snapshot_dir>/<TICKER>/<timestamp>[-suffix].<ext>[.gz|.zst]``.
+
+    ``fmt`` é uma das chaves de :data:`SNAPSHOT_EXTENSIONS`; ``compression``
+    (``gzip``/``zstd``) só se aplica a CSV.
+
+    Raises
+    ------
+    ValueError
+        Se o caminho resolvido escapar de ``snapshot_dir``.
+    """
+    snapshot_dir = Path(snapshot_dir).resolve()
+    name = when.strftime("%Y%m%dT%H%M%SZ") + (f"-{suffix}" if suffix else "")
+    filename = f"{name}{SNAPSHOT_EXTENSIONS[fmt]}"
+    if compression and fmt == "csv":
+        filename += COMPRESSION_SUFFIXES[compression]
+    out_path = (snapshot_dir / safe_ticker_dirname(ticker) / filename).resolve()
+    if not out_path.is_relative_to(snapshot_dir):
+        raise ValueError("sanitized filename escapes snapshot_dir")
+    return out_path
+
+
+def _sharded_sort_key(name: str) -> tuple[str, str]:
+    match = _SHARDED_FILENAME_RE.match(name)
+    ts = match.group("timestamp").rstrip("Z") if match else ""
+    return ts, name
+
+
+def _scan_shard(ticker_dir: Path) -> list[str]:
+    """Snapshots de um diretório de ticker, do mais recente ao mais antigo."""
+    if not ticker_dir.is_dir():
+        return []
+    names = [
+        entry.name
+        for entry in os.scandir(ticker_dir)
+        if entry.is_file() and _SHARDED_FILENAME_RE.match(entry.name)
+    ]
+    return sorted(names, key=_sharded_sort_key, reverse=True)
+
+
+def _read_shard_index(ticker_dir: Path) -> list[str] | None:
+    """Lê ``index.json``; ``None`` se ausente ou inválido."""
+    try:
+        with open(ticker_dir / SNAPSHOT_INDEX_NAME, encoding="utf-8") as fh:
+            names = json.load(fh).get("snapshots")
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+        return None
+    return names
+
+
+def _write_shard_index(ticker_dir: Path, names: list[str]) -> None:
+    """Grava ``index.json`` atomicamente (tmp + ``os.replace``)."""
+    index_path = ticker_dir / SNAPSHOT_INDEX_NAME
+    tmp = index_path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"snapshots": names}, fh)
+    os.replace(str(tmp), str(index_path))
+
+
+def _shard_names(ticker_dir: Path) -> list[str]:
+    """Snapshots retidos segundo o índice, reconstruído se necessário."""
+    names = _read_shard_index(ticker_dir)
+    if names is None:
+        names = _scan_shard(ticker_dir)
+    return names
+
+
+def latest_snapshot(snapshot_dir: Path, ticker: str) -> Optional[Path]:
+    """Caminho do snapshot mais recente de ``ticker`` ou ``None``.
+
+    Consulta apenas o ``index.json`` do shard do ticker (reconstruído a
+    partir do diretório do ticker quando ausente).
+    """
+    ticker_dir = Path(snapshot_dir) / safe_ticker_dirname(ticker)
+    for name in _shard_names(ticker_dir):
+        path = ticker_dir / name
+        if path.exists():
+            return path
+    return None
+
+
+def _flat_snapshots(snapshot_dir: Path, ticker_dirname: str) -> list[Path]:
+    """Snapshots no layout plano cujo ticker pertence ao shard ``ticker_dirname``."""
+    pattern = glob.escape(ticker_dirname).replace("_", "?") + "-*"
+    found = []
+    for path in snapshot_dir.glob(pattern):
+        match = _SNAPSHOT_FILENAME_RE.match(path.name)
+        if match and safe_ticker_dirname(match.group("ticker")) == ticker_dirname:
+            found.append(path)
+    return found
+
+
+def _snapshot_sort_key(path: Path) -> tuple[str, str]:
+    """Ordena snapshots dos dois layouts pelo timestamp do nome."""
+    match = _SHARDED_FILENAME_RE.match(path.name) or _SNAPSHOT_FILENAME_RE.match(
+        path.name
+    )
+    ts = match.group("timestamp").rstrip("Z") if match else ""
+    return ts, path.name
+
+
+def _prune_sharded(out_path: Path, keep_latest: int) -> None:
+    """Pruning no layout por ticker usando o ``index.json`` do shard.
+
+    Snapshots do mesmo ticker ainda no layout plano (ainda não migrados)
+    entram na mesma contagem, de modo que os ``keep_latest`` mais recentes
+    são mantidos somando os dois layouts.
+    """
+    ticker_dir = out_path.parent
+    sharded = [
+        ticker_dir / name for name in set(_shard_names(ticker_dir)) | {out_path.name}
+    ]
+    flat = _flat_snapshots(ticker_dir.parent, ticker_dir.name)
+    ranked = sorted(sharded + flat, key=_snapshot_sort_key, reverse=True)
+    for old_csv in ranked[keep_latest:]:
+        logger.debug("_prune_old_snapshots: removendo snapshot antiga %s", old_csv)
+        with contextlib.suppress(OSError):
+            old_csv.unlink()
+        with contextlib.suppress(OSError):
+            old_csv.with_name(f"{old_csv.name}.checksum").unlink()
+    _write_shard_index(
+        ticker_dir,
+        [path.name for path in ranked[:keep_latest] if path.parent == ticker_dir],
+    )
+
+
+def migrate_flat_snapshots(
+    snapshot_dir: Path, *, dry_run: bool = False
+) -> list[tuple[Path, Path]]:
+    """Move snapshots do layout plano para ``<TICKER>/<timestamp>.csv``.
+
+    Cada ``<TICKER>-<timestamp>[-suffix].csv`` no topo de ``snapshot_dir`` é
+    movido (com o ``.checksum`` correspondente) para o shard do ticker e o
+    ``index.json`` dos shards afetados é reconstruído.  Arquivos fora do
+    padrão, ou cujo destino já existe, são mantidos onde estão.  Nenhum
+    snapshot é removido: o pruning acontece na próxima escrita do ticker.
+
+    Parameters
+    ----------
+    snapshot_dir : Path
+        Diretório de snapshots no layout plano.
+    dry_run : bool
+        Apenas calcula os movimentos, sem alterar o disco.
+
+    Returns
+    -------
+    list[tuple[Path, Path]]
+        Pares ``(origem, destino)`` dos snapshots movidos (ou a mover).
+    """
+    snapshot_dir = Path(snapshot_dir)
+    moves: list[tuple[Path, Path]] = []
+    touched: set[Path] = set()
+    for path in sorted(snapshot_dir.iterdir()):
+        match = _SNAPSHOT_FILENAME_RE.match(path.name)
+        if not match or not path.is_file():
+            continue
+        name = match.group("timestamp")
+        if match.group("suffix"):
+            name += f"-{match.group('suffix')}"
+        name += f".{match.group('ext')}{match.group('compression') or ''}"
+        target = snapshot_dir / safe_ticker_dirname(match.group("ticker")) / name
+        if target.exists():
+            logger.warning(
+                "migrate_flat_snapshots: destino %s já existe; mantendo %s",
+                target,
+                path.name,
+            )
+            continue
+        moves.append((path, target))
+        if dry_run:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(str(path), str(target))
+        checksum = path.with_name(f"{path.name}.checksum")
+        if checksum.exists():
+            os.replace(str(checksum), str(target.with_name(f"{target.name}.checksum")))
+        touched.add(target.parent)
+    for ticker_dir in touched:
+        _write_shard_index(ticker_dir, _scan_shard(ticker_dir))
+    return moves
+
+
 def _parse_snapshot_timestamp(path: Path) -> tuple[datetime | None, float]:
     """Tenta extrair o timestamp a partir do nome do arquivo.
 
@@ -97,6 +337,12 @@ def _parse_snapshot_timestamp(path: Path) -> tuple[datetime | None, float]:
 def _prune_old_snapshots(out_path: Path) -> None:
     """Remove snapshots antigos mantendo apenas os N mais recentes.
 
+    No layout por ticker (``<TICKER>/<timestamp>.csv``) a lista de snapshots
+    retidos vem do ``index.json`` do shard, sem varrer o diretório do
+    ticker; os arquivos planos legados do mesmo ticker contam para o limite
+    e também são removidos.  No layout plano legado apenas os arquivos com
+    o prefixo do ticker são examinados.
+
     Apenas arquivos que seguem o padrão de nome esperado são considerados
     snapshots. Arquivos CSV fora do padrão são ignorados e nunca removidos por
     este processo.
@@ -108,6 +354,10 @@ def _prune_old_snapshots(out_path: Path) -> None:
     """
     keep_latest = _snapshot_keep_latest()
 
+    if _SHARDED_FILENAME_RE.match(out_path.name):
+        _prune_sharded(out_path, keep_latest)
+        return
+
     # Preferir extrair o ticker do próprio out_path usando a regex canônica.
     # Se o nome não casar com o padrão, caímos para o comportamento baseado
     # em prefixo (compatibilidade), mas sempre filtramos por ticker quando
@@ -116,10 +366,17 @@ def _prune_old_snapshots(out_path: Path) -> None:
     target_match = _SNAPSHOT_FILENAME_RE.match(out_path.name)
     if target_match:
         target_ticker = target_match.group("ticker")
-        # procurar todos os CSVs que batem o padrão geral e então filtrar
-        # apenas aqueles cujo ticker extraído coincide exatamente.
+        # procurar apenas os CSVs com o prefixo do ticker e então filtrar
+        # aqueles cujo ticker extraído coincide exatamente.
         candidate_files = []
-        for path in out_path.parent.glob("*-*.csv"):
+        prefix = glob.escape(target_ticker)
+        paths = [
+            path
+            for ext in SNAPSHOT_EXTENSIONS.values()
+            for comp in ("", *COMPRESSION_SUFFIXES.values())
+            for path in out_path.parent.glob(f"{prefix}-*{ext}{comp}")
+        ]
+        for path in paths:
             m = _SNAPSHOT_FILENAME_RE.match(path.name)
             if not m:
                 # log non-matching names so we can detect stale files
@@ -169,30 +426,197 @@ def _prune_old_snapshots(out_path: Path) -> None:
             old_checksum.unlink()
 
 
-def write_snapshot(df, out_path: Path, *, set_permissions: bool = False) -> str:
-    """Write a deterministic CSV snapshot and return its SHA256 hex digest.
+def snapshot_format(path: Path) -> str:
+    """Formato de um arquivo de snapshot, deduzido da extensão.
 
-    The function serializes the DataFrame using the project's canonical
-    `serialize_df_bytes` helper (which sorts columns and index) and writes
-    the bytes atomically. It also writes a companion `.checksum` file.
+    O sufixo de compressão (``.gz``/``.zst``) é ignorado.  Extensões
+    desconhecidas são tratadas como CSV (compatibilidade com snapshots
+    gerados antes dos formatos colunares).
     """
-    out_path = Path(out_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = strip_compression_suffix(path).suffix.lower()
+    for fmt, ext in SNAPSHOT_EXTENSIONS.items():
+        if suffix == ext:
+            return fmt
+    return "csv"
+
+
+def _require_pyarrow(fmt: str) -> None:
+    if importlib.util.find_spec("pyarrow") is None:
+        raise ImportError(
+            f"snapshots no formato {fmt!r} requerem o pacote opcional 'pyarrow' "
+            "(instale com `poetry install -E columnar`)"
+        )
 
-    data = serialize_df_bytes(
-        df,
-        index=False,
-        date_format="%Y-%m-%d",
-        float_format="%.10g",
-        na_rep="",
-    )
 
-    tmp = out_path.with_suffix(f"{out_path.suffix}.tmp")
-    with open(tmp, "wb") as fh:
-        fh.write(data)
-    os.replace(str(tmp), str(out_path))
+def _canonical_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Linhas ordenadas pelo índice, colunas em ordem alfabética e sem índice.
+
+    É o mesmo quadro que ``serialize_df_bytes`` grava em CSV, de modo que o
+    arquivo colunar e o checksum lógico descrevem exatamente os mesmos dados.
+    """
+    with contextlib.suppress(TypeError):
+        df = df.sort_index()
+    try:
+        columns = sorted(df.columns)
+    except TypeError:
+        columns = list(df.columns)
+    return df.reindex(columns=columns).reset_index(drop=True)
+
+
+def read_snapshot(path: Path) -> pd.DataFrame:
+    """Lê um snapshot em qualquer formato suportado.
+
+    CSV passa por ``pd.read_csv`` (tipos inferidos), que descomprime
+    ``.gz``/``.zst`` em fluxo; Parquet e Arrow IPC preservam os tipos
+    gravados.
+    """
+    fmt = snapshot_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path)
+    _require_pyarrow(fmt)
+    if fmt == "parquet":
+        return pd.read_parquet(path, engine="pyarrow")
+    return pd.read_feather(path)
+
+
+def snapshot_file_checksum(path: Path) -> str:
+    """Checksum lógico do snapshot gravado em ``path``.
+
+    Para CSV o arquivo já é a representação canônica, então o checksum é o
+    SHA-256 dos bytes descomprimidos (calculado em fluxo, sem carregar o
+    arquivo).  Para formatos colunares o arquivo é lido e o
+    checksum é recalculado com :func:`snapshot_checksum`, o que torna o valor
+    comparável entre formatos.  O resultado passa pelo cache persistente de
+    :func:`src.utils.checksums.checksum_cached`: um arquivo inalterado não é
+    relido.
+    """
+    if snapshot_format(path) == "csv":
+        return checksum_cached(path)
+    return checksum_cached(path, "snapshot", _decoded_checksum)
+
+
+def _decoded_checksum(path: Path) -> str:
+    return snapshot_checksum(read_snapshot(path))
+
+
+def copy_snapshot_file(src: Path, dst: Path) -> str:
+    """Copia ``src`` para ``dst`` e devolve o checksum lógico da cópia.
+
+    Para CSV (comprimido ou não) o hash é calculado durante a própria cópia,
+    numa única leitura do arquivo; formatos colunares precisam ser lidos
+    para o checksum lógico, então a cópia é relida.  Permissões e datas são
+    preservadas como em ``shutil.copy2``.
+    """
+    if snapshot_format(src) == "csv":
+        checksum = copy_sha256_content(src, dst)
+    else:
+        shutil.copyfile(src, dst)
+        checksum = snapshot_file_checksum(dst)
+    shutil.copystat(src, dst)
+    return checksum
+
+
+def _encoding_suffix(fmt: str, compression: Optional[str]) -> str:
+    """Sufixo que identifica a codificação do arquivo (``.csv.gz`` etc.)."""
+    suffix = SNAPSHOT_EXTENSIONS[fmt]
+    if compression:
+        suffix += COMPRESSION_SUFFIXES[compression]
+    return suffix
+
+
+def snapshot_encoding_suffix(path: Path) -> str:
+    """Sufixo de codificação de um snapshot existente (chave no blob store)."""
+    return _encoding_suffix(snapshot_format(path), compression_for_path(path))
+
+
+def _blob_root(out_path: Path) -> Path:
+    """Raiz do ``objects/`` de um snapshot: o diretório de snapshots.
+
+    No layout por ticker é o pai do shard; fora dele, o próprio diretório do
+    arquivo.
+    """
+    if _SHARDED_FILENAME_RE.match(out_path.name):
+        return out_path.parent.parent
+    return out_path.parent
+
+
+def _write_snapshot_file(
+    df, tmp: Path, fmt: str, compression: Optional[str], checksum: Optional[str]
+) -> str:
+    """Grava ``df`` em ``tmp`` no formato pedido e devolve o checksum lógico."""
+    if fmt == "csv":
+        return write_df_csv(
+            df,
+            tmp,
+            compression=compression,
+            index=False,
+            date_format="%Y-%m-%d",
+            float_format="%.10g",
+            na_rep="",
+        )
+    if compression is not None:
+        raise ValueError(f"compressão externa só é suportada para CSV: {tmp}")
+    _require_pyarrow(fmt)
+    frame = _canonical_frame(df)
+    if fmt == "parquet":
+        frame.to_parquet(tmp, index=False, engine="pyarrow")
+    else:
+        frame.to_feather(tmp)
+    return checksum if checksum is not None else snapshot_checksum(frame)
+
+
+def write_snapshot(
+    df,
+    out_path: Path,
+    *,
+    set_permissions: bool = False,
+    checksum: Optional[str] = None,
+) -> str:
+    """Write a deterministic snapshot and return its logical SHA256 digest.
+
+    The format follows the extension of ``out_path`` (see
+    :data:`SNAPSHOT_EXTENSIONS`).  CSV snapshots are the canonical
+    serialization produced by `serialize_df_bytes` (which sorts columns and
+    drops the index), so their checksum is the digest of the file bytes; a
+    ``.gz``/``.zst`` suffix compresses the file and the checksum, computed
+    while streaming, still covers the uncompressed CSV.
+    Parquet and Arrow IPC snapshots store the same canonical frame with its
+    column types; their checksum is still :func:`snapshot_checksum` of the
+    frame, so the value is identical to the CSV one for the same data.  The
+    price of that format independence is that a columnar write still formats
+    the canonical CSV once, only to hash it, unless ``checksum`` is given.
+
+    The file is written atomically and a companion `.checksum` file holds the
+    digest.  Callers that already computed :func:`snapshot_checksum` for
+    ``df`` may pass it as ``checksum`` to skip the CSV formatting a columnar
+    write would otherwise need just for hashing.
+
+    With ``ARTIFACT_DEDUP`` enabled the content lives in the blob store under
+    the snapshot directory (:mod:`src.utils.blobstore`) and ``out_path`` is a
+    hardlink to it; when ``checksum`` is given and the blob already exists
+    nothing is written at all.
+    """
+    from src.ingest.config import get_artifact_dedup
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    fmt = snapshot_format(out_path)
+    compression = compression_for_path(out_path)
+    suffix = _encoding_suffix(fmt, compression)
+    blob_root = _blob_root(out_path) if get_artifact_dedup() else None
+
+    if not (
+        blob_root is not None
+        and checksum is not None
+        and link_existing(blob_root, checksum, out_path, suffix)
+    ):
+        tmp = out_path.with_suffix(f"{out_path.suffix}.tmp")
+        checksum = _write_snapshot_file(df, tmp, fmt, compression, checksum)
+        if blob_root is not None:
+            store_file(blob_root, tmp, checksum, out_path, suffix)
+        else:
+            os.replace(str(tmp), str(out_path))
 
-    checksum = sha256_bytes(data)
     checksum_path = out_path.with_name(f"{out_path.name}.checksum")
     checksum_path.write_text(checksum)
     _prune_old_snapshots(out_path)
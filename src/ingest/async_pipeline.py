@@ -0,0 +1,136 @@
+"""Concurrent ingest of many tickers on top of :func:`pipeline.ingest`.
+
+Fetching is I/O bound and dominated by provider latency, so running the
+tickers of a large batch one after the other wastes most of the wall time.
+:func:`ingest_many_async` fetches up to ``concurrency`` tickers at once on
+the event loop via :meth:`Adapter.fetch_async` (retries back off with
+``asyncio.sleep``; sync-only adapters run in a worker thread) and hands each
+DataFrame to :func:`src.ingest.pipeline.ingest` in an executor, so mapping,
+raw CSV persistence, locking and DB writes keep their existing semantics and
+never block the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List
+
+import pandas as pd
+
+from src.ingest.config import get_ingest_concurrency, get_skip_up_to_date
+from src.ingest.pipeline import ingest, price_freshness
+
+logger = logging.getLogger(__name__)
+
+
+def _replay(df: pd.DataFrame | None, exc: BaseException | None):
+    """Return a ``fetcher`` for :func:`ingest` replaying an async fetch."""
+
+    def fetcher() -> pd.DataFrame:
+        if exc is not None:
+            raise exc
+        return df
+
+    return fetcher
+
+
+async def ingest_many_async(
+    tickers: Iterable[str],
+    source: str = "yfinance",
+    *,
+    concurrency: int | None = None,
+    dry_run: bool = False,
+    force_refresh: bool = False,
+    executor: Executor | None = None,
+) -> List[Dict[str, Any]]:
+    """Ingest ``tickers`` with at most ``concurrency`` fetches in flight.
+
+    Parameters
+    ----------
+    tickers:
+        Tickers to ingest; duplicates are processed once each time they
+        appear, exactly like calling :func:`ingest` in a loop.
+    source:
+        Adapter name resolved through :func:`src.adapters.factory.get_adapter`.
+    concurrency:
+        Upper bound on simultaneous provider fetches.  Defaults to
+        :func:`src.ingest.config.get_ingest_concurrency`
+        (``INGEST_CONCURRENCY``).  Provider-wide pacing is still enforced by
+        the adapter rate limiter and circuit breaker.
+    dry_run, force_refresh:
+        Forwarded to :func:`ingest`.
+    executor:
+        Executor for the CPU/DB-bound part of each ticker.  When omitted a
+        private :class:`ThreadPoolExecutor` sized to ``concurrency`` is
+        created and shut down before returning.
+
+    Returns
+    -------
+    list of dict
+        One :func:`ingest` result per ticker, in input order.  A ticker whose
+        fetch fails yields the same error result a synchronous run would.
+    """
+    from src.adapters.factory import get_adapter
+
+    tickers = list(tickers)
+    limit = get_ingest_concurrency() if concurrency is None else concurrency
+    if limit < 1:
+        raise ValueError(f"concurrency must be >= 1, got {limit}")
+
+    adapter = get_adapter(source)
+    semaphore = asyncio.Semaphore(limit)
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    check_freshness = not dry_run and not force_refresh and get_skip_up_to_date()
+    pool = executor or ThreadPoolExecutor(
+        max_workers=limit, thread_name_prefix="ingest"
+    )
+
+    async def _one(ticker: str) -> Dict[str, Any]:
+        fetcher = None
+        up_to_date = False
+        if check_freshness:
+            freshness = await loop.run_in_executor(pool, price_freshness, ticker)
+            up_to_date = freshness["up_to_date"]
+        # up-to-date tickers go straight to ingest, which skips them without
+        # a fetch; only the others take a slot of the fetch semaphore
+        if not up_to_date:
+            async with semaphore:
+                df: pd.DataFrame | None = None
+                error: BaseException | None = None
+                try:
+                    df = await adapter.fetch_async(ticker)
+                except Exception as exc:  # surfaced through ingest's error path
+                    error = exc
+            fetcher = _replay(df, error)
+        call = functools.partial(
+            ingest,
+            ticker,
+            source,
+            dry_run=dry_run,
+            force_refresh=force_refresh,
+            fetcher=fetcher,
+        )
+        return await loop.run_in_executor(pool, call)
+
+    logger.info(
+        "ingest_many_async start",
+        extra={"tickers": len(tickers), "source": source, "concurrency": limit},
+    )
+    try:
+        return list(await asyncio.gather(*(_one(t) for t in tickers)))
+    finally:
+        if own_executor:
+            pool.shutdown(wait=True)
+
+
+def ingest_many(
+    tickers: Iterable[str],
+    source: str = "yfinance",
+    **kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """Synchronous entry point running :func:`ingest_many_async` to completion."""
+    return asyncio.run(ingest_many_async(tickers, source, **kwargs))
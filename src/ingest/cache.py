@@ -1,14 +1,19 @@
-"""Simple filesystem cache for snapshot ingestion.
+"""Keyed filesystem cache for snapshot ingestion.
 
-This module provides helpers to load/store a JSON-backed cache that records
-which snapshot files have already been processed, along with their checksum
-and the timestamp of the last ingestion.  The cache is intentionally very
-lightweight: it assumes a single process is writing and uses atomic `os.replace`
-when updating the file.
+This module records which snapshot files have already been processed, along
+with their checksum and the timestamp of the last ingestion.  Entries live in
+a small SQLite file (:class:`SnapshotCache`) so a lookup or an update touches
+a single key: concurrent writers no longer rewrite each other's entries, and
+the TTL check runs inside the query.
 
 Keys are absolute paths to snapshot files (``str(Path.resolve())``) and values
 are dictionaries containing ``sha256`` and ``processed_at`` (UTC ISO string).
 
+The configured cache path keeps its historical ``.json`` name; the store is
+the sibling ``.db`` file (see :func:`store_path`).  An existing JSON cache is
+imported the first time the store is opened.  :func:`load_cache` and
+:func:`save_cache` remain as whole-dict compatibility wrappers over the store.
+
 The TTL logic lives in the orchestration layer (`src.ingest.ingest_snapshot`
 which uses these utilities).
 """
@@ -17,16 +22,221 @@ from __future__ import annotations
 
 import json
 import logging
-import os
+import sqlite3
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
 
 logger = logging.getLogger(__name__)
 
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS snapshot_cache ("
+    "key TEXT PRIMARY KEY, "
+    "sha256 TEXT, "
+    "processed_epoch REAL, "
+    "value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS snapshot_cache_meta (key TEXT PRIMARY KEY, value TEXT)",
+)
 
-def load_cache(path: Path) -> Dict[str, Any]:
-    """Return the cache dictionary stored at ``path`` or an empty dict.
+
+def store_path(path: Path) -> Path:
+    """Return the SQLite store used for the cache configured at ``path``.
+
+    ``.json`` paths (the historical format) map to the sibling ``.db`` file;
+    any other path is used as is.
+    """
+    path = Path(path)
+    return path.with_suffix(".db") if path.suffix == ".json" else path
+
+
+def _processed_epoch(entry: Any) -> Optional[float]:
+    """Parse ``entry["processed_at"]`` like :func:`entry_is_fresh` does."""
+    if not isinstance(entry, dict):
+        return None
+    ts_str = entry.get("processed_at")
+    if not isinstance(ts_str, str):
+        return None
+    try:
+        ts = datetime.fromisoformat(ts_str)
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _row(key: str, entry: Any) -> tuple[str, Optional[str], Optional[float], str]:
+    """Serialise ``entry`` into a ``snapshot_cache`` row (may raise)."""
+    sha = entry.get("sha256") if isinstance(entry, dict) else None
+    return (
+        key,
+        sha if isinstance(sha, str) else None,
+        _processed_epoch(entry),
+        json.dumps(entry, ensure_ascii=False),
+    )
+
+
+class SnapshotCache:
+    """Per-key snapshot cache stored in a SQLite file.
+
+    Every method is a single statement or a short ``BEGIN IMMEDIATE``
+    transaction, so independent processes can share the file without losing
+    each other's updates.  Use as a context manager or call :meth:`close`.
+
+    Parameters
+    ----------
+    path :
+        Configured cache path; resolved through :func:`store_path`.  A JSON
+        cache found at ``path`` is imported on first open.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = store_path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # autocommit: transactions are opened explicitly where needed
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+        try:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            legacy = Path(path)
+            if legacy != self.path:
+                self._import_json(legacy)
+        except BaseException:
+            self._conn.close()
+            raise
+
+    def __enter__(self) -> "SnapshotCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _import_json(self, legacy: Path) -> None:
+        """Import a legacy JSON cache once, without overwriting newer keys."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = self._conn.execute(
+                "SELECT 1 FROM snapshot_cache_meta WHERE key = 'json_imported'"
+            ).fetchone()
+            if done is None and legacy.exists():
+                rows = []
+                for key, entry in _read_json(legacy).items():
+                    try:
+                        rows.append(_row(str(key), entry))
+                    except (TypeError, ValueError):
+                        logger.warning("skipping unserialisable cache entry %s", key)
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO snapshot_cache VALUES (?, ?, ?, ?)", rows
+                )
+                logger.info(
+                    "imported %d entries from JSON snapshot cache %s into %s",
+                    len(rows),
+                    legacy,
+                    self.path,
+                )
+            if done is None:
+                self._conn.execute(
+                    "INSERT INTO snapshot_cache_meta VALUES ('json_imported', ?)",
+                    (str(legacy),),
+                )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry stored under ``key`` or ``None``."""
+        row = self._conn.execute(
+            "SELECT value FROM snapshot_cache WHERE key = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Insert or replace the entry stored under ``key``."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO snapshot_cache VALUES (?, ?, ?, ?)",
+            _row(key, entry),
+        )
+
+    def compare_and_set(
+        self, key: str, expected_sha256: Optional[str], entry: Dict[str, Any]
+    ) -> bool:
+        """Store ``entry`` only if the current ``sha256`` of ``key`` matches.
+
+        ``expected_sha256=None`` means "only if ``key`` is absent".  Returns
+        ``True`` when the entry was written.
+        """
+        row = _row(key, entry)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self._conn.execute(
+                "SELECT sha256 FROM snapshot_cache WHERE key = ?", (key,)
+            ).fetchone()
+            matches = (
+                current is None
+                if expected_sha256 is None
+                else current is not None and current[0] == expected_sha256
+            )
+            if matches:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO snapshot_cache VALUES (?, ?, ?, ?)", row
+                )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return matches
+
+    def is_fresh(self, key: str, sha256: str, ttl: Optional[float]) -> bool:
+        """Return ``True`` if ``key`` holds ``sha256`` processed within ``ttl``.
+
+        Same semantics as :func:`entry_is_fresh` (``ttl=None`` never
+        expires; a missing or malformed ``processed_at`` is stale), evaluated
+        by the lookup query itself.
+        """
+        if ttl is None:
+            sql = "SELECT 1 FROM snapshot_cache WHERE key = ? AND sha256 = ?"
+            params: tuple[Any, ...] = (key, sha256)
+        else:
+            sql = (
+                "SELECT 1 FROM snapshot_cache WHERE key = ? AND sha256 = ? "
+                "AND processed_epoch > ?"
+            )
+            params = (key, sha256, time.time() - ttl)
+        return self._conn.execute(sql, params).fetchone() is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return every entry as a ``{key: entry}`` dictionary."""
+        rows = self._conn.execute("SELECT key, value FROM snapshot_cache")
+        return {key: json.loads(value) for key, value in rows}
+
+    def replace_all(self, cache: Dict[str, Any]) -> None:
+        """Make the store hold exactly ``cache`` (one transaction)."""
+        rows = [_row(str(key), entry) for key, entry in cache.items()]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("DELETE FROM snapshot_cache")
+            self._conn.executemany(
+                "INSERT INTO snapshot_cache VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Return the dictionary stored in the JSON cache ``path`` or ``{}``.
 
     If the file does not exist or is invalid JSON the function returns an
     empty dictionary and logs a warning.
@@ -53,35 +263,46 @@ def load_cache(path: Path) -> Dict[str, Any]:
         return {}
 
 
+def load_cache(path: Path) -> Dict[str, Any]:
+    """Return every entry of the cache configured at ``path``.
+
+    Compatibility wrapper over :class:`SnapshotCache`; a legacy JSON file at
+    ``path`` is imported first.  Returns an empty dict (and logs a warning)
+    when the store cannot be read.
+    """
+    try:
+        with SnapshotCache(path) as store:
+            return store.to_dict()
+    except (sqlite3.Error, OSError, ValueError):
+        logger.warning(
+            "failed to read snapshot cache %s; treating as empty cache",
+            path,
+            exc_info=True,
+        )
+        return {}
+
+
 def save_cache(path: Path, cache: Dict[str, Any]) -> None:
-    """Atomically write ``cache`` to ``path``.
+    """Replace the contents of the cache configured at ``path`` with ``cache``.
 
-    The parent directory is created if necessary.  A temporary file is written
-    and ``os.replace`` is used for atomicity.
+    Compatibility wrapper over :meth:`SnapshotCache.replace_all`.  Callers
+    updating a single entry should use :meth:`SnapshotCache.put` instead,
+    which does not race with other writers.
 
-    Any failure during serialization or replacement is logged and the temporary
-    file is cleaned up to avoid leaving stale ``.tmp`` files behind.
+    Any failure during serialization or writing is logged and the existing
+    cache is left unchanged.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(f"{path.suffix}.tmp")
     try:
-        with open(tmp, "w", encoding="utf-8") as fh:
-            json.dump(cache, fh, ensure_ascii=False)
-        os.replace(str(tmp), str(path))
-    except (TypeError, ValueError, OSError):
+        # serialise before touching the store so bad values never open it
+        json.dumps(cache, ensure_ascii=False)
+        with SnapshotCache(path) as store:
+            store.replace_all(cache)
+    except (TypeError, ValueError, OSError, sqlite3.Error):
         logger.warning(
             "failed to write snapshot cache %s; leaving existing cache file unchanged",
             path,
             exc_info=True,
         )
-        # Best-effort cleanup of partially written temp file
-        try:
-            if tmp.exists():
-                tmp.unlink()
-        except OSError:
-            logger.debug(
-                "failed to remove temporary snapshot cache file %s", tmp, exc_info=True
-            )
 
 
 def entry_is_fresh(entry: Dict[str, Any], ttl: Optional[float]) -> bool:
@@ -111,4 +332,10 @@ def entry_is_fresh(entry: Dict[str, Any], ttl: Optional[float]) -> bool:
     return age.total_seconds() < ttl
 
 
-__all__ = ["load_cache", "save_cache", "entry_is_fresh"]
+__all__ = [
+    "SnapshotCache",
+    "entry_is_fresh",
+    "load_cache",
+    "save_cache",
+    "store_path",
+]
@@ -12,11 +12,28 @@ Currently it provides helpers for:
 * snapshot retention (`SNAPSHOTS_KEEP_LATEST`) which is used by both the
   snapshot ingestion layer and the lower-level exporter helpers in
   :mod:`src.etl.snapshot`.
+* async ingest concurrency (`INGEST_CONCURRENCY`) used by
+  :func:`src.ingest.async_pipeline.ingest_many_async`.
+* skipping tickers already up to date (`INGEST_SKIP_UP_TO_DATE`).
+* the on-disk snapshot format (`SNAPSHOT_FORMAT`) used by
+  :mod:`src.etl.snapshot`.
+* optional gzip/zstd compression of CSV snapshots (`SNAPSHOT_COMPRESSION`)
+  and raw provider files (`RAW_COMPRESSION`).
+* the root directory of the raw provider archive (`RAW_ROOT`).
+* content-addressed deduplication of stored artifacts (`ARTIFACT_DEDUP`).
+* the number of files copied concurrently when archiving snapshots
+  (`ARCHIVE_WORKERS`) and the default archive directory
+  (`SNAPSHOT_ARCHIVE_DIR`).
 """
 
 from __future__ import annotations
 
 import os
+from pathlib import Path
+from typing import Optional
+
+from src.utils.compression import COMPRESSIONS
+from src.utils.conversions import as_bool
 
 
 def get_ingest_lock_settings() -> tuple[float, str, bool]:
@@ -78,3 +95,148 @@ def get_snapshot_keep_latest() -> int:
     except ValueError:
         return 1
     return max(1, value)
+
+
+def get_ingest_concurrency() -> int:
+    """Return the number of tickers fetched concurrently by async ingest.
+
+    Read from ``INGEST_CONCURRENCY`` (default ``8``).  Like
+    :func:`get_ingest_lock_settings` this raises ``ValueError`` for values
+    that are not positive integers, since silently falling back would hide a
+    misconfigured batch job that hammers (or starves) the provider.
+    """
+
+    raw = os.environ.get("INGEST_CONCURRENCY", "8").strip()
+    try:
+        value = int(raw)
+    except ValueError as err:
+        raise ValueError(
+            f"Invalid INGEST_CONCURRENCY value {raw!r}: must be an integer"
+        ) from err
+    if value < 1:
+        raise ValueError(f"Invalid INGEST_CONCURRENCY value {raw!r}: must be >= 1")
+    return value
+
+
+def get_skip_up_to_date() -> bool:
+    """Return whether ingest skips tickers whose data is already current.
+
+    Read from ``INGEST_SKIP_UP_TO_DATE`` (default ``true``).  When enabled,
+    :func:`src.ingest.pipeline.ingest` makes no provider request for a
+    ticker whose stored prices already reach the last closed B3 session
+    (see :func:`src.calendar.last_closed_session`).
+    """
+
+    return as_bool(os.environ.get("INGEST_SKIP_UP_TO_DATE", "true"))
+
+
+SNAPSHOT_FORMATS = ("csv", "parquet", "arrow")
+
+
+def get_snapshot_format() -> str:
+    """Return the file format used for new snapshots.
+
+    Read from ``SNAPSHOT_FORMAT`` (default ``csv``); one of
+    :data:`SNAPSHOT_FORMATS`, case-insensitive.  ``parquet`` and ``arrow``
+    (Arrow IPC/Feather) require the optional ``pyarrow`` dependency.  Like
+    :func:`get_ingest_concurrency` an unknown value raises ``ValueError``
+    instead of silently writing CSV.
+    """
+
+    raw = os.environ.get("SNAPSHOT_FORMAT", "csv")
+    value = raw.strip().lower()
+    if value not in SNAPSHOT_FORMATS:
+        raise ValueError(
+            f"Invalid SNAPSHOT_FORMAT value {raw!r}: must be one of "
+            f"{list(SNAPSHOT_FORMATS)}"
+        )
+    return value
+
+
+def _get_compression(var: str) -> Optional[str]:
+    raw = os.environ.get(var, "none")
+    value = raw.strip().lower() or "none"
+    if value not in COMPRESSIONS:
+        raise ValueError(
+            f"Invalid {var} value {raw!r}: must be one of {list(COMPRESSIONS)}"
+        )
+    return None if value == "none" else value
+
+
+def get_snapshot_compression() -> Optional[str]:
+    """Return the compression applied to new CSV snapshots, or ``None``.
+
+    Read from ``SNAPSHOT_COMPRESSION``: ``none`` (default), ``gzip`` or
+    ``zstd`` (requires the optional ``zstandard`` dependency).  Parquet and
+    Arrow snapshots use their own internal codecs and ignore this setting.
+    An unknown value raises ``ValueError``.
+    """
+
+    return _get_compression("SNAPSHOT_COMPRESSION")
+
+
+def get_raw_compression() -> Optional[str]:
+    """Return the compression applied to raw provider CSVs, or ``None``.
+
+    Read from ``RAW_COMPRESSION`` with the same values as
+    :func:`get_snapshot_compression`.
+    """
+
+    return _get_compression("RAW_COMPRESSION")
+
+
+def get_raw_root() -> Path:
+    """Return the root directory of the raw provider archive.
+
+    Read from ``RAW_ROOT`` (unset or blank means ``raw``).  It is where
+    :func:`src.ingest.raw_storage.save_raw_csv` writes, where the replay
+    adapter reads and one of the roots ``snapshots gc`` scans.
+    """
+
+    raw = os.environ.get("RAW_ROOT", "").strip()
+    return Path(raw) if raw else Path("raw")
+
+
+def get_artifact_dedup() -> bool:
+    """Return whether raw files, snapshots and archives are deduplicated.
+
+    Read from ``ARTIFACT_DEDUP`` (default ``false``).  When enabled the
+    files are stored once in a content-addressed ``objects/`` directory (see
+    :mod:`src.utils.blobstore`) and each timestamped name is a hardlink to
+    its blob.
+    """
+
+    return as_bool(os.environ.get("ARTIFACT_DEDUP", "false"))
+
+
+def get_archive_workers() -> int:
+    """Return the number of snapshot files archived concurrently.
+
+    Read from ``ARCHIVE_WORKERS`` (default ``4``) and validated like
+    :func:`get_ingest_concurrency`.  Archiving is I/O bound, so a few
+    threads overlap disk reads and writes; a value of ``1`` copies the
+    files sequentially.
+    """
+
+    raw = os.environ.get("ARCHIVE_WORKERS", "4").strip()
+    try:
+        value = int(raw)
+    except ValueError as err:
+        raise ValueError(
+            f"Invalid ARCHIVE_WORKERS value {raw!r}: must be an integer"
+        ) from err
+    if value < 1:
+        raise ValueError(f"Invalid ARCHIVE_WORKERS value {raw!r}: must be >= 1")
+    return value
+
+
+def get_archive_dir() -> Optional[Path]:
+    """Return the default snapshot archive directory, if configured.
+
+    Read from ``SNAPSHOT_ARCHIVE_DIR`` (unset or blank means ``None``).  It
+    is the default ``--archive-dir`` of ``snapshots purge`` and one of the
+    roots ``snapshots gc`` scans for unreferenced blobs.
+    """
+
+    raw = os.environ.get("SNAPSHOT_ARCHIVE_DIR", "").strip()
+    return Path(raw) if raw else None
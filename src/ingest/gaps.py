@@ -0,0 +1,254 @@
+"""Detection and targeted backfill of missing B3 sessions in ``prices``.
+
+A run that fails halfway or a provider that silently skips days leaves holes
+in the stored history.  :func:`find_gaps` locates them for every stored
+ticker at once: one ordered read of ``(ticker, date)`` (the primary key) is
+mapped onto the session array of :mod:`src.calendar` with
+``numpy.searchsorted``, and a jump of more than one session position between
+consecutive stored rows of a ticker is a gap.  Because consecutive missing
+sessions are already collapsed into one run, each gap is the minimal
+``[start, end]`` window a provider must be asked for.
+
+:func:`backfill_gaps` fetches exactly those windows and hands them to
+:func:`src.ingest.pipeline.ingest`, so mapping, raw CSV persistence, locking
+and the incremental upsert follow the normal ingest path.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src import calendar as b3_calendar
+from src import metrics
+from src.db.connection import connect
+from src.tickers import ticker_variants
+
+logger = logging.getLogger(__name__)
+
+GAP_COLUMNS = ["ticker", "start", "end", "sessions"]
+
+
+def _candidates(tickers: Iterable[str]) -> List[str]:
+    out: List[str] = []
+    for ticker in tickers:
+        try:
+            out.extend(ticker_variants(ticker))
+        except ValueError:
+            out.append(ticker)
+    return out
+
+
+def _stored_dates(
+    conn: sqlite3.Connection,
+    tickers: Optional[Iterable[str]],
+    start: Optional[str],
+    end: Optional[str],
+) -> pd.DataFrame:
+    """Read ``(ticker, date)`` in primary-key order, optionally filtered."""
+    clauses: List[str] = []
+    params: List[str] = []
+    if tickers is not None:
+        candidates = _candidates(tickers)
+        clauses.append(f"ticker IN ({', '.join('?' for _ in candidates)})")
+        params.extend(candidates)
+    if start:
+        clauses.append("date >= ?")
+        params.append(start)
+    if end:
+        # stored dates may carry a time component in legacy databases
+        clauses.append("date < ?")
+        params.append((date.fromisoformat(end) + timedelta(days=1)).isoformat())
+    sql = "SELECT ticker, date FROM prices"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY ticker, date"
+    rows = conn.execute(sql, params).fetchall()
+    return pd.DataFrame(rows, columns=["ticker", "date"])
+
+
+def find_gaps(
+    tickers: Optional[Iterable[str]] = None,
+    *,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+    db_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """Find missing B3 sessions per ticker as minimal contiguous windows.
+
+    Parameters
+    ----------
+    tickers :
+        Restrict the scan to these tickers (base or ``.SA`` form).  ``None``
+        scans every ticker in ``prices``.
+    start, end :
+        Optional ``YYYY-MM-DD`` bounds.  Without them each ticker is checked
+        between its own first and last stored date, so only interior holes
+        are reported; with them, missing sessions before the first or after
+        the last stored row inside the bounds count as gaps too.  Tickers
+        with no rows inside the bounds are not reported.
+    conn :
+        Optional ``sqlite3.Connection`` instance to use.
+    db_path :
+        Optional path or URI to an SQLite database file.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per gap with columns ``ticker`` (as stored), ``start`` and
+        ``end`` (first/last missing session, ``YYYY-MM-DD``) and
+        ``sessions`` (number of missing sessions), ordered by ticker and
+        start.
+
+    Raises
+    ------
+    sqlite3.OperationalError
+        If the ``prices`` table does not exist.
+    """
+    close_conn = False
+    if conn is None:
+        conn = connect(db_path)
+        close_conn = True
+    try:
+        stored = _stored_dates(conn, tickers, start, end)
+    finally:
+        if close_conn:
+            conn.close()
+
+    empty = pd.DataFrame(columns=GAP_COLUMNS)
+    if stored.empty:
+        return empty
+
+    codes, names = pd.factorize(stored["ticker"])
+    days = stored["date"].astype(str).str.slice(0, 10).to_numpy(dtype="datetime64[D]")
+
+    # per-ticker bounds: explicit bounds or the ticker's own first/last row
+    # (rows arrive ordered by ticker, date, so each ticker is one block)
+    first_row = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    last_row = np.r_[first_row[1:] - 1, len(codes) - 1]
+    lo = np.full(len(names), np.datetime64(start, "D")) if start else days[first_row]
+    hi = np.full(len(names), np.datetime64(end, "D")) if end else days[last_row]
+
+    sessions = b3_calendar.sessions(lo.min(), hi.max()).values.astype("datetime64[D]")
+    if sessions.size == 0:
+        return empty
+
+    # session position of every stored row; non-session dates are ignored
+    pos = np.searchsorted(sessions, days)
+    on_session = pos < sessions.size
+    on_session[on_session] = sessions[pos[on_session]] == days[on_session]
+
+    # sentinels just outside each ticker's range turn leading/trailing holes
+    # into ordinary jumps between neighbours
+    ticker_ids = np.arange(len(names))
+    all_codes = np.concatenate([codes[on_session], ticker_ids, ticker_ids])
+    all_pos = np.concatenate(
+        [
+            pos[on_session],
+            np.searchsorted(sessions, lo) - 1,
+            np.searchsorted(sessions, hi, side="right"),
+        ]
+    )
+    order = np.lexsort((all_pos, all_codes))
+    all_codes, all_pos = all_codes[order], all_pos[order]
+
+    jump = np.diff(all_pos)
+    is_gap = (all_codes[1:] == all_codes[:-1]) & (jump > 1)
+    if not is_gap.any():
+        return empty
+
+    gap_start = sessions[all_pos[:-1][is_gap] + 1]
+    gap_end = sessions[all_pos[1:][is_gap] - 1]
+    return pd.DataFrame(
+        {
+            "ticker": np.asarray(names)[all_codes[:-1][is_gap]],
+            "start": np.datetime_as_string(gap_start, unit="D"),
+            "end": np.datetime_as_string(gap_end, unit="D"),
+            "sessions": (jump[is_gap] - 1).astype(int),
+        },
+        columns=GAP_COLUMNS,
+    )
+
+
+def backfill_gaps(
+    gaps: pd.DataFrame,
+    source: str = "yfinance",
+    *,
+    dry_run: bool = False,
+) -> List[Dict[str, Any]]:
+    """Fetch each gap window and ingest it through the normal pipeline.
+
+    Parameters
+    ----------
+    gaps :
+        Output of :func:`find_gaps`.
+    source :
+        Adapter name resolved through :func:`src.adapters.factory.get_adapter`.
+    dry_run :
+        Forwarded to :func:`src.ingest.pipeline.ingest` (fetch and map only).
+
+    Returns
+    -------
+    list of dict
+        One :func:`ingest` result per gap, in ``gaps`` order, extended with
+        the ``ticker``, ``start``, ``end`` and ``sessions`` of the window.
+
+    Notes
+    -----
+    ``end_date`` is passed as the day after the last missing session because
+    providers such as Yahoo treat it as exclusive; rows outside the gap that
+    come back are already stored and are dropped by the incremental diff.
+    The up-to-date skip of :func:`ingest` is bypassed (``force_refresh``)
+    since a ticker with holes may well be current at its tail.
+    """
+    from src.adapters.factory import get_adapter
+    from src.ingest.pipeline import ingest
+
+    adapter = get_adapter(source)
+    results: List[Dict[str, Any]] = []
+    for gap in gaps.itertuples(index=False):
+        end_exclusive = date.fromisoformat(gap.end) + timedelta(days=1)
+        fetcher = functools.partial(
+            adapter.fetch,
+            gap.ticker,
+            start_date=gap.start,
+            end_date=end_exclusive.isoformat(),
+        )
+        logger.info(
+            "backfilling gap",
+            extra={
+                "ticker": gap.ticker,
+                "start": gap.start,
+                "end": gap.end,
+                "sessions": gap.sessions,
+            },
+        )
+        result = ingest(
+            gap.ticker,
+            source,
+            dry_run=dry_run,
+            force_refresh=True,
+            fetcher=fetcher,
+        )
+        metrics.increment_counter(
+            "ingest_backfill_windows_total",
+            labels={"provider": source, "status": result.get("status", "error")},
+            documentation="Gap windows fetched by targeted backfill",
+        )
+        results.append(
+            {
+                **result,
+                "ticker": gap.ticker,
+                "start": gap.start,
+                "end": gap.end,
+                "sessions": int(gap.sessions),
+            }
+        )
+    return results
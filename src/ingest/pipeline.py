@@ -12,6 +12,7 @@ Snapshot caching and incremental diff logic live in
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import re
@@ -19,10 +20,12 @@ import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
+import pandas as pd
 import typer
 
+from src import metrics, profiling
 from src.cli_feedback import CliFeedback, format_duration
 
 # Re-export constants and helpers so existing callers keep working without
@@ -297,12 +300,56 @@ def _make_metadata(
     return out
 
 
+def price_freshness(ticker: str, *, now: datetime | None = None) -> Dict[str, Any]:
+    """Compare stored prices of ``ticker`` with the B3 trading calendar.
+
+    Returns a dict with ``last_date`` (latest stored date or ``None``),
+    ``last_session`` (last closed B3 session at ``now``, see
+    :func:`src.calendar.last_closed_session`) and ``up_to_date`` (stored data
+    already reaches that session, so a provider fetch could not add rows).
+    A database error is reported as not up to date so ingest falls back to
+    fetching.
+    """
+    from src import calendar as b3_calendar
+    from src.db import last_price_date
+
+    last_session = b3_calendar.last_closed_session(now).isoformat()
+    try:
+        last_date = last_price_date(ticker)
+    except Exception:
+        logger.debug("could not read last stored date for %s", ticker, exc_info=True)
+        last_date = None
+    return {
+        "last_date": last_date,
+        "last_session": last_session,
+        "up_to_date": last_date is not None and last_date >= last_session,
+    }
+
+
+def _expected_rows(canonical: pd.DataFrame) -> int | None:
+    """Number of B3 sessions spanned by ``canonical`` (data-quality hint)."""
+    from src import calendar as b3_calendar
+
+    if canonical.empty or "date" not in canonical.columns:
+        return None
+    dates = pd.to_datetime(canonical["date"])
+    return b3_calendar.count_sessions(dates.min(), dates.max())
+
+
+def _circuit_state(source: str) -> str:
+    """Return the circuit-breaker state of ``source`` for result dicts."""
+    from src.adapters.circuit_breaker import get_circuit_breaker
+
+    return get_circuit_breaker(source).state
+
+
 def ingest(  # noqa: C901 - function is intentionally orchestrator-style
     ticker: str,
     source: str = "yfinance",
     *,
     dry_run: bool = False,
     force_refresh: bool = False,
+    fetcher: Callable[[], pd.DataFrame] | None = None,
 ) -> Dict[str, Any]:
     """Minimal pipeline orchestration used by CLI and tests.
 
@@ -324,6 +371,18 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
     exit code without needing to catch exceptions.  This behaviour makes the
     logic easy to drive from tests or scripting environments while still
     recording useful metadata.
+
+    Unless ``dry_run`` or ``force_refresh`` is set (or
+    ``INGEST_SKIP_UP_TO_DATE`` is disabled), a ticker whose stored prices
+    already reach the last closed B3 session is skipped before any provider
+    request: the result has ``status == "success"`` and
+    ``skipped == "up_to_date"`` (see :func:`price_freshness`).
+
+    ``fetcher`` replaces the ``adapter.fetch(ticker)`` call with a zero-arg
+    callable returning the provider DataFrame.  The async orchestrator in
+    :mod:`src.ingest.async_pipeline` uses it to hand over data fetched on the
+    event loop (or re-raise the fetch error) so mapping, raw persistence and
+    metadata recording follow exactly the same path as a synchronous run.
     """
     try:
         canonical_ticker = normalize_b3_ticker(ticker)
@@ -351,7 +410,7 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
     # parsing of the environment variables has been pulled into a shared
     # helper so that both this module and other callers (e.g. tests) can
     # rely on the same validation logic and it is easier to extend later.
-    from src.ingest.config import get_ingest_lock_settings
+    from src.ingest.config import get_ingest_lock_settings, get_skip_up_to_date
 
     lock_timeout, lock_mode, wait_for_lock = get_ingest_lock_settings()
 
@@ -377,12 +436,53 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
             # ``logger`` name which would conflict with earlier references.
             log = logging.LoggerAdapter(logger, extra={**lock_meta})
 
+            # nothing to fetch: stored data already covers the last closed
+            # B3 session (weekends, holidays, repeated runs on the same day)
+            if not dry_run and not force_refresh and get_skip_up_to_date():
+                freshness = price_freshness(ticker)
+                if freshness["up_to_date"]:
+                    duration_str = f"{(time.monotonic() - t0):.2f}s"
+                    metadata = _make_metadata(
+                        job_id,
+                        ticker,
+                        source,
+                        "success",
+                        started_at,
+                        skipped="up_to_date",
+                        last_date=freshness["last_date"],
+                        last_session=freshness["last_session"],
+                        duration=duration_str,
+                        **lock_meta,
+                    )
+                    _record_ingest_metadata(metadata)
+                    metrics.increment_counter(
+                        "ingest_skipped_total",
+                        labels={"provider": source, "reason": "up_to_date"},
+                        documentation="Tickers skipped by ingest without fetching",
+                    )
+                    log.info(
+                        "pipeline.ingest skipped: data up to date",
+                        extra={"job_id": job_id, **freshness},
+                    )
+                    return {
+                        "job_id": job_id,
+                        "status": "success",
+                        "skipped": "up_to_date",
+                        "last_date": freshness["last_date"],
+                        "last_session": freshness["last_session"],
+                        "duration": duration_str,
+                        **lock_meta,
+                    }
+
             # fetch
             try:
-                from src.adapters.factory import get_adapter
+                if fetcher is None:
+                    from src.adapters.factory import get_adapter
 
-                adapter = get_adapter(source)
-                df = adapter.fetch(ticker)
+                    adapter = get_adapter(source)
+                    fetcher = functools.partial(adapter.fetch, ticker)
+                with profiling.stage("fetch"):
+                    df = fetcher()
             except Exception as exc:  # fetch failure
                 msg = f"adapter.fetch failed: {exc}"
                 logger.exception(msg)
@@ -393,15 +493,23 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
                     "error",
                     started_at,
                     error_message=msg,
+                    circuit_state=_circuit_state(source),
                 )
                 _record_ingest_metadata(metadata)
-                return {"job_id": job_id, "status": "error", "error_message": msg}
+                return {
+                    "job_id": job_id,
+                    "status": "error",
+                    "error_message": msg,
+                    "error_code": getattr(exc, "code", None),
+                    "circuit_state": _circuit_state(source),
+                }
 
             # map to canonical
             try:
                 from src.etl.mapper import to_canonical
 
-                canonical = to_canonical(df, provider_name=source, ticker=ticker)
+                with profiling.stage("map"):
+                    canonical = to_canonical(df, provider_name=source, ticker=ticker)
             except Exception as exc:  # mapper failure
                 msg = f"mapper failed: {exc}"
                 logger.exception(msg)
@@ -446,12 +554,17 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
                 _record_ingest_metadata(metadata)
                 return result
 
-            # persist raw CSV (Story 1.4)
+            # persist raw CSV (Story 1.4); the ``record`` adapter already
+            # filed the response under the wrapped provider, for replay
             ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            raw_provider = df.attrs.get("raw_provider", source)
+            save_meta = df.attrs.get("recorded_raw")
             try:
-                save_meta = save_raw_csv(
-                    df, source, ticker, ts, orchestrator_job_id=job_id
-                )
+                if not save_meta or save_meta.get("status") != "success":
+                    with profiling.stage("save_raw"):
+                        save_meta = save_raw_csv(
+                            df, raw_provider, ticker, ts, orchestrator_job_id=job_id
+                        )
             except Exception as exc:
                 msg = f"failed to save raw CSV: {exc}"
                 logger.exception(msg)
@@ -471,9 +584,10 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
             # so we can call it directly instead of importing ourselves at runtime.
             persist_result: Dict[str, Any] = {}
             try:
-                persist_result = ingest_from_snapshot(
-                    canonical, ticker, force=force_refresh
-                )
+                with profiling.stage("persist"):
+                    persist_result = ingest_from_snapshot(
+                        canonical, ticker, force=force_refresh
+                    )
             except Exception as exc:  # pragma: no cover - just in case
                 logger.exception("persistence step failed: %s", exc)
                 persist_result = {"status": "error", "error_message": str(exc)}
@@ -496,6 +610,7 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
                 "source": source,
                 "status": top_status,
                 "rows": len(canonical),
+                "expected_rows": _expected_rows(canonical),
                 "persist": persist_result,
                 "started_at": started_at,
                 "finished_at": _now_iso(),
@@ -503,6 +618,12 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
                 **lock_meta,
             }
             _record_ingest_metadata(metadata)
+            metrics.increment_counter(
+                "ingest_rows_total",
+                len(canonical),
+                labels={"ticker": ticker, "provider": source, "status": top_status},
+                documentation="Canonical rows processed by ingest per ticker",
+            )
             logger.info(
                 "pipeline.ingest completed",
                 extra={
@@ -519,6 +640,7 @@ def ingest(  # noqa: C901 - function is intentionally orchestrator-style
                 "save_meta": save_meta,
                 "persist": persist_result,
                 "duration": duration_str,
+                "circuit_state": _circuit_state(source),
                 **lock_meta,
             }
     except locks.LockTimeout as exc:
@@ -23,10 +23,24 @@ from typing import Any, Dict, Optional, Union
 
 import pandas as pd
 
+from src.ingest.config import (
+    get_artifact_dedup,
+    get_raw_compression,
+    get_raw_root,
+)
+from src.utils.blobstore import store_file
 from src.utils.checksums import (  # noqa: F401
+    checksum_cached,
     serialize_df_bytes,
     sha256_bytes,
+    sha256_content,
     sha256_file,
+    write_df_csv,
+)
+from src.utils.compression import (
+    COMPRESSION_SUFFIXES,
+    compression_for_path,
+    with_compression_suffix,
 )
 
 logger = logging.getLogger(__name__)
@@ -106,24 +120,53 @@ def _write_csv_atomic(df: pd.DataFrame, file_path: Union[str, Path]) -> None:
                 tmp.unlink()
 
 
-def _write_bytes_atomic(file_path: Union[str, Path], data: bytes) -> None:
-    """Write *data* bytes to *file_path* atomically using a sibling temp file."""
+def _write_raw_atomic(
+    df: pd.DataFrame,
+    file_path: Union[str, Path],
+    compression: Optional[str],
+    blob_root: Optional[Path] = None,
+) -> str:
+    """Stream *df* as canonical CSV to *file_path* atomically.
+
+    The CSV goes through :func:`src.utils.checksums.write_df_csv` into a
+    sibling temp file (compressed with *compression*, if any) and the SHA256
+    of the uncompressed bytes is computed in the same pass and returned.
+    With *blob_root* the temp file is moved into that blob store (or dropped
+    when the content is already stored) and *file_path* becomes a hardlink
+    to the blob.
+    """
     file_path = Path(file_path)
     fd, tmp = tempfile.mkstemp(prefix=f"{file_path.name}.", dir=str(file_path.parent))
     os.close(fd)
     tmp = Path(tmp)
     try:
-        with open(tmp, "wb") as fh:
-            fh.write(data)
-        os.replace(str(tmp), str(file_path))
+        checksum = write_df_csv(
+            df,
+            tmp,
+            compression=compression,
+            index=True,
+            date_format="%Y-%m-%dT%H:%M:%S",
+            float_format="%.10g",
+            na_rep="",
+        )
+        if blob_root is None:
+            os.replace(str(tmp), str(file_path))
+        else:
+            suffix = ".csv" + (COMPRESSION_SUFFIXES[compression] if compression else "")
+            store_file(blob_root, tmp, checksum, file_path, suffix)
     finally:
         if tmp.exists() and tmp != file_path:
             with contextlib.suppress(Exception):
                 tmp.unlink()
+    return checksum
 
 
-def _write_checksum(file_path: Union[str, Path]) -> str:
-    """Compute SHA256 of *file_path* and write a sibling ``.checksum`` file.
+def _write_checksum(file_path: Union[str, Path], checksum: Optional[str] = None) -> str:
+    """Write a sibling ``.checksum`` file for *file_path* and return the digest.
+
+    *checksum* defaults to the SHA256 of the file's (uncompressed) content,
+    taken from the persistent checksum cache when the file is unchanged;
+    callers that hashed the content while writing pass it to skip re-reading.
 
     The checksum file is written atomically by first creating a temporary
     sibling in the same directory, flushing/fsyncing the contents, and then
@@ -131,7 +174,8 @@ def _write_checksum(file_path: Union[str, Path]) -> str:
     from appearing if the process is interrupted.
     """
     file_path = Path(file_path)
-    checksum = sha256_file(file_path)
+    if checksum is None:
+        checksum = checksum_cached(file_path)
 
     checksum_path = Path(f"{file_path}.checksum")
     # write to temporary sibling in same directory for atomic replace
@@ -252,7 +296,7 @@ def save_raw_csv(
     provider: str,
     ticker: str,
     ts: Optional[Union[str, datetime]] = None,
-    raw_root: Union[str, Path] = Path("raw"),
+    raw_root: Union[str, Path, None] = None,
     db_path: Union[str, Path] = DEFAULT_DB,
     metadata_path: Union[str, Path] = DEFAULT_METADATA,
     set_permissions: bool = False,
@@ -260,9 +304,14 @@ def save_raw_csv(
 ) -> Dict[str, Any]:
     """Save *df* to ``raw/<provider>/<ticker>-<ts>.csv`` and register metadata.
 
-    Writes the CSV atomically (temp-file + ``os.replace``), computes a
-    deterministic SHA256 checksum, and appends a metadata record to the JSONL
-    audit log.  Database initialization is **not** performed here — use
+    Streams the CSV atomically (temp-file + ``os.replace``), computing a
+    deterministic SHA256 checksum of the uncompressed bytes in the same pass,
+    and appends a metadata record to the JSONL audit log.  With
+    ``RAW_COMPRESSION`` set to ``gzip``/``zstd`` the file gets a ``.gz``/
+    ``.zst`` suffix; the checksum still refers to the uncompressed CSV.
+    With ``ARTIFACT_DEDUP`` enabled, identical pulls share one blob under
+    ``<raw_root>/objects/`` and the timestamped name is a hardlink to it.
+    Database initialization is **not** performed here — use
     ``scripts/init_ingest_db.py`` before expecting DB metadata entries.
 
     Parameters
@@ -278,7 +327,8 @@ def save_raw_csv(
         UTC timestamp string (``YYYYMMDDTHHMMSSz``) or :class:`datetime`.
         Defaults to ``datetime.now(UTC)``.
     raw_root:
-        Root directory for raw files.  Defaults to ``raw/``.
+        Root directory for raw files.  Defaults to ``RAW_ROOT`` (``raw/``
+        when unset), see :func:`src.ingest.config.get_raw_root`.
     db_path:
         Legacy parameter retained for compatibility — no longer used
         internally.
@@ -302,7 +352,7 @@ def save_raw_csv(
     _warn_if_db_path_deprecated(db_path)
     ts_str = _resolve_timestamp_str(ts)
 
-    raw_root = Path(raw_root)
+    raw_root = Path(raw_root) if raw_root is not None else get_raw_root()
     provider_dir = raw_root / provider
     provider_dir.mkdir(parents=True, exist_ok=True)
 
@@ -312,22 +362,22 @@ def save_raw_csv(
     except Exception:
         df_to_save = df.copy()
 
-    file_path = provider_dir / f"{ticker}-{ts_str}.csv"
+    file_path = with_compression_suffix(
+        provider_dir / f"{ticker}-{ts_str}.csv", get_raw_compression()
+    )
     job_id = str(uuid.uuid4())
     fetched_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
     rows = len(df_to_save)
 
     try:
-        df_bytes = serialize_df_bytes(
+        checksum = _write_raw_atomic(
             df_to_save,
-            index=True,
-            date_format="%Y-%m-%dT%H:%M:%S",
-            float_format="%.10g",
-            na_rep="",
+            file_path,
+            compression_for_path(file_path),
+            blob_root=raw_root if get_artifact_dedup() else None,
         )
-        _write_bytes_atomic(file_path, df_bytes)
         # use helper which writes checksum atomically (temp file + replace)
-        checksum = _write_checksum(file_path)
+        checksum = _write_checksum(file_path, checksum)
 
         if set_permissions:
             _apply_posix_permissions([file_path, Path(f"{file_path}.checksum")])
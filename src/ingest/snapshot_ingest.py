@@ -39,6 +39,7 @@ from typing import Any, Dict, Optional, Union
 
 import pandas as pd
 
+from src import metrics
 from src.ingest.ticker_lock import lock_ticker
 
 logger = logging.getLogger(__name__)
@@ -205,14 +206,27 @@ def _resolve_ingest_params(
 def _load_last_snapshot_meta(
     ticker: str, db_path: Optional[str]
 ) -> Optional[Dict[str, Any]]:
-    """Read and deserialise the last snapshot metadata for *ticker* from the DB."""
+    """Read the last snapshot's cache-hit fields for *ticker* from the DB.
+
+    The checksum and generation time come from indexed columns (memoised
+    in-process by :func:`src.db.get_last_snapshot_meta`); the JSON payload
+    is only decoded for rows that predate those columns.
+    """
     import src.db as _db
 
     try:
-        payload_str = _db.get_last_snapshot_payload(ticker, db_path=db_path)
-        if payload_str is not None:
+        meta = _db.get_last_snapshot_meta(ticker, db_path=db_path)
+        if meta is None:
+            return None
+        if meta["checksum"] is not None:
+            return {
+                "sha256": meta["checksum"],
+                "generated_at": meta["generated_at"],
+                "rows_count": meta["rows"],
+            }
+        if meta["payload"] is not None:
             try:
-                return json.loads(payload_str)
+                return json.loads(meta["payload"])
             except json.JSONDecodeError as exc:
                 logger.warning("invalid snapshot metadata JSON for %s: %s", ticker, exc)
     except (OSError, sqlite3.DatabaseError) as exc:
@@ -292,38 +306,51 @@ def _write_and_record_snapshot(
     ticker: str,
     snapshot_dir: Path,
     db_path: Optional[str],
+    checksum: Optional[str] = None,
 ) -> tuple[str, Path]:
-    """Write a versioned snapshot CSV to disk and record metadata in the DB."""
+    """Write a versioned snapshot to disk and record metadata in the DB.
+
+    The file format comes from ``SNAPSHOT_FORMAT`` (see
+    :func:`src.ingest.config.get_snapshot_format`) and CSV snapshots are
+    compressed according to ``SNAPSHOT_COMPRESSION``.  ``checksum`` is the
+    already computed :func:`src.etl.snapshot.snapshot_checksum` of *df*; a
+    columnar write reuses it instead of formatting the frame again.
+    """
     import src.db as _db
-    from src.etl.snapshot import write_snapshot
+    from src.etl.snapshot import sharded_snapshot_path, write_snapshot
+    from src.ingest.config import (
+        get_artifact_dedup,
+        get_snapshot_compression,
+        get_snapshot_format,
+    )
 
+    fmt = get_snapshot_format()
+    compression = get_snapshot_compression() if fmt == "csv" else None
     now = datetime.now(timezone.utc)
-    ts = now.strftime("%Y%m%dT%H%M%SZ")
-
-    # sanitize ticker so that it cannot escape the snapshot directory or
-    # introduce confusing characters.  Allow alphanumerics, hyphen and
-    # underscore only; everything else becomes underscore.  Also map dots to
-    # underscore for consistency with earlier behaviour.
-    import re
-
-    safe_ticker = re.sub(r"[^A-Za-z0-9_-]", "_", ticker) or "ticker"
-
-    filename = f"{safe_ticker}-{ts}.csv"
-    snapshot_dir_res = snapshot_dir.resolve()
-    out_path = (snapshot_dir_res / filename).resolve()
-    # ensure the resolved output path is inside the snapshot directory
-    if not out_path.is_relative_to(snapshot_dir_res):
-        raise ValueError("sanitized filename escapes snapshot_dir")
+    # ``<snapshot_dir>/<TICKER>/<timestamp>.<ext>[.gz|.zst]``; the ticker is
+    # sanitized so it cannot escape the snapshot directory (ValueError
+    # otherwise)
+    out_path = sharded_snapshot_path(
+        snapshot_dir, ticker, now, fmt=fmt, compression=compression
+    )
 
-    # write_snapshot also handles pruning old files via _prune_old_snapshots
-    sha = write_snapshot(df, out_path)
+    # write_snapshot also handles pruning old files via _prune_old_snapshots,
+    # which only reads this ticker's shard index.  CSV digests come from the
+    # written bytes, so the precomputed checksum only matters for columnar
+    # formats and for deduplication (an already stored blob is just linked).
+    use_checksum = checksum and (fmt != "csv" or get_artifact_dedup())
+    write_kwargs = {"checksum": checksum} if use_checksum else {}
+    sha = write_snapshot(df, out_path, **write_kwargs)
 
     snapshot_meta: Dict[str, Any] = {
-        "snapshot_id": filename,
+        "snapshot_id": f"{out_path.parent.name}/{out_path.name}",
+        "snapshot_path": str(out_path),
         "ticker": ticker,
         "generated_at": now.isoformat().replace("+00:00", "Z"),
         "rows_count": len(df),
         "sha256": sha,
+        "format": fmt,
+        "compression": compression,
     }
     try:
         _db.record_snapshot_metadata(snapshot_meta, db_path=db_path)
@@ -333,16 +360,45 @@ def _write_and_record_snapshot(
     return sha, out_path
 
 
+def _read_overlapping_prices(
+    df: pd.DataFrame, ticker: str, db_path: Optional[str]
+) -> Optional[pd.DataFrame]:
+    """Stored rows of *ticker* within *df*'s date window, or ``None``."""
+    import src.db as _db
+
+    if df.empty:
+        return None
+    dates = to_utc_naive_datetime_index(
+        pd.Index(df["date"]) if "date" in df.columns else df.index
+    )
+    first = dates.min().strftime("%Y-%m-%d")
+    last = dates.max().strftime("%Y-%m-%d")
+    coverage = _db.get_price_coverage(ticker, db_path=db_path)
+    if coverage is None:
+        return None
+    start = max(first, coverage["min_date"])
+    end = min(last, coverage["max_date"])
+    if start > end:
+        return None
+    return _db.read_prices(ticker, start=start, end=end, db_path=db_path)
+
+
 def _run_incremental_ingest(
     df: pd.DataFrame,
     ticker: str,
     db_path: Optional[str],
 ) -> int:
-    """Diff *df* against existing DB rows and persist only new/changed rows."""
+    """Diff *df* against existing DB rows and persist only new/changed rows.
+
+    Only the stored rows inside *df*'s date window are read: the window is
+    intersected with the ticker's ``price_coverage`` range first, and a
+    window outside that range (e.g. a fresh day appended to the history)
+    skips the read entirely.
+    """
     import src.db as _db
 
     try:
-        existing = _db.read_prices(ticker, db_path=db_path)
+        existing = _read_overlapping_prices(df, ticker, db_path)
     except (sqlite3.DatabaseError, FileNotFoundError):
         # common benign failures: missing DB file or corrupted database
         existing = None
@@ -423,6 +479,7 @@ def ingest_from_snapshot(
         cache_result = _evaluate_cache_hit(
             last_meta, checksum, resolved_ttl, resolved_force, ticker
         )
+        metrics.record_cache_lookup("snapshot_ingest", cache_result is not None)
         if cache_result is not None:
             # include duration for the quick-cached path
             elapsed = time.monotonic() - start
@@ -430,7 +487,7 @@ def ingest_from_snapshot(
             return cache_result
 
         sha, out_path = _write_and_record_snapshot(
-            df, ticker, resolved_dir, resolved_db
+            df, ticker, resolved_dir, resolved_db, checksum
         )
         rows_processed = _run_incremental_ingest(df, ticker, resolved_db)
 
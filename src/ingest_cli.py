@@ -26,17 +26,20 @@ from __future__ import annotations
 
 import logging
 import os
+import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
 import pandas as pd
 
+from src import metrics
 from src.db_client import DatabaseClient, DefaultDatabaseClient
+from src.etl.snapshot import read_snapshot, snapshot_checksum, snapshot_format
 from src.ingest import cache as _cache
 from src.ingest.pipeline import rows_to_ingest
 from src.ingest.ticker_lock import lock_ticker
-from src.utils.checksums import sha256_file
+from src.utils.checksums import checksum_cached
 
 logger = logging.getLogger(__name__)
 
@@ -54,9 +57,21 @@ def _read_checksum(path: Path) -> str:
 
     If a companion ``.checksum`` file exists it will be compared against the
     computed value; a mismatch raises ``ValueError`` to prevent ingesting
-    corrupted files silently.
+    corrupted files silently.  For ``.gz``/``.zst`` CSVs the digest covers
+    the uncompressed stream.  Columnar snapshots record the logical checksum
+    of the decoded frame instead, so their companion is checked by
+    :func:`_verify_logical_checksum` once the file is loaded.  Digests of
+    unchanged files come from the persistent checksum cache
+    (:func:`src.utils.checksums.checksum_cached`).
     """
-    actual = sha256_file(path)
+    if snapshot_format(path) != "csv":
+        return checksum_cached(path, "file")
+    actual = checksum_cached(path)
+    _compare_checksum(path, actual)
+    return actual
+
+
+def _compare_checksum(path: Path, actual: str) -> None:
     check_path = path.with_name(f"{path.name}.checksum")
     if check_path.exists():
         expected = check_path.read_text().strip()
@@ -64,7 +79,63 @@ def _read_checksum(path: Path) -> str:
             raise ValueError(
                 f"checksum mismatch for {path}: expected {expected}, got {actual}"
             )
-    return actual
+
+
+def _verify_logical_checksum(path: Path, df: pd.DataFrame) -> None:
+    """Check a columnar snapshot's ``.checksum`` against its decoded frame."""
+    if snapshot_format(path) != "csv":
+        _compare_checksum(path, snapshot_checksum(df))
+
+
+def _cache_lookup(
+    cache_file: Path, key: str, checksum: str, ttl: Optional[float]
+) -> tuple[bool, Optional[str]]:
+    """Consulta o cache de snapshots.
+
+    Retorna ``(fresco, sha256_gravado)``; o ``sha256`` lido é usado depois
+    por :func:`_cache_put` no compare-and-set.  Falhas do cache contam como
+    *miss*.
+    """
+    try:
+        with _cache.SnapshotCache(cache_file) as store:
+            entry = store.get(key)
+            fresh = store.is_fresh(key, checksum, ttl)
+    except (sqlite3.Error, OSError, ValueError):
+        logger.warning(
+            "failed to read snapshot cache %s; treating as cache miss",
+            cache_file,
+            exc_info=True,
+        )
+        return False, None
+    stored = entry.get("sha256") if isinstance(entry, dict) else None
+    return fresh, stored if isinstance(stored, str) else None
+
+
+def _cache_put(
+    cache_file: Path, key: str, checksum: str, expected_sha256: Optional[str]
+) -> None:
+    """Registra ``key`` no cache se a entrada ainda for a lida na consulta.
+
+    O compare-and-set evita sobrescrever a entrada gravada por outro ingest
+    do mesmo snapshot entre a consulta e a gravação; falhas são só logadas.
+    """
+    entry = {
+        "sha256": checksum,
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        with _cache.SnapshotCache(cache_file) as store:
+            written = store.compare_and_set(key, expected_sha256, entry)
+    except (sqlite3.Error, OSError):
+        logger.warning(
+            "failed to write snapshot cache %s; entry for %s not recorded",
+            cache_file,
+            key,
+            exc_info=True,
+        )
+        return
+    if not written:
+        logger.info("snapshot cache entry for %s changed concurrently; keeping it", key)
 
 
 def _normalize_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -163,8 +234,9 @@ def ingest_snapshot(
         expiração.  Se nenhum valor for passado, o valor de ambiente
         ``SNAPSHOT_TTL`` (ou 86400s) é usado.
     cache_file:
-        Caminho para o arquivo JSON usado como cache.  Padrão:
-        ``dados/snapshot_cache.json`` ou ``SNAPSHOT_CACHE_FILE``.
+        Caminho configurado do cache.  Padrão: ``dados/snapshot_cache.json``
+        ou ``SNAPSHOT_CACHE_FILE``; as entradas ficam no arquivo SQLite
+        irmão ``.db`` (um JSON existente é importado na primeira abertura).
 
     Returns
     -------
@@ -184,19 +256,16 @@ def ingest_snapshot(
     checksum = _read_checksum(snapshot_path)
     key = str(snapshot_path.resolve())
 
-    cache = _cache.load_cache(cache_file)
-    entry = cache.get(key)
-    if (
-        entry
-        and not force_refresh
-        and entry.get("sha256") == checksum
-        and _cache.entry_is_fresh(entry, ttl)
-    ):
+    fresh, cached_sha256 = _cache_lookup(cache_file, key, checksum, ttl)
+    cache_hit = not force_refresh and fresh
+    metrics.record_cache_lookup("snapshot_cli", cache_hit)
+    if cache_hit:
         logger.info("ingest_snapshot cached", extra={"snapshot": key})
         return {"cached": True, "processed_rows": 0, "skipped_rows": 0}
 
-    # Need to actually load the CSV and potentially write to DB
-    df = pd.read_csv(snapshot_path)
+    # Need to actually load the snapshot and potentially write to DB
+    df = read_snapshot(snapshot_path)
+    _verify_logical_checksum(snapshot_path, df)
     df = _normalize_df(df)
 
     if ticker is None:
@@ -229,11 +298,10 @@ def ingest_snapshot(
 
         # update cache even if nothing was processed, so subsequent calls
         # within the TTL will skip. Use the same checksum we validated above.
-        cache[key] = {
-            "sha256": checksum,
-            "processed_at": datetime.now(timezone.utc).isoformat(),
-        }
-        _cache.save_cache(cache_file, cache)
+        # Only this key is written, so concurrent ingests of other snapshots
+        # sharing the cache file keep their entries.  A cache that cannot
+        # be written does not fail the ingest.
+        _cache_put(cache_file, key, checksum, cached_sha256)
 
     logger.info(
         "ingest_snapshot",
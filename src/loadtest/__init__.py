@@ -0,0 +1,9 @@
+"""Load-test helpers: local stand-in market-data server.
+
+Used by ``scripts/load_test.py`` and the adapter tests to exercise the HTTP,
+retry and rate-limit paths without network access.
+"""
+
+from .market_server import MarketDataServer, MarketServerConfig, synthetic_ohlcv
+
+__all__ = ["MarketDataServer", "MarketServerConfig", "synthetic_ohlcv"]
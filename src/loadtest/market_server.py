@@ -0,0 +1,245 @@
+"""Local stand-in HTTP market-data server for load tests.
+
+Serves synthetic OHLCV for any ticker over plain ``http.server`` so the
+adapter, retry, rate-limit and connection-pool paths can be exercised (and
+measured) without reaching Yahoo.  Behaviour is driven by
+:class:`MarketServerConfig`: per-request latency and jitter, the fraction of
+requests answered with ``429``/``5xx`` and the per-row padding of the
+payload.  The history length is the ``start``/``end`` window the client asks
+for (the HTTP adapter always sends one); requests without ``start`` get
+:data:`DEFAULT_HISTORY_DAYS` of history.
+
+Endpoints
+---------
+``GET /prices/<ticker>?start=YYYY-MM-DD&end=YYYY-MM-DD``
+    JSON in pandas ``orient="split"`` layout with ``Open``, ``High``,
+    ``Low``, ``Close``, ``Adj Close`` and ``Volume`` columns for every
+    business day in the window.  Prices are pseudo-random but seeded by
+    ticker and date, so repeated runs return identical data.
+``GET /stats``
+    Request counters (``requests``, ``by_status``) for the harness.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+DEFAULT_HISTORY_DAYS = 365
+
+
+@dataclass
+class MarketServerConfig:
+    """Knobs of the stand-in server.
+
+    Attributes
+    ----------
+    latency_ms:
+        Fixed delay added before every response.
+    jitter_ms:
+        Extra uniformly-distributed delay in ``[0, jitter_ms]``.
+    error_rate:
+        Fraction of requests answered with ``503``.
+    rate_limit_rate:
+        Fraction of requests answered with ``429`` (checked before
+        ``error_rate``).
+    padding_bytes:
+        Extra bytes attached to every row to inflate the payload.
+    seed:
+        Seed of the error-injection RNG (``None`` = nondeterministic).
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    padding_bytes: int = 0
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        for name in ("error_rate", "rate_limit_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be within [0, 1], got {value}")
+        if self.latency_ms < 0 or self.jitter_ms < 0:
+            raise ValueError("latency_ms and jitter_ms must be non-negative")
+
+
+def synthetic_ohlcv(
+    ticker: str, start: date, end: date, padding_bytes: int = 0
+) -> Dict[str, Any]:
+    """Return business-day OHLCV rows for ``ticker`` in ``[start, end]``.
+
+    The walk is seeded by the ticker *and* each date, so any sub-window of a
+    longer request yields exactly the same rows.
+    """
+    index: List[str] = []
+    data: List[List[Any]] = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            rng = random.Random(zlib.crc32(f"{ticker}:{day.isoformat()}".encode()))
+            base = 10.0 + (zlib.crc32(ticker.encode()) % 9000) / 100.0
+            close = round(base * (1 + rng.uniform(-0.05, 0.05)), 4)
+            open_ = round(close * (1 + rng.uniform(-0.01, 0.01)), 4)
+            high = round(max(open_, close) * (1 + rng.uniform(0.001, 0.02)), 4)
+            low = round(min(open_, close) * (1 - rng.uniform(0.001, 0.02)), 4)
+            row: List[Any] = [
+                open_,
+                high,
+                low,
+                close,
+                close,
+                rng.randint(10_000, 10_000_000),
+            ]
+            if padding_bytes:
+                row.append("x" * padding_bytes)
+            index.append(day.isoformat())
+            data.append(row)
+        day += timedelta(days=1)
+    columns = COLUMNS + (["Padding"] if padding_bytes else [])
+    return {"ticker": ticker, "columns": columns, "index": index, "data": data}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like real providers
+    server: "_Server"
+
+    def log_message(self, *args: Any) -> None:  # silence stderr access log
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        gzip_ok = "gzip" in self.headers.get("Accept-Encoding", "")
+        self.send_response(status)
+        if gzip_ok:
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header("Content-Encoding", "gzip")
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(status)
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        cfg = self.server.config
+        parts = urlsplit(self.path)
+        if parts.path == "/stats":
+            self._send_json(200, self.server.stats())
+            return
+        if not parts.path.startswith("/prices/"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        delay = cfg.latency_ms + self.server.uniform(0, cfg.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        roll = self.server.uniform(0, 1)
+        if roll < cfg.rate_limit_rate:
+            self._send_json(429, {"error": "rate limited"})
+            return
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            self._send_json(503, {"error": "injected failure"})
+            return
+
+        ticker = parts.path[len("/prices/") :]
+        query = parse_qs(parts.query)
+        try:
+            end = date.fromisoformat(query["end"][0]) if "end" in query else None
+            end = end or date.today()
+            if "start" in query:
+                start = date.fromisoformat(query["start"][0])
+            else:
+                start = end - timedelta(days=DEFAULT_HISTORY_DAYS)
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        self._send_json(200, synthetic_ohlcv(ticker, start, end, cfg.padding_bytes))
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MarketServerConfig):
+        super().__init__(address, _Handler)
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._by_status: Dict[str, int] = {}
+
+    def uniform(self, low: float, high: float) -> float:
+        with self._lock:
+            return self._rng.uniform(low, high)
+
+    def record(self, status: int) -> None:
+        with self._lock:
+            key = str(status)
+            self._by_status[key] = self._by_status.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": sum(self._by_status.values()),
+                "by_status": dict(self._by_status),
+                "config": asdict(self.config),
+            }
+
+
+class MarketDataServer:
+    """Background-thread wrapper around the stand-in server.
+
+    Use as a context manager or call :meth:`start`/:meth:`stop`.  Binding to
+    port ``0`` (the default) picks a free random port; :attr:`url` reports
+    the resulting base URL.
+    """
+
+    def __init__(
+        self,
+        config: Optional[MarketServerConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.config = config or MarketServerConfig()
+        self._server = _Server((host, port), self.config)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters served so far."""
+        return self._server.stats()
+
+    def start(self) -> "MarketDataServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="market-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MarketDataServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -11,7 +11,7 @@ import os
 import sqlite3
 from contextlib import suppress
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, TypedDict
+from typing import TYPE_CHECKING, Any, Iterator, Optional, TypedDict
 
 import typer
 
@@ -25,7 +25,7 @@ load_dotenv()
 
 import src.db as _db  # noqa: E402
 import src.retorno as _retorno  # noqa: E402
-from src import metrics  # noqa: E402
+from src import metrics, profiling  # noqa: E402
 from src.cli_feedback import CliFeedback  # noqa: E402
 from src.logging_config import configure_logging  # noqa: E402
 from src.paths import DATA_DIR  # noqa: E402
@@ -38,6 +38,7 @@ with suppress(ImportError):
     import src.cli_compat  # noqa: F401 - import for side effects
 
 app = typer.Typer()
+profiling.install_profiling(app)
 
 
 def _load_default_tickers() -> tuple[str, ...]:
@@ -122,19 +123,51 @@ def _compute_returns_for_ticker(
     torna os testes mais simples, já que podemos inspecionar o retorno sem
     capturar stdout.
     """
-    df = _retorno.compute_returns(ticker, start=start, end=end, dry_run=dry_run)
+    with profiling.stage("compute_returns"):
+        df = _retorno.compute_returns(ticker, start=start, end=end, dry_run=dry_run)
 
     if df is None or df.empty:
         return {"rows": 0, "persisted": False, "sample_df": None}
 
     rows = len(df)
     persisted = not dry_run
+    metrics.increment_counter(
+        "returns_rows_total",
+        rows,
+        labels={"ticker": ticker, "persisted": str(persisted).lower()},
+        documentation="Return rows computed per ticker",
+    )
 
     sample_df = df.head(5) if rows > 5 else df
 
     return {"rows": rows, "persisted": persisted, "sample_df": sample_df}
 
 
+def _run_ingests(
+    tickers: list[str], provider: str, force_refresh: bool
+) -> Iterator[dict[str, Any]]:
+    """Resultados de ``ingest`` para ``tickers``, na mesma ordem.
+
+    Com ``INGEST_CONCURRENCY`` definido e mais de um ticker, todos são
+    ingeridos de uma vez por :func:`src.ingest.async_pipeline.ingest_many`
+    (até ``INGEST_CONCURRENCY`` fetches simultâneos) no primeiro resultado
+    pedido; sem a variável cada ticker é ingerido sequencialmente, sob
+    demanda.
+    """
+    if len(tickers) > 1 and os.getenv("INGEST_CONCURRENCY", "").strip():
+        from src.ingest.async_pipeline import ingest_many
+
+        yield from ingest_many(tickers, provider, force_refresh=force_refresh)
+        return
+
+    from src.ingest.pipeline import ingest
+
+    for tk in tickers:
+        yield ingest(
+            ticker=tk, source=provider, dry_run=False, force_refresh=force_refresh
+        )
+
+
 @app.command("run")
 def run_cmd(
     ticker: str = typer.Option(
@@ -158,8 +191,14 @@ def run_cmd(
         help="Força persistência ignorando decisões de cache do pipeline",
     ),
 ) -> None:
-    """Executa fluxo ETL principal (ingestão + cálculo de retornos)."""
-    from src.ingest.pipeline import ingest
+    """Executa fluxo ETL principal (ingestão + cálculo de retornos).
+
+    Com ``INGEST_CONCURRENCY`` definido, os tickers são buscados
+    concorrentemente antes do relatório por ticker.
+    """
+    # jobs `run` são processos batch curtos: exporta as métricas para o
+    # textfile/sink configurado antes que se percam na saída do processo
+    metrics.start_exporters_from_env()
 
     # label shown in CLI output; localized to Portuguese
     feedback = CliFeedback("executar")
@@ -183,18 +222,14 @@ def run_cmd(
     ok = 0
     failed = 0
     warnings = 0
+    results = _run_ingests(tickers, effective_provider, effective_force_refresh)
     for idx, tk in enumerate(tickers, start=1):
         feedback.item(tk, idx, len(tickers))
         ingest_step = feedback.start_step(
             "ingestão",
             detail=f"ticker={tk} | force_refresh={effective_force_refresh}",
         )
-        result = ingest(
-            ticker=tk,
-            source=effective_provider,
-            dry_run=False,
-            force_refresh=effective_force_refresh,
-        )
+        result = next(results)
         if result.get("status") != "success":
             failed += 1
             feedback.finish_step(
@@ -204,6 +239,10 @@ def run_cmd(
             )
             continue
         ingest_detail = []
+        if result.get("skipped") == "up_to_date":
+            ingest_detail.append(
+                f"sem novo pregão desde {result.get('last_date')} (fetch omitido)"
+            )
         if result.get("duration"):
             ingest_detail.append(f"total={result['duration']}")
         if persist_reason := result.get("persist", {}).get("reason"):
@@ -442,6 +481,106 @@ def export_csv_cmd(
     feedback.summary(f"CSV exportado com {len(df)} linha(s): {output}")
 
 
+@app.command("gaps")
+def gaps_cmd(
+    ticker: str = typer.Option(
+        "",
+        help="Ticker B3 a verificar. Quando omitido, verifica todos os do banco.",
+        is_flag=False,
+    ),
+    start: Optional[str] = typer.Option(
+        None,
+        help=(
+            "Data inicial YYYY-MM-DD; pregões faltantes antes do primeiro "
+            "registro também contam"
+        ),
+        is_flag=False,
+    ),
+    end: Optional[str] = typer.Option(
+        None,
+        help=(
+            "Data final YYYY-MM-DD; pregões faltantes após o último registro "
+            "também contam"
+        ),
+        is_flag=False,
+    ),
+    backfill: bool = typer.Option(
+        False,
+        "--backfill",
+        help="Busca apenas as janelas faltantes e as ingere pelo pipeline normal",
+    ),
+    provider: str = typer.Option(
+        "yfinance",
+        help="Provider usado no --backfill (ex.: yfinance)",
+        is_flag=False,
+    ),
+) -> None:
+    """Lista pregões faltantes em ``prices`` e, opcionalmente, preenche-os."""
+    from src.ingest.gaps import backfill_gaps, find_gaps
+
+    feedback = CliFeedback("gaps")
+    tickers = [_normalize_cli_ticker(ticker)] if ticker else None
+    feedback.start(
+        f"ticker={tickers[0] if tickers else 'todos'} | start={start or '-'} | "
+        f"end={end or '-'} | backfill={backfill}"
+    )
+
+    scan_step = feedback.start_step("detecção de lacunas")
+    try:
+        gaps = find_gaps(tickers, start=start, end=end)
+    except sqlite3.OperationalError as exc:
+        feedback.finish_step(scan_step, status="error", detail=str(exc))
+        feedback.error(
+            "Erro de acesso ao banco de dados; verifique se o esquema está "
+            "inicializado e execute as migrações"
+        )
+        raise typer.Exit(code=1) from exc
+    missing = int(gaps["sessions"].sum()) if not gaps.empty else 0
+    feedback.finish_step(
+        scan_step,
+        detail=f"{len(gaps)} janela(s), {missing} pregão(ões) faltante(s)",
+    )
+    if gaps.empty:
+        feedback.summary("Nenhuma lacuna encontrada")
+        return
+
+    for gap in gaps.itertuples(index=False):
+        feedback.info(
+            f"{gap.ticker}: {gap.start} → {gap.end} ({gap.sessions} pregão(ões))"
+        )
+
+    if not backfill:
+        feedback.summary(
+            f"{len(gaps)} lacuna(s) em {gaps['ticker'].nunique()} ticker(s); "
+            "use --backfill para preenchê-las"
+        )
+        return
+
+    metrics.start_exporters_from_env()
+    fill_step = feedback.start_step(
+        "backfill", detail=f"provider={provider} | janelas={len(gaps)}"
+    )
+    results = backfill_gaps(gaps, provider)
+    failed = [r for r in results if r.get("status") != "success"]
+    for result in failed:
+        feedback.warn(
+            f"{result['ticker']} {result['start']} → {result['end']}: "
+            f"{result.get('error_message', 'erro desconhecido')}"
+        )
+    feedback.finish_step(
+        fill_step,
+        status="warning" if failed else "success",
+        detail=f"{len(results) - len(failed)} ok, {len(failed)} falha(s)",
+    )
+    remaining = find_gaps(tickers, start=start, end=end)
+    feedback.summary(
+        f"Backfill concluído: {len(results) - len(failed)}/{len(results)} "
+        f"janela(s); {len(remaining)} lacuna(s) restante(s)"
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     # configuração de logging deve ser tentada, mas qualquer erro deve
     # ser reportado em vez de silenciosamente ignorado.
@@ -470,4 +609,8 @@ if __name__ == "__main__":
                     e,
                 )
 
+    # PROMETHEUS_TEXTFILE / METRICS_SINK_FILE: persistência das métricas de
+    # processos batch (gravadas periodicamente e na saída do processo)
+    metrics.start_exporters_from_env()
+
     app()
@@ -2,10 +2,25 @@
 
 This module provides no-op implementations when `prometheus_client` is not
 installed so tests and minimal environments don't require the package.
+
+Every update is also mirrored into a small in-process *batch registry*
+(pure stdlib, label-aware) so short-lived CLI runs can persist their metrics
+when the process exits: :func:`write_textfile` renders the registry in the
+Prometheus text exposition format for node-exporter's textfile collector and
+:func:`append_metrics_snapshot` appends a JSON record to a local sink file.
+:func:`start_exporters_from_env` wires both up from environment variables.
 """
 
+import atexit
+import json
 import logging
-from typing import Dict
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +47,222 @@ class _NoopMetric:
 _counters: Dict[str, object] = {}
 _histograms: Dict[str, object] = {}
 
+# Same defaults as prometheus_client so dashboards behave identically for
+# scraped and textfile-exported series.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    7.5,
+    10.0,
+)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, object]]) -> _LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: _LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricSample(NamedTuple):
+    """A single sample produced by a collector registered via
+    :func:`register_collector`.
+    """
+
+    name: str
+    value: float
+    labels: Optional[Dict[str, object]] = None
+    kind: str = "gauge"
+    documentation: str = ""
+
+
+class _HistogramState:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class _BatchRegistry:
+    """Thread-safe, label-aware metric store rendered on demand."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, _HistogramState]] = {}
+        self._docs: Dict[str, str] = {}
+
+    def inc(self, name, amount, labels, documentation="") -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + float(amount)
+            if documentation:
+                self._docs.setdefault(name, documentation)
+
+    def set(self, name, value, labels, documentation="") -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = float(value)
+            if documentation:
+                self._docs.setdefault(name, documentation)
+
+    def observe(self, name, value, labels, documentation="", buckets=None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = _HistogramState(
+                    tuple(buckets) if buckets else DEFAULT_BUCKETS
+                )
+            state.observe(float(value))
+            if documentation:
+                self._docs.setdefault(name, documentation)
+
+    def counter_values(self, name: str) -> Dict[_LabelKey, float]:
+        with self._lock:
+            return dict(self._counters.get(name, {}))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+            self._docs.clear()
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return a JSON-serialisable view of every series."""
+
+        def _labels(key: _LabelKey) -> Dict[str, str]:
+            return dict(key)
+
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": _labels(k), "value": v} for k, v in s.items()]
+                    for name, s in self._counters.items()
+                },
+                "gauges": {
+                    name: [{"labels": _labels(k), "value": v} for k, v in s.items()]
+                    for name, s in self._gauges.items()
+                },
+                "histograms": {
+                    name: [
+                        {
+                            "labels": _labels(k),
+                            "count": h.count,
+                            "sum": h.sum,
+                            # cumulative (``le``) counts, mergeable across runs
+                            "buckets": list(h.buckets),
+                            "bucket_counts": list(h.counts),
+                        }
+                        for k, h in s.items()
+                    ]
+                    for name, s in self._histograms.items()
+                },
+            }
+
+    def render(self, extra: Iterable[MetricSample] = ()) -> str:
+        """Render the registry (plus ``extra`` samples) in text format 0.0.4."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                self._render_scalar(lines, name, "counter", self._counters[name])
+            for name in sorted(self._gauges):
+                self._render_scalar(lines, name, "gauge", self._gauges[name])
+            for name in sorted(self._histograms):
+                self._render_histogram(lines, name, self._histograms[name])
+
+        grouped: Dict[str, List[MetricSample]] = {}
+        for sample in extra:
+            grouped.setdefault(sample.name, []).append(sample)
+        for name in sorted(grouped):
+            first = grouped[name][0]
+            _append_header(lines, name, first.kind, first.documentation)
+            for sample in grouped[name]:
+                labels = _format_labels(_label_key(sample.labels))
+                lines.append(f"{name}{labels} {_format_value(sample.value)}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def _render_scalar(
+        self, lines: List[str], name: str, kind: str, series: Dict[_LabelKey, float]
+    ) -> None:
+        _append_header(lines, name, kind, self._docs.get(name, ""))
+        for key in sorted(series):
+            lines.append(f"{name}{_format_labels(key)} {_format_value(series[key])}")
+
+    def _render_histogram(
+        self, lines: List[str], name: str, series: Dict[_LabelKey, _HistogramState]
+    ) -> None:
+        _append_header(lines, name, "histogram", self._docs.get(name, ""))
+        for key in sorted(series):
+            h = series[key]
+            for bound, count in zip(h.buckets, h.counts, strict=True):
+                le = _format_labels(key, ("le", _format_value(bound)))
+                lines.append(f"{name}_bucket{le} {count}")
+            inf = _format_labels(key, ("le", "+Inf"))
+            lines.append(f"{name}_bucket{inf} {h.count}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(h.sum)}")
+            lines.append(f"{name}_count{_format_labels(key)} {h.count}")
+
+
+def _append_header(lines: List[str], name: str, kind: str, doc: str) -> None:
+    if doc:
+        lines.append(f"# HELP {name} {doc}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+_batch_registry = _BatchRegistry()
+_collectors: List[Callable[[], Iterable[MetricSample]]] = []
+
 
 def get_counter(name: str, documentation: str = ""):
     """Return a counter-like metric for the given name.
@@ -93,28 +324,48 @@ def get_histogram(name: str, documentation: str = ""):
     return _histograms[name]
 
 
-def increment_counter(name: str, amount: int = 1) -> None:
+def increment_counter(
+    name: str,
+    amount: float = 1,
+    *,
+    labels: Optional[Dict[str, object]] = None,
+    documentation: str = "",
+) -> None:
     """Increment a named counter metric.
 
     Parameters
     ----------
     name : str
         Metric name.
-    amount : int
+    amount : float
         Amount to increment the counter by.
+    labels : dict, optional
+        Label set for the series (e.g. ``{"ticker": "PETR4"}``). Labelled
+        series are only kept in the batch registry used by the textfile and
+        sink exporters; the ``prometheus_client`` metric stays label-less.
+    documentation : str, optional
+        ``# HELP`` text used by the textfile exporter.
 
     Notes
     -----
-    If Prometheus is not installed, this is a no-op. Exceptions during
-    metric updates are logged at debug level.
+    If Prometheus is not installed, only the batch registry is updated.
+    Exceptions during metric updates are logged at debug level.
     """
     try:
-        get_counter(name).inc(amount)
+        _batch_registry.inc(name, amount, labels, documentation)
+        if labels is None:
+            get_counter(name, documentation).inc(amount)
     except Exception:
         logger.debug("metrics increment failed", exc_info=True)
 
 
-def observe_histogram(name: str, value: float) -> None:
+def observe_histogram(
+    name: str,
+    value: float,
+    *,
+    labels: Optional[Dict[str, object]] = None,
+    documentation: str = "",
+) -> None:
     """Observe a value for a named histogram metric.
 
     Parameters
@@ -123,18 +374,63 @@ def observe_histogram(name: str, value: float) -> None:
         Metric name.
     value : float
         Value to observe.
+    labels : dict, optional
+        Label set for the series; see :func:`increment_counter`.
+    documentation : str, optional
+        ``# HELP`` text used by the textfile exporter.
 
     Notes
     -----
-    If Prometheus is not installed, this is a no-op. Exceptions during
-    metric updates are logged at debug level.
+    If Prometheus is not installed, only the batch registry is updated.
+    Exceptions during metric updates are logged at debug level.
     """
     try:
-        get_histogram(name).observe(value)
+        _batch_registry.observe(name, value, labels, documentation)
+        if labels is None:
+            get_histogram(name, documentation).observe(value)
     except Exception:
         logger.debug("metrics observe failed", exc_info=True)
 
 
+def set_gauge(
+    name: str,
+    value: float,
+    *,
+    labels: Optional[Dict[str, object]] = None,
+    documentation: str = "",
+) -> None:
+    """Set a gauge in the batch registry.
+
+    Gauges only exist in the batch registry (textfile/sink exporters); they
+    are not mirrored to ``prometheus_client``.
+    """
+    try:
+        _batch_registry.set(name, value, labels, documentation)
+    except Exception:
+        logger.debug("metrics gauge update failed", exc_info=True)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup; hit ratios are derived at export time.
+
+    Parameters
+    ----------
+    cache : str
+        Logical cache name (e.g. ``"snapshot_ingest"``).
+    hit : bool
+        Whether the lookup was served from cache.
+    """
+    try:
+        _batch_registry.inc(
+            "cache_lookups_total",
+            1,
+            {"cache": cache, "result": "hit" if hit else "miss"},
+            "Cache lookups by cache name and result",
+        )
+    except Exception:
+        logger.debug("metrics cache lookup failed", exc_info=True)
+
+
 def start_metrics_server(port: int = 8000) -> None:
     """Start an HTTP server exposing Prometheus metrics.
 
@@ -156,3 +452,240 @@ def start_metrics_server(port: int = 8000) -> None:
         logger.info("Prometheus metrics server started", extra={"port": port})
     except Exception:
         logger.exception("failed to start Prometheus metrics server")
+
+
+def register_collector(collector: Callable[[], Iterable[MetricSample]]) -> None:
+    """Register a callable polled for extra samples on every export.
+
+    Collectors let modules expose state they already track (e.g. retry
+    counters) without pushing every update through this module.
+    """
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def _cache_ratio_samples() -> Iterable[MetricSample]:
+    totals: Dict[str, Dict[str, float]] = {}
+    for key, value in _batch_registry.counter_values("cache_lookups_total").items():
+        labels = dict(key)
+        per_cache = totals.setdefault(labels.get("cache", ""), {})
+        result = labels.get("result", "")
+        per_cache[result] = per_cache.get(result, 0.0) + value
+    for cache, counts in sorted(totals.items()):
+        lookups = counts.get("hit", 0.0) + counts.get("miss", 0.0)
+        if lookups:
+            yield MetricSample(
+                "cache_hit_ratio",
+                counts.get("hit", 0.0) / lookups,
+                {"cache": cache},
+                documentation="Fraction of cache lookups served from cache",
+            )
+
+
+def collect_samples() -> List[MetricSample]:
+    """Return samples from the built-in and registered collectors."""
+    samples: List[MetricSample] = []
+    for collector in (_cache_ratio_samples, *_collectors):
+        try:
+            samples.extend(collector())
+        except Exception:
+            logger.debug("metrics collector failed", exc_info=True)
+    return samples
+
+
+def render_textfile() -> str:
+    """Render every batch metric in the Prometheus text exposition format."""
+    return _batch_registry.render(collect_samples())
+
+
+def write_textfile(path: os.PathLike | str) -> Path:
+    """Atomically write :func:`render_textfile` output to ``path``.
+
+    The content is written to a hidden temporary file in the same directory
+    and moved into place with :func:`os.replace`, so node-exporter's textfile
+    collector never reads a partially written file.
+
+    Returns
+    -------
+    Path
+        The destination path.
+    """
+    dest = Path(path)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(render_textfile())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, dest)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return dest
+
+
+def _retry_summary() -> Dict[str, object]:
+    # lazy import: src.adapters.retry_metrics itself imports this module
+    try:
+        from src.adapters.retry_metrics import get_global_metrics
+
+        return get_global_metrics().to_dict()
+    except Exception:
+        logger.debug("retry metrics summary unavailable", exc_info=True)
+        return {}
+
+
+def append_metrics_snapshot(
+    path: os.PathLike | str, *, extra: Optional[Dict[str, object]] = None
+) -> Path:
+    """Append one JSON line describing the current metrics to ``path``.
+
+    This is a push-style local sink: each batch run appends a record so
+    trends across runs can be analysed without a Prometheus server.
+    """
+    dest = Path(path)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    record: Dict[str, object] = {
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "pid": os.getpid(),
+        **(extra or {}),
+        **_batch_registry.snapshot(),
+        "collected": [
+            {"name": s.name, "labels": s.labels or {}, "value": s.value}
+            for s in collect_samples()
+        ],
+        "retry": _retry_summary(),
+    }
+    line = json.dumps(record, default=str) + "\n"
+    with dest.open("a", encoding="utf-8") as fh:
+        fh.write(line)
+    return dest
+
+
+class TextfileExporter:
+    """Periodically flush the batch registry to a textfile and/or a sink.
+
+    Parameters
+    ----------
+    textfile : path-like, optional
+        Destination ``.prom`` file, rewritten atomically on every flush.
+    interval : float
+        Seconds between periodic flushes; ``0`` disables the background
+        thread so the file is only written by :meth:`stop`.
+    sink : path-like, optional
+        JSONL file that receives one record when the exporter stops.
+    """
+
+    def __init__(
+        self,
+        textfile: Optional[os.PathLike | str] = None,
+        *,
+        interval: float = 15.0,
+        sink: Optional[os.PathLike | str] = None,
+    ) -> None:
+        self.textfile = Path(textfile) if textfile else None
+        self.sink = Path(sink) if sink else None
+        self.interval = max(0.0, float(interval))
+        self._started_at = time.time()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def flush(self) -> None:
+        """Rewrite the textfile with the current registry state."""
+        set_gauge(
+            "batch_run_start_timestamp_seconds",
+            self._started_at,
+            documentation="Unix time the batch process started",
+        )
+        set_gauge(
+            "batch_run_duration_seconds",
+            time.time() - self._started_at,
+            documentation="Seconds elapsed since the batch process started",
+        )
+        if self.textfile is not None:
+            try:
+                write_textfile(self.textfile)
+            except OSError:
+                logger.warning("failed to write metrics textfile", exc_info=True)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self) -> "TextfileExporter":
+        """Start the periodic flush thread and register the final flush."""
+        if self.interval > 0 and self.textfile is not None:
+            self._thread = threading.Thread(
+                target=self._loop, name="metrics-textfile", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        """Stop the thread, write the textfile one last time and push to the sink."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+        if self.sink is not None:
+            try:
+                append_metrics_snapshot(self.sink)
+            except OSError:
+                logger.warning("failed to append metrics sink", exc_info=True)
+        atexit.unregister(self.stop)
+
+
+_exporter: Optional[TextfileExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def start_textfile_exporter(
+    textfile: Optional[os.PathLike | str] = None,
+    *,
+    interval: float = 15.0,
+    sink: Optional[os.PathLike | str] = None,
+) -> Optional[TextfileExporter]:
+    """Start (once per process) the textfile/sink exporter.
+
+    Returns the running exporter, or ``None`` when neither ``textfile`` nor
+    ``sink`` is given. Subsequent calls return the exporter already running.
+    """
+    global _exporter
+    if textfile is None and sink is None:
+        return None
+    with _exporter_lock:
+        if _exporter is None or _exporter._stopped:
+            _exporter = TextfileExporter(textfile, interval=interval, sink=sink)
+            _exporter.start()
+        return _exporter
+
+
+def start_exporters_from_env() -> Optional[TextfileExporter]:
+    """Start the textfile exporter configured through environment variables.
+
+    ``PROMETHEUS_TEXTFILE`` sets the ``.prom`` destination,
+    ``PROMETHEUS_TEXTFILE_INTERVAL`` the flush interval in seconds (default
+    15, ``0`` writes only on exit) and ``METRICS_SINK_FILE`` the JSONL sink.
+    """
+    textfile = os.getenv("PROMETHEUS_TEXTFILE") or None
+    sink = os.getenv("METRICS_SINK_FILE") or None
+    raw_interval = os.getenv("PROMETHEUS_TEXTFILE_INTERVAL", "15")
+    try:
+        interval = float(raw_interval)
+    except ValueError:
+        logger.warning(
+            "invalid PROMETHEUS_TEXTFILE_INTERVAL %r; using 15s", raw_interval
+        )
+        interval = 15.0
+    return start_textfile_exporter(textfile, interval=interval, sink=sink)
+
+
+def reset_batch_metrics() -> None:
+    """Clear the batch registry (useful for tests)."""
+    _batch_registry.reset()
@@ -1,11 +1,13 @@
 """Resolução centralizada de caminhos importantes do projeto.
 
 Expõe :func:`project_root` (raiz do repositório) e :data:`DATA_DIR`
-(diretório de dados em runtime, padrão ``dados/``).  Usar estas referências
-em vez de caminhos hardcoded garante comportamento correto tanto em
-desenvolvimento local quanto em CI.
+(diretório de dados em runtime, padrão ``dados/``; sobrescrito pela
+variável de ambiente ``DATA_DIR``, como documentado em ``.env.example``).
+Usar estas referências em vez de caminhos hardcoded garante comportamento
+correto tanto em desenvolvimento local quanto em CI.
 """
 
+import os
 from pathlib import Path
 
 
@@ -20,4 +22,5 @@ _ROOT = project_root()
 SNAPSHOTS_DIR = _ROOT / "snapshots"
 RAW_DIR = _ROOT / "raw"
 METADATA_DIR = _ROOT / "metadata"
-DATA_DIR = _ROOT / "dados"
+# caminhos relativos em DATA_DIR são resolvidos a partir do project root
+DATA_DIR = _ROOT / os.environ.get("DATA_DIR", "dados")
@@ -29,11 +29,14 @@ import typer
 
 from src.adapters.factory import available_providers
 from src.cli_feedback import CliFeedback
+from src.etl.snapshot import read_snapshot
 from src.paths import SNAPSHOTS_DIR
+from src.profiling import install_profiling
 from src.tickers import normalize_b3_ticker
 from src.utils.conversions import as_bool as _as_bool
 
 app = typer.Typer()
+install_profiling(app)
 
 
 def _normalize_cli_ticker(value: str) -> str:
@@ -66,12 +69,12 @@ def _restore_snapshot_into_temp_db(
     temp_db_target: str,
     required_columns: list[str],
 ) -> tuple[dict[str, str], int]:
-    """Load a CSV snapshot into a temporary SQLite database and run checks.
+    """Load a snapshot into a temporary SQLite database and run checks.
 
     Parameters
     ----------
     snapshot_path : Path
-        Path to the snapshot CSV file to import.
+        Path to the snapshot file to import (CSV, Parquet or Arrow IPC).
     temp_db_target : str
         SQLite URI or path for the temporary database (':memory:' by default).
     required_columns : list[str]
@@ -117,7 +120,7 @@ def _restore_snapshot_into_temp_db(
         )
         temp_conn.commit()
 
-        df = pd.read_csv(snapshot_path)
+        df = read_snapshot(snapshot_path)
         rows_restored = len(df)
         if "adj_close" not in df.columns and "close" in df.columns:
             df["adj_close"] = df["close"]
@@ -324,8 +327,9 @@ def snapshot(
     used (created if necessary).
     """
     from src import db
-    from src.etl.snapshot import write_snapshot
-    from src.utils.checksums import sha256_file
+    from src.etl.snapshot import SNAPSHOT_EXTENSIONS, write_snapshot
+    from src.ingest.config import get_snapshot_compression, get_snapshot_format
+    from src.utils.compression import with_compression_suffix
 
     fb = CliFeedback("pipeline snapshot")
     fb.start("iniciando geração de snapshot")
@@ -344,9 +348,12 @@ def snapshot(
 
     out_dir = Path(output_dir) if output_dir else SNAPSHOTS_DIR
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"{normalized_ticker}_snapshot.csv"
+    fmt = get_snapshot_format()
+    out_path = out_dir / f"{normalized_ticker}_snapshot{SNAPSHOT_EXTENSIONS[fmt]}"
+    if fmt == "csv":
+        out_path = with_compression_suffix(out_path, get_snapshot_compression())
 
-    _ = write_snapshot(df.reset_index(), out_path)
+    checksum = write_snapshot(df.reset_index(), out_path)
 
     # calculate once to avoid redundant filesystem stats
     size_bytes = out_path.stat().st_size
@@ -355,7 +362,7 @@ def snapshot(
         "created_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
         "snapshot_path": str(out_path.resolve()),
         "rows": len(df),
-        "checksum": sha256_file(out_path),
+        "checksum": checksum,
         "size_bytes": size_bytes,
         # CLI-triggered snapshots are not part of an external batch/job run, so
         # we leave job_id unset. Batch runners or schedulers can populate this
@@ -370,14 +377,42 @@ def snapshot(
     fb.success(success_message)
 
 
+def _snapshot_checksum_or_none(
+    snapshot_path: Path, use_cache: bool = True
+) -> Optional[str]:
+    """Return the logical checksum of a snapshot, or ``None`` if unreadable.
+
+    For CSV this is the file digest; columnar files are decoded and hashed in
+    canonical CSV form so they compare against CSV-era metadata.  With
+    ``use_cache=False`` the persistent checksum cache is bypassed and the
+    file is always re-read.
+    """
+    from contextlib import nullcontext
+
+    from src.etl.snapshot import snapshot_file_checksum
+    from src.utils.checksums import checksum_cache_disabled
+
+    try:
+        with nullcontext() if use_cache else checksum_cache_disabled():
+            return snapshot_file_checksum(snapshot_path)
+    except (OSError, ValueError):
+        # the restore step reports unreadable files
+        return None
+
+
 @app.command("restore-verify")
 def restore_verify_cmd(
     snapshot_path: Path = typer.Option(  # noqa: B008
-        ..., "--snapshot-path", help="Path to snapshot CSV file"
+        ..., "--snapshot-path", help="Path to snapshot file (CSV/Parquet/Arrow)"
     ),
     temp_db: Optional[Path] = typer.Option(  # noqa: B008
         None, "--temp-db", help="Temp DB path (default :memory:)"
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Recompute the checksum from disk, ignoring the checksum cache",
+    ),
 ) -> None:
     """Validate a snapshot file against its metadata in the database.
 
@@ -391,14 +426,16 @@ def restore_verify_cmd(
     Parameters
     ----------
     snapshot_path : Path
-        Filesystem path to the snapshot CSV to verify.
+        Filesystem path to the snapshot file to verify.
     temp_db : Optional[Path]
         When provided, a temporary SQLite database path is used for metadata
         lookups (default is ``:memory:``).
+    no_cache : bool
+        When True, the snapshot checksum is recomputed from the file instead
+        of being read from the persistent checksum cache.
     """
     from src import db
     from src.db.snapshots import get_snapshot_by_path, normalize_snapshot_path
-    from src.utils.checksums import sha256_file
 
     fb = CliFeedback("pipeline restore-verify")
     fb.start("iniciando verificação de restauração")
@@ -407,7 +444,7 @@ def restore_verify_cmd(
         fb.error(f"Snapshot file not found: {snapshot_path}")
         raise typer.Exit(code=2)
 
-    actual_checksum = sha256_file(snapshot_path)
+    actual_checksum = _snapshot_checksum_or_none(snapshot_path, use_cache=not no_cache)
 
     metadata_conn = db.connect(db_path=None)
     try:
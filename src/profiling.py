@@ -0,0 +1,348 @@
+"""Perfilamento opcional (cProfile + tracemalloc) para qualquer comando da CLI.
+
+Este módulo concentra a opção global ``--profile`` em um único lugar: basta
+chamar :func:`install_profiling` sobre um ``typer.Typer`` para que todos os
+subcomandos daquele app passem a aceitar as opções abaixo, sem código por
+comando::
+
+    main --profile run --ticker PETR4
+    main --profile --profile-out /tmp/run.pstats compute-returns
+    main --profile-memory pipeline ingest PETR4
+    main snapshots --profile ingest dados/PETR4.csv
+
+Com ``--profile`` a execução do comando é envolvida por ``cProfile`` e, ao
+final, são gravados um arquivo ``.pstats`` e um resumo texto (``.txt``) com
+as top-N funções por tempo cumulativo.  Por padrão os arquivos ficam em
+``metadata/profiles/`` — ao lado de ``metadata/ingest_logs.jsonl``.
+
+Com ``--profile-memory`` o ``tracemalloc`` é ativado e o pico de memória de
+cada etapa instrumentada via :func:`stage` (fetch, mapeamento, gravação raw,
+persistência, cálculo de retornos...) é reportado no resumo texto.  Quando
+nenhuma sessão está ativa :func:`stage` apenas registra a duração da etapa
+em :mod:`src.metrics`, portanto pode ser usado livremente no pipeline.
+
+Apenas uma sessão pode estar ativa por processo (limitação do próprio
+``cProfile``); se o app principal e um sub-app receberem ``--profile`` a
+sessão mais externa prevalece.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+import typer
+
+from src import metrics
+
+logger = logging.getLogger(__name__)
+
+# diretório padrão dos perfis; relativo ao CWD assim como
+# ``src.ingest.raw_storage.DEFAULT_METADATA`` para que os artefatos fiquem
+# lado a lado com os metadados da execução.
+DEFAULT_PROFILE_DIR = Path("metadata") / "profiles"
+DEFAULT_TOP_N = 30
+
+
+@dataclass
+class StageMemory:
+    """Consolidação de pico de memória/tempo de uma etapa nomeada."""
+
+    name: str
+    calls: int = 0
+    peak_bytes: int = 0
+    total_seconds: float = 0.0
+
+
+@dataclass
+class _StageFrame:
+    name: str
+    started_at: float
+    peak_seen: int = 0
+
+
+@dataclass
+class ProfileSession:
+    """Estado de uma sessão de perfilamento ativa.
+
+    Attributes
+    ----------
+    output : Path
+        Caminho do arquivo ``.pstats``; o resumo texto usa o mesmo nome com
+        sufixo ``.txt``.
+    cpu : bool
+        Quando ``True`` o ``cProfile`` está ativo.
+    memory : bool
+        Quando ``True`` o ``tracemalloc`` está ativo e :func:`stage` registra
+        picos de memória.
+    top_n : int
+        Quantidade de funções listadas no resumo texto.
+    """
+
+    output: Path
+    cpu: bool = True
+    memory: bool = False
+    top_n: int = DEFAULT_TOP_N
+    command: str = ""
+    stages: dict[str, StageMemory] = field(default_factory=dict)
+    _profiler: Optional[cProfile.Profile] = field(default=None, repr=False)
+    _stack: list[_StageFrame] = field(default_factory=list, repr=False)
+    _started_at: float = 0.0
+    _started_tracemalloc: bool = field(default=False, repr=False)
+
+    @property
+    def summary_path(self) -> Path:
+        """Caminho do resumo texto gerado ao final da sessão."""
+        return self.output.with_suffix(".txt")
+
+    def start(self) -> None:
+        """Inicia os coletores configurados."""
+        self._started_at = time.monotonic()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.cpu:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        """Encerra os coletores e grava ``.pstats`` e resumo texto."""
+        elapsed = time.monotonic() - self._started_at
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        overall_peak: Optional[int] = None
+        if self.memory and tracemalloc.is_tracing():
+            overall_peak = tracemalloc.get_traced_memory()[1]
+            for frame in self._stack:
+                overall_peak = max(overall_peak, frame.peak_seen)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        if self._profiler is not None:
+            self._profiler.dump_stats(str(self.output))
+        self.summary_path.write_text(
+            self._render_summary(elapsed, overall_peak), encoding="utf-8"
+        )
+
+    def _render_summary(self, elapsed: float, overall_peak: Optional[int]) -> str:
+        lines = [
+            f"command: {self.command or '-'}",
+            f"elapsed_seconds: {elapsed:.3f}",
+        ]
+        if overall_peak is not None:
+            lines.append(f"peak_memory_bytes: {overall_peak}")
+        if self.stages:
+            lines.append("")
+            lines.append("stage                          calls   seconds    peak_bytes")
+            for st in self.stages.values():
+                lines.append(
+                    f"{st.name:<30} {st.calls:>5} {st.total_seconds:>9.3f} "
+                    f"{st.peak_bytes:>13}"
+                )
+        if self._profiler is not None:
+            buf = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=buf)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+            lines.append("")
+            lines.append(buf.getvalue().rstrip())
+        return "\n".join(lines) + "\n"
+
+    # -- etapas -------------------------------------------------------------
+
+    def _enter_stage(self, name: str) -> _StageFrame:
+        if self.memory and tracemalloc.is_tracing():
+            # preserva o pico observado pela etapa externa antes de zerar o
+            # contador global para medir a etapa interna isoladamente
+            current_peak = tracemalloc.get_traced_memory()[1]
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak_seen = max(parent.peak_seen, current_peak)
+            tracemalloc.reset_peak()
+        frame = _StageFrame(name=name, started_at=time.monotonic())
+        self._stack.append(frame)
+        return frame
+
+    def _exit_stage(self, frame: _StageFrame) -> None:
+        if self._stack and self._stack[-1] is frame:
+            self._stack.pop()
+        peak = frame.peak_seen
+        if self.memory and tracemalloc.is_tracing():
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak_seen = max(parent.peak_seen, peak)
+        agg = self.stages.setdefault(frame.name, StageMemory(frame.name))
+        agg.calls += 1
+        agg.peak_bytes = max(agg.peak_bytes, peak)
+        agg.total_seconds += time.monotonic() - frame.started_at
+
+
+_session_lock = threading.Lock()
+_active_session: Optional[ProfileSession] = None
+
+
+def get_active_session() -> Optional[ProfileSession]:
+    """Retorna a sessão de perfilamento ativa, se houver."""
+    return _active_session
+
+
+def default_output_path(command: str = "cli") -> Path:
+    """Monta o caminho padrão ``metadata/profiles/<command>-<ts>.pstats``."""
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in command) or "cli"
+    return DEFAULT_PROFILE_DIR / f"{safe}-{ts}.pstats"
+
+
+def start_session(
+    output: Optional[Path] = None,
+    *,
+    cpu: bool = True,
+    memory: bool = False,
+    top_n: int = DEFAULT_TOP_N,
+    command: str = "cli",
+) -> Optional[ProfileSession]:
+    """Inicia uma sessão global de perfilamento.
+
+    Retorna ``None`` (sem efeito) quando já existe uma sessão ativa no
+    processo, pois ``cProfile`` não suporta perfis aninhados.
+    """
+    global _active_session
+    with _session_lock:
+        if _active_session is not None:
+            logger.debug("profiling session already active; ignoring nested request")
+            return None
+        out = Path(output) if output is not None else default_output_path(command)
+        if out.suffix != ".pstats":
+            out = out.with_name(f"{out.name}.pstats")
+        session = ProfileSession(
+            output=out, cpu=cpu, memory=memory, top_n=top_n, command=command
+        )
+        session.start()
+        _active_session = session
+        return session
+
+
+def stop_session(session: ProfileSession) -> None:
+    """Finaliza ``session``, grava os artefatos e libera o slot global."""
+    global _active_session
+    with _session_lock:
+        if _active_session is not session:
+            return
+        _active_session = None
+    try:
+        session.stop()
+    except OSError as exc:
+        logger.warning("failed to write profile to %s: %s", session.output, exc)
+        return
+    written = [session.summary_path]
+    if session.cpu:
+        written.insert(0, session.output)
+    typer.echo(
+        "⏱ perfil gravado em " + ", ".join(str(p) for p in written),
+        err=True,
+    )
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Delimita uma etapa do pipeline para métricas e relatório de perfil.
+
+    A duração da etapa é sempre observada no histograma
+    ``pipeline_stage_duration_seconds{stage=...}`` de :mod:`src.metrics`.
+    O detalhamento de memória/tempo do perfil só é coletado quando há sessão
+    ativa e a chamada ocorre na thread principal (o pico do ``tracemalloc``
+    é global ao processo e não pode ser atribuído a etapas concorrentes).
+    """
+    session = _active_session
+    if session is not None and threading.current_thread() is threading.main_thread():
+        frame: Optional[_StageFrame] = session._enter_stage(name)
+    else:
+        frame = None
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_histogram(
+            "pipeline_stage_duration_seconds",
+            time.perf_counter() - started,
+            labels={"stage": name},
+            documentation="Duration of instrumented pipeline stages",
+        )
+        if frame is not None and session is not None:
+            session._exit_stage(frame)
+
+
+def install_profiling(app: typer.Typer) -> None:
+    """Registra as opções globais de perfilamento como callback de ``app``.
+
+    O callback inicia a sessão antes do subcomando e agenda a gravação dos
+    artefatos via ``ctx.call_on_close`` — que roda mesmo quando o comando
+    termina com ``typer.Exit`` ou exceção.
+    """
+
+    @app.callback()
+    def _profiling_options(
+        ctx: typer.Context,
+        profile: bool = typer.Option(
+            False,
+            "--profile",
+            help="Executa o comando sob cProfile e grava .pstats + resumo texto",
+        ),
+        profile_out: Optional[Path] = typer.Option(  # noqa: B008
+            None,
+            "--profile-out",
+            help=(
+                "Caminho do arquivo .pstats (implica --profile; padrão: "
+                "metadata/profiles/<comando>-<ts>.pstats)"
+            ),
+        ),
+        profile_memory: bool = typer.Option(
+            False,
+            "--profile-memory",
+            help="Ativa tracemalloc e reporta o pico de memória por etapa",
+        ),
+        profile_top: int = typer.Option(
+            DEFAULT_TOP_N,
+            "--profile-top",
+            min=1,
+            help="Quantidade de funções no resumo por tempo cumulativo",
+        ),
+    ) -> None:
+        cpu = profile or profile_out is not None
+        if not (cpu or profile_memory):
+            return
+        command = ctx.invoked_subcommand or ctx.info_name or "cli"
+        session = start_session(
+            profile_out,
+            cpu=cpu,
+            memory=profile_memory,
+            top_n=profile_top,
+            command=command,
+        )
+        if session is not None:
+            ctx.call_on_close(lambda: stop_session(session))
+
+
+__all__ = [
+    "DEFAULT_PROFILE_DIR",
+    "ProfileSession",
+    "StageMemory",
+    "default_output_path",
+    "get_active_session",
+    "install_profiling",
+    "stage",
+    "start_session",
+    "stop_session",
+]
@@ -9,27 +9,55 @@ from __future__ import annotations
 #    fetch rows that are older than the retention cutoff (typically based on
 #    `SNAPSHOT_RETENTION_DAYS`).
 # 2. `archive_snapshots` can be used to copy snapshot files to an archive
-#    directory and mark the corresponding metadata rows as archived.
+#    directory and mark the corresponding metadata rows as archived. Files
+#    are copied (and hashed in the same pass) by a small thread pool and the
+#    rows are flagged with batched UPDATE statements. `bundle_snapshots` is
+#    the alternative that packs them per ticker and month into zip bundles
+#    (see `src.utils.bundles`); `restore_archived_snapshot` extracts one
+#    snapshot back from its bundle.
 # 3. `delete_snapshots` removes files from disk and deletes metadata rows.
 #
 # The CLI surface (`src.snapshot_cli`) uses these helpers to implement a
 # safe purge workflow: listing candidates with `--dry-run`, requiring
 # `--confirm` to apply changes, and optionally archiving instead of deleting.
 #
+# 4. `collect_blob_garbage` removes content-addressed blobs (see
+#    `src.utils.blobstore`) that no file links to anymore once snapshots were
+#    pruned, deleted or archived.
+#
 # Note: `archive_snapshots` reports checksum mismatch via the returned
 # `checksum_ok` flag. The row is always marked as archived to avoid treating
 # it as still active.
 import contextlib
 import logging
 import os
-import shutil
 import sqlite3
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import TypedDict, cast
 
 from src.db import snapshots as snapshots_db
-from src.utils.checksums import sha256_file
+from src.etl.snapshot import (
+    copy_snapshot_file,
+    read_snapshot,
+    safe_ticker_dirname,
+    snapshot_checksum,
+    snapshot_encoding_suffix,
+    snapshot_file_checksum,
+    snapshot_format,
+)
+from src.ingest.config import get_archive_workers, get_artifact_dedup
+from src.utils.blobstore import blob_refcount, iter_blobs, link_existing, store_file
+from src.utils.bundles import (
+    add_member,
+    extract_member,
+    new_bundle_path,
+    write_manifest,
+)
+from src.utils.compression import compression_for_path
 
 
 class ArchivedSnapshotResult(TypedDict, total=False):
@@ -43,10 +71,17 @@ class ArchivedSnapshotResult(TypedDict, total=False):
     path: str
     archived_path: str | None
     checksum_ok: bool | None
+    size_bytes: int
+    member: str
+    offset: int
     error: str
 
 logger = logging.getLogger(__name__)
 
+# archived rows are flagged in chunks so the number of bound parameters stays
+# below SQLite's historical limit of 999 per statement
+_UPDATE_BATCH_SIZE = 500
+
 
 def get_retention_days() -> int:
     """Return snapshot retention period in days from environment.
@@ -116,6 +151,93 @@ def find_purge_candidates(
     return [dict(zip(cols, row, strict=False)) for row in rows]
 
 
+def _archive_file(
+    snapshot_id: object,
+    raw_path: object,
+    expected_checksum: object,
+    archive_dir: Path,
+    dedup: bool,
+) -> ArchivedSnapshotResult:
+    """Copy one snapshot into ``archive_dir`` and verify the copy.
+
+    Runs on a worker thread of :func:`archive_snapshots`; ``OSError`` is
+    reported in the result, any other exception propagates and aborts the
+    whole batch.
+    """
+    source_path = Path(str(raw_path))
+    archived_path = archive_dir / f"{snapshot_id}_{source_path.name}"
+    suffix = snapshot_encoding_suffix(source_path)
+    try:
+        if (
+            dedup
+            and expected_checksum is not None
+            and source_path.is_file()
+            and link_existing(
+                archive_dir, str(expected_checksum), archived_path, suffix
+            )
+        ):
+            actual_checksum = str(expected_checksum)
+        else:
+            # hashes while copying: the copy is read once, not twice
+            actual_checksum = copy_snapshot_file(source_path, archived_path)
+            if dedup:
+                store_file(
+                    archive_dir,
+                    archived_path,
+                    actual_checksum,
+                    archived_path,
+                    suffix,
+                )
+        size_bytes = archived_path.stat().st_size
+    except OSError as exc:  # could be missing/unreadable
+        # continue processing other snapshots but mark failure
+        return {
+            "id": str(snapshot_id),
+            "path": str(source_path),
+            "archived_path": None,
+            "checksum_ok": False,
+            "error": str(exc),
+        }
+
+    if expected_checksum is None:
+        checksum_ok = None
+    else:
+        checksum_ok = actual_checksum == str(expected_checksum)
+    return {
+        "id": str(snapshot_id),
+        "path": str(source_path),
+        "archived_path": str(archived_path),
+        "checksum_ok": checksum_ok,
+        "size_bytes": size_bytes,
+    }
+
+
+def _mark_archived(
+    cur: sqlite3.Cursor, snapshot_ids: list[str], archived_at: str
+) -> None:
+    """Set ``archived = 1`` for ``snapshot_ids`` in batched statements."""
+    for start in range(0, len(snapshot_ids), _UPDATE_BATCH_SIZE):
+        batch = snapshot_ids[start : start + _UPDATE_BATCH_SIZE]
+        placeholders = ",".join("?" * len(batch))
+        _ = cur.execute(
+            "UPDATE snapshots SET archived = 1, archived_at = ? "
+            f"WHERE id IN ({placeholders})",
+            (archived_at, *batch),
+        )
+
+
+def _created_archives(futures: list[Future[ArchivedSnapshotResult]]) -> list[Path]:
+    """Archive copies produced by the futures that completed successfully."""
+    created: list[Path] = []
+    for future in futures:
+        if future.cancelled() or future.exception() is not None:
+            continue
+        archived_path = future.result().get("archived_path")
+        if archived_path is not None:
+            created.append(Path(archived_path))
+    return created
+
+
 def archive_snapshots(
     conn: sqlite3.Connection,
     snapshot_ids: list[str],  # IDs are stored as TEXT in the DB
@@ -138,18 +260,31 @@ def archive_snapshots(
         Each dict has keys ``id``, ``path`` (original location),
         ``archived_path`` (destination copy or None on failure),
         ``checksum_ok`` (bool | None; ``None`` indicates the checksum could
-        not be verified due to missing metadata), and optionally ``error``
-        if an OSError occurred during copy.
+        not be verified due to missing metadata), ``size_bytes`` (size of
+        the archived file) and optionally ``error`` if an OSError occurred
+        during copy.  Rows keep the order of the metadata query.
 
     Side effects
     ------------
     The function creates ``archive_dir`` if missing, copies each snapshot
-    file there with a prefix of the ID, computes a SHA-256 checksum of the
-    copy, and updates the database row by setting ``archived = 1`` and
-    ``archived_at`` (commit occurs at the end).  Checksum mismatches do not
-    prevent the database flag from being set; the design assumes even a
-    mismatched file should be marked archived and ``checksum_ok`` recorded in
-    the results for later inspection.
+    file there with a prefix of the ID while computing the SHA-256 checksum
+    of the copied content in the same pass, and updates the database rows by
+    setting ``archived = 1`` and ``archived_at`` (commit occurs at the end).
+    Checksum mismatches do not prevent the database flag from being set; the
+    design assumes even a mismatched file should be marked archived and
+    ``checksum_ok`` recorded in the results for later inspection.
+
+    Files are copied by a pool of ``ARCHIVE_WORKERS`` threads (see
+    :func:`src.ingest.config.get_archive_workers`) and the rows are updated
+    with batched ``UPDATE ... WHERE id IN (...)`` statements.  If anything
+    other than a per-file ``OSError`` fails, the transaction is rolled back
+    and every copy created so far is removed.
+
+    With ``ARTIFACT_DEDUP`` enabled the copies live in the blob store under
+    ``archive_dir`` and each archived name is a hardlink: content already
+    archived under the expected checksum is linked without copying or
+    re-hashing (``checksum_ok`` is ``True`` since the blob was verified when
+    it was stored).
     """
     if not snapshot_ids:
         return []
@@ -165,78 +300,339 @@ def archive_snapshots(
     str_ids = [str(i) for i in snapshot_ids]
     _ = cur.execute(query, str_ids)
     rows = cast(list[tuple[object, object, object]], cur.fetchall())
+    if not rows:
+        return []
 
     results: list[ArchivedSnapshotResult] = []
     now_iso = datetime.now(timezone.utc).isoformat()
-    created_archives: list[Path] = []
+    dedup = get_artifact_dedup()
+    workers = min(get_archive_workers(), len(rows))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="archive") as pool:
+        futures = [pool.submit(_archive_file, *row, archive_dir, dedup) for row in rows]
+        try:
+            # Ensure we can rollback if something goes wrong (e.g. commit fails).
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+
+            results = [future.result() for future in futures]
+
+            # Regardless of checksum result (including unverifiable cases), mark
+            # the rows as archived so that the purge logic does not repeatedly
+            # attempt to process the same entries. The `checksum_ok` flag allows
+            # callers to detect and log mismatches or missing metadata.
+            _mark_archived(
+                cur,
+                [row["id"] for row in results if row["archived_path"] is not None],
+                now_iso,
+            )
+            conn.commit()
+        except Exception:
+            # Ensure DB state is consistent and remove partially-created archives.
+            logger.exception(
+                "archive_snapshots failed; rolling back DB changes and removing copies"
+            )
+            for future in futures:
+                future.cancel()
+            _ = wait(futures)
+            with contextlib.suppress(Exception):
+                conn.rollback()
+
+            for p in _created_archives(futures):
+                with contextlib.suppress(OSError):
+                    p.unlink()
+
+            raise
+
+    return results
+
+
+# Missing/unreadable files raise OSError; corrupt columnar files raise
+# pyarrow's ArrowInvalid (a ValueError) or ArrowTypeError (a TypeError).
+_UNREADABLE_SNAPSHOT_ERRORS = (OSError, ValueError, TypeError)
+
+
+def _bundle_member(
+    zf: zipfile.ZipFile, source_path: Path, arcname: str
+) -> dict[str, object]:
+    """Add one snapshot to ``zf`` and return its manifest entry.
 
+    CSV snapshots are hashed and their rows counted while they are copied;
+    columnar snapshots are decoded for their logical checksum and row count.
+    """
+    if snapshot_format(source_path) == "csv":
+        compression = compression_for_path(source_path)
+        info = add_member(
+            zf,
+            source_path,
+            arcname,
+            compression=compression,
+            deflate=compression is None,
+        )
+        # the first line of a CSV snapshot is its header
+        rows = max(int(info["lines"]) - 1, 0)
+        checksum = str(info["sha256"])
+    else:
+        df = read_snapshot(source_path)
+        checksum = snapshot_checksum(df)
+        rows = len(df)
+        info = add_member(zf, source_path, arcname, deflate=False)
+    return {
+        "member": arcname,
+        "offset": info["offset"],
+        "sha256": checksum,
+        "rows": rows,
+        "size_bytes": info["size_bytes"],
+        "source_path": str(source_path),
+    }
+
+
+def _write_bundle(
+    bundle_path: Path, rows: list[tuple[object, object, object]]
+) -> tuple[Path | None, list[ArchivedSnapshotResult]]:
+    """Pack ``rows`` (id, path, expected checksum) into a new bundle.
+
+    Runs on a worker thread of :func:`bundle_snapshots`.  Snapshots whose
+    file is missing, unreadable or corrupt are logged, reported with
+    ``error`` and left out; the bundle
+    is removed again if no snapshot made it in, or if anything else fails.
+    """
+    results: list[ArchivedSnapshotResult] = []
+    entries: list[dict[str, object]] = []
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        # Ensure we can rollback if something goes wrong (e.g. commit fails).
-        if not conn.in_transaction:
-            conn.execute("BEGIN")
-
-        for snapshot_id, raw_path, expected_checksum in rows:
-            source_path = Path(str(raw_path))
-            archived_path = archive_dir / f"{snapshot_id}_{source_path.name}"
-            try:
-                _ = shutil.copy2(source_path, archived_path)
-            except OSError as exc:  # could be missing/unreadable
-                # continue processing other snapshots but mark failure
+        with zipfile.ZipFile(bundle_path, "x") as zf:
+            for snapshot_id, raw_path, expected_checksum in rows:
+                source_path = Path(str(raw_path))
+                arcname = f"{snapshot_id}_{source_path.name}"
+                try:
+                    entry = _bundle_member(zf, source_path, arcname)
+                except _UNREADABLE_SNAPSHOT_ERRORS as exc:
+                    logger.warning(
+                        "skipping unreadable snapshot %s (id=%s): %s",
+                        source_path,
+                        snapshot_id,
+                        exc,
+                    )
+                    results.append(
+                        {
+                            "id": str(snapshot_id),
+                            "path": str(source_path),
+                            "archived_path": None,
+                            "checksum_ok": False,
+                            "error": str(exc),
+                        }
+                    )
+                    continue
+                entries.append({"snapshot_id": str(snapshot_id), **entry})
+                checksum_ok = (
+                    None
+                    if expected_checksum is None
+                    else entry["sha256"] == str(expected_checksum)
+                )
                 results.append(
                     {
-                        "id": snapshot_id,
+                        "id": str(snapshot_id),
                         "path": str(source_path),
-                        "archived_path": None,
-                        "checksum_ok": False,
-                        "error": str(exc),
+                        "archived_path": str(bundle_path),
+                        "checksum_ok": checksum_ok,
+                        "size_bytes": cast(int, entry["size_bytes"]),
+                        "member": arcname,
+                        "offset": cast(int, entry["offset"]),
                     }
                 )
-                continue
+            write_manifest(zf, entries)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            bundle_path.unlink()
+        raise
 
-            created_archives.append(archived_path)
-
-            actual_checksum = sha256_file(archived_path)
-            if expected_checksum is None:
-                checksum_ok = None
-            else:
-                checksum_ok = actual_checksum == str(expected_checksum)
-
-            # Regardless of checksum result (including unverifiable cases), mark the
-            # row as archived so that the purge logic does not repeatedly attempt to
-            # process the same entry. The `checksum_ok` flag allows callers to
-            # detect and log mismatches or missing metadata.
-            _ = cur.execute(
-                "UPDATE snapshots SET archived = 1, archived_at = ? WHERE id = ?",
-                (now_iso, snapshot_id),
-            )
+    if not entries:
+        with contextlib.suppress(OSError):
+            bundle_path.unlink()
+        return None, results
+    return bundle_path, results
+
+
+def _bundle_groups(
+    rows: list[tuple[object, object, object, object, object]], archive_dir: Path
+) -> dict[Path, list[tuple[object, object, object]]]:
+    """Group (id, ticker, path, checksum, created_at) rows by bundle name."""
+    groups: dict[Path, list[tuple[object, object, object]]] = {}
+    for snapshot_id, ticker, raw_path, checksum, created_at in rows:
+        name = safe_ticker_dirname(str(ticker or ""))
+        month = str(created_at or "")[:7] or "unknown"
+        key = archive_dir / name / f"{name}-{month}.zip"
+        groups.setdefault(key, []).append((snapshot_id, raw_path, checksum))
+    return groups
+
+
+def _written_bundles(
+    futures: list[Future[tuple[Path | None, list[ArchivedSnapshotResult]]]],
+) -> list[Path]:
+    """Bundles written by the futures that completed successfully."""
+    written: list[Path] = []
+    for future in futures:
+        if future.cancelled() or future.exception() is not None:
+            continue
+        bundle_path = future.result()[0]
+        if bundle_path is not None:
+            written.append(bundle_path)
+    return written
+
+
+def bundle_snapshots(
+    conn: sqlite3.Connection,
+    snapshot_ids: list[str],
+    archive_dir: Path,
+) -> list[ArchivedSnapshotResult]:
+    """Archive snapshots into per-ticker, per-month zip bundles.
 
-            results.append(
-                {
-                    "id": snapshot_id,
-                    "path": str(source_path),
-                    "archived_path": str(archived_path),
-                    "checksum_ok": checksum_ok,
-                }
-            )
+    Alternative to :func:`archive_snapshots` that keeps the number of files
+    in ``archive_dir`` low: candidates are grouped by ticker and by the month
+    of ``created_at`` and each group is written to a new bundle
+    ``archive_dir/<TICKER>/<TICKER>-<YYYY-MM>.zip`` (``-2``, ``-3``... when
+    an earlier run already wrote that name) with an embedded
+    ``manifest.json`` listing each member's source path, SHA-256 and row
+    count (see :mod:`src.utils.bundles`).
 
-        conn.commit()
-    except Exception:
-        # Ensure DB state is consistent and remove partially-created archives.
-        logger.exception(
-            "archive_snapshots failed; rolling back DB changes and removing copies"
-        )
-        with contextlib.suppress(Exception):
-            conn.rollback()
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Open connection to the metadata database.
+    snapshot_ids : list[str]
+        List of snapshot IDs (TEXT) that should be archived.
+    archive_dir : Path
+        Directory receiving the bundles.
+
+    Returns
+    -------
+    list of dict
+        Same rows as :func:`archive_snapshots`, where ``archived_path`` is the
+        bundle and ``member``/``offset`` locate the snapshot inside it.
 
-        for p in created_archives:
-            with contextlib.suppress(OSError):
-                p.unlink()
+    Side effects
+    ------------
+    Archived rows get ``archived = 1``, ``archived_at`` and the
+    ``archive_bundle``, ``archive_member`` and ``archive_offset`` columns
+    (migration ``0004``); :func:`restore_archived_snapshot` uses them to
+    extract a single snapshot.  Checksum and rollback semantics follow
+    :func:`archive_snapshots`: bundles are built by ``ARCHIVE_WORKERS``
+    threads and any failure other than an unreadable snapshot rolls the
+    transaction back and removes every bundle written by the call.
+    """
+    if not snapshot_ids:
+        return []
 
-        raise
+    str_ids = [str(i) for i in snapshot_ids]
+    placeholders = ",".join("?" * len(str_ids))
+    cur = conn.cursor()
+    _ = cur.execute(
+        "SELECT id, ticker, snapshot_path, checksum, created_at FROM snapshots "
+        f"WHERE id IN ({placeholders}) ORDER BY created_at ASC",
+        str_ids,
+    )
+    rows = cast(list[tuple[object, object, object, object, object]], cur.fetchall())
+    if not rows:
+        return []
+
+    groups = _bundle_groups(rows, archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    results: list[ArchivedSnapshotResult] = []
+    now_iso = datetime.now(timezone.utc).isoformat()
+    workers = min(get_archive_workers(), len(groups))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bundle") as pool:
+        # names are picked here, on one thread, so workers never race for one
+        futures = [
+            pool.submit(_write_bundle, new_bundle_path(key), members)
+            for key, members in groups.items()
+        ]
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+
+            for future in futures:
+                results.extend(future.result()[1])
+
+            _ = cur.executemany(
+                "UPDATE snapshots SET archived = 1, archived_at = ?, "
+                "archive_bundle = ?, archive_member = ?, archive_offset = ? "
+                "WHERE id = ?",
+                [
+                    (
+                        now_iso,
+                        row["archived_path"],
+                        row.get("member"),
+                        row.get("offset"),
+                        row["id"],
+                    )
+                    for row in results
+                    if row["archived_path"] is not None
+                ],
+            )
+            conn.commit()
+        except Exception:
+            logger.exception(
+                "bundle_snapshots failed; rolling back DB changes and removing bundles"
+            )
+            for future in futures:
+                future.cancel()
+            _ = wait(futures)
+            with contextlib.suppress(Exception):
+                conn.rollback()
+
+            for p in _written_bundles(futures):
+                with contextlib.suppress(OSError):
+                    p.unlink()
+
+            raise
 
     return results
 
 
+def restore_archived_snapshot(
+    conn: sqlite3.Connection, snapshot_id: str, dest: Path
+) -> dict[str, object]:
+    """Extract one bundled snapshot to ``dest`` and verify its checksum.
+
+    Only the snapshot's own member is read from the bundle recorded by
+    :func:`bundle_snapshots`.
+
+    Returns
+    -------
+    dict
+        ``id``, ``path`` (the restored file), ``bundle``, ``member`` and
+        ``checksum_ok`` (``None`` when no checksum was recorded).
+
+    Raises
+    ------
+    LookupError
+        If the snapshot does not exist or was not archived into a bundle.
+    """
+    row = conn.execute(
+        "SELECT archive_bundle, archive_member, checksum FROM snapshots WHERE id = ?",
+        (str(snapshot_id),),
+    ).fetchone()
+    if row is None or row[0] is None:
+        raise LookupError(f"snapshot {snapshot_id!r} is not in an archive bundle")
+    bundle, member, expected_checksum = (str(row[0]), str(row[1]), row[2])
+
+    restored = extract_member(bundle, member, dest)
+    checksum_ok = (
+        None
+        if expected_checksum is None
+        else snapshot_file_checksum(restored) == str(expected_checksum)
+    )
+    return {
+        "id": str(snapshot_id),
+        "path": str(restored),
+        "bundle": bundle,
+        "member": member,
+        "checksum_ok": checksum_ok,
+    }
+
+
 def delete_snapshots(
     conn: sqlite3.Connection,
     snapshot_ids: list[str],  # string IDs matching TEXT column in DB
@@ -300,3 +696,51 @@ def delete_snapshots(
 
     _ = snapshots_db.delete_snapshots(str_ids, conn=conn)
     return results
+
+
+def collect_blob_garbage(
+    root: Path,
+    *,
+    grace_seconds: float = 3600.0,
+    dry_run: bool = False,
+) -> list[dict[str, object]]:
+    """Remove blobs under ``root/objects`` that no file links to anymore.
+
+    Parameters
+    ----------
+    root : Path
+        Directory holding the blob store (snapshot dir, raw root or archive
+        dir).
+    grace_seconds : float
+        Blobs modified more recently than this are kept even if unreferenced,
+        so a writer that just stored a blob and is about to link it is never
+        raced.
+    dry_run : bool
+        Only report the blobs that would be removed.
+
+    Returns
+    -------
+    list[dict[str, object]]
+        One entry per collected blob with ``path`` and ``size_bytes``.
+
+    Notes
+    -----
+    Names are hardlinks to their blob, so the reference count is the inode
+    link count (see :func:`src.utils.blobstore.blob_refcount`); no metadata
+    lookup is needed.  Blobs whose names were deleted, pruned or replaced
+    drop to zero references.
+    """
+    cutoff = time.time() - grace_seconds
+    collected: list[dict[str, object]] = []
+    for blob in iter_blobs(root):
+        try:
+            stat = blob.stat()
+            if blob_refcount(blob) > 0 or stat.st_mtime > cutoff:
+                continue
+            if not dry_run:
+                blob.unlink()
+        except OSError as exc:
+            logger.warning("failed to collect blob %s: %s", blob, exc)
+            continue
+        collected.append({"path": str(blob), "size_bytes": stat.st_size})
+    return collected
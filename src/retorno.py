@@ -14,7 +14,7 @@ import sqlite3
 import time
 import uuid
 from datetime import date, datetime
-from typing import Optional, Tuple, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -57,16 +57,20 @@ def compute_returns(
     qend = _normalize_param(end)
 
     resolved_ticker = ticker
+    read_kwargs: Dict[str, Any] = {}
     if isinstance(repo, DefaultDatabaseClient):
         resolved = _db.resolve_existing_ticker(ticker, conn=conn)
         if resolved is not None:
             resolved_ticker = resolved
+        # only the price column is needed: skip the TEXT metadata columns
+        read_kwargs["columns"] = ["close"]
 
     df_prices = repo.read_prices(
         resolved_ticker,
         start=qstart,
         end=qend,
         conn=conn,
+        **read_kwargs,
     )
     if df_prices.empty:
         return pd.DataFrame() if dry_run else None
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import sqlite3
 import sys
+import time
 from pathlib import Path
 from typing import Any, cast, override
 
@@ -10,21 +11,35 @@ import pandas as pd
 import typer
 
 from src import db
-from src.cli_feedback import CliFeedback
+from src.cli_feedback import CliFeedback, format_duration
+from src.etl.snapshot import latest_snapshot, read_snapshot, snapshot_file_checksum
+from src.ingest.config import get_archive_dir, get_raw_root
 from src.paths import SNAPSHOTS_DIR
+from src.profiling import install_profiling
 from src.retention import (
     archive_snapshots,
+    bundle_snapshots,
     delete_snapshots,
     find_purge_candidates,
     get_retention_days,
 )
 
 app = typer.Typer()
+install_profiling(app)
 
 _PURGE_ARCHIVE_DIR_OPTION = typer.Option(
     None,
     "--archive-dir",
-    help="Diretório para arquivar snapshots ao invés de deletar",
+    help=(
+        "Diretório para arquivar snapshots ao invés de deletar "
+        "(padrão: SNAPSHOT_ARCHIVE_DIR)"
+    ),
+)
+
+_RESTORE_OUTPUT_OPTION = typer.Option(
+    None,
+    "--output",
+    help="Arquivo de destino (padrão: nome original no diretório atual)",
 )
 
 
@@ -74,6 +89,36 @@ def _resolve_snapshot_path(raw_path: str) -> Path:
     return candidate if candidate.is_absolute() else SNAPSHOTS_DIR / candidate
 
 
+def _latest_snapshot_on_disk(ticker: str) -> dict[str, object] | None:
+    """Metadata for the newest snapshot file of ``ticker`` in ``SNAPSHOT_DIR``.
+
+    Fallback for tickers without snapshot rows in the metadata DB (e.g. a
+    snapshot directory restored without its database); the lookup reads
+    only the ticker's shard ``index.json``.
+
+    Parameters
+    ----------
+    ticker : str
+        B3 ticker symbol to locate.
+
+    Returns
+    -------
+    dict[str, object] | None
+        ``ticker``, ``snapshot_path`` and ``checksum`` of the snapshot, or
+        ``None`` when the ticker has no snapshot on disk.
+    """
+    from src.ingest.snapshot_ingest import get_snapshot_dir
+
+    path = latest_snapshot(get_snapshot_dir(), ticker)
+    if path is None:
+        return None
+    return {
+        "ticker": ticker,
+        "snapshot_path": str(path),
+        "checksum": snapshot_file_checksum(path),
+    }
+
+
 def _load_latest_snapshot(
     ticker: str,
     fb: _SnapshotExportFeedback,
@@ -81,6 +126,9 @@ def _load_latest_snapshot(
 ) -> tuple[dict[str, object], pd.DataFrame]:
     """Load metadata and DataFrame for the latest snapshot of a ticker.
 
+    Tickers without snapshot rows in the DB fall back to the newest file in
+    the snapshot directory (see :func:`_latest_snapshot_on_disk`).
+
     Parameters
     ----------
     ticker : str
@@ -105,14 +153,14 @@ def _load_latest_snapshot(
 
     try:
         snapshots = db.list_snapshots(ticker=ticker, archived=False, conn=conn)
-        if not snapshots:
-            fb.error(f"No snapshots found for ticker {ticker}")
-            raise typer.Exit(code=1)
     finally:
         if close_conn and conn is not None:
             conn.close()
 
-    metadata = snapshots[0]
+    metadata = snapshots[0] if snapshots else _latest_snapshot_on_disk(ticker)
+    if metadata is None:
+        fb.error(f"No snapshots found for ticker {ticker}")
+        raise typer.Exit(code=1)
     snapshot_path_raw = metadata.get("snapshot_path")
     if not isinstance(snapshot_path_raw, str) or not snapshot_path_raw.strip():
         fb.error(f"Snapshot metadata has no valid path for {ticker}")
@@ -124,7 +172,7 @@ def _load_latest_snapshot(
         raise typer.Exit(code=1)
 
     try:
-        df = pd.read_csv(snapshot_path)
+        df = read_snapshot(snapshot_path)
     except Exception as exc:
         fb.error(f"Failed to read snapshot file: {exc}")
         raise typer.Exit(code=1) from exc
@@ -238,6 +286,25 @@ def _show_candidates(
         )
 
 
+def _format_throughput(files: int, size_bytes: int, seconds: float) -> str:
+    """Resume a vazão do arquivamento em MB/s e arquivos/s."""
+    seconds = max(seconds, 1e-9)
+    return (
+        f"Vazão: {size_bytes / 1e6 / seconds:.1f} MB/s, "
+        f"{files / seconds:.1f} arquivos/s "
+        f"({size_bytes / 1e6:.1f} MB em {format_duration(seconds)})"
+    )
+
+
+def _default_gc_roots(snapshot_dir: Path) -> list[Path]:
+    """Raízes varridas por ``snapshots gc`` quando ``--root`` não é dado."""
+    roots = [snapshot_dir, get_raw_root()]
+    archive_dir = get_archive_dir()
+    if archive_dir is not None:
+        roots.append(archive_dir)
+    return roots
+
+
 @app.command("purge")
 def purge_snapshots(
     older_than: int | None = typer.Option(
@@ -259,6 +326,14 @@ def purge_snapshots(
         help="Executa exclusão/arquivamento real",
     ),
     archive_dir: Path | None = _PURGE_ARCHIVE_DIR_OPTION,
+    bundle: bool = typer.Option(
+        False,
+        "--bundle",
+        help=(
+            "Com --archive-dir, empacota os snapshots em bundles zip por "
+            "ticker e mês em vez de um arquivo por snapshot"
+        ),
+    ),
 ) -> None:
     """Purge or archive old snapshots based on retention policy.
 
@@ -274,6 +349,11 @@ def purge_snapshots(
         command will warn but exit with no action.
     archive_dir : Path | None
         Optional directory to move snapshots instead of deleting them.
+        Defaults to ``SNAPSHOT_ARCHIVE_DIR`` when set.
+    bundle : bool
+        Archive into per-ticker, per-month zip bundles (see
+        :func:`src.retention.bundle_snapshots`) instead of one file per
+        snapshot.  Requires ``archive_dir``.
 
     Side effects
     ------------
@@ -282,10 +362,15 @@ def purge_snapshots(
     occur.
     """
     feedback = CliFeedback("snapshots purge")
+    if archive_dir is None:
+        archive_dir = get_archive_dir()
 
     if dry_run and confirm:
         feedback.error("--dry-run e --confirm não podem ser usados juntos")
         raise typer.Exit(code=1)
+    if bundle and archive_dir is None:
+        feedback.error("--bundle requer --archive-dir")
+        raise typer.Exit(code=1)
 
     effective_older_than = (
         older_than if older_than is not None else get_retention_days()
@@ -317,11 +402,22 @@ def purge_snapshots(
         ]
 
         if archive_dir is not None:
-            archived = archive_snapshots(
+            started = time.perf_counter()
+            archive = bundle_snapshots if bundle else archive_snapshots
+            archived = archive(
                 conn,
                 snapshot_ids,
                 archive_dir,
             )
+            # failed rows (missing/unreadable files) copied nothing
+            copied = [row for row in archived if row.get("archived_path") is not None]
+            feedback.info(
+                _format_throughput(
+                    len(copied),
+                    sum(int(row.get("size_bytes", 0)) for row in copied),
+                    time.perf_counter() - started,
+                )
+            )
             ok_count = sum(1 for row in archived if row.get("checksum_ok") is True)
             unknown_count = sum(1 for row in archived if row.get("checksum_ok") is None)
             msg = (
@@ -499,3 +595,138 @@ def ingest_snapshot(
 
     feedback.summary("Ingestão de snapshot concluída")
     feedback.json_output(result)
+
+
+@app.command("migrate-layout")
+def migrate_layout(
+    snapshot_dir: Path | None = typer.Option(  # noqa: B008
+        None,
+        "--snapshot-dir",
+        help="Diretório de snapshots (padrão: SNAPSHOT_DIR ou dados/snapshots)",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Lista os movimentos sem alterar arquivos nem o banco",
+    ),
+) -> None:
+    """Converte snapshots do layout plano para ``<TICKER>/<timestamp>.csv``.
+
+    Move cada ``<TICKER>-<timestamp>.csv`` (e seu ``.checksum``) para o
+    diretório do ticker, reconstrói o ``index.json`` de cada shard e
+    atualiza ``snapshot_path`` dos registros correspondentes no banco.
+    """
+    from src.etl.snapshot import migrate_flat_snapshots
+    from src.ingest.snapshot_ingest import get_snapshot_dir
+
+    feedback = CliFeedback("snapshots migrate-layout")
+    target_dir = snapshot_dir or get_snapshot_dir()
+    feedback.start(f"snapshot_dir={target_dir} | dry_run={dry_run}")
+    if not target_dir.is_dir():
+        feedback.error(f"Diretório de snapshots não encontrado: {target_dir}")
+        raise typer.Exit(code=1)
+
+    moves = migrate_flat_snapshots(target_dir, dry_run=dry_run)
+    for old, new in moves:
+        feedback.info(f"{old.name} → {new.relative_to(target_dir)}")
+
+    if dry_run:
+        feedback.success(f"Dry-run concluído: {len(moves)} snapshot(s) a mover")
+        return
+
+    renames = [(str(old.resolve()), str(new.resolve())) for old, new in moves]
+    updated = db.rename_snapshot_paths(renames)
+    feedback.success(
+        f"Migração concluída: {len(moves)} snapshot(s) movido(s), "
+        f"{updated} registro(s) atualizado(s)"
+    )
+
+
+@app.command("gc")
+def gc_blobs(
+    roots: list[Path] | None = typer.Option(  # noqa: B008
+        None,
+        "--root",
+        help=(
+            "Diretório com blob store (objects/); repetível. "
+            "Padrão: SNAPSHOT_DIR, RAW_ROOT e SNAPSHOT_ARCHIVE_DIR"
+        ),
+    ),
+    grace_seconds: float = typer.Option(
+        3600.0,
+        "--grace-seconds",
+        help="Mantém blobs modificados há menos de N segundos",
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Lista os blobs sem removê-los",
+    ),
+) -> None:
+    """Remove blobs deduplicados que nenhum arquivo referencia mais.
+
+    Com ``ARTIFACT_DEDUP`` ativo, snapshots, arquivos raw e cópias
+    arquivadas são hardlinks para blobs em ``<raiz>/objects/``; depois de
+    pruning, purge ou arquivamento os blobs sem nenhum link restante são
+    removidos por este comando.  Sem ``--root`` são varridos o diretório
+    de snapshots, ``RAW_ROOT`` e ``SNAPSHOT_ARCHIVE_DIR`` (quando definido).
+    """
+    from src.ingest.snapshot_ingest import get_snapshot_dir
+    from src.retention import collect_blob_garbage
+
+    feedback = CliFeedback("snapshots gc")
+    targets = roots or _default_gc_roots(get_snapshot_dir())
+    feedback.start(f"raízes={[str(t) for t in targets]} | dry_run={dry_run}")
+
+    total = 0
+    freed = 0
+    for root in targets:
+        collected = collect_blob_garbage(
+            root, grace_seconds=grace_seconds, dry_run=dry_run
+        )
+        for row in collected:
+            feedback.info(str(row["path"]))
+        total += len(collected)
+        freed += sum(int(cast(int, row["size_bytes"])) for row in collected)
+
+    verb = "a remover" if dry_run else "removido(s)"
+    feedback.success(f"{total} blob(s) {verb}, {freed} bytes")
+
+
+@app.command("restore-archived")
+def restore_archived(
+    snapshot_id: str = typer.Option(..., "--id", help="ID do snapshot arquivado"),
+    output: Path | None = _RESTORE_OUTPUT_OPTION,
+) -> None:
+    """Extrai um único snapshot de um bundle de arquivamento.
+
+    Usa o bundle e o membro registrados por ``snapshots purge --bundle``;
+    apenas o membro do snapshot é lido, sem descompactar o bundle inteiro.
+    O checksum do arquivo restaurado é comparado com o dos metadados.
+    """
+    from src.retention import restore_archived_snapshot
+
+    feedback = CliFeedback("snapshots restore-archived")
+    conn = db.connect()
+    try:
+        row = conn.execute(
+            "SELECT snapshot_path FROM snapshots WHERE id = ?", (snapshot_id,)
+        ).fetchone()
+        if row is None:
+            feedback.error(f"snapshot {snapshot_id!r} não encontrado")
+            raise typer.Exit(code=1)
+        dest = output or Path(Path(str(row[0])).name)
+        try:
+            result = restore_archived_snapshot(conn, snapshot_id, dest)
+        except LookupError as exc:
+            feedback.error(str(exc))
+            raise typer.Exit(code=1) from exc
+    finally:
+        conn.close()
+
+    if result["checksum_ok"] is False:
+        feedback.error(f"checksum divergente em {result['path']}")
+        raise typer.Exit(code=1)
+    feedback.success(
+        f"{result['member']} extraído de {result['bundle']} para {result['path']}"
+    )
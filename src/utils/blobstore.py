@@ -0,0 +1,133 @@
+"""Content-addressed blob store for raw files, snapshots and archives.
+
+Each distinct content is stored once under
+``<root>/objects/<checksum[:2]>/<checksum><suffix>`` and every timestamped
+name that holds that content is a hardlink to the blob.  The checksum is the
+SHA256 the rest of the code already records for the artifact (the digest of
+the uncompressed canonical CSV); ``suffix`` is the file encoding (``.csv``,
+``.csv.gz``, ``.parquet`` ...) so the same data stored in two encodings
+does not collide.
+
+Since names are hardlinks, a blob's reference count is its link count minus
+the store's own entry; :func:`src.retention.collect_blob_garbage` removes
+blobs nobody links to anymore.  Writers must keep replacing files
+atomically (temp file + ``os.replace``) instead of editing them in place, as
+an in-place edit would change every name sharing the blob.  When hardlinks
+are not available (e.g. the name is on another filesystem) the blob is
+copied to the name instead.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+OBJECTS_DIRNAME = "objects"
+
+
+def blob_path(root: Union[str, Path], checksum: str, suffix: str = "") -> Path:
+    """Return the location of the blob for *checksum* under *root*."""
+    return Path(root) / OBJECTS_DIRNAME / checksum[:2] / f"{checksum}{suffix}"
+
+
+def blob_refcount(blob: Union[str, Path]) -> int:
+    """Number of names (besides the store entry) linked to *blob*."""
+    return os.stat(blob).st_nlink - 1
+
+
+def iter_blobs(root: Union[str, Path]) -> Iterator[Path]:
+    """Yield every blob stored under *root*."""
+    objects = Path(root) / OBJECTS_DIRNAME
+    if not objects.is_dir():
+        return
+    for fanout in sorted(objects.iterdir()):
+        if fanout.is_dir():
+            yield from sorted(p for p in fanout.iterdir() if p.is_file())
+
+
+def _link(blob: Path, target: Path) -> None:
+    """Atomically make *target* a hardlink (or, failing that, a copy) of *blob*."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{target.name}.", dir=str(target.parent))
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        tmp.unlink()
+        try:
+            os.link(blob, tmp)
+        except OSError as exc:
+            logger.debug("hardlink to %s failed (%s); copying", blob, exc)
+            shutil.copyfile(blob, tmp)
+        os.replace(tmp, target)
+    finally:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def link_existing(
+    root: Union[str, Path], checksum: str, target: Union[str, Path], suffix: str = ""
+) -> bool:
+    """Point *target* at an already stored blob without writing any data.
+
+    Returns ``False`` when no blob exists for *checksum* (or it vanished
+    concurrently), in which case the caller writes the file itself.
+    """
+    blob = blob_path(root, checksum, suffix)
+    if not blob.exists():
+        return False
+    try:
+        _link(blob, Path(target))
+    except FileNotFoundError:
+        return False
+    # refresh the blob mtime so a concurrent GC grace period covers it
+    with contextlib.suppress(OSError):
+        os.utime(blob)
+    return True
+
+
+def store_file(
+    root: Union[str, Path],
+    src: Union[str, Path],
+    checksum: str,
+    target: Union[str, Path],
+    suffix: str = "",
+) -> bool:
+    """Move the freshly written *src* into the store and link *target* to it.
+
+    If a blob for *checksum* already exists, *src* is discarded and *target*
+    points at the existing blob.
+
+    Returns
+    -------
+    bool
+        ``True`` when the content was already stored (deduplicated).
+    """
+    src = Path(src)
+    blob = blob_path(root, checksum, suffix)
+    deduplicated = blob.exists()
+    if deduplicated:
+        src.unlink()
+        with contextlib.suppress(OSError):
+            os.utime(blob)
+    else:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(src, blob)
+    _link(blob, Path(target))
+    return deduplicated
+
+
+__all__ = [
+    "OBJECTS_DIRNAME",
+    "blob_path",
+    "blob_refcount",
+    "iter_blobs",
+    "link_existing",
+    "store_file",
+]
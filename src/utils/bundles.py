@@ -0,0 +1,141 @@
+"""Zip bundles that pack many archived files with an embedded manifest.
+
+A bundle is a regular zip file, so any member can be read on its own
+through the central directory without unpacking the rest; the byte offset of
+each member's local header is also reported for tools that read the file
+directly.  Members are copied in a single pass that hashes their
+(uncompressed) content and counts its lines, and the bundle ends with a
+``manifest.json`` entry describing every member.
+
+Content that is already compressed (gzip/zstd CSV, Parquet, Arrow) is
+stored as is; plain text is deflated.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from src.utils.checksums import copy_content
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def new_bundle_path(path: Union[str, Path]) -> Path:
+    """Return *path*, or ``<stem>-<n><suffix>`` if *path* already exists.
+
+    Bundles are never appended to: every archiving run writes new files, so
+    a failed run can be rolled back by deleting what it created.
+    """
+    path = Path(path)
+    candidate = path
+    n = 1
+    while candidate.exists():
+        n += 1
+        candidate = path.with_name(f"{path.stem}-{n}{path.suffix}")
+    return candidate
+
+
+def add_member(
+    zf: zipfile.ZipFile,
+    src: Union[str, Path],
+    arcname: str,
+    *,
+    compression: Optional[str] = None,
+    deflate: bool = True,
+) -> dict[str, Any]:
+    """Copy *src* into *zf* as *arcname*.
+
+    Parameters
+    ----------
+    zf : zipfile.ZipFile
+        Bundle opened for writing.
+    src : str or Path
+        File to add.  It is opened before the member is created, so a
+        missing or unreadable file raises ``OSError`` without touching the
+        bundle.
+    arcname : str
+        Member name inside the bundle.
+    compression : str, optional
+        Compression of *src* itself (``"gzip"``/``"zstd"``); the content is
+        decompressed for hashing only, the stored bytes are unchanged.
+    deflate : bool
+        Deflate the member; pass ``False`` for already compressed data.
+
+    Returns
+    -------
+    dict
+        ``member``, ``offset`` (local header offset), ``sha256`` and
+        ``lines`` of the uncompressed content, and ``size_bytes`` of *src*.
+    """
+    with open(src, "rb") as source:
+        zinfo = zipfile.ZipInfo.from_file(src, arcname)
+        zinfo.compress_type = zipfile.ZIP_DEFLATED if deflate else zipfile.ZIP_STORED
+        with zf.open(zinfo, "w") as target:
+            digest, lines = copy_content(source, target, compression)  # type: ignore[arg-type]
+    return {
+        "member": arcname,
+        "offset": zinfo.header_offset,
+        "sha256": digest,
+        "lines": lines,
+        "size_bytes": zinfo.file_size,
+    }
+
+
+def write_manifest(zf: zipfile.ZipFile, members: list[dict[str, Any]]) -> None:
+    """Append the ``manifest.json`` entry listing *members*."""
+    payload = {"version": MANIFEST_VERSION, "members": members}
+    zf.writestr(
+        MANIFEST_NAME,
+        json.dumps(payload, indent=2, sort_keys=True),
+        compress_type=zipfile.ZIP_DEFLATED,
+    )
+
+
+def read_manifest(bundle: Union[str, Path]) -> list[dict[str, Any]]:
+    """Return the member entries recorded in the manifest of *bundle*."""
+    with zipfile.ZipFile(bundle) as zf:
+        payload = json.loads(zf.read(MANIFEST_NAME))
+    return list(payload.get("members", []))
+
+
+def extract_member(
+    bundle: Union[str, Path], member: str, dest: Union[str, Path]
+) -> Path:
+    """Extract a single *member* of *bundle* to *dest* atomically.
+
+    Only that member is read and decompressed; ``KeyError`` is raised when
+    the bundle has no such member.
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{dest.name}.", dir=str(dest.parent))
+    try:
+        with (
+            os.fdopen(fd, "wb") as out,
+            zipfile.ZipFile(bundle) as zf,
+            zf.open(member) as src,
+        ):
+            while chunk := src.read(1 << 20):
+                out.write(chunk)
+        os.replace(tmp_name, dest)
+    finally:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+    return dest
+
+
+__all__ = [
+    "MANIFEST_NAME",
+    "add_member",
+    "extract_member",
+    "new_bundle_path",
+    "read_manifest",
+    "write_manifest",
+]
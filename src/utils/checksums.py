@@ -1,15 +1,29 @@
 """Checksum utilities.
 
-Small helpers to compute SHA256 checksums for files and bytes.
+Small helpers to compute SHA256 checksums for files and bytes, and to
+stream a DataFrame's canonical CSV form into a (possibly compressed) file
+while hashing it in the same pass.
+
+:func:`checksum_cached` memoises file digests in a small SQLite store shared
+by every process of the project, so unchanged files are not re-read.
 """
 
+import contextlib
 import hashlib
+import io
 import logging
+import os
+import shutil
+import sqlite3
+import time
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import BinaryIO, Callable, Iterator, List, Optional, Union
 
 import pandas as pd
 
+from src.utils.compression import compression_for_path, open_compressed, wrap_stream
+from src.utils.conversions import as_bool
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,20 +59,273 @@ def sha256_bytes(data: bytes) -> str:
     return h.hexdigest()
 
 
-def serialize_df_bytes(
-    df: pd.DataFrame,
-    *,
-    index: bool = True,
-    date_format: str = "%Y-%m-%dT%H:%M:%S",
-    float_format: str = "%.10g",
-    na_rep: str = "",
-    columns: Optional[List[str]] = None,
-) -> bytes:
-    """Serialize a DataFrame to bytes deterministically.
+def sha256_content(path: Union[str, Path]) -> str:
+    """Return the SHA256 hex digest of the *uncompressed* content of a file.
 
-    This helper is intended to produce a stable CSV bytes representation used
-    both for writing raw files and for computing checksums so that different
-    components generate the same digest when given the same DataFrame.
+    ``.gz``/``.zst`` files are decompressed as a stream (see
+    :func:`src.utils.compression.open_compressed`); any other file is hashed
+    as is, so the result equals :func:`sha256_file` for plain files.
+    """
+    h = hashlib.sha256()
+    with open_compressed(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Files smaller than this are hashed directly: a cache lookup would cost
+# about as much as reading them.
+_CACHE_MIN_SIZE = 256 * 1024
+# Entries are only stored for files whose mtime is older than this, since a
+# file modified within the timestamp granularity could change again without
+# changing its (size, mtime_ns) key.
+_CACHE_RACY_WINDOW_NS = 2_000_000_000
+_checksum_cache_override: Optional[bool] = None
+
+_DIGESTS: dict[str, Callable[[Path], str]] = {
+    "content": sha256_content,
+    "file": sha256_file,
+}
+
+
+def checksum_cache_path() -> Path:
+    """Location of the persistent checksum cache.
+
+    Read from ``CHECKSUM_CACHE_PATH``; defaults to ``checksum_cache.db`` in
+    the data directory (:data:`src.paths.DATA_DIR`).
+    """
+    raw = os.environ.get("CHECKSUM_CACHE_PATH", "").strip()
+    if raw:
+        return Path(raw)
+    from src.paths import DATA_DIR
+
+    return DATA_DIR / "checksum_cache.db"
+
+
+def checksum_cache_enabled() -> bool:
+    """Return whether :func:`checksum_cached` may use the persistent cache.
+
+    :func:`set_checksum_cache_enabled` takes precedence over the
+    ``CHECKSUM_CACHE`` environment variable (default ``true``).
+    """
+    if _checksum_cache_override is not None:
+        return _checksum_cache_override
+    return as_bool(os.environ.get("CHECKSUM_CACHE", "true"))
+
+
+def set_checksum_cache_enabled(enabled: Optional[bool]) -> None:
+    """Force the checksum cache on/off for this process (``None`` resets)."""
+    global _checksum_cache_override
+    _checksum_cache_override = enabled
+
+
+@contextlib.contextmanager
+def checksum_cache_disabled() -> Iterator[None]:
+    """Temporarily hash every file from disk (the ``--no-cache`` switch)."""
+    previous = _checksum_cache_override
+    set_checksum_cache_enabled(False)
+    try:
+        yield
+    finally:
+        set_checksum_cache_enabled(previous)
+
+
+def _open_checksum_cache() -> sqlite3.Connection:
+    path = checksum_cache_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS file_checksums ("
+        "dev INTEGER NOT NULL, ino INTEGER NOT NULL, kind TEXT NOT NULL, "
+        "size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+        "checksum TEXT NOT NULL, path TEXT, "
+        "PRIMARY KEY (dev, ino, kind))"
+    )
+    return conn
+
+
+def _cache_lookup(st: os.stat_result, kind: str) -> Optional[str]:
+    try:
+        with contextlib.closing(_open_checksum_cache()) as conn:
+            row = conn.execute(
+                "SELECT checksum FROM file_checksums WHERE dev = ? AND ino = ? "
+                "AND kind = ? AND size = ? AND mtime_ns = ?",
+                (st.st_dev, st.st_ino, kind, st.st_size, st.st_mtime_ns),
+            ).fetchone()
+    except (sqlite3.Error, OSError) as exc:
+        logger.debug("checksum cache unavailable: %s", exc)
+        return None
+    return None if row is None else str(row[0])
+
+
+def _cache_store(path: Path, st: os.stat_result, kind: str, checksum: str) -> None:
+    try:
+        with contextlib.closing(_open_checksum_cache()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO file_checksums "
+                "(dev, ino, kind, size, mtime_ns, checksum, path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    st.st_dev,
+                    st.st_ino,
+                    kind,
+                    st.st_size,
+                    st.st_mtime_ns,
+                    checksum,
+                    str(path),
+                ),
+            )
+    except (sqlite3.Error, OSError) as exc:
+        logger.debug("checksum cache unavailable: %s", exc)
+
+
+def checksum_cached(
+    path: Union[str, Path],
+    kind: str = "content",
+    compute: Optional[Callable[[Path], str]] = None,
+) -> str:
+    """Return a digest of *path*, reusing the persistent cache when valid.
+
+    Parameters
+    ----------
+    path : str or Path
+        File to hash.
+    kind : str
+        ``"content"`` (:func:`sha256_content`, the default), ``"file"``
+        (:func:`sha256_file`) or any label naming *compute*; entries of
+        different kinds never mix.
+    compute : callable, optional
+        Function computing the digest for a custom *kind*.
+
+    Notes
+    -----
+    Entries are keyed by (device, inode, kind) and only reused while the
+    file's size and ``mtime_ns`` are unchanged; atomic replacements create a
+    new inode and therefore miss.  A file changed while it was being hashed,
+    or modified less than two seconds ago, is hashed but not cached.  Small
+    files bypass the cache.  Any error of the cache itself falls back to
+    hashing the file.  Disable it with ``CHECKSUM_CACHE=false`` or
+    :func:`checksum_cache_disabled`.
+    """
+    path = Path(path)
+    if compute is None:
+        try:
+            compute = _DIGESTS[kind]
+        except KeyError:
+            raise ValueError(
+                f"unknown checksum kind {kind!r}; pass compute= for custom kinds"
+            ) from None
+    if not checksum_cache_enabled():
+        return compute(path)
+    before = path.stat()
+    if before.st_size < _CACHE_MIN_SIZE:
+        return compute(path)
+
+    cached = _cache_lookup(before, kind)
+    if cached is not None:
+        return cached
+    checksum = compute(path)
+    after = path.stat()
+    unchanged = (before.st_ino, before.st_size, before.st_mtime_ns) == (
+        after.st_ino,
+        after.st_size,
+        after.st_mtime_ns,
+    )
+    if unchanged and after.st_mtime_ns < time.time_ns() - _CACHE_RACY_WINDOW_NS:
+        _cache_store(path, after, kind, checksum)
+    return checksum
+
+
+class HashingWriter(io.RawIOBase):
+    """Binary writer that hashes every byte before forwarding it.
+
+    Wrap the (compressing) output stream to get the digest of the
+    uncompressed bytes without a second pass over the written file.
+    Closing the writer does not close the wrapped stream.
+    """
+
+    def __init__(self, target: BinaryIO) -> None:
+        self._target = target
+        self._hash = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:  # type: ignore[override]
+        view = memoryview(b)
+        self._hash.update(view)
+        self._target.write(view)
+        return view.nbytes
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class _TeeReader(io.RawIOBase):
+    """Binary reader that copies every byte it reads into *target*."""
+
+    def __init__(self, source: BinaryIO, target: BinaryIO) -> None:
+        self._source = source
+        self._target = target
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        n = self._source.readinto(b)  # type: ignore[attr-defined]
+        if n:
+            self._target.write(memoryview(b)[:n])
+        return n or 0
+
+
+def copy_content(
+    source: BinaryIO, target: BinaryIO, compression: Optional[str] = None
+) -> tuple[str, int]:
+    """Copy the open *source* stream into *target*, hashing its content.
+
+    The bytes are copied as they are (compressed data stays compressed)
+    while the content — decompressed with *compression* first — is hashed
+    and its lines are counted in the same read.
+
+    Returns
+    -------
+    tuple[str, int]
+        SHA256 hex digest of the uncompressed content and its number of
+        lines (a final line without ``\n`` counts as a line).
+    """
+    h = hashlib.sha256()
+    lines = 0
+    last = b""
+    tee = _TeeReader(source, target)
+    with wrap_stream(tee, "rb", compression) as f:  # type: ignore[arg-type]
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    # copy whatever the decompressor did not need (e.g. trailing frames)
+    shutil.copyfileobj(source, target, 1 << 20)
+    if last not in (b"", b"\n"):
+        lines += 1
+    return h.hexdigest(), lines
+
+
+def copy_sha256_content(src: Union[str, Path], dst: Union[str, Path]) -> str:
+    """Copy *src* to *dst* and return :func:`sha256_content` of the copy.
+
+    The bytes are copied as they are (compressed files stay compressed) and
+    hashed — after stream decompression for ``.gz``/``.zst`` — in the same
+    read, so copying and verifying a file costs one pass over it instead of
+    a copy followed by a re-read.  File metadata is not copied.
+    """
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        digest, _ = copy_content(source, target, compression_for_path(src))
+    return digest
+
+
+def _canonical_csv_frame(
+    df: pd.DataFrame, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Return *df* with sorted columns and rows, as serialized to CSV.
 
     The function may encounter situations where pandas operations cannot be
     performed (e.g. non-sortable columns); in those cases we log a *single*
@@ -111,12 +378,7 @@ def serialize_df_bytes(
 
     # Ordenar pelo índice para tornar a saída determinística entre execuções
     try:
-        csv_str = df_to_serialize.sort_index().to_csv(
-            index=index,
-            date_format=date_format,
-            float_format=float_format,
-            na_rep=na_rep,
-        )
+        return df_to_serialize.sort_index()
     except Exception:
         # sort_index may raise different exception types depending on the
         # DataFrame implementation or test monkeypatching; catch all
@@ -129,14 +391,86 @@ def serialize_df_bytes(
                 "não-determinístico)"
             )
             _non_deterministic_checksum_warned = True
-        csv_str = df_to_serialize.to_csv(
+        return df_to_serialize
+
+
+def serialize_df_bytes(
+    df: pd.DataFrame,
+    *,
+    index: bool = True,
+    date_format: str = "%Y-%m-%dT%H:%M:%S",
+    float_format: str = "%.10g",
+    na_rep: str = "",
+    columns: Optional[List[str]] = None,
+) -> bytes:
+    """Serialize a DataFrame to bytes deterministically.
+
+    This helper is intended to produce a stable CSV bytes representation used
+    both for writing raw files and for computing checksums so that different
+    components generate the same digest when given the same DataFrame.
+    Column and row ordering follow :func:`_canonical_csv_frame`.
+    """
+    csv_str = _canonical_csv_frame(df, columns).to_csv(
+        index=index,
+        date_format=date_format,
+        float_format=float_format,
+        na_rep=na_rep,
+    )
+    return csv_str.encode("utf-8")
+
+
+def write_df_csv(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    *,
+    compression: Optional[str] = None,
+    index: bool = True,
+    date_format: str = "%Y-%m-%dT%H:%M:%S",
+    float_format: str = "%.10g",
+    na_rep: str = "",
+    columns: Optional[List[str]] = None,
+) -> str:
+    """Stream the :func:`serialize_df_bytes` form of *df* into *path*.
+
+    pandas writes the CSV in chunks through a :class:`HashingWriter`, so the
+    digest of the uncompressed bytes is computed while the (optionally
+    ``gzip``/``zstd`` compressed) file is written and the full CSV is never
+    held in memory.  ``compression`` defaults to the one implied by the
+    suffix of *path*.
+
+    Returns
+    -------
+    str
+        SHA256 hex digest of the uncompressed CSV — identical to
+        ``sha256_bytes(serialize_df_bytes(df, ...))``.
+    """
+    frame = _canonical_csv_frame(df, columns)
+    with open_compressed(path, "wb", compression) as raw:
+        writer = HashingWriter(raw)
+        frame.to_csv(
+            writer,
+            mode="wb",
+            encoding="utf-8",
             index=index,
             date_format=date_format,
             float_format=float_format,
             na_rep=na_rep,
         )
-
-    return csv_str.encode("utf-8")
+    return writer.hexdigest()
 
 
-__all__ = ["sha256_file", "sha256_bytes", "serialize_df_bytes"]
+__all__ = [
+    "HashingWriter",
+    "checksum_cache_disabled",
+    "checksum_cache_enabled",
+    "checksum_cache_path",
+    "checksum_cached",
+    "copy_content",
+    "copy_sha256_content",
+    "serialize_df_bytes",
+    "set_checksum_cache_enabled",
+    "sha256_bytes",
+    "sha256_content",
+    "sha256_file",
+    "write_df_csv",
+]
@@ -0,0 +1,129 @@
+"""Compressão opcional (gzip/zstd) de artefatos CSV.
+
+O formato de um arquivo é deduzido do sufixo (``.gz`` ou ``.zst``); os
+arquivos são abertos como fluxos binários, de modo que leitura e escrita
+acontecem em blocos sem materializar o conteúdo inteiro em memória.  zstd
+requer o pacote opcional ``zstandard``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+try:
+    import zstandard  # type: ignore[import]
+except ImportError:  # pragma: no cover - dependency optional
+    zstandard = None
+
+# valores aceitos nas variáveis de ambiente; "none" desativa a compressão
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+# compressão -> sufixo acrescentado ao nome do arquivo
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# nível padrão: bom equilíbrio entre CPU e tamanho para CSV numérico
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+
+def compression_for_path(path: Union[str, Path]) -> Optional[str]:
+    """Compressão indicada pelo sufixo de ``path`` (``None`` se nenhuma)."""
+    suffix = Path(path).suffix.lower()
+    for name, ext in COMPRESSION_SUFFIXES.items():
+        if suffix == ext:
+            return name
+    return None
+
+
+def strip_compression_suffix(path: Union[str, Path]) -> Path:
+    """``path`` sem o sufixo de compressão (``a.csv.gz`` -> ``a.csv``)."""
+    path = Path(path)
+    if compression_for_path(path) is None:
+        return path
+    return path.with_suffix("")
+
+
+def with_compression_suffix(path: Union[str, Path], compression: Optional[str]) -> Path:
+    """Acrescenta o sufixo de ``compression`` a ``path`` (se houver)."""
+    path = Path(path)
+    if not compression:
+        return path
+    return path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError(
+            "compressão 'zstd' requer o pacote opcional 'zstandard' "
+            "(instale com `poetry install -E zstd`)"
+        )
+
+
+@contextlib.contextmanager
+def wrap_stream(
+    raw: BinaryIO, mode: str, compression: Optional[str]
+) -> Iterator[BinaryIO]:
+    """(Des)comprime em blocos o fluxo binário já aberto ``raw``.
+
+    ``raw`` não é fechado ao final.  Com ``compression=None`` o próprio
+    ``raw`` é devolvido.
+    """
+    if mode not in ("rb", "wb"):
+        raise ValueError(f"mode must be 'rb' or 'wb', got {mode!r}")
+    if compression is None:
+        yield raw
+    elif compression == "gzip":
+        with gzip.GzipFile(
+            filename="",
+            mode=mode,
+            compresslevel=_GZIP_LEVEL,
+            fileobj=raw,
+            mtime=0,
+        ) as fh:
+            yield fh  # type: ignore[misc]
+    elif compression == "zstd":
+        _require_zstandard()
+        if mode == "wb":
+            cctx = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+            with cctx.stream_writer(raw, closefd=False) as fh:
+                yield fh
+        else:
+            with zstandard.ZstdDecompressor().stream_reader(raw, closefd=False) as fh:
+                yield fh
+    else:
+        raise ValueError(f"unknown compression {compression!r}")
+
+
+@contextlib.contextmanager
+def open_compressed(
+    path: Union[str, Path],
+    mode: str = "rb",
+    compression: Optional[str] = None,
+) -> Iterator[BinaryIO]:
+    """Abre ``path`` como fluxo binário, (des)comprimindo em blocos.
+
+    ``mode`` é ``"rb"`` ou ``"wb"``.  ``compression`` assume o valor deduzido
+    do sufixo quando omitido (útil para arquivos temporários, cujo nome não
+    termina em ``.gz``/``.zst``).  O gzip é gravado sem nome nem data no
+    cabeçalho para que o mesmo conteúdo gere os mesmos bytes.
+    """
+    if mode not in ("rb", "wb"):
+        raise ValueError(f"mode must be 'rb' or 'wb', got {mode!r}")
+    if compression is None:
+        compression = compression_for_path(path)
+    with open(path, mode) as raw, wrap_stream(raw, mode, compression) as fh:
+        yield fh
+
+
+__all__ = [
+    "COMPRESSIONS",
+    "COMPRESSION_SUFFIXES",
+    "compression_for_path",
+    "open_compressed",
+    "strip_compression_suffix",
+    "with_compression_suffix",
+    "wrap_stream",
+]
@@ -15,6 +15,7 @@ import pandas as pd
 import pytest
 
 from src import db
+from src.adapters.circuit_breaker import reset_circuit_breakers
 from src.adapters.retry_metrics import get_global_metrics
 from src.db_migrator import apply_migrations
 from src.utils.checksums import sha256_file
@@ -53,17 +54,27 @@ def _load_sample_dataframe(ticker: str, start=None, end=None, **kwargs) -> pd.Da
 
 @pytest.fixture(autouse=True)
 def reset_retry_metrics():
-    """Reset the global retry-metrics singleton before every test.
+    """Reset the global retry-metrics singleton (and the per-provider circuit
+    breakers) before every test.
 
     Prevents retry counters from leaking between tests when the same process
     runs the full suite, which could produce non-deterministic assertions in
     tests that inspect retry/failure counts.
     """
     get_global_metrics().reset()
+    reset_circuit_breakers()
     yield
     # reset again after the test so any metric mutations don't bleed into
     # fixtures that run during teardown.
     get_global_metrics().reset()
+    reset_circuit_breakers()
+
+
+@pytest.fixture(autouse=True)
+def isolated_checksum_cache(monkeypatch, tmp_path):
+    """Mantém o cache persistente de checksums fora de `dados/` nos testes."""
+    monkeypatch.setenv("CHECKSUM_CACHE_PATH", str(tmp_path / "checksum_cache.db"))
+    yield
 
 
 @pytest.fixture(autouse=True)
@@ -224,6 +235,7 @@ def isolate_metadata_db(tmp_path, monkeypatch):
     # Use the low-level connector so we can redirect all calls (including
     # ones that import `db.connect` at import-time) to the isolated metadata DB.
     from src.db import connection
+    from src.db.snapshots import clear_last_snapshot_cache
 
     orig_connect = connection._connect
     # initialize DB file and apply migrations
@@ -242,9 +254,13 @@ def isolate_metadata_db(tmp_path, monkeypatch):
         return orig_connect(db_path=db_path, **kw)
 
     monkeypatch.setattr(connection, "_connect", _test_connect)
+    # memoised last-snapshot lookups are keyed by path, and the default (None)
+    # path now points at a different file
+    clear_last_snapshot_cache()
 
     # nothing to close here; connect() returns fresh connections per call
     yield
+    clear_last_snapshot_cache()
 
 
 @pytest.fixture(scope="function")
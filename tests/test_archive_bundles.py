@@ -0,0 +1,190 @@
+"""Tests for bundled (zip) snapshot archiving and single-member restore."""
+
+import sqlite3
+import zipfile
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from src import retention
+from src.db_migrator import apply_migrations
+from src.etl import snapshot as snapshot_module
+from src.utils.bundles import MANIFEST_NAME, read_manifest
+
+SNAPSHOTS = [
+    # id, ticker, created_at, file suffix, rows
+    ("1", "PETR4", "2025-01-03T00:00:00+00:00", ".csv", 3),
+    ("2", "PETR4", "2025-01-20T00:00:00+00:00", ".csv", 5),
+    ("3", "PETR4", "2025-02-02T00:00:00+00:00", ".csv", 2),
+    ("4", "VALE3", "2025-01-07T00:00:00+00:00", ".csv.gz", 4),
+]
+
+
+def _setup(tmp_path):
+    conn = sqlite3.connect(":memory:")
+    apply_migrations(conn)
+    for snapshot_id, ticker, created_at, suffix, rows in SNAPSHOTS:
+        df = pd.DataFrame({"date": range(rows), "close": [1.5] * rows})
+        path = tmp_path / "snaps" / f"{ticker}-{snapshot_id}{suffix}"
+        checksum = snapshot_module.write_snapshot(df, path)
+        conn.execute(
+            "INSERT INTO snapshots (id, ticker, snapshot_path, checksum, "
+            "created_at, archived) VALUES (?, ?, ?, ?, ?, 0)",
+            (snapshot_id, ticker, str(path), checksum, created_at),
+        )
+    conn.commit()
+    return conn, [row[0] for row in SNAPSHOTS]
+
+
+def test_bundles_group_by_ticker_and_month(tmp_path):
+    conn, ids = _setup(tmp_path)
+    archive = tmp_path / "archive"
+
+    results = retention.bundle_snapshots(conn, ids, archive)
+
+    assert all(row["checksum_ok"] is True for row in results)
+    assert sorted(
+        p.relative_to(archive).as_posix() for p in archive.rglob("*.zip")
+    ) == [
+        "PETR4/PETR4-2025-01.zip",
+        "PETR4/PETR4-2025-02.zip",
+        "VALE3/VALE3-2025-01.zip",
+    ]
+
+    manifest = read_manifest(archive / "PETR4" / "PETR4-2025-01.zip")
+    assert [(m["snapshot_id"], m["rows"]) for m in manifest] == [("1", 3), ("2", 5)]
+    (gz_entry,) = read_manifest(archive / "VALE3" / "VALE3-2025-01.zip")
+    assert gz_entry["rows"] == 4
+    assert (
+        gz_entry["sha256"]
+        == conn.execute("SELECT checksum FROM snapshots WHERE id = '4'").fetchone()[0]
+    )
+
+    stored = conn.execute(
+        "SELECT archived, archive_bundle, archive_member, archive_offset "
+        "FROM snapshots WHERE id = '2'"
+    ).fetchone()
+    assert stored[0] == 1
+    with zipfile.ZipFile(stored[1]) as zf:
+        assert zf.getinfo(stored[2]).header_offset == stored[3]
+        assert MANIFEST_NAME in zf.namelist()
+    with open(stored[1], "rb") as fh:
+        fh.seek(stored[3])
+        assert fh.read(4) == b"PK\x03\x04"
+
+
+def test_restore_extracts_a_single_member(tmp_path):
+    conn, ids = _setup(tmp_path)
+    retention.bundle_snapshots(conn, ids, tmp_path / "archive")
+
+    result = retention.restore_archived_snapshot(
+        conn, "4", tmp_path / "restored" / "VALE3-4.csv.gz"
+    )
+
+    assert result["checksum_ok"] is True
+    restored = snapshot_module.read_snapshot(tmp_path / "restored" / "VALE3-4.csv.gz")
+    assert len(restored) == 4
+    with pytest.raises(LookupError):
+        retention.restore_archived_snapshot(conn, "missing", tmp_path / "x.csv")
+
+
+def test_later_runs_write_new_bundles(tmp_path):
+    conn, _ = _setup(tmp_path)
+    archive = tmp_path / "archive"
+    retention.bundle_snapshots(conn, ["1"], archive)
+    retention.bundle_snapshots(conn, ["2"], archive)
+
+    assert sorted(p.name for p in (archive / "PETR4").iterdir()) == [
+        "PETR4-2025-01-2.zip",
+        "PETR4-2025-01.zip",
+    ]
+
+
+def test_missing_file_is_reported_and_left_out(tmp_path):
+    conn, ids = _setup(tmp_path)
+    (tmp_path / "snaps" / "PETR4-1.csv").unlink()
+
+    results = {
+        row["id"]: row for row in retention.bundle_snapshots(conn, ids, tmp_path / "a")
+    }
+
+    assert results["1"]["archived_path"] is None
+    assert "error" in results["1"]
+    assert results["2"]["archived_path"] is not None
+    archived = {
+        r[0] for r in conn.execute("SELECT id FROM snapshots WHERE archived = 1")
+    }
+    assert archived == {"2", "3", "4"}
+
+
+def test_failure_removes_bundles_and_rolls_back(tmp_path, monkeypatch):
+    conn, ids = _setup(tmp_path)
+    archive = tmp_path / "archive"
+    add = retention._bundle_member
+
+    def flaky(zf, source_path, arcname):
+        if source_path.name == "PETR4-3.csv":
+            raise RuntimeError("boom")
+        return add(zf, source_path, arcname)
+
+    monkeypatch.setattr(retention, "_bundle_member", flaky)
+    with pytest.raises(RuntimeError):
+        retention.bundle_snapshots(conn, ids, archive)
+
+    assert list(archive.rglob("*.zip")) == []
+    assert (
+        conn.execute("SELECT COUNT(*) FROM snapshots WHERE archived = 1").fetchone()[0]
+        == 0
+    )
+
+
+def test_purge_bundle_and_restore_cli(purge_test_setup, monkeypatch, tmp_path):
+    from src.main import app
+
+    test_csv, _, _ = purge_test_setup
+    monkeypatch.setenv("SNAPSHOT_RETENTION_DAYS", "90")
+    runner = CliRunner()
+
+    purge = runner.invoke(
+        app,
+        [
+            "snapshots",
+            "purge",
+            "--confirm",
+            "--archive-dir",
+            str(tmp_path / "archive"),
+            "--bundle",
+        ],
+    )
+    assert purge.exit_code == 0, purge.output
+    assert len(list((tmp_path / "archive" / "PETR4").glob("PETR4-*.zip"))) == 1
+
+    out = tmp_path / "restored.csv"
+    restore = runner.invoke(
+        app, ["snapshots", "restore-archived", "--id", "1", "--output", str(out)]
+    )
+    assert restore.exit_code == 0, restore.output
+    assert out.read_bytes() == test_csv.read_bytes()
+
+
+def test_corrupt_columnar_snapshot_is_skipped(tmp_path, caplog):
+    pytest.importorskip("pyarrow")
+    conn, ids = _setup(tmp_path)
+    corrupt = tmp_path / "snaps" / "PETR4-5.parquet"
+    corrupt.write_bytes(b"PAR1 not really parquet PAR1")
+    conn.execute(
+        "INSERT INTO snapshots (id, ticker, snapshot_path, checksum, "
+        "created_at, archived) VALUES ('5', 'PETR4', ?, 'x', ?, 0)",
+        (str(corrupt), "2025-01-25T00:00:00+00:00"),
+    )
+
+    results = {
+        row["id"]: row
+        for row in retention.bundle_snapshots(conn, [*ids, "5"], tmp_path / "a")
+    }
+
+    assert results["5"]["archived_path"] is None
+    assert "error" in results["5"]
+    assert str(corrupt) in caplog.text
+    assert all(results[i]["checksum_ok"] is True for i in ids)
@@ -0,0 +1,128 @@
+"""Tests for single-pass, parallel snapshot archiving."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from src import retention
+from src.db_migrator import apply_migrations
+from src.etl import snapshot as snapshot_module
+from src.ingest.config import get_archive_workers
+from src.utils.checksums import copy_sha256_content, sha256_content
+
+
+def _conn_with_snapshots(tmp_path, count, suffix=".csv"):
+    conn = sqlite3.connect(":memory:")
+    apply_migrations(conn)
+    rows = []
+    for i in range(count):
+        df = pd.DataFrame({"date": ["2026-01-02"], "close": [float(i)]})
+        path = tmp_path / "snaps" / f"PETR4-{i:03d}{suffix}"
+        checksum = snapshot_module.write_snapshot(df, path)
+        rows.append((str(i), "PETR4", str(path), checksum, "x", 0))
+    conn.executemany(
+        "INSERT INTO snapshots (id, ticker, snapshot_path, checksum, "
+        "created_at, archived) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    return conn, [row[0] for row in rows]
+
+
+def _archived_ids(conn):
+    return {
+        row[0] for row in conn.execute("SELECT id FROM snapshots WHERE archived = 1")
+    }
+
+
+def test_copy_hashes_uncompressed_content_in_one_pass(tmp_path):
+    src = tmp_path / "a.csv.gz"
+    checksum = snapshot_module.write_snapshot(pd.DataFrame({"x": range(10_000)}), src)
+    dst = tmp_path / "b.csv.gz"
+
+    assert copy_sha256_content(src, dst) == checksum
+    assert dst.read_bytes() == src.read_bytes()
+    assert sha256_content(dst) == checksum
+
+
+def test_parallel_archive_batches_updates(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARCHIVE_WORKERS", "4")
+    monkeypatch.setattr(retention, "_UPDATE_BATCH_SIZE", 3)
+    conn, ids = _conn_with_snapshots(tmp_path, 10, suffix=".csv.gz")
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    results = retention.archive_snapshots(conn, ids, tmp_path / "archive")
+
+    assert [row["id"] for row in results] == ids
+    assert all(row["checksum_ok"] is True for row in results)
+    assert all(row["size_bytes"] > 0 for row in results)
+    assert _archived_ids(conn) == set(ids)
+    assert sum(s.startswith("UPDATE snapshots") for s in statements) == 4
+
+
+def test_failure_in_a_worker_rolls_back_everything(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARCHIVE_WORKERS", "2")
+    conn, ids = _conn_with_snapshots(tmp_path, 6)
+    archive = tmp_path / "archive"
+    copy = retention.copy_snapshot_file
+
+    def flaky_copy(src, dst):
+        if src.name.endswith("003.csv"):
+            raise RuntimeError("boom")
+        return copy(src, dst)
+
+    monkeypatch.setattr(retention, "copy_snapshot_file", flaky_copy)
+    with pytest.raises(RuntimeError):
+        retention.archive_snapshots(conn, ids, archive)
+
+    assert _archived_ids(conn) == set()
+    assert list(archive.iterdir()) == []
+
+
+def test_invalid_archive_workers_is_rejected(monkeypatch):
+    monkeypatch.setenv("ARCHIVE_WORKERS", "0")
+    with pytest.raises(ValueError):
+        get_archive_workers()
+
+
+def test_purge_reports_throughput(purge_test_setup, monkeypatch, tmp_path):
+    from src.main import app
+
+    monkeypatch.setenv("SNAPSHOT_RETENTION_DAYS", "90")
+    result = CliRunner().invoke(
+        app,
+        ["snapshots", "purge", "--confirm", "--archive-dir", str(tmp_path / "arc")],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "MB/s" in result.output
+    assert "arquivos/s" in result.output
+
+
+def test_throughput_counts_only_archived_files(purge_test_setup, monkeypatch, tmp_path):
+    from src import snapshot_cli
+    from src.main import app
+
+    monkeypatch.setenv("SNAPSHOT_RETENTION_DAYS", "90")
+    rows = [
+        {"id": "1", "archived_path": "a", "checksum_ok": True, "size_bytes": 10},
+        {"id": "2", "archived_path": None, "checksum_ok": False, "error": "gone"},
+    ]
+    monkeypatch.setattr(snapshot_cli, "archive_snapshots", lambda *a: rows)
+    seen = []
+    monkeypatch.setattr(
+        snapshot_cli,
+        "_format_throughput",
+        lambda files, size, seconds: seen.append((files, size)) or "",
+    )
+
+    result = CliRunner().invoke(
+        app,
+        ["snapshots", "purge", "--confirm", "--archive-dir", str(tmp_path / "arc")],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert seen == [(1, 10)]
@@ -0,0 +1,166 @@
+"""Testes do caminho assíncrono: Adapter.fetch_async e ingest_many_async."""
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import src.adapters.factory as factory
+import src.etl.mapper as mapper
+from src.adapters.base import Adapter
+from src.adapters.errors import NetworkError
+from src.ingest import async_pipeline
+
+
+@pytest.fixture(autouse=True)
+def isolate_lock_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    monkeypatch.delenv("INGEST_LOCK_MODE", raising=False)
+    monkeypatch.delenv("INGEST_LOCK_TIMEOUT_SECONDS", raising=False)
+    monkeypatch.delenv("INGEST_CONCURRENCY", raising=False)
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"Open": [1.0], "High": [1.0], "Low": [1.0], "Close": [1.0], "Volume": [1]},
+        index=pd.date_range("2024-01-01", periods=1),
+    )
+
+
+class _FlakyAdapter(Adapter):
+    """Falha com erro de rede nas primeiras ``failures`` chamadas."""
+
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.calls = 0
+
+    def _fetch_once(self, ticker, start, end, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise NetworkError("timeout")
+        return _frame()
+
+    def fetch(self, ticker, **kwargs):  # pragma: no cover - não usado
+        raise AssertionError("use _fetch_with_retries_async")
+
+
+def test_async_retry_uses_non_blocking_sleep(monkeypatch):
+    slept: list[float] = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    def blocking_sleep(seconds):  # pragma: no cover - falha explícita
+        raise AssertionError("time.sleep não deve ser usado no caminho async")
+
+    monkeypatch.setattr("src.adapters.base.asyncio.sleep", fake_sleep)
+    monkeypatch.setattr("src.adapters.base.time.sleep", blocking_sleep)
+    adapter = _FlakyAdapter(failures=2)
+
+    df = asyncio.run(
+        adapter._fetch_with_retries_async(
+            "PETR4.SA",
+            "2024-01-01",
+            "2024-01-02",
+            max_retries=3,
+            backoff_factor=0.01,
+            required_columns=["Open", "Close"],
+        )
+    )
+
+    assert adapter.calls == 3
+    assert len(slept) == 2
+    assert not df.empty
+
+
+def test_sync_only_adapter_runs_in_worker_thread():
+    seen: list[str] = []
+
+    class SyncOnly(Adapter):
+        def fetch(self, ticker, **kwargs):
+            seen.append(threading.current_thread().name)
+            return _frame()
+
+        def _fetch_once(self, ticker, start, end, **kwargs):  # pragma: no cover
+            return _frame()
+
+    df = asyncio.run(SyncOnly().fetch_async("PETR4"))
+
+    assert not df.empty
+    assert seen and seen[0] != threading.main_thread().name
+
+
+def test_yfinance_fetch_async_sets_metadata():
+    from src.adapters.yfinance_adapter import YFinanceAdapter
+
+    df = asyncio.run(YFinanceAdapter(max_retries=1).fetch_async("PETR4"))
+
+    assert df.attrs["ticker"] == "PETR4.SA"
+    assert df.attrs["adapter"] == "YFinanceAdapter"
+
+
+class _SlowAdapter(Adapter):
+    """Registra o pico de fetches simultâneos."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def fetch_async(self, ticker, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if ticker == "FAIL3":
+            raise NetworkError("provider down")
+        return _frame()
+
+    def fetch(self, ticker, **kwargs):  # pragma: no cover - não usado
+        raise AssertionError("ingest_many_async deve usar fetch_async")
+
+    def _fetch_once(self, ticker, start, end, **kwargs):  # pragma: no cover
+        return _frame()
+
+
+def test_ingest_many_async_bounds_concurrency_and_keeps_order(monkeypatch):
+    adapter = _SlowAdapter()
+    monkeypatch.setattr(factory, "get_adapter", lambda name: adapter)
+    monkeypatch.setattr(mapper, "to_canonical", lambda df, **kwargs: df)
+    tickers = [f"T{i:02d}" for i in range(10)] + ["FAIL3"]
+
+    results = async_pipeline.ingest_many(tickers, "dummy", concurrency=3, dry_run=True)
+
+    assert adapter.peak == 3
+    assert [r.get("ticker") for r in results[:-1]] == tickers[:-1]
+    assert all(r["status"] == "success" for r in results[:-1])
+    assert results[-1]["status"] == "error"
+    assert results[-1]["error_code"] == "NETWORK_ERROR"
+
+
+def test_ingest_many_async_runs_ingest_off_the_event_loop(monkeypatch):
+    adapter = _SlowAdapter()
+    monkeypatch.setattr(factory, "get_adapter", lambda name: adapter)
+    loop_threads: list[bool] = []
+
+    def slow_map(df, **kwargs):
+        loop_threads.append(threading.current_thread() is threading.main_thread())
+        time.sleep(0.01)
+        return df
+
+    monkeypatch.setattr(mapper, "to_canonical", slow_map)
+
+    async_pipeline.ingest_many(["A1", "B2"], "dummy", concurrency=2, dry_run=True)
+
+    assert loop_threads == [False, False]
+
+
+def test_concurrency_from_env(monkeypatch):
+    from src.ingest.config import get_ingest_concurrency
+
+    monkeypatch.setenv("INGEST_CONCURRENCY", "4")
+    assert get_ingest_concurrency() == 4
+    monkeypatch.setenv("INGEST_CONCURRENCY", "0")
+    with pytest.raises(ValueError):
+        get_ingest_concurrency()
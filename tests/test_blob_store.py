@@ -0,0 +1,159 @@
+"""Tests for the content-addressed artifact store and its garbage collector."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from src.db_migrator import apply_migrations
+from src.etl import snapshot as snapshot_module
+from src.ingest.raw_storage import save_raw_csv
+from src.retention import archive_snapshots, collect_blob_garbage
+from src.utils import blobstore
+
+T0 = datetime(2026, 3, 2, 10, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def dedup(monkeypatch):
+    monkeypatch.setenv("ARTIFACT_DEDUP", "1")
+    monkeypatch.setattr(snapshot_module, "_snapshot_keep_latest", lambda: 5)
+
+
+def _prices(close=1.0):
+    return pd.DataFrame({"date": ["2026-03-02"], "close": [close], "volume": [10]})
+
+
+def _snapshot(root, minutes, df, checksum=None):
+    path = snapshot_module.sharded_snapshot_path(
+        root, "PETR4", T0 + timedelta(minutes=minutes)
+    )
+    return path, snapshot_module.write_snapshot(df, path, checksum=checksum)
+
+
+def test_identical_snapshots_share_one_blob(tmp_path, monkeypatch):
+    first, checksum = _snapshot(tmp_path, 0, _prices())
+    blob = blobstore.blob_path(tmp_path, checksum, ".csv")
+
+    def no_write(*args, **kwargs):
+        raise AssertionError("unchanged snapshot was rewritten")
+
+    monkeypatch.setattr(snapshot_module, "_write_snapshot_file", no_write)
+    second, again = _snapshot(tmp_path, 1, _prices(), checksum=checksum)
+
+    assert again == checksum
+    assert first.stat().st_ino == second.stat().st_ino == blob.stat().st_ino
+    assert blobstore.blob_refcount(blob) == 2
+    assert list(blobstore.iter_blobs(tmp_path)) == [blob]
+    assert snapshot_module.latest_snapshot(tmp_path, "PETR4") == second
+
+
+def test_identical_raw_pulls_are_hardlinked(tmp_path):
+    df = pd.DataFrame(
+        {"Close": [1.0, 2.0]},
+        index=pd.DatetimeIndex(["2026-03-02", "2026-03-03"], name="Date"),
+    )
+    metas = [
+        save_raw_csv(
+            df,
+            "prov",
+            "PETR4",
+            ts,
+            raw_root=tmp_path,
+            metadata_path=tmp_path / "logs.jsonl",
+        )
+        for ts in ("20260302T000000Z", "20260303T000000Z")
+    ]
+
+    first, second = (Path(m["filepath"]) for m in metas)
+    assert metas[0]["raw_checksum"] == metas[1]["raw_checksum"]
+    assert first.stat().st_ino == second.stat().st_ino
+    assert len(list(blobstore.iter_blobs(tmp_path))) == 1
+
+
+def test_archiving_links_already_archived_content(tmp_path, monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    apply_migrations(conn)
+    rows = []
+    for i in range(2):
+        path = tmp_path / "snaps" / f"PETR4-2026030{i + 1}T000000Z.csv"
+        rows.append(
+            (
+                str(i),
+                "PETR4",
+                str(path),
+                snapshot_module.write_snapshot(_prices(), path),
+                "x",
+                0,
+            )
+        )
+    conn.executemany(
+        "INSERT INTO snapshots (id, ticker, snapshot_path, checksum, "
+        "created_at, archived) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    archive = tmp_path / "archive"
+    archive_snapshots(conn, ["0"], archive)
+
+    def no_copy(*args, **kwargs):
+        raise AssertionError("archived content was copied again")
+
+    monkeypatch.setattr("src.retention.copy_snapshot_file", no_copy)
+    (result,) = archive_snapshots(conn, ["1"], archive)
+
+    assert result["checksum_ok"] is True
+    names = sorted(archive.glob("*.csv"))
+    assert len(names) == 2
+    assert names[0].stat().st_ino == names[1].stat().st_ino
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path):
+    kept, _ = _snapshot(tmp_path, 0, _prices(1.0))
+    dropped, checksum = _snapshot(tmp_path, 1, _prices(2.0))
+    dropped.unlink()
+    orphan = blobstore.blob_path(tmp_path, checksum, ".csv")
+
+    assert collect_blob_garbage(tmp_path) == []  # still inside the grace period
+    planned = collect_blob_garbage(tmp_path, grace_seconds=0, dry_run=True)
+    assert [row["path"] for row in planned] == [str(orphan)]
+    assert orphan.exists()
+
+    from src.main import app
+
+    result = CliRunner().invoke(
+        app,
+        ["snapshots", "gc", "--root", str(tmp_path), "--grace-seconds", "0"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert not orphan.exists()
+    assert kept.exists()
+    assert len(list(blobstore.iter_blobs(tmp_path))) == 1
+
+
+def test_gc_scans_the_configured_archive_dir_by_default(tmp_path, monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    apply_migrations(conn)
+    path = tmp_path / "snaps" / "PETR4-20260301T000000Z.csv"
+    conn.execute(
+        "INSERT INTO snapshots (id, ticker, snapshot_path, checksum, "
+        "created_at, archived) VALUES ('0', 'PETR4', ?, ?, 'x', 0)",
+        (str(path), snapshot_module.write_snapshot(_prices(), path)),
+    )
+    archive = tmp_path / "archive"
+    (result,) = archive_snapshots(conn, ["0"], archive)
+    Path(result["archived_path"]).unlink()
+    (orphan,) = blobstore.iter_blobs(archive)
+
+    monkeypatch.setenv("SNAPSHOT_DIR", str(tmp_path / "snaps"))
+    monkeypatch.setenv("RAW_ROOT", str(tmp_path / "raw"))
+    monkeypatch.setenv("SNAPSHOT_ARCHIVE_DIR", str(archive))
+    from src.main import app
+
+    result = CliRunner().invoke(app, ["snapshots", "gc", "--grace-seconds", "0"])
+
+    assert result.exit_code == 0, result.output
+    assert not orphan.exists()
@@ -0,0 +1,158 @@
+"""Testes do calendário de pregões da B3 e do skip de tickers atualizados."""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import calendar as b3
+from src.db import last_price_date, write_prices
+from src.ingest import async_pipeline
+from src.ingest.pipeline import ingest
+
+
+def test_moving_holidays_follow_easter():
+    assert b3.easter_sunday(2024) == date(2024, 3, 31)
+    assert b3.easter_sunday(2025) == date(2025, 4, 20)
+    holidays = b3.holidays(2025)
+    assert holidays[date(2025, 3, 3)].startswith("Carnaval")
+    assert holidays[date(2025, 3, 4)].startswith("Carnaval")
+    assert holidays[date(2025, 4, 18)] == "Sexta-feira Santa"
+    assert holidays[date(2025, 6, 19)] == "Corpus Christi"
+
+
+def test_local_holidays_by_year():
+    assert date(2021, 1, 25) in b3.holidays(2021)
+    assert date(2022, 1, 25) not in b3.holidays(2022)
+    assert date(2003, 11, 20) not in b3.holidays(2003)
+    assert date(2004, 11, 20) in b3.holidays(2004)
+    assert date(2021, 11, 20) in b3.holidays(2021)
+    assert date(2023, 11, 20) not in b3.holidays(2023)
+    assert date(2024, 11, 20) in b3.holidays(2024)
+
+
+def test_vectorized_trading_day_lookups():
+    days = pd.DatetimeIndex(["2025-03-03", "2025-03-05", "2025-03-08", "2025-12-31"])
+
+    assert list(b3.is_trading_day(days)) == [False, True, False, False]
+    assert b3.is_trading_day("2025-03-05") is True
+    assert b3.next_session(date(2025, 2, 28)) == date(2025, 3, 5)
+    assert b3.previous_session("2026-01-02") == date(2025, 12, 30)
+    assert list(b3.next_session(["2025-12-23", "2025-12-24"])) == [
+        pd.Timestamp("2025-12-26"),
+        pd.Timestamp("2025-12-26"),
+    ]
+
+
+def test_session_counts_match_sessions():
+    sessions = b3.sessions("2025-01-01", "2025-01-10")
+
+    assert list(sessions.strftime("%Y-%m-%d")) == [
+        "2025-01-02",
+        "2025-01-03",
+        "2025-01-06",
+        "2025-01-07",
+        "2025-01-08",
+        "2025-01-09",
+        "2025-01-10",
+    ]
+    assert b3.count_sessions("2025-01-01", "2025-01-10") == 7
+    assert b3.count_sessions("2025-01-10", "2025-01-01") == 0
+    assert b3.count_sessions("2025-01-01", "2025-12-31") == len(
+        b3.sessions("2025-01-01", "2025-12-31")
+    )
+
+
+def test_extra_holidays_from_env(monkeypatch):
+    assert b3.is_trading_day("2025-03-05")
+    monkeypatch.setenv("B3_EXTRA_HOLIDAYS", "2025-03-05")
+    assert not b3.is_trading_day("2025-03-05")
+    assert isinstance(b3.busdaycalendar(), np.busdaycalendar)
+
+
+@pytest.mark.parametrize(
+    ("now", "expected"),
+    [
+        # quarta-feira de cinzas, 17:00 em Brasília: pregão do dia em aberto
+        (datetime(2025, 3, 5, 20, 0, tzinfo=timezone.utc), date(2025, 2, 28)),
+        # mesma data, 19:00 em Brasília: pregão encerrado
+        (datetime(2025, 3, 5, 22, 0, tzinfo=timezone.utc), date(2025, 3, 5)),
+        # sábado
+        (datetime(2025, 3, 8, 15, 0, tzinfo=timezone.utc), date(2025, 3, 7)),
+    ],
+)
+def test_last_closed_session(now, expected):
+    assert b3.last_closed_session(now) == expected
+
+
+def _store_until(ticker: str, last: date) -> None:
+    dates = pd.DatetimeIndex([b3.previous_session(last), pd.Timestamp(last)])
+    df = pd.DataFrame(
+        {
+            "open": 1.0,
+            "high": 1.0,
+            "low": 1.0,
+            "close": 1.0,
+            "volume": 100,
+            "source": "test",
+        },
+        index=pd.DatetimeIndex(dates, name="date"),
+    )
+    write_prices(df, ticker)
+
+
+def _fail_fetch():
+    raise AssertionError("fetch não deveria ser chamado")
+
+
+def test_ingest_skips_ticker_already_at_last_session(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    last_session = b3.last_closed_session()
+    _store_until("PETR4", last_session)
+
+    result = ingest("PETR4", "dummy", fetcher=_fail_fetch)
+
+    assert last_price_date("PETR4.SA") == last_session.isoformat()
+    assert result["status"] == "success"
+    assert result["skipped"] == "up_to_date"
+    assert result["last_session"] == last_session.isoformat()
+
+
+def test_ingest_fetches_when_stale_or_forced(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    _store_until("VALE3", b3.previous_session(b3.last_closed_session()))
+    calls = []
+
+    def fetcher():
+        calls.append(1)
+        raise RuntimeError("provedor fora")
+
+    stale = ingest("VALE3", "dummy", fetcher=fetcher)
+    _store_until("VALE3", b3.last_closed_session())
+    forced = ingest("VALE3", "dummy", force_refresh=True, fetcher=fetcher)
+
+    assert stale["status"] == forced["status"] == "error"
+    assert len(calls) == 2
+
+
+def test_ingest_many_does_not_fetch_up_to_date_tickers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    _store_until("ITUB4", b3.last_closed_session())
+    fetched = []
+
+    class _Adapter:
+        async def fetch_async(self, ticker):
+            fetched.append(ticker)
+            raise RuntimeError("offline")
+
+    monkeypatch.setattr("src.adapters.factory.get_adapter", lambda source: _Adapter())
+
+    results = async_pipeline.ingest_many(["ITUB4", "BBDC4"], "dummy", concurrency=2)
+
+    assert fetched == ["BBDC4"]
+    assert results[0]["skipped"] == "up_to_date"
+    assert results[1]["status"] == "error"
@@ -0,0 +1,139 @@
+"""Tests for the persistent file-checksum cache in ``src.utils.checksums``."""
+
+import contextlib
+import gzip
+import os
+import sqlite3
+import time
+
+import pytest
+
+from src.db_migrator import apply_migrations
+from src.utils import checksums
+
+
+@pytest.fixture(autouse=True)
+def cache_small_files(monkeypatch):
+    monkeypatch.setattr(checksums, "_CACHE_MIN_SIZE", 0)
+    monkeypatch.delenv("CHECKSUM_CACHE", raising=False)
+    checksums.set_checksum_cache_enabled(None)
+
+
+def _write(path, data, age_seconds=60):
+    path.write_bytes(data)
+    old = time.time() - age_seconds
+    os.utime(path, (old, old))
+    return path
+
+
+def _counting(monkeypatch, kind):
+    calls = []
+    real = checksums._DIGESTS[kind]
+
+    def digest(path):
+        calls.append(path)
+        return real(path)
+
+    monkeypatch.setitem(checksums._DIGESTS, kind, digest)
+    return calls
+
+
+def test_unchanged_file_is_not_reread(tmp_path, monkeypatch):
+    path = _write(tmp_path / "a.csv", b"date,close\n2026-01-02,1.0\n")
+    calls = _counting(monkeypatch, "content")
+
+    first = checksums.checksum_cached(path)
+    second = checksums.checksum_cached(path)
+
+    assert first == second == checksums.sha256_file(path)
+    assert len(calls) == 1
+    assert checksums.checksum_cache_path().exists()
+
+
+def test_kinds_are_cached_separately(tmp_path):
+    path = tmp_path / "a.csv.gz"
+    path.write_bytes(gzip.compress(b"date,close\n"))
+    os.utime(path, (time.time() - 60,) * 2)
+
+    assert checksums.checksum_cached(path) == checksums.sha256_bytes(b"date,close\n")
+    assert checksums.checksum_cached(path, "file") == checksums.sha256_file(path)
+    assert checksums.checksum_cached(path, "upper", lambda p: "X") == "X"
+    with pytest.raises(ValueError):
+        checksums.checksum_cached(path, "unknown")
+
+
+def test_modified_and_replaced_files_are_rehashed(tmp_path, monkeypatch):
+    path = _write(tmp_path / "a.csv", b"one\n")
+    calls = _counting(monkeypatch, "content")
+    checksums.checksum_cached(path)
+
+    _write(path, b"two\n", age_seconds=30)
+    assert checksums.checksum_cached(path) == checksums.sha256_bytes(b"two\n")
+
+    # atomic replace with identical size and mtime: only the inode changes
+    st = path.stat()
+    tmp = _write(tmp_path / "a.tmp", b"six\n")
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp, path)
+    assert checksums.checksum_cached(path) == checksums.sha256_bytes(b"six\n")
+    assert len(calls) == 3
+
+
+def test_recently_modified_files_are_not_cached(tmp_path, monkeypatch):
+    path = _write(tmp_path / "a.csv", b"fresh\n", age_seconds=0)
+    calls = _counting(monkeypatch, "content")
+
+    checksums.checksum_cached(path)
+    checksums.checksum_cached(path)
+
+    assert len(calls) == 2
+
+
+def test_small_files_bypass_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(checksums, "_CACHE_MIN_SIZE", 1024)
+    path = _write(tmp_path / "a.csv", b"tiny\n")
+
+    checksums.checksum_cached(path)
+
+    assert not checksums.checksum_cache_path().exists()
+
+
+def test_cache_can_be_disabled(tmp_path, monkeypatch):
+    path = _write(tmp_path / "a.csv", b"data\n")
+    calls = _counting(monkeypatch, "content")
+    checksums.checksum_cached(path)
+
+    with checksums.checksum_cache_disabled():
+        checksums.checksum_cached(path)
+    monkeypatch.setenv("CHECKSUM_CACHE", "false")
+    checksums.checksum_cached(path)
+    monkeypatch.delenv("CHECKSUM_CACHE")
+    checksums.checksum_cached(path)
+
+    assert len(calls) == 3
+
+
+def test_unusable_cache_falls_back_to_hashing(tmp_path, monkeypatch):
+    path = _write(tmp_path / "a.csv", b"data\n")
+    corrupt = tmp_path / "corrupt.db"
+    corrupt.write_bytes(b"not a sqlite database" * 10)
+    monkeypatch.setenv("CHECKSUM_CACHE_PATH", str(corrupt))
+
+    assert checksums.checksum_cached(path) == checksums.sha256_file(path)
+
+    monkeypatch.setenv("CHECKSUM_CACHE_PATH", str(path / "nested" / "cache.db"))
+    assert checksums.checksum_cached(path) == checksums.sha256_file(path)
+
+
+def test_ci_validation_no_cache_flag(tmp_path, monkeypatch):
+    from scripts import ci_validate_checksums
+
+    db_path = tmp_path / "empty.db"
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        apply_migrations(conn)
+    monkeypatch.setenv("DB_PATH", str(db_path))
+    try:
+        assert ci_validate_checksums.main(["--no-cache"]) == 0
+        assert checksums.checksum_cache_enabled() is False
+    finally:
+        checksums.set_checksum_cache_enabled(None)
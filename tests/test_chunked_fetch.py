@@ -0,0 +1,132 @@
+"""Testes da busca de histórico em blocos com checkpoint."""
+
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+
+from src.adapters.base import Adapter
+from src.adapters.chunked import ChunkCheckpoint, ChunkConfig, split_window
+from src.adapters.errors import NetworkError
+from src.adapters.retry_config import RetryConfig
+
+
+def test_split_window_shares_boundaries():
+    assert split_window("2024-01-01", "2024-01-10", 0) == [("2024-01-01", "2024-01-10")]
+    assert split_window("2024-01-01", "2024-01-10", 30) == [
+        ("2024-01-01", "2024-01-10")
+    ]
+    assert split_window("2024-01-01", "2024-01-10", 4) == [
+        ("2024-01-01", "2024-01-05"),
+        ("2024-01-05", "2024-01-09"),
+        ("2024-01-09", "2024-01-10"),
+    ]
+
+
+class _WindowAdapter(Adapter):
+    """Devolve uma linha por dia da janela (fim inclusivo); falha sob demanda."""
+
+    def __init__(self, checkpoint_dir, fail_windows=(), chunk_days=10):
+        super().__init__(
+            retry_config=RetryConfig(
+                max_attempts=2, initial_delay_ms=1, max_delay_ms=1
+            ),
+            chunk_config=ChunkConfig(
+                chunk_days=chunk_days,
+                concurrency=3,
+                checkpoint_dir=str(checkpoint_dir) if checkpoint_dir else None,
+            ),
+        )
+        self.fail_windows = set(fail_windows)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _fetch_once(self, ticker, start, end, **kwargs):
+        with self._lock:
+            self.calls.append((start, end))
+        if start in self.fail_windows:
+            raise ConnectionError("provedor indisponível")
+        idx = pd.date_range(start, end, freq="D", name="Date")
+        idx = idx[idx >= pd.Timestamp("2024-01-08")]  # "IPO": sem dados antes
+        return pd.DataFrame(
+            {
+                "Open": 1.0,
+                "High": 2.0,
+                "Low": 0.5,
+                "Close": [float(d.day) for d in idx],
+                "Volume": 100,
+            },
+            index=idx,
+        )
+
+    def fetch(self, ticker, start_date=None, end_date=None, **kwargs):
+        return self._fetch_chunked(
+            ticker,
+            start_date,
+            end_date,
+            log_context={"ticker": ticker, "provider": "window"},
+            max_retries=self.retry_config.max_attempts,
+        )
+
+    def get_metadata(self):
+        return {"provider": "window"}
+
+
+def test_long_window_is_fetched_in_chunks_and_deduplicated(tmp_path):
+    adapter = _WindowAdapter(tmp_path / "ckpt")
+
+    df = adapter.fetch("PETR4", "2024-01-01", "2024-02-15")
+
+    assert sorted(adapter.calls) == split_window("2024-01-01", "2024-02-15", 10)
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    assert df.index[0] == pd.Timestamp("2024-01-08")  # bloco vazio aceito
+    assert df.index[-1] == pd.Timestamp("2024-02-15")
+    assert len(df) == 39
+    assert not (tmp_path / "ckpt" / "window" / "PETR4").exists()
+
+
+def test_failed_chunk_keeps_checkpoint_and_resume_fetches_only_missing(tmp_path):
+    ckpt = tmp_path / "ckpt"
+    failing = _WindowAdapter(ckpt, fail_windows={"2024-01-21"})
+
+    with pytest.raises(NetworkError):
+        failing.fetch("VALE3", "2024-01-01", "2024-02-15")
+
+    saved = ChunkCheckpoint(ckpt, "window", "VALE3").path
+    assert len(list(saved.glob("*.csv"))) == 4
+    # o bloco que falhou foi repetido isoladamente (max_attempts=2)
+    assert failing.calls.count(("2024-01-21", "2024-01-31")) == 2
+
+    resumed = _WindowAdapter(ckpt)
+    df = resumed.fetch("VALE3", "2024-01-01", "2024-02-15")
+
+    assert resumed.calls == [("2024-01-21", "2024-01-31")]
+    assert len(df) == 39
+    assert not saved.exists()
+
+
+def test_short_window_uses_single_request(tmp_path):
+    adapter = _WindowAdapter(tmp_path, chunk_days=365)
+
+    df = adapter.fetch("ITUB4", "2024-01-01", "2024-02-15")
+
+    assert adapter.calls == [("2024-01-01", "2024-02-15")]
+    assert len(df) == 39
+
+
+def test_async_chunked_fetch_matches_sync(tmp_path):
+    adapter = _WindowAdapter(None)
+
+    df = asyncio.run(
+        adapter._fetch_chunked_async(
+            "BBDC4",
+            "2024-01-01",
+            "2024-02-15",
+            log_context={"provider": "window"},
+            max_retries=1,
+        )
+    )
+
+    assert len(adapter.calls) == 5
+    assert len(df) == 39
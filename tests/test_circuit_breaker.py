@@ -0,0 +1,127 @@
+"""Testes do circuit breaker por provedor (src/adapters/circuit_breaker.py)."""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.adapters import circuit_breaker as cb
+from src.adapters.errors import CircuitOpenError, NetworkError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold_and_probes_after_timeout():
+    clock = _Clock()
+    cfg = cb.CircuitBreakerConfig(failure_threshold=2, reset_timeout_seconds=10)
+    with patch.object(cb, "time", clock):
+        breaker = cb.CircuitBreaker("p", cfg)
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == cb.CLOSED
+        breaker.record_failure()
+        assert breaker.state == cb.OPEN
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        clock.now += 10
+        breaker.before_call()  # sondagem liberada
+        assert breaker.state == cb.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # só uma sondagem por vez
+
+        breaker.record_failure()
+        assert breaker.state == cb.OPEN
+
+        clock.now += 10
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == cb.CLOSED
+        breaker.before_call()
+
+
+def test_disabled_breaker_never_opens():
+    breaker = cb.CircuitBreaker("p", cb.CircuitBreakerConfig(failure_threshold=0))
+    for _ in range(10):
+        breaker.record_failure()
+    breaker.before_call()
+    assert breaker.state == cb.CLOSED
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("ADAPTER_CIRCUIT_FAILURE_THRESHOLD", "7")
+    monkeypatch.setenv("ADAPTER_CIRCUIT_YFINANCE_RESET_TIMEOUT_SECONDS", "2.5")
+    cfg = cb.CircuitBreakerConfig.from_env("yfinance")
+    assert cfg.failure_threshold == 7
+    assert cfg.reset_timeout_seconds == 2.5
+
+
+@patch("src.adapters.yfinance_adapter.web.DataReader")
+@patch("src.adapters.base.time.sleep")
+def test_adapter_fails_fast_once_circuit_opens(
+    mock_sleep, mock_datareader, monkeypatch
+):
+    from src.adapters.yfinance_adapter import YFinanceAdapter
+
+    monkeypatch.setenv("ADAPTER_CIRCUIT_FAILURE_THRESHOLD", "2")
+    mock_datareader.side_effect = ConnectionError("provider down")
+
+    adapter = YFinanceAdapter(max_retries=5)
+    with pytest.raises(CircuitOpenError):
+        adapter.fetch("PETR4")
+    # abriu na 2ª falha: sem esgotar as 5 tentativas
+    assert mock_datareader.call_count == 2
+
+    with pytest.raises(CircuitOpenError):
+        adapter.fetch("VALE3")
+    assert mock_datareader.call_count == 2
+    assert cb.get_circuit_breaker("yfinance").state == cb.OPEN
+
+
+@patch("src.adapters.yfinance_adapter.web.DataReader")
+@patch("src.adapters.base.time.sleep")
+def test_successful_fetch_resets_failure_count(
+    mock_sleep, mock_datareader, monkeypatch
+):
+    from src.adapters.yfinance_adapter import YFinanceAdapter
+
+    monkeypatch.setenv("ADAPTER_CIRCUIT_FAILURE_THRESHOLD", "2")
+    ok = pd.DataFrame(
+        {c: [1.0] for c in ["Open", "High", "Low", "Close", "Adj Close", "Volume"]},
+        index=pd.date_range("2024-01-01", periods=1),
+    )
+    mock_datareader.side_effect = [ConnectionError("blip"), ok, ConnectionError("x")]
+
+    adapter = YFinanceAdapter(max_retries=1)
+    with pytest.raises(NetworkError):
+        adapter.fetch("PETR4")
+    adapter.fetch("PETR4")
+    with pytest.raises(NetworkError):
+        adapter.fetch("PETR4")
+    assert cb.get_circuit_breaker("yfinance").state == cb.CLOSED
+
+
+def test_ingest_result_exposes_circuit_state(monkeypatch, tmp_path):
+    from src.ingest import pipeline
+
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    monkeypatch.setattr(pipeline, "_record_ingest_metadata", lambda meta: None)
+
+    class _Down:
+        def fetch(self, ticker):
+            raise CircuitOpenError("circuito aberto para dummy")
+
+    monkeypatch.setattr("src.adapters.factory.get_adapter", lambda name: _Down())
+
+    result = pipeline.ingest("PETR4", "dummy")
+
+    assert result["status"] == "error"
+    assert result["error_code"] == "CIRCUIT_OPEN"
+    assert result["circuit_state"] == cb.CLOSED
@@ -131,6 +131,31 @@ def test_run_uses_ingest_pipeline(monkeypatch):
     assert len(calls_to_compute) == len(ingest_tickers)
 
 
+def test_run_ingests_concurrently_with_ingest_concurrency(monkeypatch):
+    """Com INGEST_CONCURRENCY, `run` ingere todos os tickers via ingest_many."""
+    batches = []
+
+    def fake_ingest_many(tickers, source, force_refresh=False):
+        batches.append(list(tickers))
+        return [{"status": "success"} for _ in tickers]
+
+    def sequential_ingest(*args, **kwargs):
+        raise AssertionError("ingest sequencial não deveria ser chamado")
+
+    monkeypatch.setenv("INGEST_CONCURRENCY", "2")
+    monkeypatch.setattr("src.ingest.async_pipeline.ingest_many", fake_ingest_many)
+    monkeypatch.setattr("src.ingest.pipeline.ingest", sequential_ingest)
+    monkeypatch.setattr(
+        "src.main._compute_returns_for_ticker", lambda tk, *a, **k: {"rows": 1}
+    )
+
+    result = CliRunner().invoke(app, ["run"])
+
+    assert result.exit_code == 0, result.output
+    assert len(batches) == 1 and len(batches[0]) > 1
+    assert f"sucesso={len(batches[0])}, falhas=0" in result.output
+
+
 def test_compute_returns_single_ticker(monkeypatch):
     """`compute-returns` invoca o helper e imprime linhas geradas."""
     from src.main import app
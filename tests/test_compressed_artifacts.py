@@ -0,0 +1,126 @@
+"""Tests for gzip/zstd compressed raw and snapshot artifacts."""
+
+import gzip
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.adapters.replay import ReplayAdapter
+from src.etl import snapshot as snapshot_module
+from src.ingest.config import get_snapshot_compression
+from src.ingest.raw_storage import save_raw_csv
+from src.ingest_cli import ingest_snapshot
+from src.utils.checksums import (
+    serialize_df_bytes,
+    sha256_bytes,
+    sha256_content,
+    write_df_csv,
+)
+
+
+def _prices():
+    return pd.DataFrame(
+        {
+            "date": ["2026-01-02", "2026-01-05"],
+            "open": [1.0, 2.0],
+            "high": [1.5, 2.5],
+            "low": [0.5, 1.5],
+            "close": [1.2, 2.2],
+            "volume": [10, 20],
+        }
+    )
+
+
+def _require(compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_streamed_checksum_matches_uncompressed_bytes(tmp_path, compression):
+    _require(compression)
+    df = pd.DataFrame({"b": range(50_000), "a": 1.5})
+    expected = sha256_bytes(serialize_df_bytes(df, index=False))
+
+    path = tmp_path / ("x.csv.gz" if compression == "gzip" else "x.csv.zst")
+    digest = write_df_csv(df, path, index=False)
+
+    assert digest == expected
+    assert sha256_content(path) == expected
+    assert path.stat().st_size < len(serialize_df_bytes(df, index=False))
+    assert pd.read_csv(path).shape == (50_000, 2)
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_snapshot_roundtrip(tmp_path, monkeypatch, compression):
+    _require(compression)
+    monkeypatch.setenv("SNAPSHOT_COMPRESSION", compression)
+    df = _prices()
+    plain = snapshot_module.write_snapshot(df, tmp_path / "plain.csv")
+
+    path = snapshot_module.sharded_snapshot_path(
+        tmp_path,
+        "PETR4",
+        pd.Timestamp("2026-01-06T10:00:00Z").to_pydatetime(),
+        compression=get_snapshot_compression(),
+    )
+    checksum = snapshot_module.write_snapshot(df, path)
+
+    assert checksum == plain
+    assert snapshot_module.snapshot_format(path) == "csv"
+    assert snapshot_module.snapshot_file_checksum(path) == plain
+    assert snapshot_module.latest_snapshot(tmp_path, "PETR4") == path
+    assert snapshot_module.read_snapshot(path)["close"].tolist() == [1.2, 2.2]
+
+
+def test_ingest_snapshot_verifies_uncompressed_checksum(tmp_path):
+    from src.db.schema import _ensure_schema
+
+    conn = sqlite3.connect(":memory:")
+    _ensure_schema(conn)
+    path = tmp_path / "snap.csv.gz"
+    snapshot_module.write_snapshot(_prices(), path)
+    kwargs = {"conn": conn, "cache_file": tmp_path / "cache.json"}
+
+    assert ingest_snapshot(path, "VALE3", **kwargs)["processed_rows"] == 2
+
+    # same content, different compressed bytes: still valid
+    content = gzip.decompress(path.read_bytes())
+    path.write_bytes(gzip.compress(content, compresslevel=1))
+    assert (
+        ingest_snapshot(path, "VALE3", force_refresh=True, **kwargs)["cached"] is False
+    )
+
+    path.write_bytes(gzip.compress(content.replace(b"2.2", b"9.9")))
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        ingest_snapshot(path, "VALE3", force_refresh=True, **kwargs)
+
+
+def test_compressed_raw_files_are_replayed(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAW_COMPRESSION", "gzip")
+    idx = pd.date_range("2026-01-02", periods=3, freq="D", name="Date")
+    df = pd.DataFrame({"Close": [1.0, 2.0, 3.0], "Volume": [1, 2, 3]}, index=idx)
+
+    meta = save_raw_csv(
+        df,
+        "yfinance",
+        "PETR4.SA",
+        "20260105T000000Z",
+        raw_root=tmp_path / "raw",
+        metadata_path=tmp_path / "ingest_logs.jsonl",
+    )
+
+    assert meta["status"] == "success"
+    assert meta["filepath"].endswith("PETR4.SA-20260105T000000Z.csv.gz")
+    assert meta["raw_checksum"] == sha256_bytes(
+        serialize_df_bytes(df, index=True, date_format="%Y-%m-%dT%H:%M:%S")
+    )
+    replayed = ReplayAdapter(raw_root=tmp_path / "raw").fetch("PETR4")
+    assert replayed["Close"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_invalid_compression_is_rejected(monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_COMPRESSION", "brotli")
+    with pytest.raises(ValueError):
+        get_snapshot_compression()
@@ -0,0 +1,106 @@
+"""Testes da detecção de lacunas em ``prices`` e do backfill direcionado."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from src import calendar as b3
+from src.db import write_prices
+from src.ingest.gaps import backfill_gaps, find_gaps
+
+
+def _prices(dates) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "open": 1.0,
+            "high": 1.1,
+            "low": 0.9,
+            "close": 1.0,
+            "volume": 100,
+            "source": "test",
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(dates), name="date"),
+    )
+
+
+def _store(ticker, dates, conn=None):
+    write_prices(_prices(dates), ticker, conn=conn)
+
+
+def test_find_gaps_reports_minimal_windows_per_ticker():
+    conn = sqlite3.connect(":memory:")
+    # janeiro/2025: 02, 03, 06, 07, 08, 09, 10 são pregões
+    _store("PETR4", ["2025-01-02", "2025-01-03", "2025-01-08", "2025-01-10"], conn)
+    _store("VALE3", ["2025-01-06", "2025-01-07"], conn)
+
+    gaps = find_gaps(conn=conn)
+
+    assert gaps.to_dict("records") == [
+        {"ticker": "PETR4", "start": "2025-01-06", "end": "2025-01-07", "sessions": 2},
+        {"ticker": "PETR4", "start": "2025-01-09", "end": "2025-01-09", "sessions": 1},
+    ]
+
+
+def test_find_gaps_with_bounds_counts_edges_and_skips_holidays():
+    conn = sqlite3.connect(":memory:")
+    # 03 e 04/03/2025 são Carnaval: não são lacunas
+    _store("ITUB4", ["2025-02-27", "2025-03-06"], conn)
+
+    gaps = find_gaps(["ITUB4.SA"], start="2025-02-26", end="2025-03-10", conn=conn)
+
+    assert gaps[["start", "end", "sessions"]].values.tolist() == [
+        ["2025-02-26", "2025-02-26", 1],
+        ["2025-02-28", "2025-03-05", 2],
+        ["2025-03-07", "2025-03-10", 2],
+    ]
+    assert find_gaps(["BBDC4"], conn=conn).empty
+
+
+def test_backfill_fetches_only_missing_windows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    monkeypatch.setenv("SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setenv("SNAPSHOT_CACHE_FILE", str(tmp_path / "snapshot_cache.db"))
+    _store("WEGE3", ["2025-01-02", "2025-01-08"])
+    calls = []
+
+    class _Adapter:
+        def fetch(self, ticker, start_date=None, end_date=None):
+            calls.append((ticker, start_date, end_date))
+            days = b3.sessions(start_date, b3.previous_session(end_date))
+            frame = _prices(days).rename(columns=str.capitalize)
+            return frame.drop(columns=["Source"])
+
+    monkeypatch.setattr("src.adapters.factory.get_adapter", lambda source: _Adapter())
+
+    gaps = find_gaps()
+    results = backfill_gaps(gaps, "dummy")
+
+    assert calls == [("WEGE3", "2025-01-03", "2025-01-08")]
+    assert [r["status"] for r in results] == ["success"]
+    assert find_gaps().empty
+
+
+@pytest.mark.parametrize("backfill", [False, True])
+def test_gaps_command(tmp_path, monkeypatch, backfill):
+    from src.main import app
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    _store("BBAS3", ["2025-01-02", "2025-01-07"])
+    filled = []
+
+    def fake_backfill(gaps, source):
+        filled.append((gaps["ticker"].tolist(), source))
+        return [{"status": "success", **g} for g in gaps.to_dict("records")]
+
+    monkeypatch.setattr("src.ingest.gaps.backfill_gaps", fake_backfill)
+
+    args = ["gaps", "--ticker", "BBAS3"] + (["--backfill"] if backfill else [])
+    result = CliRunner().invoke(app, args)
+
+    assert result.exit_code == 0, result.output
+    assert "BBAS3: 2025-01-03 → 2025-01-06 (2 pregão(ões))" in result.output
+    assert filled == ([(["BBAS3"], "yfinance")] if backfill else [])
@@ -0,0 +1,107 @@
+"""Testes do pool keep-alive de src/adapters/http_client.py."""
+
+import gzip
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import metrics
+from src.adapters import http_client
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):  # noqa: N802 - API do http.server
+        body = b'{"ok": true}'
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    metrics.reset_batch_metrics()
+    http_client.reset_default_client()
+    yield
+    http_client.reset_default_client()
+    metrics.reset_batch_metrics()
+
+
+def _counter(name, **labels):
+    values = metrics._batch_registry.counter_values(name)
+    return sum(
+        value
+        for key, value in values.items()
+        if all(dict(key).get(k) == v for k, v in labels.items())
+    )
+
+
+def test_reuses_connection_and_decodes_gzip(server):
+    client = http_client.RequestsHTTPClient(http_client.HTTPPoolConfig())
+    host = server.split("//", 1)[1]
+
+    first = client.get(f"{server}/a")
+    second = client.get(f"{server}/b")
+    client.close()
+
+    assert first.json() == {"ok": True}
+    assert second.headers["Content-Encoding"] == "gzip"
+    assert _counter("http_connections_opened_total", host=host) == 1
+    assert _counter("http_requests_total", host=host, status="200") == 2
+    text = metrics.render_textfile()
+    assert f'http_request_ttfb_seconds_count{{host="{host}"}} 2' in text
+    assert f'http_request_duration_seconds_count{{host="{host}"}} 2' in text
+
+
+def test_threads_share_a_bounded_pool(server):
+    cfg = http_client.HTTPPoolConfig(pool_maxsize=2, pool_block=True)
+    client = http_client.RequestsHTTPClient(cfg)
+    host = server.split("//", 1)[1]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        statuses = list(
+            pool.map(lambda i: client.get(f"{server}/{i}").status_code, range(20))
+        )
+    client.close()
+
+    assert statuses == [200] * 20
+    assert _counter("http_connections_opened_total", host=host) <= 2
+
+
+def test_default_client_is_shared():
+    assert http_client.get_default_client() is http_client.get_default_client()
+
+
+def test_pool_config_from_env(monkeypatch):
+    monkeypatch.setenv("HTTP_POOL_MAXSIZE", "32")
+    monkeypatch.setenv("HTTP_POOL_BLOCK", "true")
+
+    cfg = http_client.HTTPPoolConfig.from_env()
+
+    assert cfg.pool_maxsize == 32
+    assert cfg.pool_block is True
+    with pytest.raises(ValueError):
+        http_client.HTTPPoolConfig(pool_maxsize=0)
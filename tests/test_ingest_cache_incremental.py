@@ -115,7 +115,7 @@ def test_cache_hit_for_unchanged_snapshot(tmp_path, monkeypatch):
     r1 = ingest_from_snapshot(df, "TEST", db_path=str(db_path))
     assert not r1["cached"]
     assert r1["rows_processed"] == len(df)
-    assert f"{snap_dir}/TEST-" in r1["snapshot_path"]
+    assert f"{snap_dir}/TEST/" in r1["snapshot_path"]
 
     # second ingestion with identical df should hit cache
     r2 = ingest_from_snapshot(df, "TEST", db_path=str(db_path))
@@ -306,7 +306,7 @@ def test_snapshot_metadata_cache_fallback(tmp_path, monkeypatch, caplog):
     _db.init_db(str(db_path))
 
     call_count = {"n": 0}
-    orig_get = _db.get_last_snapshot_payload
+    orig_get = _db.get_last_snapshot_meta
 
     def fake_get_payload(*args, **kwargs):
         # fail on first call (metadata read) but succeed thereafter
@@ -316,7 +316,7 @@ def test_snapshot_metadata_cache_fallback(tmp_path, monkeypatch, caplog):
         # otherwise delegate to original implementation
         return orig_get(*args, **kwargs)
 
-    monkeypatch.setattr(_db, "get_last_snapshot_payload", fake_get_payload)
+    monkeypatch.setattr(_db, "get_last_snapshot_meta", fake_get_payload)
 
     caplog.set_level("WARNING")
     called = False
@@ -386,21 +386,21 @@ def test_snapshot_retention_policy(monkeypatch, tmp_path, mock_time_progression)
     db.init_db(str(db_path))
 
     initial_ingest_and_assert_not_cached("2026-01-01", db_path)
-    snaps = list((tmp_path / "snaps").glob("RET-*.csv"))
+    snaps = list((tmp_path / "snaps" / "RET").glob("*.csv"))
     assert len(snaps) == 1
 
     initial_ingest_and_assert_not_cached("2026-01-02", db_path)
-    snaps = sorted((tmp_path / "snaps").glob("RET-*.csv"))
+    snaps = sorted((tmp_path / "snaps" / "RET").glob("*.csv"))
     assert len(snaps) == 2
 
     # third ingestion triggers retention; only recent two snapshots remain
     df3 = make_sample_df(["2026-01-03"])
     _ = ingest_from_snapshot(df3, "RET", db_path=str(db_path))
-    snaps = sorted((tmp_path / "snaps").glob("RET-*.csv"))
+    snaps = sorted((tmp_path / "snaps" / "RET").glob("*.csv"))
     assert len(snaps) == 2
 
     # os arquivos .checksum associados também devem ser mantidos e corresponder
-    remaining_checksums = sorted((tmp_path / "snaps").glob("RET-*.csv.checksum"))
+    remaining_checksums = sorted((tmp_path / "snaps" / "RET").glob("*.csv.checksum"))
     assert len(remaining_checksums) == 2
     remaining_csv_stems = {p.name for p in snaps}
     remaining_checksum_stems = {
@@ -0,0 +1,109 @@
+"""Testes do servidor local de market data e do adaptador HTTP."""
+
+import importlib.util
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.adapters.errors import NetworkError
+from src.adapters.factory import get_adapter
+from src.adapters.http_client import RequestsHTTPClient
+from src.adapters.http_market_adapter import HTTPMarketDataAdapter
+from src.adapters.retry_config import RetryConfig
+from src.loadtest import MarketDataServer, MarketServerConfig, synthetic_ohlcv
+
+_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "load_test.py"
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("load_test", _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _fast_retry(max_attempts: int = 2) -> RetryConfig:
+    return RetryConfig(
+        max_attempts=max_attempts,
+        initial_delay_ms=1,
+        max_delay_ms=2,
+        timeout_seconds=5,
+    )
+
+
+def test_synthetic_ohlcv_is_deterministic_per_day():
+    full = synthetic_ohlcv("PETR4", date(2024, 1, 1), date(2024, 1, 31))
+    part = synthetic_ohlcv("PETR4", date(2024, 1, 10), date(2024, 1, 12))
+
+    assert len(full["index"]) == 23  # dias úteis de janeiro/2024
+    offset = full["index"].index("2024-01-10")
+    assert full["data"][offset : offset + 3] == part["data"]
+
+
+def test_adapter_fetches_from_local_server():
+    with MarketDataServer(MarketServerConfig(padding_bytes=64)) as server:
+        adapter = HTTPMarketDataAdapter(
+            base_url=server.url, client=RequestsHTTPClient(), retry_config=_fast_retry()
+        )
+        df = adapter.fetch("VALE3", start_date="2024-03-01", end_date="2024-03-08")
+        stats = server.stats()
+
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+    assert len(df) == 6
+    assert df.index.name == "Date"
+    assert df.attrs["source"] == "http"
+    assert stats["by_status"] == {"200": 1}
+
+
+def test_adapter_retries_rate_limited_requests_then_gives_up():
+    config = MarketServerConfig(rate_limit_rate=1.0, seed=0)
+    with MarketDataServer(config) as server:
+        adapter = HTTPMarketDataAdapter(
+            base_url=server.url,
+            client=RequestsHTTPClient(),
+            retry_config=_fast_retry(3),
+        )
+        with pytest.raises(NetworkError):
+            adapter.fetch("ITUB4", start_date="2024-03-01", end_date="2024-03-08")
+        stats = server.stats()
+
+    assert stats["by_status"] == {"429": 3}
+
+
+def test_http_provider_is_registered(monkeypatch):
+    monkeypatch.setenv("MARKET_DATA_URL", "http://example.invalid:9/")
+    adapter = get_adapter("http")
+
+    assert isinstance(adapter, HTTPMarketDataAdapter)
+    assert adapter.base_url == "http://example.invalid:9"
+
+
+def test_histogram_quantile_uses_bucket_upper_bounds():
+    load_test = _load_script()
+    buckets = [0.1, 0.5, 1.0]
+    cumulative = [50, 95, 99]
+
+    assert load_test.histogram_quantile(buckets, cumulative, 100, 0.5) == 0.1
+    assert load_test.histogram_quantile(buckets, cumulative, 100, 0.95) == 0.5
+    assert load_test.histogram_quantile(buckets, cumulative, 100, 0.999) == float("inf")
+    assert load_test.histogram_quantile(buckets, [0, 0, 0], 0, 0.5) is None
+
+
+def test_load_test_drives_main_run_against_server(tmp_path):
+    load_test = _load_script()
+    tickers = load_test.synthetic_tickers(4)
+
+    report = load_test.run_load_test(
+        tickers,
+        workers=2,
+        config=MarketServerConfig(seed=1),
+        workdir=tmp_path,
+    )
+
+    assert report["failed_workers"] == []
+    assert report["ingested"]["success"] == 4
+    assert report["retry"]["attempts"] == 4
+    assert report["ticker_fetch_latency_seconds"]["count"] == 4
+    assert report["server"]["by_status"] == {"200": 4}
+    assert (tmp_path / "dados" / "data.db").exists()
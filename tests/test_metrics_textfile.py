@@ -0,0 +1,83 @@
+"""Testes do exportador textfile/sink de src.metrics."""
+
+import json
+
+import pytest
+
+from src import metrics
+from src.adapters.retry_metrics import get_global_metrics
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    metrics.reset_batch_metrics()
+    yield
+    metrics.reset_batch_metrics()
+
+
+def test_render_includes_labels_histograms_and_retry_counts():
+    metrics.increment_counter("ingest_rows_total", 10, labels={"ticker": "PETR4"})
+    metrics.increment_counter("ingest_rows_total", 5, labels={"ticker": "VALE3"})
+    metrics.observe_histogram(
+        "pipeline_stage_duration_seconds", 0.2, labels={"stage": "fetch"}
+    )
+    get_global_metrics().record_retry("yfinance")
+
+    text = metrics.render_textfile()
+
+    assert "# TYPE ingest_rows_total counter" in text
+    assert 'ingest_rows_total{ticker="PETR4"} 10' in text
+    assert 'ingest_rows_total{ticker="VALE3"} 5' in text
+    assert 'pipeline_stage_duration_seconds_bucket{stage="fetch",le="0.1"} 0' in text
+    assert 'pipeline_stage_duration_seconds_bucket{stage="fetch",le="0.25"} 1' in text
+    assert 'pipeline_stage_duration_seconds_count{stage="fetch"} 1' in text
+    assert 'adapter_fetch_retries_total{provider="yfinance"} 1' in text
+
+
+def test_cache_hit_ratio_is_derived():
+    metrics.record_cache_lookup("snapshot_ingest", True)
+    metrics.record_cache_lookup("snapshot_ingest", True)
+    metrics.record_cache_lookup("snapshot_ingest", False)
+    metrics.record_cache_lookup("snapshot_ingest", False)
+
+    text = metrics.render_textfile()
+
+    assert 'cache_hit_ratio{cache="snapshot_ingest"} 0.5' in text
+
+
+def test_label_values_are_escaped():
+    metrics.set_gauge("weird", 1, labels={"path": 'a"b\\c\nd'})
+    assert 'weird{path="a\\"b\\\\c\\nd"} 1' in metrics.render_textfile()
+
+
+def test_write_textfile_is_atomic_and_leaves_no_tmp(tmp_path):
+    metrics.increment_counter("ingest_rows_total", 1, labels={"ticker": "PETR4"})
+    dest = tmp_path / "textfile" / "b3.prom"
+
+    metrics.write_textfile(dest)
+
+    assert 'ingest_rows_total{ticker="PETR4"} 1' in dest.read_text()
+    assert [p.name for p in dest.parent.iterdir()] == ["b3.prom"]
+
+
+def test_exporter_stop_flushes_textfile_and_appends_sink(tmp_path):
+    prom = tmp_path / "run.prom"
+    sink = tmp_path / "metrics.jsonl"
+    exporter = metrics.TextfileExporter(prom, interval=0, sink=sink).start()
+    metrics.increment_counter("returns_rows_total", 3, labels={"ticker": "ITUB3"})
+
+    exporter.stop()
+    exporter.stop()  # idempotente
+
+    text = prom.read_text()
+    assert "batch_run_duration_seconds" in text
+    assert 'returns_rows_total{ticker="ITUB3"} 3' in text
+    records = [json.loads(line) for line in sink.read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]["counters"]["returns_rows_total"][0]["value"] == 3
+
+
+def test_start_exporters_from_env_without_config_is_noop(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_TEXTFILE", raising=False)
+    monkeypatch.delenv("METRICS_SINK_FILE", raising=False)
+    assert metrics.start_exporters_from_env() is None
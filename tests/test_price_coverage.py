@@ -0,0 +1,121 @@
+"""Tests for the per-ticker ``price_coverage`` index table."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import src.db as dbmod
+from src.ingest import snapshot_ingest
+
+
+def _prices(dates, close=1.0):
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 100,
+            "source": "test",
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(dates), name="date"),
+    )
+
+
+def test_write_prices_maintains_coverage():
+    conn = sqlite3.connect(":memory:")
+    dbmod.write_prices(_prices(["2024-01-02", "2024-01-03"]), "PETR4.SA", conn=conn)
+    dbmod.write_prices(
+        _prices(["2024-01-03", "2024-01-04"], close=2.0),
+        "PETR4",
+        conn=conn,
+        fetched_at="2024-01-05T00:00:00Z",
+    )
+
+    cov = dbmod.get_price_coverage("PETR4.SA", conn=conn)
+    newest = conn.execute(
+        "SELECT raw_checksum FROM prices WHERE ticker = 'PETR4' AND date = ?",
+        ("2024-01-04",),
+    ).fetchone()[0]
+
+    assert cov == {
+        "ticker": "PETR4",
+        "min_date": "2024-01-02",
+        "max_date": "2024-01-04",
+        "row_count": 3,
+        "last_fetched_at": "2024-01-05T00:00:00Z",
+        "last_checksum": newest,
+    }
+    assert dbmod.last_price_date("PETR4", conn=conn) == "2024-01-04"
+    assert dbmod.resolve_existing_ticker("PETR4.SA", conn=conn) == "PETR4"
+    assert dbmod.list_price_tickers(conn=conn) == ["PETR4"]
+
+
+def test_prices_and_coverage_share_the_transaction():
+    conn = sqlite3.connect(":memory:")
+    dbmod.write_prices(_prices(["2024-01-02"]), "VALE3", conn=conn)
+    conn.execute(
+        "CREATE TRIGGER boom BEFORE UPDATE ON price_coverage "
+        "BEGIN SELECT RAISE(ABORT, 'boom'); END"
+    )
+
+    with pytest.raises(sqlite3.IntegrityError):
+        dbmod.write_prices(_prices(["2024-01-03"]), "VALE3", conn=conn)
+
+    # the price upsert was rolled back together with the coverage refresh
+    assert len(dbmod.read_prices("VALE3", conn=conn)) == 1
+    cov = dbmod.get_price_coverage("VALE3", conn=conn)
+    assert (cov["max_date"], cov["row_count"]) == ("2024-01-02", 1)
+
+
+def test_coverage_backfilled_and_falls_back_to_prices():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE prices (ticker TEXT, date DATE, open REAL, high REAL, "
+        "low REAL, close REAL, volume INTEGER, source TEXT, fetched_at TEXT, "
+        "raw_checksum TEXT, PRIMARY KEY (ticker, date))"
+    )
+    conn.executemany(
+        "INSERT INTO prices (ticker, date, close, source) VALUES (?, ?, ?, 'raw')",
+        [("ITUB4", "2023-01-02", 1.0), ("ITUB4", "2023-01-03", 1.1)],
+    )
+    # no coverage table yet: readers aggregate prices directly
+    assert dbmod.list_price_tickers(conn=conn) == ["ITUB4"]
+    assert dbmod.last_price_date("ITUB4", conn=conn) == "2023-01-03"
+
+    dbmod.write_prices(_prices(["2023-01-04"]), "BBDC4", conn=conn)
+    backfilled = dbmod.get_price_coverage("ITUB4", conn=conn)
+    assert (backfilled["row_count"], backfilled["last_checksum"]) == (2, None)
+
+    # rows inserted with plain SQL after the backfill are still resolvable
+    conn.execute(
+        "INSERT INTO prices (ticker, date, close, source) "
+        "VALUES ('WEGE3', '2023-01-05', 1.0, 'raw')"
+    )
+    assert dbmod.resolve_existing_ticker("WEGE3", conn=conn) == "WEGE3"
+    assert dbmod.list_price_tickers(conn=conn) == ["BBDC4", "ITUB4"]
+
+
+def test_incremental_ingest_reads_only_the_overlapping_window(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "prices.db")
+    dbmod.write_prices(
+        _prices(["2024-01-02", "2024-01-03", "2024-01-04"]), "WEGE3", db_path=db_path
+    )
+    reads = []
+    real_read = dbmod.read_prices
+
+    def spy(ticker, start=None, end=None, **kwargs):
+        reads.append((start, end))
+        return real_read(ticker, start=start, end=end, **kwargs)
+
+    monkeypatch.setattr(dbmod, "read_prices", spy)
+
+    appended = _prices(["2024-01-05", "2024-01-08"])
+    assert snapshot_ingest._run_incremental_ingest(appended, "WEGE3", db_path) == 2
+    overlap = _prices(["2024-01-04", "2024-01-09"], close=3.0)
+    assert snapshot_ingest._run_incremental_ingest(overlap, "WEGE3", db_path) == 2
+
+    assert reads == [("2024-01-04", "2024-01-08")]
+    cov = dbmod.get_price_coverage("WEGE3", db_path=db_path)
+    assert (cov["max_date"], cov["row_count"]) == ("2024-01-09", 6)
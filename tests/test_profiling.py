@@ -0,0 +1,95 @@
+"""Testes da opção global ``--profile`` (src/profiling.py)."""
+
+import pstats
+
+import pytest
+from typer.testing import CliRunner
+
+from src import profiling
+from src.main import app
+
+
+@pytest.fixture(autouse=True)
+def _no_active_session():
+    yield
+    # garante que uma falha no meio do teste não vaze a sessão global
+    session = profiling.get_active_session()
+    if session is not None:
+        profiling.stop_session(session)
+
+
+def _fake_ingest(ticker, source="yfinance", dry_run=False, force_refresh=False):
+    with profiling.stage("fetch"):
+        _ = [0] * 10_000
+    return {"status": "success"}
+
+
+def _fake_compute(ticker, *args, **kwargs):
+    with profiling.stage("compute_returns"):
+        pass
+    return {"rows": 1, "persisted": True, "sample_df": None}
+
+
+def test_profile_writes_pstats_and_summary(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.ingest.pipeline.ingest", _fake_ingest)
+    monkeypatch.setattr("src.main._compute_returns_for_ticker", _fake_compute)
+    out = tmp_path / "run.pstats"
+
+    result = CliRunner().invoke(
+        app, ["--profile-out", str(out), "--profile-top", "5", "run"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert out.exists()
+    # o arquivo deve ser carregável pelo módulo pstats
+    assert pstats.Stats(str(out)).total_calls > 0
+    summary = out.with_suffix(".txt").read_text(encoding="utf-8")
+    assert "command: run" in summary
+    assert "cumulative" in summary
+    assert profiling.get_active_session() is None
+
+
+def test_profile_default_path_under_metadata(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("src.main._compute_returns_for_ticker", _fake_compute)
+
+    result = CliRunner().invoke(app, ["--profile", "compute-returns", "PETR4"])
+
+    assert result.exit_code == 0, result.output
+    produced = list((tmp_path / "metadata" / "profiles").glob("*.pstats"))
+    assert len(produced) == 1
+    assert produced[0].name.startswith("compute-returns-")
+
+
+def test_profile_memory_reports_stages(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.ingest.pipeline.ingest", _fake_ingest)
+    monkeypatch.setattr("src.main._compute_returns_for_ticker", _fake_compute)
+    out = tmp_path / "mem"
+
+    result = CliRunner().invoke(
+        app, ["--profile-memory", "--profile-out", str(out), "run"]
+    )
+
+    assert result.exit_code == 0, result.output
+    summary = (tmp_path / "mem.txt").read_text(encoding="utf-8")
+    assert "peak_memory_bytes:" in summary
+    fetch_line = next(ln for ln in summary.splitlines() if ln.startswith("fetch"))
+    # três tickers padrão → três chamadas e pico > 0
+    assert int(fetch_line.split()[1]) >= 1
+    assert int(fetch_line.split()[-1]) > 0
+    assert "compute_returns" in summary
+
+
+def test_stage_is_noop_without_session():
+    with profiling.stage("anything"):
+        pass
+    assert profiling.get_active_session() is None
+
+
+def test_nested_session_is_ignored(tmp_path):
+    outer = profiling.start_session(tmp_path / "outer.pstats", command="outer")
+    assert outer is not None
+    assert profiling.start_session(tmp_path / "inner.pstats") is None
+    profiling.stop_session(outer)
+    assert (tmp_path / "outer.pstats").exists()
+    assert not (tmp_path / "inner.pstats").exists()
@@ -0,0 +1,142 @@
+"""Testes do token bucket por provedor (src/adapters/rate_limiter.py)."""
+
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.adapters import rate_limiter as rl
+from src.adapters.errors import RateLimitError
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiters():
+    rl.reset_rate_limiters()
+    yield
+    rl.reset_rate_limiters()
+
+
+class _FakeClock:
+    """Relógio controlado: ``sleep`` apenas avança o tempo."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_config_from_env_prefers_provider_specific(monkeypatch):
+    monkeypatch.setenv("ADAPTER_RATE_LIMIT_RPS", "1")
+    monkeypatch.setenv("ADAPTER_RATE_LIMIT_BURST", "3")
+    monkeypatch.setenv("ADAPTER_RATE_LIMIT_YFINANCE_RPS", "5")
+
+    cfg = rl.RateLimitConfig.from_env("yfinance")
+
+    assert cfg.rate_per_second == 5
+    assert cfg.burst == 3
+    assert cfg.enabled
+    assert rl.RateLimitConfig.from_env("other").rate_per_second == 1
+
+
+def test_invalid_config_rejected():
+    with pytest.raises(ValueError):
+        rl.RateLimitConfig(rate_per_second=-1)
+    with pytest.raises(ValueError):
+        rl.RateLimitConfig(rate_per_second=1, burst=0)
+
+
+def test_disabled_by_default_returns_noop(monkeypatch):
+    monkeypatch.delenv("ADAPTER_RATE_LIMIT_RPS", raising=False)
+    assert isinstance(rl.get_rate_limiter("yfinance"), rl.NoopRateLimiter)
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = _FakeClock()
+    with patch.object(rl, "time", clock):
+        bucket = rl.TokenBucket("p", rl.RateLimitConfig(rate_per_second=2, burst=2))
+        waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5)
+    assert waits[3] == pytest.approx(0.5)
+
+
+def test_token_bucket_raises_when_wait_exceeds_max():
+    clock = _FakeClock()
+    cfg = rl.RateLimitConfig(rate_per_second=0.1, burst=1, max_wait_seconds=1)
+    with patch.object(rl, "time", clock):
+        bucket = rl.TokenBucket("p", cfg)
+        bucket.acquire()
+        with pytest.raises(RateLimitError):
+            bucket.acquire()
+
+
+def test_token_bucket_is_thread_safe():
+    cfg = rl.RateLimitConfig(rate_per_second=1000, burst=1000)
+    with patch.object(rl, "time", _FakeClock()):
+        bucket = rl.TokenBucket("p", cfg)
+        threads = [
+            threading.Thread(target=lambda: [bucket.acquire() for _ in range(100)])
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    # relógio parado: 800 reservas a partir de 1000 tokens sem perda de updates
+    assert bucket._tokens == pytest.approx(200)
+
+
+def test_shared_bucket_persists_state_between_instances(tmp_path):
+    clock = _FakeClock()
+    cfg = rl.RateLimitConfig(rate_per_second=1, burst=1, shared=True)
+    with patch.object(rl, "time", clock):
+        first = rl.SharedTokenBucket("yfinance", cfg, state_dir=tmp_path)
+        second = rl.SharedTokenBucket("yfinance", cfg, state_dir=tmp_path)
+        assert first.acquire() == 0.0
+        # outra instância (simulando outro processo) enxerga o saldo consumido
+        assert second.acquire() == pytest.approx(1.0)
+
+    assert (tmp_path / "ratelimit-yfinance.json").exists()
+
+
+@patch("src.adapters.yfinance_adapter.web.DataReader")
+def test_adapter_acquires_token_before_each_fetch(mock_datareader, monkeypatch):
+    from src.adapters.yfinance_adapter import YFinanceAdapter
+
+    acquired: list[str] = []
+
+    class _Recorder:
+        def acquire(self) -> float:
+            acquired.append("token")
+            return 0.0
+
+    monkeypatch.setattr(
+        "src.adapters.base.get_rate_limiter", lambda provider: _Recorder()
+    )
+    mock_datareader.return_value = pd.DataFrame(
+        {
+            "Open": [1.0],
+            "High": [1.0],
+            "Low": [1.0],
+            "Close": [1.0],
+            "Adj Close": [1.0],
+            "Volume": [10],
+        },
+        index=pd.date_range("2024-01-01", periods=1),
+    )
+
+    YFinanceAdapter(max_retries=1).fetch("PETR4")
+
+    assert acquired == ["token"]
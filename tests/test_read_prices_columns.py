@@ -0,0 +1,78 @@
+"""Tests for column projection and typed decoding in ``read_prices``."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.db as dbmod
+from src.retorno import compute_returns
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    df = pd.DataFrame(
+        {
+            "open": [10.0, 11.0, 12.0],
+            "high": [10.5, 11.5, 12.5],
+            "low": [9.5, 10.5, 11.5],
+            "close": [10.0, 11.0, 12.1],
+            "volume": [100, 200, 300],
+            "source": "test",
+        },
+        index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"], name="date"),
+    )
+    dbmod.write_prices(df, "PETR4", conn=conn)
+    yield conn
+    conn.close()
+
+
+def test_projection_selects_only_requested_columns(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    out = dbmod.read_prices(
+        "PETR4.SA", start="2024-01-03", conn=conn, columns=["close"]
+    )
+
+    assert list(out.columns) == ["close"]
+    assert out["close"].tolist() == [11.0, 12.1]
+    select = next(s for s in statements if s.startswith("SELECT"))
+    assert select.startswith('SELECT "date", "close" FROM prices')
+
+
+def test_columns_are_decoded_with_schema_dtypes(conn):
+    out = dbmod.read_prices("PETR4", conn=conn)
+
+    assert out.index.dtype == np.dtype("datetime64[ns]")
+    assert out.index.name == "date"
+    assert out["close"].dtype == np.float64
+    assert out["volume"].dtype == np.int64
+    assert out["source"].dtype == object
+
+
+def test_null_integers_fall_back_to_float(conn):
+    conn.execute("UPDATE prices SET volume = NULL WHERE date = '2024-01-03'")
+
+    out = dbmod.read_prices("PETR4", conn=conn, columns=["volume"])
+
+    assert out["volume"].dtype == np.float64
+    assert np.isnan(out.loc["2024-01-03", "volume"])
+
+
+def test_unknown_column_is_rejected(conn):
+    with pytest.raises(ValueError):
+        dbmod.read_prices("PETR4", conn=conn, columns=["close", "nope"])
+
+
+def test_compute_returns_reads_only_the_price_column(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    out = compute_returns("PETR4", conn=conn, dry_run=True)
+
+    assert out["return_value"].round(4).tolist() == [0.1, 0.1]
+    select = next(s for s in statements if "FROM prices WHERE ticker IN" in s)
+    assert select.startswith('SELECT "date", "close" FROM prices')
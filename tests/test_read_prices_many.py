@@ -0,0 +1,120 @@
+"""Tests for the multi-ticker ``read_prices_many`` panel API."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import src.db as dbmod
+import src.db.prices as prices_mod
+from src.db_client import DatabaseClient, DefaultDatabaseClient
+
+
+def _prices(dates, close):
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 100,
+            "source": "test",
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(dates), name="date"),
+    )
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    dbmod.write_prices(_prices(["2024-01-02", "2024-01-03"], 10.0), "PETR4", conn=conn)
+    dbmod.write_prices(_prices(["2024-01-03", "2024-01-04"], 20.0), "VALE3", conn=conn)
+    # legacy row stored under the provider spelling
+    conn.execute(
+        "INSERT INTO prices (ticker, date, close, source, fetched_at, raw_checksum) "
+        "VALUES ('ITUB4.SA', '2024-01-02', 30.0, 'legacy', '', '')"
+    )
+    yield conn
+    conn.close()
+
+
+def test_long_frame_projects_requested_columns(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    df = dbmod.read_prices_many(
+        ["PETR4.SA", "VALE3", "ITUB4"], start="2024-01-03", columns=["close"], conn=conn
+    )
+
+    assert list(df.columns) == ["date", "ticker", "close"]
+    assert df[["ticker", "close"]].values.tolist() == [
+        ["PETR4", 10.0],
+        ["VALE3", 20.0],
+        ["VALE3", 20.0],
+    ]
+    selects = [s for s in statements if s.startswith("SELECT")]
+    assert len(selects) == 1
+    assert selects[0].startswith('SELECT "date", "ticker", "close" FROM prices')
+
+
+def test_wide_panel_for_a_field(conn):
+    panel = dbmod.read_prices_many(
+        ["PETR4", "VALE3", "ITUB4"], field="close", conn=conn
+    )
+
+    assert list(panel.columns) == ["ITUB4", "PETR4", "VALE3"]
+    expected = pd.DataFrame(
+        {
+            "ITUB4": [30.0, None, None],
+            "PETR4": [10.0, 10.0, None],
+            "VALE3": [None, 20.0, 20.0],
+        },
+        index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"], name="date"),
+    )
+    pd.testing.assert_frame_equal(panel, expected)
+
+
+def test_real_values_in_integer_columns_are_not_truncated(conn):
+    conn.execute("UPDATE prices SET volume = 100.5 WHERE ticker = 'VALE3'")
+
+    df = dbmod.read_prices_many(["PETR4", "VALE3"], columns=["volume"], conn=conn)
+    ints = dbmod.read_prices_many(["PETR4"], columns=["volume"], conn=conn)
+
+    assert df["volume"].tolist() == [100.0, 100.0, 100.5, 100.5]
+    assert ints["volume"].dtype == "int64"
+
+
+def test_long_ticker_lists_are_chunked(conn, monkeypatch):
+    monkeypatch.setattr(prices_mod, "_MAX_BIND_VARIABLES", 3)
+    statements = []
+    conn.set_trace_callback(statements.append)
+
+    df = dbmod.read_prices_many(
+        ["PETR4", "VALE3", "ITUB4"], columns=["close"], conn=conn
+    )
+
+    assert sum(s.startswith("SELECT") for s in statements) == 2
+    assert len(df) == 5
+
+
+def test_unknown_columns_are_rejected(conn):
+    with pytest.raises(ValueError):
+        dbmod.read_prices_many(
+            ["PETR4"], columns=["close; DROP TABLE prices"], conn=conn
+        )
+    with pytest.raises(ValueError):
+        dbmod.read_prices_many(["PETR4"], field="date", conn=conn)
+
+
+def test_database_clients_share_the_contract(conn):
+    class LoopingClient(DatabaseClient):
+        read_prices = staticmethod(dbmod.read_prices)
+        write_returns = write_prices = record_snapshot_metadata = None
+
+    args = (["PETR4", "VALE3"],)
+    kwargs = {"field": "close", "conn": conn}
+
+    pd.testing.assert_frame_equal(
+        LoopingClient().read_prices_many(*args, **kwargs),
+        DefaultDatabaseClient().read_prices_many(*args, **kwargs),
+    )
@@ -0,0 +1,125 @@
+"""Testes dos adaptadores record/replay sobre o arquivo raw/."""
+
+import pandas as pd
+import pytest
+
+from src.adapters.dummy import DummyAdapter
+from src.adapters.errors import FetchError, ValidationError
+from src.adapters.factory import available_providers, get_adapter
+from src.adapters.replay import RecordingAdapter, ReplayAdapter, find_raw_files
+from src.ingest.raw_storage import save_raw_csv
+
+
+def _frame(start: str, periods: int, close: float = 10.0) -> pd.DataFrame:
+    idx = pd.date_range(start, periods=periods, freq="D", name="Date")
+    return pd.DataFrame(
+        {
+            "Open": [close] * periods,
+            "High": [close + 1] * periods,
+            "Low": [close - 1] * periods,
+            "Close": [close] * periods,
+            "Volume": [100] * periods,
+        },
+        index=idx,
+    )
+
+
+def test_replay_and_record_are_registered():
+    assert {"replay", "record"} <= set(available_providers())
+    assert isinstance(get_adapter("replay"), ReplayAdapter)
+
+
+def test_replay_serves_newest_file_filtered_to_window(tmp_path):
+    raw = tmp_path / "raw"
+    meta = tmp_path / "ingest_logs.jsonl"
+    save_raw_csv(
+        _frame("2024-01-01", 10, 1.0),
+        "yfinance",
+        "PETR4",
+        ts="20240101T000000Z",
+        raw_root=raw,
+        metadata_path=meta,
+    )
+    save_raw_csv(
+        _frame("2024-01-01", 10, 2.0),
+        "yfinance",
+        "PETR4",
+        ts="20240201T000000Z",
+        raw_root=raw,
+        metadata_path=meta,
+    )
+
+    df = ReplayAdapter(raw_root=raw).fetch(
+        "PETR4.SA", start_date="2024-01-03", end_date="2024-01-05"
+    )
+
+    assert list(df.index.strftime("%Y-%m-%d")) == [
+        "2024-01-03",
+        "2024-01-04",
+        "2024-01-05",
+    ]
+    assert (df["Close"] == 2.0).all()
+    assert df.attrs["replayed_from"].endswith("PETR4-20240201T000000Z.csv")
+
+
+def test_replay_rejects_tampered_file(tmp_path):
+    raw = tmp_path / "raw"
+    save_raw_csv(
+        _frame("2024-01-01", 3),
+        "yfinance",
+        "VALE3",
+        raw_root=raw,
+        metadata_path=tmp_path / "m.jsonl",
+    )
+    (path,) = find_raw_files("yfinance", "VALE3", raw)
+    path.write_text(path.read_text().replace("10", "99"))
+
+    with pytest.raises(ValidationError):
+        ReplayAdapter(raw_root=raw).fetch("VALE3")
+    assert len(ReplayAdapter(raw_root=raw, verify_checksum=False).fetch("VALE3")) == 3
+
+
+def test_replay_without_archive_raises_fetch_error(tmp_path):
+    with pytest.raises(FetchError):
+        ReplayAdapter(raw_root=tmp_path).fetch("ITUB3")
+
+
+def test_record_writes_through_and_replays_from_raw_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAW_ROOT", str(tmp_path))
+    monkeypatch.chdir(tmp_path)  # metadata/ fica no tmp
+    recorder = RecordingAdapter(DummyAdapter(), provider="dummy")
+
+    live = recorder.fetch("BBDC4")
+
+    (recorded,) = find_raw_files("dummy", "BBDC4")
+    assert recorded.parent == tmp_path / "dummy"
+    assert live.attrs["raw_provider"] == "dummy"
+    assert live.attrs["recorded_raw"]["filepath"] == str(recorded)
+    assert recorder.retry_config is not None
+    replay = ReplayAdapter(provider="dummy")
+    assert replay.raw_root == tmp_path
+    assert replay.chunk_config is not None
+    replayed = replay.fetch("BBDC4")
+    assert list(replayed["Close"]) == list(live["Close"])
+
+
+def test_recorded_ingest_writes_raw_once_and_replays(tmp_path, monkeypatch):
+    from src.ingest import pipeline
+
+    monkeypatch.chdir(tmp_path)  # raw/ e metadata/ ficam no tmp
+    monkeypatch.setenv("LOCK_DIR", str(tmp_path / "locks"))
+    monkeypatch.setattr(pipeline, "_record_ingest_metadata", lambda meta: None)
+    monkeypatch.setattr(
+        pipeline, "ingest_from_snapshot", lambda *a, **k: {"status": "success"}
+    )
+    recorder = RecordingAdapter(DummyAdapter(), provider="dummy")
+    monkeypatch.setattr("src.adapters.factory.get_adapter", lambda name: recorder)
+
+    result = pipeline.ingest("BBDC4", "record", force_refresh=True)
+
+    assert result["status"] == "success"
+    raw = tmp_path / "raw"
+    (recorded,) = find_raw_files("dummy", "BBDC4", raw)
+    assert find_raw_files("record", "BBDC4", raw) == []
+    replayed = ReplayAdapter(provider="dummy", raw_root=raw).fetch("BBDC4")
+    assert list(replayed["Close"]) == list(DummyAdapter().fetch("BBDC4")["Close"])
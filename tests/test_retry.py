@@ -57,3 +57,33 @@ def test_metrics_are_recorded_on_retries(mock_sleep, mock_datareader):
     assert m["retry_count"] >= 1
     assert m["success_after_retry"] >= 1
     assert m["total_attempts"] >= 2
+
+    # detalhamento por provedor com latência e backoff
+    yf = m["providers"]["yfinance"]
+    assert yf["retry_count"] == m["retry_count"]
+    assert yf["fetch_latency"]["count"] == m["total_attempts"]
+    assert yf["backoff_sleep"]["count"] == m["retry_count"]
+
+
+def test_retry_metrics_are_thread_safe_and_keyed_by_provider():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.adapters.retry_metrics import RetryMetrics
+
+    metrics = RetryMetrics(per_ticker=True)
+
+    def worker(i: int) -> None:
+        provider = "a" if i % 2 else "b"
+        for _ in range(500):
+            metrics.record_attempt(provider, f"T{i % 3}")
+            metrics.observe_fetch_latency(0.02, provider)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    m = metrics.to_dict()
+    assert m["total_attempts"] == 8 * 500
+    assert m["providers"]["a"]["total_attempts"] == 4 * 500
+    assert m["providers"]["b"]["fetch_latency"]["count"] == 4 * 500
+    assert m["providers"]["b"]["fetch_latency"]["p95"] == 0.02
+    assert sum(v["total_attempts"] for v in m["tickers"].values()) == 8 * 500
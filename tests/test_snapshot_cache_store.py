@@ -0,0 +1,139 @@
+"""Tests for the keyed SQLite snapshot cache behind ``src.ingest.cache``."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from src.ingest import cache
+from src.ingest_cli import ingest_snapshot
+from src.utils.checksums import sha256_file
+
+
+def _entry(sha, age_seconds=0.0):
+    ts = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    return {"sha256": sha, "processed_at": ts.isoformat()}
+
+
+def test_legacy_json_cache_is_imported_once(tmp_path):
+    legacy = tmp_path / "snapshot_cache.json"
+    legacy.write_text(json.dumps({"/a.csv": _entry("aaa")}), encoding="utf-8")
+
+    with cache.SnapshotCache(legacy) as store:
+        assert store.path == tmp_path / "snapshot_cache.db"
+        assert store.get("/a.csv")["sha256"] == "aaa"
+        store.put("/a.csv", _entry("bbb"))
+
+    # later edits of the JSON file are not re-imported over the store
+    legacy.write_text(json.dumps({"/a.csv": _entry("old")}), encoding="utf-8")
+    assert cache.load_cache(legacy)["/a.csv"]["sha256"] == "bbb"
+
+
+def test_freshness_is_evaluated_by_the_lookup(tmp_path):
+    with cache.SnapshotCache(tmp_path / "c.json") as store:
+        store.put("/fresh.csv", _entry("x"))
+        store.put("/old.csv", _entry("x", age_seconds=120))
+        store.put("/bad.csv", {"sha256": "x", "processed_at": "not-a-timestamp"})
+
+        assert store.is_fresh("/fresh.csv", "x", ttl=60)
+        assert not store.is_fresh("/fresh.csv", "other", ttl=60)
+        assert not store.is_fresh("/old.csv", "x", ttl=60)
+        assert store.is_fresh("/old.csv", "x", ttl=None)
+        assert not store.is_fresh("/bad.csv", "x", ttl=60)
+        assert not store.is_fresh("/missing.csv", "x", ttl=None)
+
+
+def test_compare_and_set(tmp_path):
+    with cache.SnapshotCache(tmp_path / "c.db") as store:
+        assert store.compare_and_set("/k.csv", None, _entry("one"))
+        assert not store.compare_and_set("/k.csv", None, _entry("two"))
+        assert not store.compare_and_set("/k.csv", "stale", _entry("two"))
+        assert store.compare_and_set("/k.csv", "one", _entry("two"))
+        assert store.get("/k.csv")["sha256"] == "two"
+
+
+def test_concurrent_writers_keep_each_others_keys(tmp_path):
+    path = tmp_path / "c.json"
+    cache.SnapshotCache(path).close()
+
+    def writer(prefix):
+        with cache.SnapshotCache(path) as store:
+            for i in range(50):
+                store.put(f"/{prefix}{i}.csv", _entry(prefix))
+
+    threads = [threading.Thread(target=writer, args=(p,)) for p in "abcd"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(cache.load_cache(path)) == 200
+
+
+def test_ingest_snapshot_hits_a_migrated_json_cache(tmp_path):
+    from src.db.schema import _ensure_schema
+
+    conn = sqlite3.connect(":memory:")
+    _ensure_schema(conn)
+    snap = tmp_path / "snap.csv"
+    pd.DataFrame(
+        {"date": ["2023-01-02"], "open": [1], "high": [1], "low": [1], "close": [1]}
+    ).to_csv(snap, index=False)
+    legacy = tmp_path / "snapshot_cache.json"
+    legacy.write_text(
+        json.dumps({str(snap.resolve()): _entry(sha256_file(snap))}), encoding="utf-8"
+    )
+
+    result = ingest_snapshot(snap, "TICK", conn=conn, cache_file=legacy, ttl=3600)
+
+    assert result["cached"] is True
+    assert conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0] == 0
+
+
+def test_ingest_snapshot_survives_an_unusable_cache(tmp_path, caplog):
+    from src.db.schema import _ensure_schema
+
+    conn = sqlite3.connect(":memory:")
+    _ensure_schema(conn)
+    snap = tmp_path / "snap.csv"
+    pd.DataFrame(
+        {"date": ["2023-01-02"], "open": [1], "high": [1], "low": [1], "close": [1]}
+    ).to_csv(snap, index=False)
+    corrupt = tmp_path / "snapshot_cache.db"
+    corrupt.write_bytes(b"not a sqlite database" * 10)
+
+    result = ingest_snapshot(snap, "TICK", conn=conn, cache_file=corrupt, ttl=3600)
+
+    assert result == {"cached": False, "processed_rows": 1, "skipped_rows": 0}
+    assert "treating as cache miss" in caplog.text
+    assert "not recorded" in caplog.text
+
+
+def test_ingest_snapshot_keeps_a_concurrent_cache_entry(tmp_path, monkeypatch):
+    from src import ingest_cli
+    from src.db.schema import _ensure_schema
+
+    conn = sqlite3.connect(":memory:")
+    _ensure_schema(conn)
+    snap = tmp_path / "snap.csv"
+    pd.DataFrame(
+        {"date": ["2023-01-02"], "open": [1], "high": [1], "low": [1], "close": [1]}
+    ).to_csv(snap, index=False)
+    cache_file = tmp_path / "snapshot_cache.db"
+    other = {"sha256": "other", "processed_at": "2023-01-02T00:00:00+00:00"}
+    real_lookup = ingest_cli._cache_lookup
+
+    def lookup_then_race(*args):
+        result = real_lookup(*args)
+        with cache.SnapshotCache(cache_file) as store:
+            store.put(str(snap.resolve()), other)
+        return result
+
+    monkeypatch.setattr(ingest_cli, "_cache_lookup", lookup_then_race)
+
+    ingest_snapshot(snap, "TICK", conn=conn, cache_file=cache_file, ttl=3600)
+
+    with cache.SnapshotCache(cache_file) as store:
+        assert store.get(str(snap.resolve())) == other
@@ -0,0 +1,88 @@
+"""Tests for columnar (Parquet/Arrow IPC) snapshots and their logical checksum."""
+
+import json
+import re
+
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from src.etl import snapshot as snapshot_module
+from src.ingest.config import get_snapshot_format
+from src.ingest.snapshot_ingest import ingest_from_snapshot
+from src.ingest_cli import ingest_snapshot
+
+pytest.importorskip("pyarrow")
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "date": ["2026-01-02", "2026-01-03", "2026-01-06"],
+            "open": [10.0, 11.0, 12.0],
+            "high": [10.5, 11.5, 12.5],
+            "low": [9.5, 10.5, 11.5],
+            "close": [10.2, 11.2, 12.2],
+            "volume": [1000, 1100, 1200],
+        }
+    )
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_checksum_is_independent_of_format(tmp_path, fmt):
+    df = _frame()
+    csv_sum = snapshot_module.write_snapshot(df, tmp_path / "a.csv")
+    path = tmp_path / f"a{snapshot_module.SNAPSHOT_EXTENSIONS[fmt]}"
+
+    assert snapshot_module.write_snapshot(df, path) == csv_sum
+    assert snapshot_module.snapshot_format(path) == fmt
+    assert snapshot_module.snapshot_file_checksum(path) == csv_sum
+    assert path.with_name(f"{path.name}.checksum").read_text() == csv_sum
+    restored = snapshot_module.read_snapshot(path)
+    assert restored["close"].tolist() == df["close"].tolist()
+    assert snapshot_module.snapshot_checksum(restored) == csv_sum
+
+
+def test_invalid_format_is_rejected(monkeypatch):
+    monkeypatch.setenv("SNAPSHOT_FORMAT", "xlsx")
+    with pytest.raises(ValueError):
+        get_snapshot_format()
+
+
+def test_ingest_writes_configured_format_and_restore_verifies(tmp_path, monkeypatch):
+    from src.main import app
+
+    monkeypatch.setenv("SNAPSHOT_FORMAT", "parquet")
+    snap_dir = tmp_path / "snaps"
+
+    df = _frame().assign(ticker="PETR4")
+    result = ingest_from_snapshot(df, "PETR4", snapshot_dir=snap_dir)
+
+    (written,) = (snap_dir / "PETR4").glob("*.parquet")
+    assert result["cached"] is False
+    assert snapshot_module.latest_snapshot(snap_dir, "PETR4") == written
+
+    verify = CliRunner().invoke(
+        app, ["pipeline", "restore-verify", "--snapshot-path", str(written)]
+    )
+    report = json.loads(re.search(r"\{.*\}", verify.stdout, re.DOTALL).group(0))
+    assert report["checks"]["checksum_match"] == "pass", verify.output
+    assert verify.exit_code == 0
+
+
+def test_snapshots_ingest_checks_the_logical_checksum(tmp_path):
+    import sqlite3
+
+    from src.db.schema import _ensure_schema
+
+    conn = sqlite3.connect(":memory:")
+    _ensure_schema(conn)
+    path = tmp_path / "snap.arrow"
+    snapshot_module.write_snapshot(_frame(), path)
+    kwargs = {"conn": conn, "cache_file": tmp_path / "cache.json"}
+
+    assert ingest_snapshot(path, "VALE3", **kwargs)["processed_rows"] == 3
+
+    path.with_name("snap.arrow.checksum").write_text("0" * 64)
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        ingest_snapshot(path, "VALE3", force_refresh=True, **kwargs)
@@ -0,0 +1,129 @@
+"""Tests for the indexed snapshot hot columns and the last-snapshot cache."""
+
+import json
+import shutil
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from src import db
+from src.db_migrator import apply_migrations
+from src.ingest.snapshot_ingest import ingest_from_snapshot
+
+MIGRATIONS = Path(__file__).resolve().parent.parent / "migrations"
+
+
+def _migrated(tmp_path) -> str:
+    db_path = str(tmp_path / "meta.db")
+    conn = sqlite3.connect(db_path)
+    apply_migrations(conn)
+    conn.close()
+    return db_path
+
+
+def test_migration_backfills_hot_columns_from_payload(tmp_path):
+    old = tmp_path / "old"
+    old.mkdir()
+    for sql in sorted(MIGRATIONS.glob("000[0-2]_*.sql")):
+        shutil.copy(sql, old)
+    conn = sqlite3.connect(":memory:")
+    apply_migrations(conn, str(old))
+    payload = {"sha256": "abc", "generated_at": "2026-01-02T00:00:00Z", "rows_count": 3}
+    conn.executemany(
+        "INSERT INTO snapshots (id, ticker, created_at, payload) VALUES (?, ?, ?, ?)",
+        [
+            ("a", "PETR4", "2026-01-02", json.dumps(payload)),
+            ("b", "VALE3", "x", "{bad"),
+        ],
+    )
+    conn.commit()
+
+    apply_migrations(conn, str(MIGRATIONS))
+
+    rows = conn.execute(
+        "SELECT id, checksum, generated_at, rows FROM snapshots ORDER BY id"
+    ).fetchall()
+    assert rows == [
+        ("a", "abc", "2026-01-02T00:00:00Z", 3),
+        ("b", None, None, None),
+    ]
+    plan = " ".join(
+        str(r[-1])
+        for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT checksum, generated_at FROM snapshots "
+            "WHERE ticker = ? ORDER BY created_at DESC LIMIT 1",
+            ("PETR4",),
+        )
+    )
+    assert "COVERING INDEX snapshots_ticker_created_at_idx" in plan
+
+
+def test_record_fills_columns_and_listing_skips_payload(tmp_path):
+    db_path = _migrated(tmp_path)
+    db.record_snapshot_metadata(
+        {
+            "snapshot_id": "PETR4-1.csv",
+            "ticker": "PETR4",
+            "generated_at": "2026-01-02T00:00:00Z",
+            "rows_count": 5,
+            "sha256": "f00",
+        },
+        db_path=db_path,
+    )
+
+    (listed,) = db.list_snapshots("PETR4", db_path=db_path)
+    assert "payload" not in listed
+    assert (listed["checksum"], listed["generated_at"], listed["rows"]) == (
+        "f00",
+        "2026-01-02T00:00:00Z",
+        5,
+    )
+    (full,) = db.list_snapshots("PETR4", include_payload=True, db_path=db_path)
+    assert json.loads(full["payload"])["sha256"] == "f00"
+
+
+def test_last_snapshot_meta_is_memoised_until_recorded(tmp_path, monkeypatch):
+    db_path = _migrated(tmp_path)
+    meta = {"ticker": "VALE3", "sha256": "one", "generated_at": "2026-01-02"}
+    db.record_snapshot_metadata({**meta, "created_at": "1"}, db_path=db_path)
+    opened = []
+    real_connect = db.connect
+
+    def counting_connect(*args, **kwargs):
+        opened.append(1)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(db, "connect", counting_connect)
+
+    assert db.get_last_snapshot_meta("VALE3", db_path=db_path)["checksum"] == "one"
+    assert db.get_last_snapshot_meta("VALE3", db_path=db_path)["payload"] is None
+    assert len(opened) == 1
+
+    db.record_snapshot_metadata(
+        {**meta, "sha256": "two", "created_at": "2"}, db_path=db_path
+    )
+    assert db.get_last_snapshot_meta("VALE3", db_path=db_path)["checksum"] == "two"
+    assert db.get_last_snapshot_meta("MISSING", db_path=db_path) is None
+
+
+def test_repeated_ingest_hits_cache_without_decoding_payload(tmp_path, monkeypatch):
+    db_path = _migrated(tmp_path)
+    df = pd.DataFrame(
+        {
+            "date": ["2026-01-01", "2026-01-02"],
+            "open": [1.0, 1.1],
+            "high": [1.0, 1.1],
+            "low": [1.0, 1.1],
+            "close": [1.0, 1.1],
+            "volume": [10, 11],
+        }
+    )
+    kwargs = {"db_path": db_path, "snapshot_dir": tmp_path / "snaps", "ttl": 0}
+    assert ingest_from_snapshot(df, "WEGE3", **kwargs)["cached"] is False
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("payload decoded")
+
+    monkeypatch.setattr("src.ingest.snapshot_ingest.json.loads", no_decode)
+    assert ingest_from_snapshot(df, "WEGE3", **kwargs)["cached"] is True
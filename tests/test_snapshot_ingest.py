@@ -62,14 +62,18 @@ def test_sanitized_filename_and_path(tmp_path, monkeypatch):
     assert sha == "deadbeef"
     # output path must be inside snapshot directory
     assert out_path.resolve().is_relative_to(snap_dir.resolve())
-    # filename should have no path separators and illegal chars replaced
-    assert ".." not in out_path.name
-    assert "/" not in out_path.name
-    assert "?" not in out_path.name
-    assert "foo_bar_TICK_" in out_path.name
+    # the ticker shard directory should have no path separators and illegal
+    # chars replaced, and sit directly under the snapshot directory
+    shard = out_path.parent
+    assert shard.parent == snap_dir.resolve()
+    assert ".." not in shard.name
+    assert "/" not in shard.name
+    assert "?" not in shard.name
+    assert "foo_bar_TICK_" in shard.name
 
     # even a ticker that looks like a path should be safely mapped
     evil = "..\\evil"  # backslash on windows-like input
     sha2, out2 = si._write_and_record_snapshot(df, evil, snap_dir, db_path=None)
     assert out2.resolve().is_relative_to(snap_dir.resolve())
-    assert "evil" in out2.name
+    assert out2.parent.parent == snap_dir.resolve()
+    assert "evil" in out2.parent.name
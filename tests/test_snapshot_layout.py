@@ -0,0 +1,153 @@
+"""Testes do layout de snapshots por ticker e do índice ``index.json``."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from src import db
+from src.db.snapshots import normalize_snapshot_path
+from src.etl import snapshot as snapshot_module
+
+T0 = datetime(2026, 1, 2, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def _write(snap_dir, ticker, minutes):
+    path = snapshot_module.sharded_snapshot_path(
+        snap_dir, ticker, T0 + timedelta(minutes=minutes)
+    )
+    snapshot_module.write_snapshot(pd.DataFrame({"x": [minutes]}), path)
+    return path
+
+
+def _index(shard):
+    return json.loads((shard / "index.json").read_text())["snapshots"]
+
+
+def test_pruning_uses_the_shard_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module, "_snapshot_keep_latest", lambda: 2)
+    other = _write(tmp_path, "VALE3", 0)
+    first = _write(tmp_path, "PETR4", 1)
+
+    # with the index in place no directory is scanned again
+    def no_scan(ticker_dir):
+        raise AssertionError(f"scanned {ticker_dir}")
+
+    monkeypatch.setattr(snapshot_module, "_scan_shard", no_scan)
+    second = _write(tmp_path, "PETR4", 2)
+    third = _write(tmp_path, "PETR4", 3)
+
+    assert first.parent == tmp_path.resolve() / "PETR4"
+    assert not first.exists()
+    assert not first.with_name(f"{first.name}.checksum").exists()
+    assert second.exists() and third.exists()
+    assert _index(third.parent) == [third.name, second.name]
+    assert other.exists()
+    assert snapshot_module.latest_snapshot(tmp_path, "PETR4") == third
+
+
+def test_latest_snapshot_rebuilds_a_missing_index(tmp_path):
+    newest = _write(tmp_path, "ITUB4.SA", 5)
+    (newest.parent / "index.json").unlink()
+
+    assert newest.parent.name == "ITUB4_SA"
+    assert snapshot_module.latest_snapshot(tmp_path, "ITUB4.SA") == newest
+    assert snapshot_module.latest_snapshot(tmp_path, "BBDC4") is None
+
+
+def test_migrate_flat_snapshots(tmp_path):
+    for name in ("PETR4-20260101T000000Z.csv", "PETR4-20260102T000000Z.csv"):
+        (tmp_path / name).write_text("x\n1\n")
+        (tmp_path / f"{name}.checksum").write_text("abc")
+    (tmp_path / "notes.csv").write_text("x\n")
+
+    planned = snapshot_module.migrate_flat_snapshots(tmp_path, dry_run=True)
+    assert len(planned) == 2
+    assert (tmp_path / "PETR4-20260101T000000Z.csv").exists()
+
+    moves = snapshot_module.migrate_flat_snapshots(tmp_path)
+
+    shard = tmp_path / "PETR4"
+    assert [new for _, new in moves] == [
+        shard / "20260101T000000Z.csv",
+        shard / "20260102T000000Z.csv",
+    ]
+    assert (shard / "20260101T000000Z.csv.checksum").read_text() == "abc"
+    assert _index(shard) == ["20260102T000000Z.csv", "20260101T000000Z.csv"]
+    assert (tmp_path / "notes.csv").exists()
+    assert not list(tmp_path.glob("PETR4-*"))
+
+
+def test_migrate_layout_command_updates_metadata(tmp_path):
+    from src.snapshot_cli import app
+
+    flat = tmp_path / "WEGE3-20260101T000000Z.csv"
+    flat.write_text("x\n1\n")
+    db.record_snapshot_metadata(
+        {"ticker": "WEGE3", "snapshot_path": str(flat), "start": "2026-01-01"}
+    )
+
+    result = CliRunner().invoke(
+        app, ["migrate-layout", "--snapshot-dir", str(tmp_path)]
+    )
+
+    assert result.exit_code == 0, result.output
+    moved = tmp_path / "WEGE3" / "20260101T000000Z.csv"
+    assert moved.exists()
+    (row,) = db.list_snapshots("WEGE3")
+    assert row["snapshot_path"] == normalize_snapshot_path(str(moved))
+
+
+def test_sharded_write_prunes_legacy_flat_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module, "_snapshot_keep_latest", lambda: 2)
+    flat = [
+        tmp_path / "PETR4-20260101T000000Z.csv",
+        tmp_path / "PETR4-20260103T000000Z.csv",
+    ]
+    for path in flat:
+        path.write_text("x\n1\n")
+        path.with_name(f"{path.name}.checksum").write_text("abc")
+    prefix_twin = tmp_path / "PETR4F-20250101T000000Z.csv"
+    prefix_twin.write_text("x\n1\n")
+
+    newest = _write(tmp_path, "PETR4", 0)  # 2026-01-02 10:00
+
+    assert not flat[0].exists()
+    assert not flat[0].with_name(f"{flat[0].name}.checksum").exists()
+    assert flat[1].exists() and newest.exists()
+    assert prefix_twin.exists()
+    assert _index(newest.parent) == [newest.name]
+
+
+def test_rename_snapshot_paths_updates_the_stored_path():
+    old = "/srv/snapshots/PETR4-20260101T000000Z.csv"
+    new = "/srv/snapshots/PETR4/20260101T000000Z.csv"
+    db.record_snapshot_metadata({"ticker": "PETR4", "snapshot_path": old})
+    db.record_snapshot_metadata(
+        {"ticker": "VALE3", "snapshot_path": "/srv/snapshots/VALE3-x.csv"}
+    )
+
+    assert db.rename_snapshot_paths([(old, new)]) == 1
+    assert db.rename_snapshot_paths([(old, new)]) == 0
+
+    (row,) = db.list_snapshots("PETR4")
+    assert row["snapshot_path"] == new
+    (other,) = db.list_snapshots("VALE3")
+    assert other["snapshot_path"] == "/srv/snapshots/VALE3-x.csv"
+
+
+def test_export_falls_back_to_the_newest_snapshot_on_disk(tmp_path, monkeypatch):
+    from src.main import app
+
+    monkeypatch.setenv("SNAPSHOT_DIR", str(tmp_path))
+    _write(tmp_path, "PETR4", 1)
+    _write(tmp_path, "PETR4", 2)
+
+    result = CliRunner().invoke(
+        app, ["snapshots", "export", "--ticker", "PETR4", "--format", "json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.stdout[result.stdout.index("{") :])
+    assert payload["data"] == [{"x": 2}]
@@ -0,0 +1,101 @@
+"""Tests for parallel hashing and the incremental checksum cache of
+``scripts/validate_snapshots.py``."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from scripts import validate_snapshots as vs
+
+_SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "validate_snapshots.py"
+
+
+def _make_files(directory: Path, count: int = 4, age_seconds: int = 60) -> list[Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+    old = time.time() - age_seconds
+    files = []
+    for i in range(count):
+        p = directory / f"S{i}.csv"
+        p.write_text(f"date,close\n2026-01-0{i + 1},{i}\n")
+        os.utime(p, (old, old))
+        files.append(p)
+    return files
+
+
+def test_parallel_hashing_matches_sequential(tmp_path):
+    _make_files(tmp_path / "snap", count=6)
+
+    sequential = vs.generate_manifest(tmp_path / "snap", vs.SNAPSHOT_PATTERNS)
+    parallel = vs.generate_manifest(tmp_path / "snap", vs.SNAPSHOT_PATTERNS, workers=3)
+
+    assert parallel == sequential
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path, monkeypatch):
+    files = _make_files(tmp_path / "snap")
+    cache: dict = {}
+    first = vs.generate_manifest(tmp_path / "snap", cache=cache)
+    assert len(cache) == len(files)
+
+    def no_hash(path):
+        raise AssertionError(f"{path} was hashed again")
+
+    monkeypatch.setattr(vs, "sha256_of_file", no_hash)
+    assert vs.generate_manifest(tmp_path / "snap", cache=cache) == first
+
+
+def test_changed_and_deleted_files_update_the_cache(tmp_path):
+    files = _make_files(tmp_path / "snap")
+    cache: dict = {}
+    vs.generate_manifest(tmp_path / "snap", cache=cache)
+
+    files[0].write_text("date,close\n2026-01-01,999\n")
+    old = time.time() - 60
+    os.utime(files[0], (old, old))
+    files[1].unlink()
+    current = vs.generate_manifest(tmp_path / "snap", cache=cache)
+
+    assert current[files[0].as_posix()]["sha256"] == vs.sha256_of_file(files[0])
+    assert str(files[1]) not in cache
+    assert set(cache) == {str(p) for p in files if p.exists()}
+
+
+def test_recently_modified_files_are_not_cached(tmp_path):
+    (fresh,) = _make_files(tmp_path / "snap", count=1, age_seconds=0)
+    cache: dict = {}
+    vs.generate_manifest(tmp_path / "snap", cache=cache)
+
+    assert str(fresh) not in cache
+
+
+@pytest.mark.parametrize("no_cache", [False, True])
+def test_cli_cache_file(tmp_path, no_cache):
+    _make_files(tmp_path / "snap")
+    manifest = tmp_path / "checksums.json"
+    base = [
+        sys.executable,
+        str(_SCRIPT),
+        "--dir",
+        str(tmp_path / "snap"),
+        "--manifest",
+        str(manifest),
+        "--allow-external",
+        "--workers",
+        "2",
+    ]
+    extra = ["--no-cache"] if no_cache else []
+
+    update = subprocess.run(
+        [*base, "--update", *extra], capture_output=True, text=True, timeout=60
+    )
+    assert update.returncode == 0, update.stderr
+    check = subprocess.run([*base, *extra], capture_output=True, text=True, timeout=60)
+    assert check.returncode == 0, check.stderr
+    assert "All snapshots match manifest." in check.stdout
+
+    cache_file = tmp_path / ".checksums.json.cache"
+    assert cache_file.exists() is not no_cache